@@ -0,0 +1,27 @@
+"""add users.created_at index for keyset pagination
+
+Revision ID: 0b9e4f7a2c61
+Revises: f3c8a0b64d17
+Create Date: 2026-10-17 18:21:09.674512
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0b9e4f7a2c61'
+down_revision: Union[str, Sequence[str], None] = 'f3c8a0b64d17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_users_created_at', 'users', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_users_created_at', table_name='users')
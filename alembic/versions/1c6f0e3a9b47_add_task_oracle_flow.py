@@ -0,0 +1,35 @@
+"""add tasks.oracle_flow
+
+Revision ID: 1c6f0e3a9b47
+Revises: e4b7a1c92d58
+Create Date: 2026-10-18 13:27:19.840265
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1c6f0e3a9b47'
+down_revision: Union[str, Sequence[str], None] = 'e4b7a1c92d58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # PostgreSQL: add_column 不会自动 CREATE TYPE
+    bind = op.get_bind()
+    if bind.dialect.name == 'postgresql':
+        sa.Enum('staged', 'fused', name='oracleflow').create(bind, checkfirst=True)
+
+    with op.batch_alter_table('tasks', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('oracle_flow', sa.Enum('staged', 'fused', name='oracleflow'), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('tasks', schema=None) as batch_op:
+        batch_op.drop_column('oracle_flow')
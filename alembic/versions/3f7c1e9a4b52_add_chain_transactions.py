@@ -0,0 +1,64 @@
+"""add chain_transactions table and submitted payout status
+
+Revision ID: 3f7c1e9a4b52
+Revises: 8e41c6b2f9d0
+Create Date: 2026-10-17 22:41:08.315274
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f7c1e9a4b52'
+down_revision: Union[str, Sequence[str], None] = '8e41c6b2f9d0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('chain_transactions',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('tx_hash', sa.String(), nullable=False),
+    sa.Column('kind', sa.Enum('payout', 'refund', 'escrow_create', 'escrow_join', 'escrow_resolve', 'escrow_void', name='chaintxkind'), nullable=False),
+    sa.Column('task_id', sa.String(), nullable=True),
+    sa.Column('ref_id', sa.String(), nullable=True),
+    sa.Column('status', sa.Enum('submitted', 'confirmed', 'failed', name='chaintxstatus'), nullable=False),
+    sa.Column('block_number', sa.Integer(), nullable=True),
+    sa.Column('checks', sa.Integer(), nullable=False),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_chain_transactions_status', 'chain_transactions', ['status', 'id'], unique=False)
+    op.create_index('ix_chain_transactions_task_id', 'chain_transactions', ['task_id'], unique=False)
+    op.create_index('ix_chain_transactions_tx_hash', 'chain_transactions', ['tx_hash'], unique=False)
+
+    # PostgreSQL: 需要显式 ADD VALUE
+    bind = op.get_bind()
+    if bind.dialect.name == 'postgresql':
+        op.execute("ALTER TYPE payoutstatus ADD VALUE IF NOT EXISTS 'submitted'")
+
+    with op.batch_alter_table('tasks', schema=None) as batch_op:
+        batch_op.alter_column('payout_status',
+               existing_type=sa.Enum('pending', 'paid', 'failed', 'refunded', name='payoutstatus'),
+               type_=sa.Enum('pending', 'submitted', 'paid', 'failed', 'refunded', name='payoutstatus'),
+               existing_nullable=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('tasks', schema=None) as batch_op:
+        batch_op.alter_column('payout_status',
+               existing_type=sa.Enum('pending', 'submitted', 'paid', 'failed', 'refunded', name='payoutstatus'),
+               type_=sa.Enum('pending', 'paid', 'failed', 'refunded', name='payoutstatus'),
+               existing_nullable=False)
+
+    op.drop_index('ix_chain_transactions_tx_hash', table_name='chain_transactions')
+    op.drop_index('ix_chain_transactions_task_id', table_name='chain_transactions')
+    op.drop_index('ix_chain_transactions_status', table_name='chain_transactions')
+    op.drop_table('chain_transactions')
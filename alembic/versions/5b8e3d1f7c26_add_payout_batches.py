@@ -0,0 +1,81 @@
+"""add payout_batches table and tasks.payout_batch_id
+
+Revision ID: 5b8e3d1f7c26
+Revises: 9c4d2e7b1a85
+Create Date: 2026-10-17 23:58:12.330871
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b8e3d1f7c26'
+down_revision: Union[str, Sequence[str], None] = '9c4d2e7b1a85'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_PAYOUT_OLD = ('pending', 'submitted', 'paid', 'failed', 'refunded')
+_PAYOUT_NEW = ('pending', 'queued', 'submitted', 'paid', 'failed', 'refunded')
+_KIND_OLD = ('payout', 'refund', 'escrow_create', 'escrow_join', 'escrow_resolve', 'escrow_void')
+_KIND_NEW = _KIND_OLD + ('payout_batch',)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('payout_batches',
+    sa.Column('id', sa.String(), nullable=False),
+    sa.Column('status', sa.Enum('pending', 'submitted', 'confirmed', 'failed', name='payoutbatchstatus'), nullable=False),
+    sa.Column('tx_hash', sa.String(), nullable=True),
+    sa.Column('transfer_count', sa.Integer(), nullable=False),
+    sa.Column('total_amount', sa.Float(), nullable=False),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_payout_batches_status', 'payout_batches', ['status', 'created_at'], unique=False)
+
+    # PostgreSQL: 需要显式 ADD VALUE
+    bind = op.get_bind()
+    if bind.dialect.name == 'postgresql':
+        op.execute("ALTER TYPE payoutstatus ADD VALUE IF NOT EXISTS 'queued'")
+        op.execute("ALTER TYPE chaintxkind ADD VALUE IF NOT EXISTS 'payout_batch'")
+
+    with op.batch_alter_table('tasks', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('payout_batch_id', sa.String(), nullable=True))
+        batch_op.alter_column('payout_status',
+               existing_type=sa.Enum(*_PAYOUT_OLD, name='payoutstatus'),
+               type_=sa.Enum(*_PAYOUT_NEW, name='payoutstatus'),
+               existing_nullable=False)
+        batch_op.create_index('ix_tasks_payout_status', ['payout_status'], unique=False)
+        batch_op.create_index('ix_tasks_payout_batch_id', ['payout_batch_id'], unique=False)
+
+    with op.batch_alter_table('chain_transactions', schema=None) as batch_op:
+        batch_op.alter_column('kind',
+               existing_type=sa.Enum(*_KIND_OLD, name='chaintxkind'),
+               type_=sa.Enum(*_KIND_NEW, name='chaintxkind'),
+               existing_nullable=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('chain_transactions', schema=None) as batch_op:
+        batch_op.alter_column('kind',
+               existing_type=sa.Enum(*_KIND_NEW, name='chaintxkind'),
+               type_=sa.Enum(*_KIND_OLD, name='chaintxkind'),
+               existing_nullable=False)
+
+    with op.batch_alter_table('tasks', schema=None) as batch_op:
+        batch_op.drop_index('ix_tasks_payout_batch_id')
+        batch_op.drop_index('ix_tasks_payout_status')
+        batch_op.alter_column('payout_status',
+               existing_type=sa.Enum(*_PAYOUT_NEW, name='payoutstatus'),
+               type_=sa.Enum(*_PAYOUT_OLD, name='payoutstatus'),
+               existing_nullable=False)
+        batch_op.drop_column('payout_batch_id')
+
+    op.drop_index('ix_payout_batches_status', table_name='payout_batches')
+    op.drop_table('payout_batches')
@@ -0,0 +1,38 @@
+"""add task_events table
+
+Revision ID: 5d2a9c7e1b38
+Revises: 0b9e4f7a2c61
+Create Date: 2026-10-17 19:02:37.218450
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d2a9c7e1b38'
+down_revision: Union[str, Sequence[str], None] = '0b9e4f7a2c61'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('task_events',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('task_id', sa.String(), nullable=False),
+    sa.Column('submission_id', sa.String(), nullable=True),
+    sa.Column('event_type', sa.String(), nullable=False),
+    sa.Column('data', sa.Text(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_task_events_task_id', 'task_events', ['task_id', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_task_events_task_id', table_name='task_events')
+    op.drop_table('task_events')
@@ -0,0 +1,61 @@
+"""add webhooks and webhook_deliveries tables
+
+Revision ID: 8e41c6b2f9d0
+Revises: 5d2a9c7e1b38
+Create Date: 2026-10-17 20:14:52.907113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e41c6b2f9d0'
+down_revision: Union[str, Sequence[str], None] = '5d2a9c7e1b38'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('webhooks',
+    sa.Column('id', sa.String(), nullable=False),
+    sa.Column('user_id', sa.String(), nullable=False),
+    sa.Column('url', sa.String(), nullable=False),
+    sa.Column('secret', sa.String(), nullable=False),
+    sa.Column('event_types', sa.Text(), nullable=True),
+    sa.Column('task_id', sa.String(), nullable=True),
+    sa.Column('active', sa.Boolean(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_webhooks_active_user', 'webhooks', ['active', 'user_id'], unique=False)
+    op.create_table('webhook_deliveries',
+    sa.Column('id', sa.String(), nullable=False),
+    sa.Column('webhook_id', sa.String(), nullable=False),
+    sa.Column('event_id', sa.Integer(), nullable=False),
+    sa.Column('status', sa.Enum('pending', 'sending', 'delivered', 'dead', name='webhookdeliverystatus'), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('next_attempt_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('lease_token', sa.String(), nullable=True),
+    sa.Column('locked_until', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('delivered_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_webhook_deliveries_due', 'webhook_deliveries', ['status', 'next_attempt_at'], unique=False)
+    op.create_index('ix_webhook_deliveries_webhook', 'webhook_deliveries', ['webhook_id', 'status'], unique=False)
+    op.create_index('ix_webhook_deliveries_lease', 'webhook_deliveries', ['lease_token'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_webhook_deliveries_lease', table_name='webhook_deliveries')
+    op.drop_index('ix_webhook_deliveries_webhook', table_name='webhook_deliveries')
+    op.drop_index('ix_webhook_deliveries_due', table_name='webhook_deliveries')
+    op.drop_table('webhook_deliveries')
+    op.drop_index('ix_webhooks_active_user', table_name='webhooks')
+    op.drop_table('webhooks')
@@ -0,0 +1,49 @@
+"""add escrow_outbox table
+
+Revision ID: 9c4d2e7b1a85
+Revises: 3f7c1e9a4b52
+Create Date: 2026-10-17 23:26:41.502913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c4d2e7b1a85'
+down_revision: Union[str, Sequence[str], None] = '3f7c1e9a4b52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('escrow_outbox',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('task_id', sa.String(), nullable=False),
+    sa.Column('action', sa.Enum('create_challenge', 'resolve_challenge', 'void_challenge', name='escrowaction'), nullable=False),
+    sa.Column('payload', sa.Text(), nullable=False),
+    sa.Column('status', sa.Enum('pending', 'sending', 'sent', 'failed', name='escrowcallstatus'), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('next_attempt_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('lease_token', sa.String(), nullable=True),
+    sa.Column('locked_until', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('tx_hash', sa.String(), nullable=True),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('sent_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_escrow_outbox_due', 'escrow_outbox', ['status', 'next_attempt_at'], unique=False)
+    op.create_index('ix_escrow_outbox_task', 'escrow_outbox', ['task_id', 'status'], unique=False)
+    op.create_index('ix_escrow_outbox_lease', 'escrow_outbox', ['lease_token'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_escrow_outbox_lease', table_name='escrow_outbox')
+    op.drop_index('ix_escrow_outbox_task', table_name='escrow_outbox')
+    op.drop_index('ix_escrow_outbox_due', table_name='escrow_outbox')
+    op.drop_table('escrow_outbox')
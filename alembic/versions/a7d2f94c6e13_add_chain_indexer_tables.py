@@ -0,0 +1,85 @@
+"""add chain indexer tables
+
+Revision ID: a7d2f94c6e13
+Revises: 5b8e3d1f7c26
+Create Date: 2026-10-18 00:41:05.117482
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7d2f94c6e13'
+down_revision: Union[str, Sequence[str], None] = '5b8e3d1f7c26'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('indexer_cursors',
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('block_number', sa.Integer(), nullable=False),
+    sa.Column('block_hash', sa.String(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+    op.create_table('indexed_blocks',
+    sa.Column('number', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('hash', sa.String(), nullable=False),
+    sa.PrimaryKeyConstraint('number')
+    )
+    op.create_table('token_transfers',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('token', sa.String(), nullable=False),
+    sa.Column('block_number', sa.Integer(), nullable=False),
+    sa.Column('tx_hash', sa.String(), nullable=False),
+    sa.Column('log_index', sa.Integer(), nullable=False),
+    sa.Column('from_address', sa.String(), nullable=False),
+    sa.Column('to_address', sa.String(), nullable=False),
+    sa.Column('amount', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('tx_hash', 'log_index', name='uq_token_transfers_log')
+    )
+    op.create_index('ix_token_transfers_block', 'token_transfers', ['block_number'], unique=False)
+    op.create_index('ix_token_transfers_to', 'token_transfers', ['token', 'to_address', 'block_number'], unique=False)
+    op.create_index('ix_token_transfers_from', 'token_transfers', ['token', 'from_address', 'block_number'], unique=False)
+    op.create_table('token_balances',
+    sa.Column('token', sa.String(), nullable=False),
+    sa.Column('wallet', sa.String(), nullable=False),
+    sa.Column('balance', sa.BigInteger(), nullable=False),
+    sa.Column('block_number', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('token', 'wallet')
+    )
+    op.create_table('escrow_events',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('block_number', sa.Integer(), nullable=False),
+    sa.Column('tx_hash', sa.String(), nullable=False),
+    sa.Column('log_index', sa.Integer(), nullable=False),
+    sa.Column('event', sa.String(), nullable=False),
+    sa.Column('task_key', sa.String(), nullable=False),
+    sa.Column('account', sa.String(), nullable=True),
+    sa.Column('amount', sa.BigInteger(), nullable=True),
+    sa.Column('verdict', sa.Integer(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('tx_hash', 'log_index', name='uq_escrow_events_log')
+    )
+    op.create_index('ix_escrow_events_task_key', 'escrow_events', ['task_key', 'event'], unique=False)
+    op.create_index('ix_escrow_events_block', 'escrow_events', ['block_number'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_escrow_events_block', table_name='escrow_events')
+    op.drop_index('ix_escrow_events_task_key', table_name='escrow_events')
+    op.drop_table('escrow_events')
+    op.drop_table('token_balances')
+    op.drop_index('ix_token_transfers_from', table_name='token_transfers')
+    op.drop_index('ix_token_transfers_to', table_name='token_transfers')
+    op.drop_index('ix_token_transfers_block', table_name='token_transfers')
+    op.drop_table('token_transfers')
+    op.drop_table('indexed_blocks')
+    op.drop_table('indexer_cursors')
@@ -0,0 +1,45 @@
+"""add oracle_jobs table
+
+Revision ID: a7d3e91f0c24
+Revises: c42bbc03e581
+Create Date: 2026-10-17 10:12:41.503118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7d3e91f0c24'
+down_revision: Union[str, Sequence[str], None] = 'c42bbc03e581'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('oracle_jobs',
+    sa.Column('id', sa.String(), nullable=False),
+    sa.Column('kind', sa.Enum('submission', 'dimension_gen', name='oraclejobkind'), nullable=False),
+    sa.Column('task_id', sa.String(), nullable=False),
+    sa.Column('submission_id', sa.String(), nullable=True),
+    sa.Column('priority', sa.Integer(), nullable=False),
+    sa.Column('status', sa.Enum('queued', 'running', 'done', 'dead', name='oraclejobstatus'), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('max_attempts', sa.Integer(), nullable=False),
+    sa.Column('available_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('locked_until', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_oracle_jobs_claim', 'oracle_jobs', ['status', 'priority', 'available_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_oracle_jobs_claim', table_name='oracle_jobs')
+    op.drop_table('oracle_jobs')
@@ -0,0 +1,101 @@
+"""add submission_dimension_scores
+
+Revision ID: e4b7a1c92d58
+Revises: a7d2f94c6e13
+Create Date: 2026-10-18 09:12:44.503118
+
+"""
+import json
+from datetime import datetime, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy import text
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4b7a1c92d58'
+down_revision: Union[str, Sequence[str], None] = 'a7d2f94c6e13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_BATCH = 500
+
+
+def _stage(feedback: dict):
+    # Same rules as app.services.dimension_scores.feedback_stage
+    if not isinstance(feedback.get('dimension_scores'), dict):
+        return None
+    if feedback.get('type') == 'individual_scoring':
+        return 'individual'
+    if feedback.get('type') == 'scoring':
+        return 'comparative' if 'rank' in feedback else 'individual'
+    return None
+
+
+def _number(value):
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    return float(value)
+
+
+def _rows(sub_id, task_id, worker_id, raw, now):
+    try:
+        feedback = json.loads(raw)
+    except (TypeError, ValueError):
+        return []
+    if not isinstance(feedback, dict):
+        return []
+    stage = _stage(feedback)
+    if stage is None:
+        return []
+    return [
+        {'submission_id': sub_id, 'task_id': task_id, 'worker_id': worker_id,
+         'dim_id': dim_id, 'stage': stage, 'band': entry.get('band'),
+         'score': _number(entry.get('score')), 'raw_score': _number(entry.get('raw_score')),
+         'evidence': entry.get('evidence'), 'created_at': now}
+        for dim_id, entry in feedback['dimension_scores'].items()
+        if isinstance(entry, dict)
+    ]
+
+
+def upgrade() -> None:
+    """Upgrade schema: create the table, then backfill it from submissions.oracle_feedback."""
+    scores = op.create_table('submission_dimension_scores',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('submission_id', sa.String(), nullable=False),
+    sa.Column('task_id', sa.String(), nullable=False),
+    sa.Column('worker_id', sa.String(), nullable=False),
+    sa.Column('dim_id', sa.String(), nullable=False),
+    sa.Column('stage', sa.Enum('individual', 'comparative', name='dimensionscorestage'), nullable=False),
+    sa.Column('band', sa.String(), nullable=True),
+    sa.Column('score', sa.Float(), nullable=True),
+    sa.Column('raw_score', sa.Float(), nullable=True),
+    sa.Column('evidence', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('submission_id', 'stage', 'dim_id', name='uq_submission_dimension_scores')
+    )
+    op.create_index('ix_submission_dimension_scores_rank', 'submission_dimension_scores',
+                    ['task_id', 'stage', 'dim_id', 'score'], unique=False)
+
+    conn = op.get_bind()
+    now = datetime.now(timezone.utc)
+    result = conn.execute(text(
+        "SELECT id, task_id, worker_id, oracle_feedback FROM submissions "
+        "WHERE oracle_feedback IS NOT NULL"
+    ))
+    while True:
+        chunk = result.fetchmany(_BATCH)
+        if not chunk:
+            break
+        rows = [r for sub in chunk for r in _rows(*sub, now)]
+        if rows:
+            op.bulk_insert(scores, rows)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_submission_dimension_scores_rank', table_name='submission_dimension_scores')
+    op.drop_table('submission_dimension_scores')
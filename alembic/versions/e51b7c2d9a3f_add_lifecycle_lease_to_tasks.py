@@ -0,0 +1,32 @@
+"""add lifecycle lease columns to tasks
+
+Revision ID: e51b7c2d9a3f
+Revises: a7d3e91f0c24
+Create Date: 2026-10-17 14:03:27.118406
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e51b7c2d9a3f'
+down_revision: Union[str, Sequence[str], None] = 'a7d3e91f0c24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('tasks', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('lease_owner', sa.String(), nullable=True))
+        batch_op.add_column(sa.Column('lease_until', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('tasks', schema=None) as batch_op:
+        batch_op.drop_column('lease_until')
+        batch_op.drop_column('lease_owner')
@@ -0,0 +1,53 @@
+"""add composite indexes for hot query paths
+
+Revision ID: f3c8a0b64d17
+Revises: e51b7c2d9a3f
+Create Date: 2026-10-17 16:40:52.336104
+
+jury_ballots.task_id and the malicious_tags.task_id prefix are already
+served by the indexes behind their unique constraints.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3c8a0b64d17'
+down_revision: Union[str, Sequence[str], None] = 'e51b7c2d9a3f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = [
+    ('ix_tasks_type_status_deadline', 'tasks', ['type', 'status', 'deadline']),
+    ('ix_tasks_status_window_end', 'tasks', ['status', 'challenge_window_end']),
+    ('ix_tasks_status_created_at', 'tasks', ['status', 'created_at']),
+    ('ix_tasks_created_at', 'tasks', ['created_at']),
+    ('ix_tasks_publisher_id', 'tasks', ['publisher_id']),
+    ('ix_tasks_winner_submission_id', 'tasks', ['winner_submission_id']),
+    ('ix_scoring_dimensions_task_id', 'scoring_dimensions', ['task_id']),
+    ('ix_submissions_task_worker', 'submissions', ['task_id', 'worker_id']),
+    ('ix_submissions_task_status', 'submissions', ['task_id', 'status']),
+    ('ix_submissions_worker_status', 'submissions', ['worker_id', 'status']),
+    ('ix_challenges_task_challenger_sub', 'challenges', ['task_id', 'challenger_submission_id']),
+    ('ix_challenges_wallet_created_at', 'challenges', ['challenger_wallet', 'created_at']),
+    ('ix_challenges_challenger_submission_id', 'challenges', ['challenger_submission_id']),
+    ('ix_trust_events_user_created_at', 'trust_events', ['user_id', 'created_at']),
+    ('ix_trust_events_task_id', 'trust_events', ['task_id']),
+    ('ix_arbiter_votes_challenge_id', 'arbiter_votes', ['challenge_id']),
+    ('ix_arbiter_votes_arbiter_user_id', 'arbiter_votes', ['arbiter_user_id']),
+    ('ix_malicious_tags_task_target', 'malicious_tags', ['task_id', 'target_submission_id']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,198 @@
+"""Event-driven task lifecycle engine.
+
+Keeps an in-process min-heap of the next moment each live task needs
+attention — its deadline, its challenge_window_end, or its jury voting
+timeout — and runs the scheduler's lifecycle sweeps for just those tasks when
+the timer fires. Code that changes a task's state out of band (task
+creation, oracle completion, a jury vote) calls `notify_lifecycle(task_id)`
+so the task is re-evaluated immediately instead of on the next sweep.
+
+The heap is rebuilt from the database at startup; the APScheduler interval
+jobs in scheduler.py remain as a slow safety net.
+"""
+import heapq
+import itertools
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from sqlalchemy.orm import Session
+from .database import SessionLocal
+from .models import Task, TaskStatus, JuryBallot
+
+_LIVE_STATUSES = (TaskStatus.open, TaskStatus.scoring,
+                  TaskStatus.challenge_window, TaskStatus.arbitrating)
+
+# A pass that could not move a task (still scoring after a failed batch_score,
+# leased by another scheduler, a step that raised) looks at it again this soon,
+# like the old one-minute tick, instead of spinning on a due time already past.
+RECHECK_INTERVAL = timedelta(minutes=1)
+
+
+def _aware(dt: Optional[datetime]) -> Optional[datetime]:
+    # SQLite drops tzinfo on the way back
+    if dt is not None and dt.tzinfo is None:
+        return dt.replace(tzinfo=timezone.utc)
+    return dt
+
+
+def next_due(db: Session, task: Task) -> Optional[datetime]:
+    """When the lifecycle next needs to look at `task` without being notified."""
+    if task.status == TaskStatus.open:
+        return _aware(task.deadline)
+    if task.status == TaskStatus.challenge_window:
+        return _aware(task.challenge_window_end)
+    if task.status == TaskStatus.arbitrating:
+        from .scheduler import JURY_VOTING_TIMEOUT
+        first = (
+            db.query(JuryBallot.created_at)
+            .filter(JuryBallot.task_id == task.id)
+            .order_by(JuryBallot.created_at)
+            .first()
+        )
+        if first:
+            return _aware(first[0]) + JURY_VOTING_TIMEOUT
+        # Legacy per-challenge arbitration: votes arrive without a notification
+        return datetime.now(timezone.utc) + RECHECK_INTERVAL
+    if task.status == TaskStatus.scoring:
+        # Oracle completion notifies sooner; this retries a failed batch_score
+        return datetime.now(timezone.utc) + RECHECK_INTERVAL
+    # closed/voided are final
+    return None
+
+
+class LifecycleEngine:
+    """Timer heap of task due times plus a set of tasks to re-evaluate now."""
+
+    def __init__(self, session_factory=None):
+        self.session_factory = session_factory or SessionLocal
+        self._heap: list[tuple[datetime, int, str]] = []
+        self._scheduled: dict[str, datetime] = {}   # latest due time per task; stale heap entries are skipped
+        self._ready: set[str] = set()
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._stop = False
+        self._thread: Optional[threading.Thread] = None
+
+    def load(self) -> int:
+        """Seed the heap from every task that can still transition."""
+        db = self.session_factory()
+        try:
+            tasks = db.query(Task).filter(Task.status.in_(_LIVE_STATUSES)).all()
+            for task in tasks:
+                if task.status == TaskStatus.scoring:
+                    self.trigger(task.id)
+                else:
+                    due = next_due(db, task)
+                    if due is not None:
+                        self.schedule(task.id, due)
+            return len(tasks)
+        finally:
+            db.close()
+
+    def schedule(self, task_id: str, due: datetime) -> None:
+        with self._cond:
+            self._scheduled[task_id] = due
+            heapq.heappush(self._heap, (due, next(self._seq), task_id))
+            self._cond.notify()
+
+    def trigger(self, task_id: str) -> None:
+        with self._cond:
+            self._ready.add(task_id)
+            self._cond.notify()
+
+    def pop_due(self, now: Optional[datetime] = None) -> list[str]:
+        """Remove and return tasks that were triggered or whose timer has expired."""
+        now = now or datetime.now(timezone.utc)
+        with self._cond:
+            due = set(self._ready)
+            self._ready.clear()
+            while self._heap and self._heap[0][0] <= now:
+                when, _, task_id = heapq.heappop(self._heap)
+                if self._scheduled.get(task_id) == when:
+                    del self._scheduled[task_id]
+                    due.add(task_id)
+            return sorted(due)
+
+    def _seconds_until_next(self) -> Optional[float]:
+        if self._ready:
+            return 0.0
+        if not self._heap:
+            return None
+        return max(0.0, (self._heap[0][0] - datetime.now(timezone.utc)).total_seconds())
+
+    def process(self, task_ids: list[str]) -> None:
+        """Run the lifecycle for `task_ids`, then reschedule them from their new state."""
+        from .scheduler import quality_first_lifecycle, fastest_first_refund
+        if not task_ids:
+            return
+        db = self.session_factory()
+        try:
+            now = datetime.now(timezone.utc)
+            before = dict(db.query(Task.id, Task.status).filter(Task.id.in_(task_ids)).all())
+            quality_first_lifecycle(db=db, task_ids=task_ids)
+            fastest_first_refund(db=db, task_ids=task_ids)
+            db.expire_all()
+            for task in db.query(Task).filter(Task.id.in_(task_ids)).all():
+                if task.status == TaskStatus.scoring and before.get(task.id) != TaskStatus.scoring:
+                    # Just left open: batch scoring can start right away
+                    self.trigger(task.id)
+                    continue
+                due = next_due(db, task)
+                if due is not None and due <= now and task.status == before.get(task.id):
+                    # Nothing moved (e.g. another node holds the lease): back off
+                    due = now + RECHECK_INTERVAL
+                if due is not None:
+                    self.schedule(task.id, due)
+        finally:
+            db.close()
+
+    def start(self) -> None:
+        self.load()
+        self._thread = threading.Thread(target=self._loop, name="lifecycle-engine", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        with self._cond:
+            self._stop = True
+            self._cond.notify()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def _loop(self) -> None:
+        while True:
+            with self._cond:
+                if self._stop:
+                    return
+                wait = self._seconds_until_next()
+                if wait is None or wait > 0:
+                    self._cond.wait(timeout=wait)
+                if self._stop:
+                    return
+            try:
+                self.process(self.pop_due())
+            except Exception as e:
+                print(f"[lifecycle] error: {e}", flush=True)
+
+
+_engine: Optional[LifecycleEngine] = None
+
+
+def start_lifecycle_engine() -> LifecycleEngine:
+    global _engine
+    if _engine is None:
+        _engine = LifecycleEngine()
+        _engine.start()
+    return _engine
+
+
+def stop_lifecycle_engine() -> None:
+    global _engine
+    if _engine is not None:
+        _engine.stop()
+        _engine = None
+
+
+def notify_lifecycle(task_id: str) -> None:
+    """Re-evaluate a task now (it was created or changed state). No-op when the engine is not running."""
+    if _engine is not None:
+        _engine.trigger(task_id)
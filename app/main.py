@@ -13,7 +13,19 @@ from .routers import users as users_router
 from .routers import challenges as challenges_router
 from .routers import trust as trust_router_module
 from .routers import auth as auth_router_module
+from .routers import events as events_router
+from .routers import webhooks as webhooks_router
 from .scheduler import create_scheduler
+from .services.oracle_pool import shutdown_oracle_pool
+from .services.job_queue import start_job_dispatcher, stop_job_dispatcher
+from .lifecycle import start_lifecycle_engine, stop_lifecycle_engine
+from .services.events import stop_event_broker
+from .services.webhooks import start_webhook_dispatcher, stop_webhook_dispatcher
+from .services.x402 import close_facilitator_client
+from .services.tx_tracker import start_tx_confirmer, stop_tx_confirmer
+from .services.escrow_outbox import start_escrow_relayer, stop_escrow_relayer
+from .services.payout_batch import start_payout_batcher, stop_payout_batcher
+from .services.chain_indexer import start_chain_indexer, stop_chain_indexer
 
 
 def run_migrations():
@@ -30,8 +42,25 @@ async def lifespan(app: FastAPI):
     #run_migrations()
     scheduler = create_scheduler()
     scheduler.start()
+    start_job_dispatcher()
+    start_lifecycle_engine()
+    start_webhook_dispatcher()
+    start_tx_confirmer()
+    start_escrow_relayer()
+    start_payout_batcher()
+    start_chain_indexer()
     yield
+    stop_chain_indexer()
+    stop_payout_batcher()
+    stop_escrow_relayer()
+    stop_tx_confirmer()
+    stop_webhook_dispatcher()
+    stop_event_broker()
+    stop_lifecycle_engine()
+    stop_job_dispatcher()
     scheduler.shutdown()
+    shutdown_oracle_pool()
+    await close_facilitator_client()
 
 
 app = FastAPI(title="Agent Market", version="0.2.0", lifespan=lifespan)
@@ -44,6 +73,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 
@@ -64,3 +94,5 @@ app.include_router(users_router.router)
 app.include_router(challenges_router.router)
 app.include_router(trust_router_module.router)
 app.include_router(auth_router_module.router)
+app.include_router(events_router.router)
+app.include_router(webhooks_router.router)
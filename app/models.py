@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime, timezone
 from enum import Enum as PyEnum
-from sqlalchemy import Column, String, Text, Float, Integer, DateTime, Enum, ForeignKey, Boolean, UniqueConstraint
+from sqlalchemy import Column, String, Text, Float, Integer, BigInteger, DateTime, Enum, ForeignKey, Boolean, UniqueConstraint, Index
 from sqlalchemy.orm import relationship
 from .database import Base
 
@@ -36,6 +36,8 @@ class UserRole(str, PyEnum):
 
 class PayoutStatus(str, PyEnum):
     pending = "pending"
+    queued = "queued"         # waiting for the next batchTransfer (PAYOUT_MODE=batch)
+    submitted = "submitted"   # transfer broadcast, waiting for the tx confirmer
     paid = "paid"
     failed = "failed"
     refunded = "refunded"
@@ -87,6 +89,71 @@ class StakePurpose(str, PyEnum):
     credit_recharge = "credit_recharge"
 
 
+class OracleJobKind(str, PyEnum):
+    submission = "submission"          # gate_check (+ individual scoring) for one submission
+    dimension_gen = "dimension_gen"    # lock scoring dimensions for a new task
+
+
+class OracleFlow(str, PyEnum):
+    staged = "staged"   # gate_check, then score_individual: two LLM round trips
+    fused = "fused"     # gate_and_score: acceptance check and individual scores in one call
+
+
+class WebhookDeliveryStatus(str, PyEnum):
+    pending = "pending"
+    sending = "sending"
+    delivered = "delivered"
+    dead = "dead"       # exhausted max attempts; kept for inspection / redrive
+
+
+class ChainTxKind(str, PyEnum):
+    payout = "payout"                  # USDC transfer to the winner
+    refund = "refund"                  # USDC transfer back to the publisher
+    escrow_create = "escrow_create"    # ChallengeEscrow.createChallenge
+    escrow_join = "escrow_join"        # ChallengeEscrow.joinChallenge (ref_id = challenge id)
+    escrow_resolve = "escrow_resolve"  # ChallengeEscrow.resolveChallenge
+    escrow_void = "escrow_void"        # ChallengeEscrow.voidChallenge
+    payout_batch = "payout_batch"      # BatchPayout.batchTransfer (ref_id = payout batch id)
+
+
+class ChainTxStatus(str, PyEnum):
+    submitted = "submitted"
+    confirmed = "confirmed"
+    failed = "failed"   # reverted, or dropped by the node
+
+
+class EscrowAction(str, PyEnum):
+    create_challenge = "create_challenge"
+    resolve_challenge = "resolve_challenge"
+    void_challenge = "void_challenge"
+
+
+class EscrowCallStatus(str, PyEnum):
+    pending = "pending"
+    sending = "sending"   # leased by a relayer worker
+    sent = "sent"         # broadcast (or found already applied on-chain)
+    failed = "failed"     # gave up after ESCROW_MAX_ATTEMPTS
+
+
+class PayoutBatchStatus(str, PyEnum):
+    pending = "pending"       # tasks claimed, batchTransfer not broadcast yet
+    submitted = "submitted"
+    confirmed = "confirmed"
+    failed = "failed"
+
+
+class DimensionScoreStage(str, PyEnum):
+    individual = "individual"     # score_individual: band + score per dimension
+    comparative = "comparative"   # dimension_score across the top submissions (raw / final score)
+
+
+class OracleJobStatus(str, PyEnum):
+    queued = "queued"
+    running = "running"
+    done = "done"
+    dead = "dead"       # exhausted max_attempts, needs manual attention
+
+
 def _uuid() -> str:
     return str(uuid.uuid4())
 
@@ -117,10 +184,24 @@ class Task(Base):
     challenge_duration = Column(Integer, nullable=True)
     challenge_window_end = Column(DateTime(timezone=True), nullable=True)
     acceptance_criteria = Column(Text, nullable=True)
+    oracle_flow = Column(Enum(OracleFlow), nullable=True)         # None = ORACLE_FLOW default
     refund_amount = Column(Float, nullable=True)
     refund_tx_hash = Column(String, nullable=True)
     escrow_tx_hash = Column(String, nullable=True)
+    payout_batch_id = Column(String, nullable=True)               # payout_batches.id when paid by batchTransfer
+    lease_owner = Column(String, nullable=True)                   # scheduler process currently driving this task
+    lease_until = Column(DateTime(timezone=True), nullable=True)  # lease expiry; stale leases are reclaimable
     created_at = Column(DateTime(timezone=True), nullable=False, default=_now)
+    __table_args__ = (
+        Index("ix_tasks_type_status_deadline", "type", "status", "deadline"),
+        Index("ix_tasks_status_window_end", "status", "challenge_window_end"),
+        Index("ix_tasks_status_created_at", "status", "created_at"),
+        Index("ix_tasks_created_at", "created_at"),
+        Index("ix_tasks_publisher_id", "publisher_id"),
+        Index("ix_tasks_winner_submission_id", "winner_submission_id"),
+        Index("ix_tasks_payout_status", "payout_status"),
+        Index("ix_tasks_payout_batch_id", "payout_batch_id"),
+    )
 
 
 class ScoringDimension(Base):
@@ -136,6 +217,7 @@ class ScoringDimension(Base):
     scoring_guidance = Column(Text, nullable=False)
 
     task = relationship("Task", backref="dimensions")
+    __table_args__ = (Index("ix_scoring_dimensions_task_id", "task_id"),)
 
 
 class User(Base):
@@ -154,6 +236,7 @@ class User(Base):
     staked_amount = Column(Float, nullable=False, default=0.0)
     stake_bonus = Column(Float, nullable=False, default=0.0)
     created_at = Column(DateTime(timezone=True), nullable=False, default=_now)
+    __table_args__ = (Index("ix_users_created_at", "created_at"),)
 
 
 class Submission(Base):
@@ -171,6 +254,32 @@ class Submission(Base):
     deposit_returned = Column(Float, nullable=True)
     comparative_feedback = Column(Text, nullable=True)
     created_at = Column(DateTime(timezone=True), nullable=False, default=_now)
+    __table_args__ = (
+        Index("ix_submissions_task_worker", "task_id", "worker_id"),
+        Index("ix_submissions_task_status", "task_id", "status"),
+        Index("ix_submissions_worker_status", "worker_id", "status"),
+    )
+
+
+class SubmissionDimensionScore(Base):
+    """One dimension's band / score / evidence for a submission, mirrored from oracle_feedback."""
+    __tablename__ = "submission_dimension_scores"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    submission_id = Column(String, nullable=False)
+    task_id = Column(String, nullable=False)
+    worker_id = Column(String, nullable=False)
+    dim_id = Column(String, nullable=False)
+    stage = Column(Enum(DimensionScoreStage), nullable=False)
+    band = Column(String, nullable=True)             # A-E; comparative rows carry the individual band
+    score = Column(Float, nullable=True)             # individual score, or comparative final_score
+    raw_score = Column(Float, nullable=True)         # comparative only
+    evidence = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), nullable=False, default=_now)
+    __table_args__ = (
+        UniqueConstraint("submission_id", "stage", "dim_id", name="uq_submission_dimension_scores"),
+        Index("ix_submission_dimension_scores_rank", "task_id", "stage", "dim_id", "score"),
+    )
 
 
 class Challenge(Base):
@@ -189,6 +298,11 @@ class Challenge(Base):
     deposit_tx_hash = Column(String, nullable=True)
     deposit_amount = Column(Float, nullable=True)
     created_at = Column(DateTime(timezone=True), nullable=False, default=_now)
+    __table_args__ = (
+        Index("ix_challenges_task_challenger_sub", "task_id", "challenger_submission_id"),
+        Index("ix_challenges_wallet_created_at", "challenger_wallet", "created_at"),
+        Index("ix_challenges_challenger_submission_id", "challenger_submission_id"),
+    )
 
 
 class TrustEvent(Base):
@@ -203,6 +317,10 @@ class TrustEvent(Base):
     score_before = Column(Float, nullable=False, default=0.0)
     score_after = Column(Float, nullable=False, default=0.0)
     created_at = Column(DateTime(timezone=True), nullable=False, default=_now)
+    __table_args__ = (
+        Index("ix_trust_events_user_created_at", "user_id", "created_at"),
+        Index("ix_trust_events_task_id", "task_id"),
+    )
 
 
 class ArbiterVote(Base):
@@ -217,6 +335,10 @@ class ArbiterVote(Base):
     reward_amount = Column(Float, nullable=True)
     coherence_status = Column(String, nullable=True)
     created_at = Column(DateTime(timezone=True), nullable=False, default=_now)
+    __table_args__ = (
+        Index("ix_arbiter_votes_challenge_id", "challenge_id"),
+        Index("ix_arbiter_votes_arbiter_user_id", "arbiter_user_id"),
+    )
 
 
 class StakeRecord(Base):
@@ -254,4 +376,194 @@ class MaliciousTag(Base):
     arbiter_user_id = Column(String, ForeignKey("users.id"), nullable=False)
     target_submission_id = Column(String, ForeignKey("submissions.id"), nullable=False)
     created_at = Column(DateTime(timezone=True), default=_now)
-    __table_args__ = (UniqueConstraint("task_id", "arbiter_user_id", "target_submission_id"),)
+    __table_args__ = (
+        UniqueConstraint("task_id", "arbiter_user_id", "target_submission_id"),
+        Index("ix_malicious_tags_task_target", "task_id", "target_submission_id"),
+    )
+
+
+class OracleJob(Base):
+    """Durable oracle work item, claimed by the job dispatcher under a visibility timeout."""
+    __tablename__ = "oracle_jobs"
+    id = Column(String, primary_key=True, default=_uuid)
+    kind = Column(Enum(OracleJobKind), nullable=False)
+    task_id = Column(String, nullable=False)
+    submission_id = Column(String, nullable=True)
+    priority = Column(Integer, nullable=False, default=0)   # lower runs first
+    status = Column(Enum(OracleJobStatus), nullable=False, default=OracleJobStatus.queued)
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=3)
+    available_at = Column(DateTime(timezone=True), nullable=False, default=_now)
+    locked_until = Column(DateTime(timezone=True), nullable=True)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), nullable=False, default=_now)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    __table_args__ = (Index("ix_oracle_jobs_claim", "status", "priority", "available_at"),)
+
+
+class TaskEvent(Base):
+    """Append-only log of task / submission state changes. The id doubles as the SSE event id."""
+    __tablename__ = "task_events"
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    task_id = Column(String, nullable=False)
+    submission_id = Column(String, nullable=True)
+    event_type = Column(String, nullable=False)   # task.status | task.payout | submission.status
+    data = Column(Text, nullable=False)           # JSON payload sent to clients
+    created_at = Column(DateTime(timezone=True), nullable=False, default=_now)
+    __table_args__ = (Index("ix_task_events_task_id", "task_id", "id"),)
+
+
+class Webhook(Base):
+    """A user's outbound notification endpoint for task events."""
+    __tablename__ = "webhooks"
+    id = Column(String, primary_key=True, default=_uuid)
+    user_id = Column(String, nullable=False)
+    url = Column(String, nullable=False)
+    secret = Column(String, nullable=False)        # HMAC-SHA256 signing key
+    event_types = Column(Text, nullable=True)      # JSON list of event types; null = all
+    task_id = Column(String, nullable=True)        # only events of this task; null = any task
+    active = Column(Boolean, nullable=False, default=True)
+    created_at = Column(DateTime(timezone=True), nullable=False, default=_now)
+    __table_args__ = (Index("ix_webhooks_active_user", "active", "user_id"),)
+
+
+class WebhookDelivery(Base):
+    """One task event queued for one webhook; sent in per-endpoint batches."""
+    __tablename__ = "webhook_deliveries"
+    id = Column(String, primary_key=True, default=_uuid)
+    webhook_id = Column(String, nullable=False)
+    event_id = Column(Integer, nullable=False)     # task_events.id
+    status = Column(Enum(WebhookDeliveryStatus), nullable=False, default=WebhookDeliveryStatus.pending)
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime(timezone=True), nullable=False, default=_now)
+    lease_token = Column(String, nullable=True)
+    locked_until = Column(DateTime(timezone=True), nullable=True)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), nullable=False, default=_now)
+    delivered_at = Column(DateTime(timezone=True), nullable=True)
+    __table_args__ = (
+        Index("ix_webhook_deliveries_due", "status", "next_attempt_at"),
+        Index("ix_webhook_deliveries_webhook", "webhook_id", "status"),
+        Index("ix_webhook_deliveries_lease", "lease_token"),
+    )
+
+
+class ChainTransaction(Base):
+    """A broadcast platform-wallet transaction, confirmed (or failed) later by the tx confirmer."""
+    __tablename__ = "chain_transactions"
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    tx_hash = Column(String, nullable=False)
+    kind = Column(Enum(ChainTxKind), nullable=False)
+    task_id = Column(String, nullable=True)
+    ref_id = Column(String, nullable=True)
+    status = Column(Enum(ChainTxStatus), nullable=False, default=ChainTxStatus.submitted)
+    block_number = Column(Integer, nullable=True)
+    checks = Column(Integer, nullable=False, default=0)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), nullable=False, default=_now)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    __table_args__ = (
+        Index("ix_chain_transactions_status", "status", "id"),
+        Index("ix_chain_transactions_task_id", "task_id"),
+        Index("ix_chain_transactions_tx_hash", "tx_hash"),
+    )
+
+
+class PayoutBatch(Base):
+    """One BatchPayout.batchTransfer covering the queued payouts / refunds of several tasks."""
+    __tablename__ = "payout_batches"
+    id = Column(String, primary_key=True, default=_uuid)
+    status = Column(Enum(PayoutBatchStatus), nullable=False, default=PayoutBatchStatus.pending)
+    tx_hash = Column(String, nullable=True)
+    transfer_count = Column(Integer, nullable=False, default=0)
+    total_amount = Column(Float, nullable=False, default=0.0)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), nullable=False, default=_now)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    __table_args__ = (Index("ix_payout_batches_status", "status", "created_at"),)
+
+
+class EscrowCall(Base):
+    """Outbox row for a ChallengeEscrow call, written with the lifecycle state change it belongs to."""
+    __tablename__ = "escrow_outbox"
+    id = Column(Integer, primary_key=True, autoincrement=True)   # per-task execution order
+    task_id = Column(String, nullable=False)
+    action = Column(Enum(EscrowAction), nullable=False)
+    payload = Column(Text, nullable=False)        # JSON call arguments
+    status = Column(Enum(EscrowCallStatus), nullable=False, default=EscrowCallStatus.pending)
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime(timezone=True), nullable=False, default=_now)
+    lease_token = Column(String, nullable=True)
+    locked_until = Column(DateTime(timezone=True), nullable=True)
+    tx_hash = Column(String, nullable=True)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), nullable=False, default=_now)
+    sent_at = Column(DateTime(timezone=True), nullable=True)
+    __table_args__ = (
+        Index("ix_escrow_outbox_due", "status", "next_attempt_at"),
+        Index("ix_escrow_outbox_task", "task_id", "status"),
+        Index("ix_escrow_outbox_lease", "lease_token"),
+    )
+
+
+class IndexerCursor(Base):
+    """Last block the chain indexer has applied, with its hash for reorg detection."""
+    __tablename__ = "indexer_cursors"
+    name = Column(String, primary_key=True)
+    block_number = Column(Integer, nullable=False)
+    block_hash = Column(String, nullable=False)
+    updated_at = Column(DateTime(timezone=True), nullable=False, default=_now)
+
+
+class IndexedBlock(Base):
+    """Hash of a recently indexed block; the reorg walk-back compares these with the node."""
+    __tablename__ = "indexed_blocks"
+    number = Column(Integer, primary_key=True, autoincrement=False)
+    hash = Column(String, nullable=False)
+
+
+class TokenTransfer(Base):
+    """ERC-20 Transfer log picked up by the chain indexer (amount in token base units)."""
+    __tablename__ = "token_transfers"
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    token = Column(String, nullable=False)           # lowercase contract address
+    block_number = Column(Integer, nullable=False)
+    tx_hash = Column(String, nullable=False)
+    log_index = Column(Integer, nullable=False)
+    from_address = Column(String, nullable=False)    # lowercase
+    to_address = Column(String, nullable=False)      # lowercase
+    amount = Column(BigInteger, nullable=False)
+    __table_args__ = (
+        UniqueConstraint("tx_hash", "log_index", name="uq_token_transfers_log"),
+        Index("ix_token_transfers_block", "block_number"),
+        Index("ix_token_transfers_to", "token", "to_address", "block_number"),
+        Index("ix_token_transfers_from", "token", "from_address", "block_number"),
+    )
+
+
+class TokenBalance(Base):
+    """balanceOf(wallet) at block_number; the indexed balance adds the Transfer rows after it."""
+    __tablename__ = "token_balances"
+    token = Column(String, primary_key=True)         # lowercase contract address
+    wallet = Column(String, primary_key=True)        # lowercase
+    balance = Column(BigInteger, nullable=False)
+    block_number = Column(Integer, nullable=False)
+
+
+class EscrowEvent(Base):
+    """ChallengeEscrow log picked up by the chain indexer."""
+    __tablename__ = "escrow_events"
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    block_number = Column(Integer, nullable=False)
+    tx_hash = Column(String, nullable=False)
+    log_index = Column(Integer, nullable=False)
+    event = Column(String, nullable=False)           # ChallengeCreated / ChallengerJoined / ChallengeResolved
+    task_key = Column(String, nullable=False)        # 0x-hex keccak256(task_id)
+    account = Column(String, nullable=True)          # winner / challenger / final winner (lowercase)
+    amount = Column(BigInteger, nullable=True)       # bounty for ChallengeCreated
+    verdict = Column(Integer, nullable=True)         # ChallengeResolved verdict (3 = voided)
+    __table_args__ = (
+        UniqueConstraint("tx_hash", "log_index", name="uq_escrow_events_log"),
+        Index("ix_escrow_events_task_key", "task_key", "event"),
+        Index("ix_escrow_events_block", "block_number"),
+    )
@@ -3,11 +3,13 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 from typing import List
 from ..database import get_db
-from ..models import Task, Submission, Challenge, User, TaskStatus, JuryBallot, MaliciousTag
+from ..models import Task, Submission, Challenge, User, TaskStatus, JuryBallot, MaliciousTag, ChainTxKind
 from ..schemas import ChallengeCreate, ChallengeOut, JuryVoteIn, JuryBallotOut
 from ..services.escrow import check_usdc_balance, join_challenge_onchain
+from ..services.chain_indexer import indexed_usdc_balance
 from ..services.trust import check_permissions, get_challenge_deposit_rate
 from ..services.arbiter_pool import submit_merged_vote
+from ..services.tx_tracker import track_transaction
 
 SERVICE_FEE = 0.01  # 0.01 USDC
 
@@ -73,9 +75,11 @@ def create_challenge(
         deposit_amount = task.submission_deposit or round(task.bounty * deposit_rate, 6)
         required = deposit_amount + SERVICE_FEE
 
-        # 1. Balance check
+        # 1. Balance check (indexed; the chain is read only when the index is stale or says too low)
         try:
-            balance = check_usdc_balance(data.challenger_wallet)
+            balance = indexed_usdc_balance(db, data.challenger_wallet)
+            if balance is None or balance < required:
+                balance = check_usdc_balance(data.challenger_wallet)
         except Exception:
             balance = 0.0
         if balance < required:
@@ -113,6 +117,10 @@ def create_challenge(
         deposit_amount=deposit_amount if deposit_tx_hash else None,
     )
     db.add(challenge)
+    if deposit_tx_hash:
+        db.flush()
+        track_transaction(db, deposit_tx_hash, ChainTxKind.escrow_join,
+                          task_id=task_id, ref_id=challenge.id)
     db.commit()
     db.refresh(challenge)
     return challenge
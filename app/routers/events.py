@@ -0,0 +1,43 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from ..services.events import EventBroker, event_stream, get_event_broker
+
+router = APIRouter(tags=["events"])
+
+_SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+def _resume_from(header: Optional[str], query: Optional[int]) -> Optional[int]:
+    # Browsers send Last-Event-ID on reconnect; the query param covers the first connect
+    if header is None:
+        return query
+    try:
+        return int(header)
+    except ValueError:
+        raise HTTPException(400, "Last-Event-ID must be an integer event id")
+
+
+@router.get("/events")
+async def stream_all_events(
+    last_event_id: Optional[int] = Query(None, ge=0),
+    last_event_id_header: Optional[str] = Header(None, alias="Last-Event-ID"),
+    broker: EventBroker = Depends(get_event_broker),
+):
+    after = _resume_from(last_event_id_header, last_event_id)
+    return StreamingResponse(event_stream(broker, last_event_id=after),
+                             media_type="text/event-stream", headers=_SSE_HEADERS)
+
+
+@router.get("/tasks/{task_id}/events")
+async def stream_task_events(
+    task_id: str,
+    last_event_id: Optional[int] = Query(None, ge=0),
+    last_event_id_header: Optional[str] = Header(None, alias="Last-Event-ID"),
+    broker: EventBroker = Depends(get_event_broker),
+):
+    after = _resume_from(last_event_id_header, last_event_id)
+    if not await broker.task_exists(task_id):
+        raise HTTPException(404, "Task not found")
+    return StreamingResponse(event_stream(broker, task_id=task_id, last_event_id=after),
+                             media_type="text/event-stream", headers=_SSE_HEADERS)
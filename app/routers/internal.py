@@ -8,7 +8,7 @@ from ..models import (
 from ..schemas import ScoreInput, ManualJudgeInput, ChallengeOut
 from ..services.payout import pay_winner
 from ..services.arbiter import run_arbitration
-from ..services.oracle import get_oracle_logs
+from ..services.oracle import get_oracle_logs, get_speculation_stats
 
 router = APIRouter(prefix="/internal", tags=["internal"])
 
@@ -49,6 +49,10 @@ def retry_payout(task_id: str, db: Session = Depends(get_db)):
         raise HTTPException(status_code=400, detail="Task has no winner")
     if task.payout_status == PayoutStatus.paid:
         raise HTTPException(status_code=400, detail="Task already paid out")
+    if task.payout_status == PayoutStatus.submitted:
+        raise HTTPException(status_code=400, detail="Payout transaction still pending confirmation")
+    if task.payout_status == PayoutStatus.queued:
+        raise HTTPException(status_code=400, detail="Payout already queued for the next batch")
     pay_winner(db, task.id)
     return {"ok": True}
 
@@ -127,3 +131,9 @@ def oracle_logs(
     for log in logs:
         log["worker_nickname"] = nickname_map.get(log.get("worker_id", ""), "")
     return logs
+
+
+@router.get("/oracle-logs/speculation")
+def oracle_speculation_stats():
+    """Speculative scoring counters: hit ratio, wasted-token rate, mean time-to-feedback."""
+    return get_speculation_stats()
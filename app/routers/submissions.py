@@ -1,11 +1,15 @@
 from datetime import datetime, timezone
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from typing import List
+from starlette.concurrency import run_in_threadpool
+from typing import List, Optional
 from ..database import get_db
 from ..models import Task, Submission, User, TaskStatus, TaskType, SubmissionStatus
 from ..schemas import SubmissionCreate, SubmissionOut
-from ..services.oracle import invoke_oracle
+from ..services.job_queue import enqueue_submission_job, wake_job_dispatcher
+from ..services.events import (
+    EventBroker, get_event_broker, wait_for_status_change, SUBMISSION_WAIT_MAX_SECONDS,
+)
 from ..services.trust import check_permissions
 
 router = APIRouter(tags=["submissions"])
@@ -38,7 +42,6 @@ def _maybe_hide_score(submission: Submission, task: Task, db: Session = None) ->
 def create_submission(
     task_id: str,
     data: SubmissionCreate,
-    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
 ):
     task = db.query(Task).filter(Task.id == task_id).first()
@@ -91,10 +94,13 @@ def create_submission(
         revision=existing + 1,
     )
     db.add(submission)
+    db.flush()
+    # Oracle job commits atomically with the submission, so it survives restarts
+    enqueue_submission_job(db, task, submission.id)
     db.commit()
     db.refresh(submission)
 
-    background_tasks.add_task(invoke_oracle, submission.id, task_id)
+    wake_job_dispatcher()
     return submission
 
 
@@ -107,12 +113,47 @@ def list_submissions(task_id: str, db: Session = Depends(get_db)):
     return [_maybe_hide_score(s, task, db) for s in subs]
 
 
+def _read_submission(db: Session, task_id: str, sub_id: str) -> Optional[SubmissionOut]:
+    try:
+        sub = db.query(Submission).filter(
+            Submission.id == sub_id, Submission.task_id == task_id
+        ).first()
+        if not sub:
+            return None
+        task = db.query(Task).filter(Task.id == task_id).first()
+        return SubmissionOut.model_validate(_maybe_hide_score(sub, task, db))
+    finally:
+        # Hand the connection back to the pool before a long-poll starts waiting
+        db.rollback()
+
+
 @router.get("/tasks/{task_id}/submissions/{sub_id}", response_model=SubmissionOut)
-def get_submission(task_id: str, sub_id: str, db: Session = Depends(get_db)):
-    sub = db.query(Submission).filter(
-        Submission.id == sub_id, Submission.task_id == task_id
-    ).first()
-    if not sub:
-        raise HTTPException(status_code=404, detail="Submission not found")
-    task = db.query(Task).filter(Task.id == task_id).first()
-    return _maybe_hide_score(sub, task, db)
+async def get_submission(
+    task_id: str,
+    sub_id: str,
+    wait: Optional[float] = Query(None, gt=0, le=SUBMISSION_WAIT_MAX_SECONDS),
+    since_status: Optional[SubmissionStatus] = None,
+    db: Session = Depends(get_db),
+    broker: EventBroker = Depends(get_event_broker),
+):
+    """Return one submission. With `wait`, hold the request until its status
+    differs from `since_status` (default: its current status) or `wait`
+    seconds pass. The wait runs on the event loop and holds no DB connection."""
+    if not wait:
+        out = await run_in_threadpool(_read_submission, db, task_id, sub_id)
+        if out is None:
+            raise HTTPException(status_code=404, detail="Submission not found")
+        return out
+
+    # Subscribe before reading so a change landing in between is not missed
+    subscription = await broker.subscribe(submission_id=sub_id)
+    try:
+        out = await run_in_threadpool(_read_submission, db, task_id, sub_id)
+        if out is None:
+            raise HTTPException(status_code=404, detail="Submission not found")
+        baseline = since_status or out.status
+        if out.status == baseline and await wait_for_status_change(subscription, baseline.value, wait):
+            out = await run_in_threadpool(_read_submission, db, task_id, sub_id)
+        return out
+    finally:
+        broker.unsubscribe(subscription)
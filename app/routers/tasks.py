@@ -1,56 +1,64 @@
 import json
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 from typing import List, Optional
 from ..database import get_db
-from ..models import Task, TaskStatus, TaskType, Submission, ScoringDimension, User
-from ..schemas import TaskCreate, TaskOut, TaskDetail, SubmissionOut, ScoringDimensionPublic, SettlementOut
+from ..models import Task, TaskStatus, TaskType, Submission, User, DimensionScoreStage
+from ..schemas import (
+    TaskCreate, TaskOut, TaskDetail, SubmissionOut, ScoringDimensionPublic, SettlementOut,
+    SubmissionDimensionScoreOut,
+)
 from ..services.settlement import compute_settlement
-from ..services.oracle import generate_dimensions
-from ..services.x402 import build_payment_requirements, verify_payment
+from ..services.dimension_cache import get_dimension_bundle
+from ..services.dimension_scores import top_by_dimension
+from ..services.job_queue import enqueue_dimension_job, wake_job_dispatcher
+from ..services.pagination import (
+    paginate, InvalidCursor, MAX_PAGE_SIZE, NEXT_CURSOR_HEADER,
+)
+from ..lifecycle import notify_lifecycle
+from ..services.x402 import build_payment_requirements, verify_payment, X402_BREAKER_RESET_SECONDS
 
 router = APIRouter(prefix="/tasks", tags=["tasks"])
 
 
-def _generate_dimensions_bg(task_id: str):
-    """后台任务：为任务生成评分维度（LLM 调用，避免阻塞响应）。"""
-    from ..database import SessionLocal
-    db = SessionLocal()
-    try:
-        task = db.query(Task).filter(Task.id == task_id).first()
-        if task:
-            generate_dimensions(db, task)
-    except Exception as e:
-        print(f"[tasks] dimension generation failed for {task_id}: {e}", flush=True)
-    finally:
-        db.close()
-
-
 @router.post("", response_model=TaskOut, status_code=201)
-def create_task(data: TaskCreate, request: Request, background_tasks: BackgroundTasks, db: Session = Depends(get_db)):
+async def create_task(data: TaskCreate, request: Request, db: Session = Depends(get_db)):
     payment_header = request.headers.get("x-payment")
     if not payment_header:
         return JSONResponse(
             status_code=402,
             content=build_payment_requirements(data.bounty),
         )
-    result = verify_payment(payment_header, data.bounty)
+    # Facilitator round trips are awaited on the event loop; only the DB writes take a threadpool slot
+    result = await verify_payment(payment_header, data.bounty)
+    if result.get("unavailable"):
+        return JSONResponse(
+            status_code=503,
+            content={"detail": result.get("reason", "payment facilitator unavailable")},
+            headers={"Retry-After": str(int(X402_BREAKER_RESET_SECONDS))},
+        )
     if not result["valid"]:
         reqs = build_payment_requirements(data.bounty)
         reqs["error"] = result.get("reason", "payment verification failed")
         return JSONResponse(status_code=402, content=reqs)
-    tx_hash = result.get("tx_hash")
+    return await run_in_threadpool(_persist_task, db, data, result.get("tx_hash"))
+
 
+def _persist_task(db: Session, data: TaskCreate, tx_hash: Optional[str]) -> TaskOut:
     task_data = data.model_dump()
     task_data['acceptance_criteria'] = json.dumps(data.acceptance_criteria, ensure_ascii=False)
     task = Task(**task_data, payment_tx_hash=tx_hash)
     db.add(task)
+    db.flush()
+    # 维度生成是 LLM 调用（最长 120s），作为持久化任务与 task 同一事务入队，由 job dispatcher 异步执行
+    enqueue_dimension_job(db, task)
     db.commit()
     db.refresh(task)
-
-    # 维度生成是 LLM 调用（最长 120s），移到后台避免响应超时
-    background_tasks.add_task(_generate_dimensions_bg, task.id)
+    wake_job_dispatcher()
+    notify_lifecycle(task.id)
 
     result_out = TaskOut.model_validate(task)
     result_out.scoring_dimensions = []
@@ -63,8 +71,15 @@ def create_task(data: TaskCreate, request: Request, background_tasks: Background
 
 @router.get("", response_model=List[TaskOut])
 def list_tasks(
+    response: Response,
     status: Optional[TaskStatus] = None,
     type: Optional[TaskType] = None,
+    min_bounty: Optional[float] = None,
+    max_bounty: Optional[float] = None,
+    deadline_after: Optional[datetime] = None,
+    deadline_before: Optional[datetime] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db),
 ):
     q = db.query(Task)
@@ -72,7 +87,20 @@ def list_tasks(
         q = q.filter(Task.status == status)
     if type:
         q = q.filter(Task.type == type)
-    tasks = q.order_by(Task.created_at.desc()).all()
+    if min_bounty is not None:
+        q = q.filter(Task.bounty >= min_bounty)
+    if max_bounty is not None:
+        q = q.filter(Task.bounty <= max_bounty)
+    if deadline_after is not None:
+        q = q.filter(Task.deadline >= deadline_after)
+    if deadline_before is not None:
+        q = q.filter(Task.deadline <= deadline_before)
+    try:
+        tasks, next_cursor = paginate(q, Task, limit, cursor)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
     # Resolve publisher nicknames
     pub_ids = {t.publisher_id for t in tasks if t.publisher_id}
     nickname_map: dict[str, str] = {}
@@ -94,10 +122,10 @@ def get_task(task_id: str, db: Session = Depends(get_db)):
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
     subs = db.query(Submission).filter(Submission.task_id == task_id).all()
-    dims = db.query(ScoringDimension).filter(ScoringDimension.task_id == task_id).all()
+    bundle = get_dimension_bundle(db, task_id)
     result = TaskDetail.model_validate(task)
     result.scoring_dimensions = [
-        ScoringDimensionPublic.model_validate(d) for d in dims
+        ScoringDimensionPublic.model_validate(d) for d in (bundle.public if bundle else ())
     ]
     if task.publisher_id:
         pub_user = db.query(User).filter(User.id == task.publisher_id).first()
@@ -130,3 +158,18 @@ def get_settlement(task_id: str, db: Session = Depends(get_db)):
     if result is None:
         raise HTTPException(status_code=404, detail="Settlement not available")
     return result
+
+
+@router.get("/{task_id}/dimension-scores", response_model=List[SubmissionDimensionScoreOut])
+def get_dimension_scores(
+    task_id: str,
+    dim_id: str,
+    stage: DimensionScoreStage = DimensionScoreStage.individual,
+    limit: int = Query(10, ge=1, le=100),
+    db: Session = Depends(get_db),
+):
+    """Top submissions of a task on one scoring dimension, best score first."""
+    task = db.query(Task).filter(Task.id == task_id).first()
+    if not task:
+        raise HTTPException(status_code=404, detail="Task not found")
+    return top_by_dimension(db, task_id, dim_id, stage, limit)
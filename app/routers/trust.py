@@ -1,5 +1,5 @@
 from datetime import datetime, timezone
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
 from app.database import get_db
 from app.models import (
@@ -7,6 +7,9 @@ from app.models import (
     Task, Submission, StakeRecord,
 )
 from app.schemas import TrustProfile, TrustQuote, TrustEventOut, ArbiterVoteOut, BalanceEventOut, WeeklyLeaderboardEntry
+from app.services.pagination import (
+    paginate, InvalidCursor, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, NEXT_CURSOR_HEADER,
+)
 from app.services.trust import (
     get_challenge_deposit_rate, get_platform_fee_rate, check_permissions,
 )
@@ -73,18 +76,25 @@ def trust_quote(
 
 
 @router.get("/users/{user_id}/trust/events", response_model=list[TrustEventOut])
-def get_trust_events(user_id: str, db: Session = Depends(get_db)):
+def get_trust_events(
+    user_id: str,
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    db: Session = Depends(get_db),
+):
     user = db.query(User).filter_by(id=user_id).first()
     if not user:
         raise HTTPException(404, "User not found")
 
-    events = (
-        db.query(TrustEvent)
-        .filter_by(user_id=user_id)
-        .order_by(TrustEvent.created_at.desc())
-        .limit(100)
-        .all()
-    )
+    try:
+        events, next_cursor = paginate(
+            db.query(TrustEvent).filter_by(user_id=user_id), TrustEvent, limit, cursor,
+        )
+    except InvalidCursor as e:
+        raise HTTPException(400, str(e))
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
     return events
 
 
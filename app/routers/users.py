@@ -6,13 +6,27 @@ from sqlalchemy.orm import Session
 from ..database import get_db
 from ..models import User, Submission, Task, TaskStatus, PayoutStatus, SubmissionStatus, UserRole
 from ..schemas import UserCreate, UserOut, UserStats
+from ..services.pagination import (
+    paginate, InvalidCursor, MAX_PAGE_SIZE, NEXT_CURSOR_HEADER,
+)
 
 router = APIRouter(prefix="/users", tags=["users"])
 
 
 @router.get("/list", response_model=list[UserOut])
-def list_users(db: Session = Depends(get_db)):
-    return db.query(User).order_by(User.created_at).all()
+def list_users(
+    response: Response,
+    limit: int | None = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    db: Session = Depends(get_db),
+):
+    try:
+        users, next_cursor = paginate(db.query(User), User, limit, cursor, descending=False)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return users
 
 
 @router.get("", response_model=UserOut)
@@ -0,0 +1,82 @@
+import json
+import secrets
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from ..database import get_db
+from ..models import User, Webhook, WebhookDelivery, WebhookDeliveryStatus
+from ..schemas import WebhookCreate, WebhookCreated, WebhookDeliveryOut, WebhookOut
+from ..services.webhooks import InvalidWebhookURL, redrive_dead, validate_webhook_url
+
+router = APIRouter(prefix="/users/{user_id}/webhooks", tags=["webhooks"])
+
+
+def _webhook_out(hook: Webhook, cls=WebhookOut, **extra):
+    return cls(
+        id=hook.id, user_id=hook.user_id, url=hook.url,
+        events=json.loads(hook.event_types) if hook.event_types else None,
+        task_id=hook.task_id, active=hook.active, created_at=hook.created_at, **extra,
+    )
+
+
+def _get_webhook(db: Session, user_id: str, webhook_id: str) -> Webhook:
+    hook = db.query(Webhook).filter(Webhook.id == webhook_id, Webhook.user_id == user_id).first()
+    if not hook:
+        raise HTTPException(status_code=404, detail="Webhook not found")
+    return hook
+
+
+@router.post("", response_model=WebhookCreated, status_code=201)
+def create_webhook(user_id: str, data: WebhookCreate, db: Session = Depends(get_db)):
+    if not db.query(User).filter(User.id == user_id).first():
+        raise HTTPException(status_code=404, detail="User not found")
+    try:
+        validate_webhook_url(data.url)
+    except InvalidWebhookURL as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    hook = Webhook(
+        user_id=user_id, url=data.url, secret=secrets.token_hex(32), task_id=data.task_id,
+        event_types=json.dumps(data.events) if data.events else None,
+    )
+    db.add(hook)
+    db.commit()
+    db.refresh(hook)
+    return _webhook_out(hook, WebhookCreated, secret=hook.secret)
+
+
+@router.get("", response_model=List[WebhookOut])
+def list_webhooks(user_id: str, db: Session = Depends(get_db)):
+    hooks = db.query(Webhook).filter(Webhook.user_id == user_id).order_by(Webhook.created_at).all()
+    return [_webhook_out(h) for h in hooks]
+
+
+@router.delete("/{webhook_id}", status_code=204)
+def delete_webhook(user_id: str, webhook_id: str, db: Session = Depends(get_db)):
+    hook = _get_webhook(db, user_id, webhook_id)
+    db.query(WebhookDelivery).filter(WebhookDelivery.webhook_id == hook.id).delete(
+        synchronize_session=False)
+    db.delete(hook)
+    db.commit()
+
+
+@router.get("/{webhook_id}/deliveries", response_model=List[WebhookDeliveryOut])
+def list_deliveries(
+    user_id: str,
+    webhook_id: str,
+    status: Optional[WebhookDeliveryStatus] = None,
+    limit: int = Query(100, ge=1, le=500),
+    db: Session = Depends(get_db),
+):
+    """Recent deliveries, newest first; `?status=dead` lists the dead letters."""
+    hook = _get_webhook(db, user_id, webhook_id)
+    q = db.query(WebhookDelivery).filter(WebhookDelivery.webhook_id == hook.id)
+    if status:
+        q = q.filter(WebhookDelivery.status == status)
+    return q.order_by(WebhookDelivery.event_id.desc()).limit(limit).all()
+
+
+@router.post("/{webhook_id}/deliveries/redrive")
+def redrive_deliveries(user_id: str, webhook_id: str, db: Session = Depends(get_db)):
+    """Put every dead-lettered delivery of this webhook back in the queue."""
+    hook = _get_webhook(db, user_id, webhook_id)
+    return {"requeued": redrive_dead(db, hook.id)}
@@ -1,11 +1,16 @@
+import os
+import socket
+import uuid
+from collections import Counter, defaultdict
 from datetime import datetime, timedelta, timezone
 from typing import Optional
+from sqlalchemy import and_, func, or_, select, update
 from sqlalchemy.orm import Session
 from apscheduler.schedulers.background import BackgroundScheduler
 from .database import SessionLocal
 from .models import (
     Task, Submission, Challenge, ArbiterVote, JuryBallot,
-    TaskType, TaskStatus, SubmissionStatus, ChallengeStatus,
+    TaskType, TaskStatus, SubmissionStatus, ChallengeStatus, EscrowAction,
 )
 from .services.arbiter import run_arbitration
 from .services.arbiter_pool import (
@@ -13,7 +18,7 @@ from .services.arbiter_pool import (
     resolve_merged_jury, check_merged_jury_ready,
 )
 from .services.oracle import batch_score_submissions
-from .services.escrow import create_challenge_onchain, resolve_challenge_onchain, void_challenge_onchain
+from .services.escrow_outbox import enqueue_escrow_call
 from .services.payout import refund_publisher
 
 
@@ -24,7 +29,10 @@ def _resolve_via_contract(
     arbiter_reward: float,
     is_challenger_win: bool = False,
 ) -> None:
-    """Call resolveChallenge on-chain with unified pool distribution."""
+    """Queue resolveChallenge (unified pool distribution) in the escrow outbox.
+
+    The call commits with the caller's transition; the relayer broadcasts it.
+    """
     from .models import User, PayoutStatus
     from .services.trust import get_winner_payout_rate
     try:
@@ -53,19 +61,21 @@ def _resolve_via_contract(
                 arbiter_from_incentive = round(upheld_deposit * 0.30, 6)
                 incentive_remainder = round(incentive - arbiter_from_incentive, 6)
                 payout_amount = round(payout_amount + max(incentive_remainder, 0), 6)
-            tx_hash = resolve_challenge_onchain(
-                task.id, winner_user.wallet, payout_amount,
-                refunds, arbiter_wallets, arbiter_reward,
+            enqueue_escrow_call(
+                db, task.id, EscrowAction.resolve_challenge,
+                winner_wallet=winner_user.wallet, winner_payout=payout_amount,
+                refunds=refunds, arbiter_wallets=arbiter_wallets, arbiter_reward=arbiter_reward,
             )
-            task.payout_status = PayoutStatus.paid
-            task.payout_tx_hash = tx_hash
             task.payout_amount = payout_amount
     except Exception as e:
         task.payout_status = PayoutStatus.failed
-        print(f"[scheduler] resolveChallenge failed for {task.id}: {e}", flush=True)
+        print(f"[scheduler] resolveChallenge could not be queued for {task.id}: {e}", flush=True)
 
 
 JURY_VOTING_TIMEOUT = timedelta(hours=6)
+LIFECYCLE_SAFETY_NET_MINUTES = int(os.environ.get("LIFECYCLE_SAFETY_NET_MINUTES", "10"))
+LIFECYCLE_LEASE_SECONDS = int(os.environ.get("LIFECYCLE_LEASE_SECONDS", "900"))
+SCHEDULER_NODE_ID = f"{socket.gethostname()}:{os.getpid()}"
 
 
 def _try_resolve_challenge_jury(
@@ -112,13 +122,136 @@ def _apply_verdict_trust(
     db.commit()
 
 
-def quality_first_lifecycle(db: Optional[Session] = None) -> None:
-    """Push quality_first tasks through their 4-phase lifecycle."""
+# Keep IN (...) lists under SQLite's default bound-parameter limit
+_IN_CHUNK = 900
+
+
+def _chunks(ids: list[str]):
+    for i in range(0, len(ids), _IN_CHUNK):
+        yield ids[i:i + _IN_CHUNK]
+
+
+def _submission_histograms(db: Session, task_ids: list[str]) -> dict[str, Counter]:
+    """Per-task submission counts by status: {task_id: Counter({status: n})}.
+
+    One GROUP BY task_id, status query per chunk instead of several count()
+    round trips per task.
+    """
+    hist: dict[str, Counter] = defaultdict(Counter)
+    for chunk in _chunks(task_ids):
+        rows = (
+            db.query(Submission.task_id, Submission.status, func.count(Submission.id))
+            .filter(Submission.task_id.in_(chunk))
+            .group_by(Submission.task_id, Submission.status)
+            .all()
+        )
+        for task_id, status, n in rows:
+            hist[task_id][status] = n
+    return hist
+
+
+def _challenge_counts(db: Session, task_ids: list[str]) -> Counter:
+    counts: Counter = Counter()
+    for chunk in _chunks(task_ids):
+        rows = (
+            db.query(Challenge.task_id, func.count(Challenge.id))
+            .filter(Challenge.task_id.in_(chunk))
+            .group_by(Challenge.task_id)
+            .all()
+        )
+        counts.update(dict(rows))
+    return counts
+
+
+def _claim_tasks(db: Session, task_ids: list[str], now: datetime) -> tuple[str, list[str]]:
+    """Lease the given tasks to this sweep so concurrent scheduler processes split the work.
+
+    Returns (lease token, claimed ids). Postgres takes candidate rows with
+    SELECT ... FOR UPDATE SKIP LOCKED so racing processes never wait on each
+    other; SQLite serializes writers, so a conditional UPDATE on the lease
+    columns is enough. Either way the lease outlives the claiming transaction,
+    because a sweep commits many times. Leases left by a crashed process
+    expire after LIFECYCLE_LEASE_SECONDS.
+    """
+    token = f"{SCHEDULER_NODE_ID}:{uuid.uuid4().hex[:8]}"
+    until = now + timedelta(seconds=LIFECYCLE_LEASE_SECONDS)
+    lease_free = or_(Task.lease_until.is_(None), Task.lease_until < now)
+    postgres = db.get_bind().dialect.name == "postgresql"
+    for chunk in _chunks(task_ids):
+        if postgres:
+            chunk = db.execute(
+                select(Task.id)
+                .where(Task.id.in_(chunk), lease_free)
+                .with_for_update(skip_locked=True)
+            ).scalars().all()
+            if not chunk:
+                continue
+        db.execute(
+            update(Task)
+            .where(Task.id.in_(chunk), lease_free)
+            .values(lease_owner=token, lease_until=until)
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+    claimed = []
+    for chunk in _chunks(task_ids):
+        claimed.extend(
+            db.execute(select(Task.id).where(Task.id.in_(chunk), Task.lease_owner == token))
+            .scalars().all()
+        )
+    return token, claimed
+
+
+def _release_tasks(db: Session, token: str) -> None:
+    db.execute(
+        update(Task)
+        .where(Task.lease_owner == token)
+        .values(lease_owner=None, lease_until=None)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+
+
+def _scope(task_ids: Optional[list[str]]) -> list:
+    """Extra filter restricting a lifecycle sweep to the given tasks (None = all)."""
+    return [Task.id.in_(task_ids)] if task_ids is not None else []
+
+
+def quality_first_lifecycle(
+    db: Optional[Session] = None, task_ids: Optional[list[str]] = None,
+) -> None:
+    """Push quality_first tasks through their 4-phase lifecycle.
+
+    `task_ids` limits the sweep to those tasks; the lifecycle engine passes
+    the tasks whose timer fired instead of scanning every task.
+    """
     own_session = db is None
     if own_session:
         db = SessionLocal()
+    token = None
     try:
         now = datetime.now(timezone.utc)
+        candidate_ids = [
+            t.id for t in db.query(Task.id).filter(
+                Task.type == TaskType.quality_first,
+                or_(
+                    and_(Task.status == TaskStatus.open, Task.deadline <= now),
+                    Task.status == TaskStatus.scoring,
+                    and_(Task.status == TaskStatus.challenge_window,
+                         Task.challenge_window_end <= now),
+                    Task.status == TaskStatus.arbitrating,
+                ),
+                *_scope(task_ids),
+            ).all()
+        ]
+        if not candidate_ids:
+            return
+        token, claimed_ids = _claim_tasks(db, candidate_ids, now)
+        if not claimed_ids:
+            return
+        # Re-read phases for claimed tasks only: another process may have
+        # moved a task on between the candidate query and the claim.
+        scope = _scope(claimed_ids)
 
         # Snapshot IDs for each phase BEFORE any transitions, so tasks
         # don't cascade through multiple phases in a single tick.
@@ -126,6 +259,7 @@ def quality_first_lifecycle(db: Optional[Session] = None) -> None:
             t.id for t in db.query(Task.id).filter(
                 Task.type == TaskType.quality_first,
                 Task.status == TaskStatus.scoring,
+                *scope,
             ).all()
         ]
         challenge_window_task_ids = [
@@ -133,12 +267,14 @@ def quality_first_lifecycle(db: Optional[Session] = None) -> None:
                 Task.type == TaskType.quality_first,
                 Task.status == TaskStatus.challenge_window,
                 Task.challenge_window_end <= now,
+                *scope,
             ).all()
         ]
         arbitrating_task_ids = [
             t.id for t in db.query(Task.id).filter(
                 Task.type == TaskType.quality_first,
                 Task.status == TaskStatus.arbitrating,
+                *scope,
             ).all()
         ]
 
@@ -149,14 +285,13 @@ def quality_first_lifecycle(db: Optional[Session] = None) -> None:
                 Task.type == TaskType.quality_first,
                 Task.status == TaskStatus.open,
                 Task.deadline <= now,
+                *scope,
             )
             .all()
         )
+        open_hist = _submission_histograms(db, [t.id for t in expired_open])
         for task in expired_open:
-            sub_count = db.query(Submission).filter(
-                Submission.task_id == task.id
-            ).count()
-            if sub_count == 0:
+            if sum(open_hist[task.id].values()) == 0:
                 # No submissions → full refund, close immediately
                 task.status = TaskStatus.closed
                 refund_publisher(db, task.id, rate=1.0)
@@ -172,39 +307,25 @@ def quality_first_lifecycle(db: Optional[Session] = None) -> None:
             .filter(Task.id.in_(scoring_task_ids))
             .all()
         ) if scoring_task_ids else []
+        scoring_hist = _submission_histograms(db, scoring_task_ids)
         for task in scoring_tasks:
-            pending_count = db.query(Submission).filter(
-                Submission.task_id == task.id,
-                Submission.status == SubmissionStatus.pending,
-            ).count()
-
-            if pending_count > 0:
+            counts = scoring_hist[task.id]
+            if counts[SubmissionStatus.pending] > 0:
                 # V2 mode: if some submissions already went through gate check,
                 # remaining pending ones are still being processed — wait.
-                has_gated = db.query(Submission).filter(
-                    Submission.task_id == task.id,
-                    Submission.status.in_([
-                        SubmissionStatus.gate_passed,
-                        SubmissionStatus.gate_failed,
-                    ]),
-                ).count() > 0
+                has_gated = (counts[SubmissionStatus.gate_passed]
+                             + counts[SubmissionStatus.gate_failed]) > 0
                 if has_gated:
                     continue
 
             # All oracle processing done (or V1 mode). Batch score if needed.
-            unscored_count = db.query(Submission).filter(
-                Submission.task_id == task.id,
-                Submission.status.in_([
-                    SubmissionStatus.pending,
-                    SubmissionStatus.gate_passed,
-                ]),
-            ).count()
+            unscored_count = counts[SubmissionStatus.pending] + counts[SubmissionStatus.gate_passed]
             if unscored_count > 0:
                 try:
                     batch_score_submissions(db, task.id)
                 except Exception as e:
                     print(f"[scheduler] batch_score error for {task.id}: {e}", flush=True)
-                    continue  # Re-check next tick on error
+                    continue  # Still scoring: the lifecycle engine retries after RECHECK_INTERVAL
 
             # Find best submission; apply threshold filter if set
             score_filter = [Submission.task_id == task.id, Submission.score.isnot(None)]
@@ -222,40 +343,29 @@ def quality_first_lifecycle(db: Optional[Session] = None) -> None:
                 task.challenge_window_end = now + timedelta(seconds=duration)
                 task.status = TaskStatus.challenge_window
 
-                # Lock 95% bounty into escrow contract at start of challenge window
+                # Lock 95% bounty into escrow at start of challenge window. The outbox
+                # row commits with the transition; the relayer broadcasts it and, if it
+                # keeps failing, sends the task back to scoring.
                 if task.escrow_tx_hash:
-                    # Escrow already created on-chain (previous tick succeeded but
-                    # DB commit may have failed); skip contract call.
+                    # Escrow already created on-chain; skip createChallenge
                     print(f"[scheduler] escrow already exists for {task.id}, skipping createChallenge", flush=True)
                 else:
-                    try:
-                        from .models import User
-                        winner_sub = db.query(Submission).filter(
-                            Submission.id == best.id
-                        ).first()
-                        winner_user = db.query(User).filter(
-                            User.id == winner_sub.worker_id
-                        ).first() if winner_sub else None
-                        if winner_user:
-                            escrow_amount = round(task.bounty * 0.95, 6)
-                            incentive = round(task.bounty * 0.05, 6)
-                            tx_hash = create_challenge_onchain(
-                                task.id, winner_user.wallet, escrow_amount, incentive
-                            )
-                            task.escrow_tx_hash = tx_hash
-                    except Exception as e:
-                        print(f"[scheduler] createChallenge failed for {task.id}: {e}", flush=True)
-                        # Revert: do NOT enter challenge_window if escrow lock failed
-                        task.winner_submission_id = None
-                        task.challenge_window_end = None
-                        task.status = TaskStatus.scoring
-                        continue
+                    from .models import User
+                    winner_user = db.query(User).join(
+                        Submission, Submission.worker_id == User.id
+                    ).filter(Submission.id == best.id).first()
+                    if winner_user:
+                        enqueue_escrow_call(
+                            db, task.id, EscrowAction.create_challenge,
+                            winner_wallet=winner_user.wallet,
+                            bounty=round(task.bounty * 0.95, 6),
+                            incentive=round(task.bounty * 0.05, 6),
+                        )
             else:
                 # No qualifying submissions → 95% refund if there were submissions, close
                 task.status = TaskStatus.closed
-                has_subs = db.query(Submission).filter(
-                    Submission.task_id == task.id
-                ).count() > 0
+                # batch scoring moves submissions between statuses but never adds any
+                has_subs = sum(counts.values()) > 0
                 if has_subs:
                     refund_publisher(db, task.id, rate=0.95)
         if scoring_tasks:
@@ -267,11 +377,9 @@ def quality_first_lifecycle(db: Optional[Session] = None) -> None:
             .filter(Task.id.in_(challenge_window_task_ids))
             .all()
         ) if challenge_window_task_ids else []
+        challenge_counts = _challenge_counts(db, challenge_window_task_ids)
         for task in expired_window:
-            challenge_count = db.query(Challenge).filter(
-                Challenge.task_id == task.id
-            ).count()
-            if challenge_count == 0:
+            if challenge_counts[task.id] == 0:
                 task.status = TaskStatus.closed
                 # Publisher trust reward for successful task completion
                 from .services.trust import apply_event as _apply_event
@@ -340,7 +448,12 @@ def quality_first_lifecycle(db: Optional[Session] = None) -> None:
 
             _settle_after_arbitration(db, task)
 
+    except Exception:
+        db.rollback()  # don't let the lease release commit a half-done phase
+        raise
     finally:
+        if token:
+            _release_tasks(db, token)
         if own_session:
             db.close()
 
@@ -475,15 +588,13 @@ def _settle_after_arbitration(db: Session, task: Task) -> None:
                 arbiter_reward = round(task.bounty * 0.05, 6)
 
                 if publisher_wallet:
-                    tx_hash = void_challenge_onchain(
-                        task.id, publisher_wallet, publisher_refund,
-                        refunds, arb_wallets, arbiter_reward,
+                    enqueue_escrow_call(
+                        db, task.id, EscrowAction.void_challenge,
+                        publisher_wallet=publisher_wallet, publisher_refund=publisher_refund,
+                        refunds=refunds, arbiter_wallets=arb_wallets, arbiter_reward=arbiter_reward,
                     )
-                    from .models import PayoutStatus
-                    task.payout_status = PayoutStatus.refunded
-                    task.payout_tx_hash = tx_hash
             except Exception as e:
-                print(f"[scheduler] voidChallenge failed for {task.id}: {e}", flush=True)
+                print(f"[scheduler] voidChallenge could not be queued for {task.id}: {e}", flush=True)
 
             # Hawkish trust matrix for arbiters (voided path)
             voted_bs = [b for b in ballots if b.winner_submission_id is not None]
@@ -768,26 +879,35 @@ def run_weekly_leaderboard(db: Optional[Session] = None) -> None:
             db.close()
 
 
-def fastest_first_refund(db: Optional[Session] = None) -> None:
+def fastest_first_refund(
+    db: Optional[Session] = None, task_ids: Optional[list[str]] = None,
+) -> None:
     """Refund fastest_first tasks that expired without a winner."""
     own_session = db is None
     if own_session:
         db = SessionLocal()
+    token = None
     try:
         now = datetime.now(timezone.utc)
+        expired_filter = [
+            Task.type == TaskType.fastest_first,
+            Task.status == TaskStatus.open,
+            Task.deadline <= now,
+        ]
+        candidate_ids = [
+            t.id for t in db.query(Task.id).filter(*expired_filter, *_scope(task_ids)).all()
+        ]
+        if not candidate_ids:
+            return
+        token, claimed_ids = _claim_tasks(db, candidate_ids, now)
         expired = (
             db.query(Task)
-            .filter(
-                Task.type == TaskType.fastest_first,
-                Task.status == TaskStatus.open,
-                Task.deadline <= now,
-            )
+            .filter(*expired_filter, *_scope(claimed_ids))
             .all()
-        )
+        ) if claimed_ids else []
+        hist = _submission_histograms(db, [t.id for t in expired])
         for task in expired:
-            sub_count = db.query(Submission).filter(
-                Submission.task_id == task.id
-            ).count()
+            sub_count = sum(hist[task.id].values())
             task.status = TaskStatus.closed
             if sub_count == 0:
                 refund_publisher(db, task.id, rate=1.0)
@@ -796,7 +916,12 @@ def fastest_first_refund(db: Optional[Session] = None) -> None:
                 refund_publisher(db, task.id, rate=0.95)
         if expired:
             db.commit()
+    except Exception:
+        db.rollback()  # don't let the lease release commit a half-done phase
+        raise
     finally:
+        if token:
+            _release_tasks(db, token)
         if own_session:
             db.close()
 
@@ -808,8 +933,10 @@ def settle_expired_quality_first(db: Optional[Session] = None) -> None:
 
 def create_scheduler() -> BackgroundScheduler:
     scheduler = BackgroundScheduler()
-    scheduler.add_job(quality_first_lifecycle, "interval", minutes=1)
-    scheduler.add_job(fastest_first_refund, "interval", minutes=1)
+    # Transitions are driven by the lifecycle engine's timers; these full
+    # sweeps only catch anything a missed or lost timer left behind.
+    scheduler.add_job(quality_first_lifecycle, "interval", minutes=LIFECYCLE_SAFETY_NET_MINUTES)
+    scheduler.add_job(fastest_first_refund, "interval", minutes=LIFECYCLE_SAFETY_NET_MINUTES)
     scheduler.add_job(
         run_weekly_leaderboard, "cron",
         day_of_week="sun", hour=0, minute=0,
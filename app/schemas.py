@@ -14,7 +14,7 @@ UTCDatetime = Annotated[datetime, PlainSerializer(_utc_iso, return_type=str)]
 from .models import (
     TaskType, TaskStatus, SubmissionStatus, UserRole, PayoutStatus,
     ChallengeVerdict, ChallengeStatus,
-    TrustTier, TrustEventType, StakePurpose,
+    TrustTier, TrustEventType, StakePurpose, WebhookDeliveryStatus, DimensionScoreStage, OracleFlow,
 )
 
 
@@ -56,6 +56,7 @@ class TaskCreate(BaseModel):
     submission_deposit: Optional[float] = None
     challenge_duration: Optional[int] = None
     acceptance_criteria: list[str]
+    oracle_flow: Optional[OracleFlow] = None
 
     @field_validator('acceptance_criteria')
     @classmethod
@@ -105,10 +106,12 @@ class TaskOut(BaseModel):
     payment_tx_hash: Optional[str] = None
     payout_status: PayoutStatus = PayoutStatus.pending
     payout_tx_hash: Optional[str] = None
+    payout_batch_id: Optional[str] = None
     payout_amount: Optional[float] = None
     submission_deposit: Optional[float] = None
     challenge_duration: Optional[int] = None
     acceptance_criteria: list[str] = []
+    oracle_flow: Optional[OracleFlow] = None
     scoring_dimensions: List["ScoringDimensionPublic"] = []
     refund_amount: Optional[float] = None
     refund_tx_hash: Optional[str] = None
@@ -179,6 +182,19 @@ class SubmissionOut(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class SubmissionDimensionScoreOut(BaseModel):
+    submission_id: str
+    worker_id: str
+    dim_id: str
+    stage: DimensionScoreStage
+    band: Optional[str] = None
+    score: Optional[float] = None
+    raw_score: Optional[float] = None
+    evidence: Optional[str] = None
+
+    model_config = {"from_attributes": True}
+
+
 class ChallengeCreate(BaseModel):
     challenger_submission_id: str
     reason: str
@@ -401,4 +417,47 @@ class UserStats(BaseModel):
     registered_at: UTCDatetime
 
 
+class WebhookCreate(BaseModel):
+    url: str
+    events: Optional[list[str]] = None   # None = every event type
+    task_id: Optional[str] = None         # None = every task
+
+    @field_validator("events")
+    @classmethod
+    def known_event_types(cls, v: Optional[list[str]]) -> Optional[list[str]]:
+        from .services.events import EVENT_TYPES
+        if v is not None:
+            unknown = sorted(set(v) - set(EVENT_TYPES))
+            if unknown:
+                raise ValueError(f"unknown event types {unknown}; expected any of {list(EVENT_TYPES)}")
+        return v
+
+
+class WebhookOut(BaseModel):
+    id: str
+    user_id: str
+    url: str
+    events: Optional[list[str]] = None
+    task_id: Optional[str] = None
+    active: bool
+    created_at: UTCDatetime
+
+
+class WebhookCreated(WebhookOut):
+    secret: str   # only returned once, at registration
+
+
+class WebhookDeliveryOut(BaseModel):
+    id: str
+    event_id: int
+    status: WebhookDeliveryStatus
+    attempts: int
+    next_attempt_at: UTCDatetime
+    last_error: Optional[str] = None
+    created_at: UTCDatetime
+    delivered_at: Optional[UTCDatetime] = None
+
+    model_config = {"from_attributes": True}
+
+
 TaskDetail.model_rebuild()
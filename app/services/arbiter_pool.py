@@ -6,6 +6,7 @@ from app.models import (
     User, Task, Submission, Challenge, ArbiterVote, JuryBallot, MaliciousTag,
     ChallengeVerdict, ChallengeStatus, TaskStatus,
 )
+from app.lifecycle import notify_lifecycle
 
 JURY_SIZE = 3
 
@@ -103,6 +104,8 @@ def submit_merged_vote(
 
     db.commit()
     db.refresh(ballot)
+    if check_merged_jury_ready(db, task_id):
+        notify_lifecycle(task_id)
     return ballot
 
 
@@ -0,0 +1,264 @@
+"""Shared chain access for every on-chain call the platform makes.
+
+One Web3 instance over a pooled `requests.Session` serves all callers.
+Contract objects are memoized by (address, ABI name), and Foundry ABIs are
+read from disk once. Outgoing transactions from the platform wallet draw
+nonces from an in-process allocator instead of `get_transaction_count`, so
+several transactions can be in flight at once without colliding.
+
+Tests (or a local anvil / eth-tester chain) can swap the provider with
+`configure(w3)`; `reset()` drops all cached state.
+
+Env vars:
+    BASE_SEPOLIA_RPC_URL: JSON-RPC endpoint (default https://sepolia.base.org)
+    CHAIN_RPC_TIMEOUT: per-request RPC timeout in seconds (default 30)
+    CHAIN_RPC_POOL_SIZE: pooled HTTP connections to the RPC node (default 20)
+    CHAIN_RECEIPT_TIMEOUT: seconds to wait for a receipt (default 60)
+"""
+import json
+import os
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+from web3 import Web3
+from web3.exceptions import TransactionNotFound
+
+RPC_URL = os.environ.get("BASE_SEPOLIA_RPC_URL", "https://sepolia.base.org")
+PLATFORM_PRIVATE_KEY = os.environ.get("PLATFORM_PRIVATE_KEY", "")
+CHAIN_RPC_TIMEOUT = float(os.environ.get("CHAIN_RPC_TIMEOUT", "30"))
+CHAIN_RPC_POOL_SIZE = int(os.environ.get("CHAIN_RPC_POOL_SIZE", "20"))
+CHAIN_RECEIPT_TIMEOUT = float(os.environ.get("CHAIN_RECEIPT_TIMEOUT", "60"))
+
+_FOUNDRY_OUT = Path(__file__).parent.parent.parent / "contracts" / "out"
+
+_lock = threading.Lock()
+_w3: Optional[Web3] = None
+_chain_id: Optional[int] = None
+_contracts: dict = {}
+_nonces: dict = {}
+
+
+def get_w3() -> Web3:
+    """The process-wide Web3 instance (pooled keep-alive HTTP session)."""
+    global _w3
+    if _w3 is None:
+        with _lock:
+            if _w3 is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=CHAIN_RPC_POOL_SIZE)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                _w3 = Web3(Web3.HTTPProvider(
+                    RPC_URL, session=session, request_kwargs={"timeout": CHAIN_RPC_TIMEOUT},
+                ))
+    return _w3
+
+
+def configure(w3: Web3) -> None:
+    """Use `w3` for all chain access (tests, local anvil / eth-tester)."""
+    global _w3
+    reset()
+    _w3 = w3
+
+
+def reset() -> None:
+    """Drop the provider, memoized contracts and nonce state."""
+    global _w3, _chain_id
+    with _lock:
+        _w3 = None
+        _chain_id = None
+        _contracts.clear()
+        _nonces.clear()
+
+
+def chain_id() -> int:
+    global _chain_id
+    if _chain_id is None:
+        _chain_id = get_w3().eth.chain_id
+    return _chain_id
+
+
+@lru_cache(maxsize=None)
+def _foundry_abi(name: str) -> Optional[list]:
+    path = _FOUNDRY_OUT / f"{name}.sol" / f"{name}.json"
+    if not path.exists():
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)["abi"]
+
+
+def load_abi(name: str, fallback: Optional[list] = None) -> list:
+    """ABI from Foundry output (contracts/out/<name>.sol/<name>.json), read once per process.
+
+    `fallback` is used when the artifact is missing (e.g. in tests).
+    """
+    abi = _foundry_abi(name)
+    if abi is not None:
+        return abi
+    if fallback is None:
+        raise FileNotFoundError(f"ABI for {name} not found under {_FOUNDRY_OUT}")
+    return fallback
+
+
+def get_contract(address: str, abi: list, key: Optional[str] = None):
+    """Memoized contract object for `address`. `key` names the ABI (defaults to its function names)."""
+    if key is None:
+        key = ",".join(sorted(item.get("name", "") for item in abi))
+    cache_key = (address.lower(), key)
+    contract = _contracts.get(cache_key)
+    if contract is None:
+        contract = get_w3().eth.contract(address=Web3.to_checksum_address(address), abi=abi)
+        _contracts[cache_key] = contract
+    return contract
+
+
+class NonceAllocator:
+    """Hands out consecutive nonces for one sender so several txs can be in flight.
+
+    The first allocation (and the first after a resync) reads the pending
+    transaction count from the node; afterwards nonces come from memory.
+    A nonce whose send failed is handed back with `release()`. If it was the
+    most recent one the counter just steps back; otherwise there is now a gap,
+    so the next allocation re-reads the count from the node.
+    """
+
+    def __init__(self, address: str):
+        self.address = address
+        self._next: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def allocate(self, w3: Web3) -> int:
+        with self._lock:
+            if self._next is None:
+                self._next = w3.eth.get_transaction_count(self.address, "pending")
+            nonce = self._next
+            self._next += 1
+            return nonce
+
+    def release(self, nonce: int) -> None:
+        with self._lock:
+            if self._next is not None and nonce == self._next - 1:
+                self._next = nonce
+            else:
+                self._next = None
+
+    def resync(self) -> None:
+        with self._lock:
+            self._next = None
+
+
+def nonce_allocator(address: str) -> NonceAllocator:
+    key = address.lower()
+    allocator = _nonces.get(key)
+    if allocator is None:
+        with _lock:
+            allocator = _nonces.setdefault(key, NonceAllocator(address))
+    return allocator
+
+
+def resync_nonces() -> None:
+    """Make every allocator re-read its count from the node (after a dropped tx)."""
+    for allocator in list(_nonces.values()):
+        allocator.resync()
+
+
+def platform_account(w3: Optional[Web3] = None):
+    return (w3 or get_w3()).eth.account.from_key(PLATFORM_PRIVATE_KEY)
+
+
+def send_transaction(
+    call: Union[dict, object],
+    *,
+    gas: int,
+    description: str,
+    w3: Optional[Web3] = None,
+    wait: bool = True,
+) -> str:
+    """Sign and broadcast a transaction from the platform wallet. Returns tx hash hex.
+
+    `call` is a bound contract function (``contract.functions.x(...)``) or a
+    plain tx dict (``{"to": ..., "value": ...}``). With `wait` the receipt
+    is awaited and a reverted transaction raises RuntimeError.
+    """
+    w3 = w3 or get_w3()
+    account = platform_account(w3)
+    nonces = nonce_allocator(account.address)
+    nonce = nonces.allocate(w3)
+    try:
+        params = {
+            "from": account.address,
+            "nonce": nonce,
+            "gas": gas,
+            "gasPrice": w3.eth.gas_price,
+        }
+        if w3 is _w3:
+            params["chainId"] = chain_id()   # saves an eth_chainId round trip per tx
+        if isinstance(call, dict):
+            tx = {**call, **params}
+            tx.pop("from")
+        else:
+            tx = call.build_transaction(params)
+        signed = account.sign_transaction(tx)
+        tx_hash = w3.eth.send_raw_transaction(signed.raw_transaction)
+    except Exception as e:
+        nonces.release(nonce)
+        if "nonce" in str(e).lower():
+            nonces.resync()
+        raise
+    if wait:
+        receipt = w3.eth.wait_for_transaction_receipt(tx_hash, timeout=CHAIN_RECEIPT_TIMEOUT)
+        if receipt["status"] != 1:
+            raise RuntimeError(f"{description} reverted (tx={tx_hash.hex()})")
+    return tx_hash.hex()
+
+
+def _hex_int(value) -> Optional[int]:
+    if value is None:
+        return None
+    return int(value, 16) if isinstance(value, str) else int(value)
+
+
+def get_receipts(tx_hashes: list[str]) -> dict[str, Optional[dict]]:
+    """Receipt summaries ({"status", "blockNumber"}) keyed by hash; None while not mined.
+
+    Uses one JSON-RPC batch request when the provider supports it (HTTP),
+    otherwise one call per hash (eth-tester).
+    """
+    w3 = get_w3()
+    hashes = [h if h.startswith("0x") else "0x" + h for h in tx_hashes]
+    out: dict[str, Optional[dict]] = {}
+    if hashes and isinstance(w3.provider, Web3.HTTPProvider):
+        responses = w3.provider.make_batch_request(
+            [("eth_getTransactionReceipt", [h]) for h in hashes]
+        )
+        if not isinstance(responses, list):
+            raise RuntimeError(f"batch receipt request failed: {responses.get('error')}")
+        for original, resp in zip(tx_hashes, responses):
+            if resp.get("error"):
+                raise RuntimeError(f"eth_getTransactionReceipt failed: {resp['error']}")
+            r = resp.get("result")
+            out[original] = None if r is None else {
+                "status": _hex_int(r.get("status")), "blockNumber": _hex_int(r.get("blockNumber")),
+            }
+        return out
+    for original, h in zip(tx_hashes, hashes):
+        try:
+            r = w3.eth.get_transaction_receipt(h)
+        except TransactionNotFound:
+            out[original] = None
+            continue
+        out[original] = {"status": r["status"], "blockNumber": r["blockNumber"]}
+    return out
+
+
+def transaction_known(tx_hash: str) -> bool:
+    """Whether the node still has the transaction (mined or in its mempool)."""
+    try:
+        get_w3().eth.get_transaction(tx_hash if tx_hash.startswith("0x") else "0x" + tx_hash)
+        return True
+    except TransactionNotFound:
+        return False
@@ -0,0 +1,324 @@
+"""Local index of USDC Transfer and ChallengeEscrow events.
+
+A background indexer follows both contracts with one eth_getLogs per pass
+and writes the logs into token_transfers / escrow_events. The cursor
+(indexer_cursors) records the last applied block and its hash. Logs,
+cursor and block hashes commit together, so a pass is all-or-nothing.
+
+Reorgs: each pass first compares the cursor hash with the node. On a
+mismatch it walks back over indexed_blocks (the last CHAIN_INDEXER_REORG_DEPTH
+indexed blocks) to the newest block the node still agrees with. Everything
+above that block is deleted and indexing resumes from there.
+
+Reads served from the index:
+    indexed_usdc_balance   balanceOf seeded once per wallet at the cursor block
+                           (token_balances), plus the indexed transfers after it
+    indexed_challenge_state  exists / resolved from ChallengeCreated / ChallengeResolved
+
+Both return None when the indexer is not running or has fallen behind
+(no pass in CHAIN_INDEXER_MAX_LAG_SECONDS); callers then read the chain.
+
+Env vars:
+    CHAIN_INDEXER_POLL_INTERVAL: seconds between passes once caught up (default 4)
+    CHAIN_INDEXER_START_BLOCK: first block to index on a fresh database (default: current head)
+    CHAIN_INDEXER_BLOCK_RANGE: max blocks per eth_getLogs (default 2000)
+    CHAIN_INDEXER_CONFIRMATIONS: blocks kept back from the head (default 0)
+    CHAIN_INDEXER_REORG_DEPTH: block hashes kept for reorg walk-back (default 64)
+    CHAIN_INDEXER_MAX_LAG_SECONDS: cursor age after which lookups fall back to RPC (default 60)
+"""
+import os
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from web3 import Web3
+
+from ..database import SessionLocal
+from ..models import EscrowEvent, IndexedBlock, IndexerCursor, TokenBalance, TokenTransfer
+from . import chain
+from .escrow import ERC20_BALANCE_ABI, ESCROW_CONTRACT_ADDRESS, USDC_CONTRACT
+
+CHAIN_INDEXER_POLL_INTERVAL = float(os.environ.get("CHAIN_INDEXER_POLL_INTERVAL", "4"))
+CHAIN_INDEXER_START_BLOCK = os.environ.get("CHAIN_INDEXER_START_BLOCK", "")
+CHAIN_INDEXER_BLOCK_RANGE = int(os.environ.get("CHAIN_INDEXER_BLOCK_RANGE", "2000"))
+CHAIN_INDEXER_CONFIRMATIONS = int(os.environ.get("CHAIN_INDEXER_CONFIRMATIONS", "0"))
+CHAIN_INDEXER_REORG_DEPTH = int(os.environ.get("CHAIN_INDEXER_REORG_DEPTH", "64"))
+CHAIN_INDEXER_MAX_LAG_SECONDS = int(os.environ.get("CHAIN_INDEXER_MAX_LAG_SECONDS", "60"))
+
+CURSOR_NAME = "main"
+
+EVENTS_ABI = [
+    {
+        "anonymous": False,
+        "inputs": [
+            {"indexed": True, "name": "from", "type": "address"},
+            {"indexed": True, "name": "to", "type": "address"},
+            {"indexed": False, "name": "value", "type": "uint256"},
+        ],
+        "name": "Transfer",
+        "type": "event",
+    },
+    {
+        "anonymous": False,
+        "inputs": [
+            {"indexed": True, "name": "taskId", "type": "bytes32"},
+            {"indexed": False, "name": "winner", "type": "address"},
+            {"indexed": False, "name": "bounty", "type": "uint256"},
+        ],
+        "name": "ChallengeCreated",
+        "type": "event",
+    },
+    {
+        "anonymous": False,
+        "inputs": [
+            {"indexed": True, "name": "taskId", "type": "bytes32"},
+            {"indexed": False, "name": "challenger", "type": "address"},
+        ],
+        "name": "ChallengerJoined",
+        "type": "event",
+    },
+    {
+        "anonymous": False,
+        "inputs": [
+            {"indexed": True, "name": "taskId", "type": "bytes32"},
+            {"indexed": False, "name": "finalWinner", "type": "address"},
+            {"indexed": False, "name": "verdict", "type": "uint8"},
+        ],
+        "name": "ChallengeResolved",
+        "type": "event",
+    },
+]
+
+TRANSFER_TOPIC = Web3.keccak(text="Transfer(address,address,uint256)")
+ESCROW_TOPICS = {
+    Web3.keccak(text="ChallengeCreated(bytes32,address,uint256)"): "ChallengeCreated",
+    Web3.keccak(text="ChallengerJoined(bytes32,address)"): "ChallengerJoined",
+    Web3.keccak(text="ChallengeResolved(bytes32,address,uint8)"): "ChallengeResolved",
+}
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _hex(value) -> str:
+    return Web3.to_hex(value)
+
+
+def _block_hash(w3: Web3, number: int) -> str:
+    return _hex(w3.eth.get_block(number)["hash"])
+
+
+def _events():
+    """Contract object used only to decode logs (address-independent)."""
+    return chain.get_w3().eth.contract(abi=EVENTS_ABI).events
+
+
+def _apply_log(db: Session, log, events, usdc: str, escrow: str) -> None:
+    address = log["address"].lower()
+    topic = log["topics"][0] if log["topics"] else None
+    base = dict(block_number=log["blockNumber"], tx_hash=_hex(log["transactionHash"]),
+                log_index=log["logIndex"])
+    if address == usdc and topic == TRANSFER_TOPIC:
+        args = events.Transfer().process_log(log)["args"]
+        db.add(TokenTransfer(token=usdc, from_address=args["from"].lower(),
+                             to_address=args["to"].lower(), amount=args["value"], **base))
+    elif address == escrow and topic in ESCROW_TOPICS:
+        name = ESCROW_TOPICS[topic]
+        args = getattr(events, name)().process_log(log)["args"]
+        account = args.get("winner") or args.get("challenger") or args.get("finalWinner")
+        db.add(EscrowEvent(event=name, task_key=_hex(args["taskId"]),
+                           account=account.lower() if account else None,
+                           amount=args.get("bounty"), verdict=args.get("verdict"), **base))
+
+
+def _find_ancestor(db: Session, w3: Web3) -> tuple[int, str]:
+    """Newest indexed block whose hash the node still agrees with."""
+    rows = db.query(IndexedBlock).order_by(IndexedBlock.number.desc()).all()
+    for row in rows:
+        if _block_hash(w3, row.number) == row.hash:
+            return row.number, row.hash
+    # Deeper than everything we kept: restart just below the oldest known block
+    number = max((rows[-1].number if rows else 0) - 1, 0)
+    print(f"[indexer] reorg deeper than {len(rows)} indexed blocks, rewinding to {number}", flush=True)
+    return number, _block_hash(w3, number)
+
+
+def rollback_to(db: Session, number: int, block_hash: str) -> None:
+    """Forget everything indexed above `number` (no commit)."""
+    db.query(TokenTransfer).filter(TokenTransfer.block_number > number).delete(synchronize_session=False)
+    db.query(EscrowEvent).filter(EscrowEvent.block_number > number).delete(synchronize_session=False)
+    # A balance read from the orphaned chain is re-seeded on the next lookup
+    db.query(TokenBalance).filter(TokenBalance.block_number > number).delete(synchronize_session=False)
+    db.query(IndexedBlock).filter(IndexedBlock.number > number).delete(synchronize_session=False)
+    if db.get(IndexedBlock, number) is None:
+        db.add(IndexedBlock(number=number, hash=block_hash))
+    cursor = db.get(IndexerCursor, CURSOR_NAME)
+    cursor.block_number = number
+    cursor.block_hash = block_hash
+    cursor.updated_at = _now()
+
+
+def index_once(db: Session) -> int:
+    """One indexer pass. Returns how many blocks it advanced (0 when caught up or rewound)."""
+    w3 = chain.get_w3()
+    head = w3.eth.block_number - CHAIN_INDEXER_CONFIRMATIONS
+    cursor = db.get(IndexerCursor, CURSOR_NAME)
+    if cursor is None:
+        # The cursor is the last block already covered, so start one below the first block to index
+        base = int(CHAIN_INDEXER_START_BLOCK) - 1 if CHAIN_INDEXER_START_BLOCK else head
+        base = max(min(base, head), 0)
+        block_hash = _block_hash(w3, base)
+        db.add(IndexerCursor(name=CURSOR_NAME, block_number=base, block_hash=block_hash))
+        db.add(IndexedBlock(number=base, hash=block_hash))
+        db.commit()
+        return 0
+
+    if _block_hash(w3, cursor.block_number) != cursor.block_hash:
+        number, block_hash = _find_ancestor(db, w3)
+        print(f"[indexer] reorg at {cursor.block_number}, rolling back to {number}", flush=True)
+        rollback_to(db, number, block_hash)
+        db.commit()
+        return 0
+
+    if head <= cursor.block_number:
+        cursor.updated_at = _now()
+        db.commit()
+        return 0
+
+    from_block = cursor.block_number + 1
+    to_block = min(head, cursor.block_number + CHAIN_INDEXER_BLOCK_RANGE)
+    to_hash = _block_hash(w3, to_block)
+    usdc, escrow = USDC_CONTRACT.lower(), ESCROW_CONTRACT_ADDRESS.lower()
+    addresses = [Web3.to_checksum_address(a) for a in (usdc, escrow) if a]
+    logs = w3.eth.get_logs({"fromBlock": from_block, "toBlock": to_block, "address": addresses})
+    if _block_hash(w3, to_block) != to_hash:
+        return 0   # reorg while fetching; the next pass starts over from the cursor
+
+    events = _events()
+    seen = {to_block: to_hash}
+    for log in sorted(logs, key=lambda entry: (entry["blockNumber"], entry["logIndex"])):
+        seen[log["blockNumber"]] = _hex(log["blockHash"])
+        _apply_log(db, log, events, usdc, escrow)
+    for number, block_hash in seen.items():
+        db.merge(IndexedBlock(number=number, hash=block_hash))
+    db.query(IndexedBlock).filter(
+        IndexedBlock.number < to_block - CHAIN_INDEXER_REORG_DEPTH
+    ).delete(synchronize_session=False)
+    cursor.block_number = to_block
+    cursor.block_hash = to_hash
+    cursor.updated_at = _now()
+    db.commit()
+    return to_block - from_block + 1
+
+
+def _fresh_cursor(db: Session) -> Optional[IndexerCursor]:
+    cursor = db.get(IndexerCursor, CURSOR_NAME)
+    if cursor is None:
+        return None
+    updated = cursor.updated_at if cursor.updated_at.tzinfo else cursor.updated_at.replace(tzinfo=timezone.utc)
+    if _now() - updated > timedelta(seconds=CHAIN_INDEXER_MAX_LAG_SECONDS):
+        return None
+    return cursor
+
+
+def _balance_at(token: str, wallet: str, block_number: int) -> int:
+    """balanceOf(wallet) at a block, in base units. Separated for mocking."""
+    contract = chain.get_contract(token, ERC20_BALANCE_ABI, key="erc20-balance")
+    return contract.functions.balanceOf(Web3.to_checksum_address(wallet)).call(
+        block_identifier=block_number)
+
+
+def indexed_usdc_balance(db: Session, wallet: str) -> Optional[float]:
+    """USDC balance from the index, or None if the indexer is not current.
+
+    The first lookup for a wallet reads balanceOf once at the cursor block;
+    later lookups only sum the indexed transfers since then.
+    """
+    cursor = _fresh_cursor(db)
+    if cursor is None:
+        return None
+    token, wallet = USDC_CONTRACT.lower(), wallet.lower()
+    seed = db.get(TokenBalance, (token, wallet))
+    if seed is None:
+        seed = TokenBalance(token=token, wallet=wallet, block_number=cursor.block_number,
+                            balance=_balance_at(token, wallet, cursor.block_number))
+        db.add(seed)
+        try:
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            seed = db.get(TokenBalance, (token, wallet))
+
+    def _sum(column):
+        return db.query(func.coalesce(func.sum(TokenTransfer.amount), 0)).filter(
+            TokenTransfer.token == token, column == wallet,
+            TokenTransfer.block_number > seed.block_number,
+        ).scalar()
+
+    balance = seed.balance + _sum(TokenTransfer.to_address) - _sum(TokenTransfer.from_address)
+    return balance / 10**6
+
+
+def indexed_challenge_state(db: Session, task_id: str) -> Optional[dict]:
+    """{"exists", "resolved"} for a task's escrow challenge from the index, or None if not current."""
+    if _fresh_cursor(db) is None:
+        return None
+    key = _hex(Web3.keccak(text=task_id))
+    seen = {name for (name,) in db.query(EscrowEvent.event)
+            .filter(EscrowEvent.task_key == key).distinct()}
+    return {"exists": "ChallengeCreated" in seen, "resolved": "ChallengeResolved" in seen}
+
+
+class ChainIndexer:
+    """Background thread that runs index_once back to back until caught up, then every poll interval."""
+
+    def __init__(self, session_factory=None, poll_interval: float = CHAIN_INDEXER_POLL_INTERVAL):
+        self.session_factory = session_factory or SessionLocal
+        self.poll_interval = poll_interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._loop, name="chain-indexer", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            db = self.session_factory()
+            advanced = 0
+            try:
+                advanced = index_once(db)
+            except Exception as e:
+                db.rollback()
+                print(f"[indexer] pass failed: {e}", flush=True)
+            finally:
+                db.close()
+            if not advanced:
+                self._stop.wait(self.poll_interval)
+
+
+_indexer: Optional[ChainIndexer] = None
+
+
+def start_chain_indexer() -> ChainIndexer:
+    global _indexer
+    if _indexer is None:
+        _indexer = ChainIndexer()
+        _indexer.start()
+    return _indexer
+
+
+def stop_chain_indexer() -> None:
+    global _indexer
+    if _indexer is not None:
+        _indexer.stop()
+        _indexer = None
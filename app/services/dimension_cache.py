@@ -0,0 +1,95 @@
+"""Per-task cache of the locked scoring dimensions.
+
+A task's ScoringDimension rows never change once generate_dimensions has
+committed them. The oracle and router paths therefore share one immutable
+DimensionBundle per task, with every shape they need precomputed: the
+oracle payload dicts, the penalty inputs, the fixed-dim ids and the
+id / weight arrays. Bundles live in a bounded LRU. generate_dimensions fills
+it; any other path fills it on first use. A task without dimensions is
+never cached, so dimensions generated later are picked up.
+
+Env vars:
+    DIMENSION_CACHE_SIZE: max tasks kept (default 1024)
+"""
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from ..models import ScoringDimension
+
+DIMENSION_CACHE_SIZE = int(os.environ.get("DIMENSION_CACHE_SIZE", "1024"))
+
+
+@dataclass(frozen=True)
+class DimensionBundle:
+    """Read-only view of a task's dimensions; callers must not mutate the dicts."""
+    task_id: str
+    payload: tuple[dict, ...]        # {"id", "name", "description", "weight", "scoring_guidance"} for oracle calls
+    penalty_dims: tuple[dict, ...]   # {"dim_id", "dim_type", "weight"} for compute_penalized_total
+    public: tuple[dict, ...]         # ScoringDimensionPublic fields
+    dim_ids: tuple[str, ...]
+    weights: tuple[float, ...]
+    fixed_dim_ids: frozenset[str]
+
+    @classmethod
+    def from_rows(cls, task_id: str, rows: list) -> "DimensionBundle":
+        return cls(
+            task_id=task_id,
+            payload=tuple(
+                {"id": d.dim_id, "name": d.name, "description": d.description,
+                 "weight": d.weight, "scoring_guidance": d.scoring_guidance}
+                for d in rows
+            ),
+            penalty_dims=tuple(
+                {"dim_id": d.dim_id, "dim_type": d.dim_type, "weight": d.weight} for d in rows
+            ),
+            public=tuple(
+                {"dim_id": d.dim_id, "name": d.name, "dim_type": d.dim_type,
+                 "description": d.description, "weight": d.weight,
+                 "scoring_guidance": d.scoring_guidance}
+                for d in rows
+            ),
+            dim_ids=tuple(d.dim_id for d in rows),
+            weights=tuple(d.weight for d in rows),
+            fixed_dim_ids=frozenset(d.dim_id for d in rows if d.dim_type == "fixed"),
+        )
+
+
+_bundles: "OrderedDict[str, DimensionBundle]" = OrderedDict()
+_lock = threading.Lock()
+
+
+def _store(bundle: DimensionBundle) -> DimensionBundle:
+    with _lock:
+        _bundles[bundle.task_id] = bundle
+        _bundles.move_to_end(bundle.task_id)
+        while len(_bundles) > DIMENSION_CACHE_SIZE:
+            _bundles.popitem(last=False)
+    return bundle
+
+
+def put_dimension_bundle(task_id: str, rows: list) -> DimensionBundle:
+    """Cache the bundle for freshly locked dimension rows."""
+    return _store(DimensionBundle.from_rows(task_id, rows))
+
+
+def get_dimension_bundle(db: Session, task_id: str) -> Optional[DimensionBundle]:
+    """Bundle for a task, loading it on a miss. None when the task has no dimensions yet."""
+    with _lock:
+        bundle = _bundles.get(task_id)
+        if bundle is not None:
+            _bundles.move_to_end(task_id)
+            return bundle
+    rows = db.query(ScoringDimension).filter(ScoringDimension.task_id == task_id).all()
+    if not rows:
+        return None
+    return _store(DimensionBundle.from_rows(task_id, rows))
+
+
+def clear_dimension_cache() -> None:
+    with _lock:
+        _bundles.clear()
@@ -0,0 +1,91 @@
+"""Per-dimension scores as rows (submission_dimension_scores).
+
+oracle_feedback keeps the full oracle output as JSON; every dimension's
+band / score / evidence is also written here, one row per submission,
+dimension and stage, in the same transaction. Ranking and analytics read
+the rows with plain SQL instead of decoding every blob. The batch write-back
+replaces a submission's oracle_feedback with the comparative result, so the
+individual rows are also the only place its individual scores survive.
+"""
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from ..models import DimensionScoreStage, Submission, SubmissionDimensionScore
+
+
+def feedback_stage(feedback: dict) -> Optional[DimensionScoreStage]:
+    """Stage of the dimension_scores inside a decoded oracle_feedback, None if it has none."""
+    if not isinstance(feedback.get("dimension_scores"), dict):
+        return None
+    kind = feedback.get("type")
+    if kind == "individual_scoring":
+        return DimensionScoreStage.individual
+    if kind == "scoring":
+        # batch_score_submissions ranks its write-back; fastest_first stores individual scores
+        return DimensionScoreStage.comparative if "rank" in feedback else DimensionScoreStage.individual
+    return None
+
+
+def _number(value) -> Optional[float]:
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    return float(value)
+
+
+def record_dimension_scores(
+    db: Session, submission: Submission, stage: DimensionScoreStage, dim_scores: dict,
+) -> None:
+    """Replace the submission's rows for `stage`. The caller commits."""
+    if not isinstance(dim_scores, dict):
+        dim_scores = {}
+    db.query(SubmissionDimensionScore).filter(
+        SubmissionDimensionScore.submission_id == submission.id,
+        SubmissionDimensionScore.stage == stage,
+    ).delete()
+    db.add_all([
+        SubmissionDimensionScore(
+            submission_id=submission.id,
+            task_id=submission.task_id,
+            worker_id=submission.worker_id,
+            dim_id=dim_id,
+            stage=stage,
+            band=entry.get("band"),
+            score=_number(entry.get("score")),
+            raw_score=_number(entry.get("raw_score")),
+            evidence=entry.get("evidence"),
+        )
+        for dim_id, entry in dim_scores.items()
+        if isinstance(entry, dict)
+    ])
+
+
+def load_dimension_scores(
+    db: Session, submission_ids: list[str], stage: DimensionScoreStage,
+) -> dict[str, dict[str, SubmissionDimensionScore]]:
+    """{submission_id: {dim_id: row}} for the given submissions; absent ids have no rows."""
+    from ..scheduler import _chunks
+    stored: dict[str, dict[str, SubmissionDimensionScore]] = {}
+    for chunk in _chunks(submission_ids):
+        rows = db.query(SubmissionDimensionScore).filter(
+            SubmissionDimensionScore.submission_id.in_(chunk),
+            SubmissionDimensionScore.stage == stage,
+        ).all()
+        for row in rows:
+            stored.setdefault(row.submission_id, {})[row.dim_id] = row
+    return stored
+
+
+def top_by_dimension(
+    db: Session, task_id: str, dim_id: str,
+    stage: DimensionScoreStage = DimensionScoreStage.individual, limit: int = 10,
+) -> list[SubmissionDimensionScore]:
+    """Highest-scoring rows of one dimension in a task (served by ix_submission_dimension_scores_rank)."""
+    return db.query(SubmissionDimensionScore).filter(
+        SubmissionDimensionScore.task_id == task_id,
+        SubmissionDimensionScore.stage == stage,
+        SubmissionDimensionScore.dim_id == dim_id,
+        SubmissionDimensionScore.score.isnot(None),
+    ).order_by(
+        SubmissionDimensionScore.score.desc(), SubmissionDimensionScore.id,
+    ).limit(limit).all()
@@ -1,11 +1,8 @@
 """ChallengeEscrow contract interaction layer."""
-import json
 import os
-from pathlib import Path
 from web3 import Web3
+from . import chain
 
-PLATFORM_PRIVATE_KEY = os.environ.get("PLATFORM_PRIVATE_KEY", "")
-RPC_URL = os.environ.get("BASE_SEPOLIA_RPC_URL", "https://sepolia.base.org")
 USDC_CONTRACT = os.environ.get("USDC_CONTRACT", "0x036CbD53842c5426634e7929541eC2318f3dCF7e")
 ESCROW_CONTRACT_ADDRESS = os.environ.get("ESCROW_CONTRACT_ADDRESS", "")
 
@@ -22,13 +19,9 @@ ERC20_BALANCE_ABI = [
 
 
 def _load_escrow_abi() -> list:
-    """Load ChallengeEscrow ABI from Foundry output."""
-    abi_path = Path(__file__).parent.parent.parent / "contracts" / "out" / "ChallengeEscrow.sol" / "ChallengeEscrow.json"
-    if abi_path.exists():
-        with open(abi_path, encoding="utf-8") as f:
-            return json.load(f)["abi"]
-    # Fallback: minimal ABI for the 4 functions we use
-    return _MINIMAL_ESCROW_ABI
+    """Load ChallengeEscrow ABI from Foundry output (read once per process)."""
+    # Fallback: minimal ABI for the functions we use
+    return chain.load_abi("ChallengeEscrow", fallback=_MINIMAL_ESCROW_ABI)
 
 
 # Minimal ABI fallback (used when Foundry artifacts not available, e.g. in tests)
@@ -78,6 +71,22 @@ _MINIMAL_ESCROW_ABI = [
         "outputs": [],
         "type": "function",
     },
+    {
+        "inputs": [{"name": "", "type": "bytes32"}],
+        "name": "challenges",
+        "outputs": [
+            {"name": "winner", "type": "address"},
+            {"name": "bounty", "type": "uint256"},
+            {"name": "incentive", "type": "uint256"},
+            {"name": "serviceFee", "type": "uint256"},
+            {"name": "challengerCount", "type": "uint8"},
+            {"name": "resolved", "type": "bool"},
+            {"name": "createdAt", "type": "uint256"},
+            {"name": "totalDeposits", "type": "uint256"},
+        ],
+        "stateMutability": "view",
+        "type": "function",
+    },
     {
         "inputs": [{"name": "taskId", "type": "bytes32"}],
         "name": "emergencyWithdraw",
@@ -108,13 +117,9 @@ _MINIMAL_ESCROW_ABI = [
 
 
 def _get_w3_and_contract():
-    """Create web3 instance and contract object. Separated for mocking."""
-    w3 = Web3(Web3.HTTPProvider(RPC_URL))
-    abi = _load_escrow_abi()
-    contract = w3.eth.contract(
-        address=Web3.to_checksum_address(ESCROW_CONTRACT_ADDRESS), abi=abi
-    )
-    return w3, contract
+    """Shared web3 instance and memoized escrow contract. Separated for mocking."""
+    contract = chain.get_contract(ESCROW_CONTRACT_ADDRESS, _load_escrow_abi(), key="ChallengeEscrow")
+    return chain.get_w3(), contract
 
 
 def _task_id_to_bytes32(task_id: str) -> bytes:
@@ -123,35 +128,34 @@ def _task_id_to_bytes32(task_id: str) -> bytes:
 
 
 def _send_tx(w3, contract_fn, description: str) -> str:
-    """Build, sign, send a contract transaction. Returns tx hash hex."""
-    account = w3.eth.account.from_key(PLATFORM_PRIVATE_KEY)
-    tx = contract_fn.build_transaction({
-        "from": account.address,
-        "nonce": w3.eth.get_transaction_count(account.address),
-        "gas": 300_000,
-        "gasPrice": w3.eth.gas_price,
-    })
-    signed = account.sign_transaction(tx)
-    tx_hash = w3.eth.send_raw_transaction(signed.raw_transaction)
-    receipt = w3.eth.wait_for_transaction_receipt(tx_hash, timeout=60)
-    if receipt["status"] != 1:
-        raise RuntimeError(f"{description} reverted (tx={tx_hash.hex()})")
-    print(f"[escrow] {description} tx={tx_hash.hex()}", flush=True)
-    return tx_hash.hex()
+    """Build, sign, broadcast a contract transaction. Returns tx hash hex.
+
+    Does not wait for the receipt; callers record the hash with
+    tx_tracker.track_transaction and the confirmer settles the outcome.
+    """
+    tx_hash = chain.send_transaction(contract_fn, gas=300_000, description=description,
+                                     w3=w3, wait=False)
+    print(f"[escrow] {description} tx={tx_hash}", flush=True)
+    return tx_hash
 
 
 def check_usdc_balance(wallet_address: str) -> float:
     """Check USDC balance of a wallet. Returns amount in USDC (not wei)."""
-    w3 = Web3(Web3.HTTPProvider(RPC_URL))
-    contract = w3.eth.contract(
-        address=Web3.to_checksum_address(USDC_CONTRACT), abi=ERC20_BALANCE_ABI
-    )
+    contract = chain.get_contract(USDC_CONTRACT, ERC20_BALANCE_ABI, key="erc20-balance")
     balance_wei = contract.functions.balanceOf(
         Web3.to_checksum_address(wallet_address)
     ).call()
     return balance_wei / 10**6
 
 
+def get_challenge_state(task_id: str) -> dict:
+    """Read ChallengeEscrow.challenges(taskId). Returns {"exists": bool, "resolved": bool}."""
+    _, contract = _get_w3_and_contract()
+    info = contract.functions.challenges(_task_id_to_bytes32(task_id)).call()
+    # (winner, bounty, incentive, serviceFee, challengerCount, resolved, createdAt, totalDeposits)
+    return {"exists": info[1] > 0, "resolved": bool(info[5])}
+
+
 def create_challenge_onchain(
     task_id: str, winner_wallet: str, bounty: float, incentive: float
 ) -> str:
@@ -0,0 +1,375 @@
+"""Transactional outbox for ChallengeEscrow calls made by the lifecycle.
+
+The quality_first lifecycle no longer calls the escrow contract while it
+walks a tick's tasks. Each phase writes an EscrowCall row in the same
+transaction as its state change:
+
+    scoring → challenge_window    create_challenge
+    challenge_window / jury → closed    resolve_challenge
+    jury deadlock → voided    void_challenge
+
+so a call exists if and only if the transition committed, and one slow RPC
+no longer holds up every other task in the tick.
+
+A relayer thread leases due rows and broadcasts them on a small thread pool
+(ESCROW_RELAYER_CONCURRENCY). Calls of one task run one at a time, in the
+order they were written, so resolve never overtakes create. A sent call
+stamps the task (escrow_tx_hash, or payout_tx_hash with payout_status
+`submitted`) and hands the hash to the tx confirmer (services/tx_tracker.py),
+which advances the task once the receipt is in.
+
+Failures retry with exponential backoff. After ESCROW_MAX_ATTEMPTS the call
+is parked as `failed` and the inline failure handling applies:
+    create_challenge: the task goes back to scoring, and the lifecycle re-enqueues it
+    resolve_challenge: payout_status = failed (retry via /internal)
+    void_challenge: logged only
+A retry can follow an attempt that did broadcast before it failed, for example
+a timeout after send_raw_transaction, or a process that died between the send
+and its commit. Attempts are therefore counted when a call is claimed, and
+before re-sending the relayer reads the challenge on-chain and skips the call
+when its effect is already there.
+
+Env vars:
+    ESCROW_RELAYER_CONCURRENCY: calls broadcast at once (default 4)
+    ESCROW_RELAYER_POLL_INTERVAL: idle poll seconds; new rows wake the relayer (default 2)
+    ESCROW_MAX_ATTEMPTS: attempts before a call is given up (default 5)
+    ESCROW_RETRY_BASE: first retry delay in seconds, doubled per attempt (default 15)
+    ESCROW_RETRY_MAX: cap on the retry delay in seconds (default 600)
+"""
+import json
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import and_, event, exists, or_, select, update
+from sqlalchemy.orm import Session, aliased
+
+from ..database import SessionLocal
+from ..models import (
+    ChainTxKind, EscrowAction, EscrowCall, EscrowCallStatus, PayoutStatus, Task, TaskStatus,
+)
+from .chain_indexer import indexed_challenge_state
+from .escrow import (
+    create_challenge_onchain, get_challenge_state, resolve_challenge_onchain, void_challenge_onchain,
+)
+from .tx_tracker import track_transaction
+
+ESCROW_RELAYER_CONCURRENCY = int(os.environ.get("ESCROW_RELAYER_CONCURRENCY", "4"))
+ESCROW_RELAYER_POLL_INTERVAL = float(os.environ.get("ESCROW_RELAYER_POLL_INTERVAL", "2"))
+ESCROW_MAX_ATTEMPTS = int(os.environ.get("ESCROW_MAX_ATTEMPTS", "5"))
+ESCROW_RETRY_BASE = float(os.environ.get("ESCROW_RETRY_BASE", "15"))
+ESCROW_RETRY_MAX = float(os.environ.get("ESCROW_RETRY_MAX", "600"))
+ESCROW_LEASE_SECONDS = 300   # a call not settled by then (process died) is picked up again
+
+_PENDING_KEY = "escrow_outbox_pending"
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def enqueue_escrow_call(db: Session, task_id: str, action: EscrowAction, **args) -> EscrowCall:
+    """Queue an escrow call; it is committed (or rolled back) with the caller's transaction."""
+    call = EscrowCall(task_id=task_id, action=action, payload=json.dumps(args))
+    db.add(call)
+    db.info[_PENDING_KEY] = True
+    return call
+
+
+@event.listens_for(Session, "after_commit")
+def _wake_after_commit(session: Session) -> None:
+    if session.info.pop(_PENDING_KEY, False):
+        wake_escrow_relayer()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+# ---------------------------------------------------------------------------
+# Claiming
+# ---------------------------------------------------------------------------
+
+def _claimable(now: datetime):
+    return or_(
+        and_(EscrowCall.status == EscrowCallStatus.pending, EscrowCall.next_attempt_at <= now),
+        and_(EscrowCall.status == EscrowCallStatus.sending, EscrowCall.locked_until < now),
+    )
+
+
+def claim_calls(db: Session, limit: int, now: Optional[datetime] = None,
+                exclude: frozenset = frozenset()) -> dict[str, int]:
+    """Lease up to `limit` due calls, at most one per task and only the oldest
+    unfinished call of that task. Tasks in `exclude` are skipped.
+    Returns {task_id: call_id}."""
+    if limit <= 0:
+        return {}
+    now = now or _now()
+    earlier = aliased(EscrowCall)
+    blocked = exists().where(
+        earlier.task_id == EscrowCall.task_id,
+        earlier.id < EscrowCall.id,
+        earlier.status.in_([EscrowCallStatus.pending, EscrowCallStatus.sending]),
+    )
+    query = db.query(EscrowCall.id, EscrowCall.task_id).filter(_claimable(now), ~blocked)
+    if exclude:
+        query = query.filter(EscrowCall.task_id.notin_(exclude))
+    picked: dict[str, int] = {}
+    for call_id, task_id in query.order_by(EscrowCall.id).limit(limit * 4).all():
+        if task_id not in picked and len(picked) < limit:
+            picked[task_id] = call_id
+    if not picked:
+        return {}
+
+    token = uuid.uuid4().hex
+    # The WHERE re-checks claimability, so racing relayers never share a call.
+    # The attempt is counted here, before any broadcast, so a crash after the
+    # send still leaves a reclaimed call marked as possibly applied.
+    db.execute(
+        update(EscrowCall)
+        .where(EscrowCall.id.in_(picked.values()), _claimable(now))
+        .values(status=EscrowCallStatus.sending, lease_token=token,
+                attempts=EscrowCall.attempts + 1,
+                locked_until=now + timedelta(seconds=ESCROW_LEASE_SECONDS))
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return {task_id: call_id for call_id, task_id in db.execute(
+        select(EscrowCall.id, EscrowCall.task_id).where(EscrowCall.lease_token == token)
+    )}
+
+
+# ---------------------------------------------------------------------------
+# Execution
+# ---------------------------------------------------------------------------
+
+def _broadcast(call: EscrowCall, args: dict) -> str:
+    if call.action == EscrowAction.create_challenge:
+        return create_challenge_onchain(
+            call.task_id, args["winner_wallet"], args["bounty"], args["incentive"])
+    if call.action == EscrowAction.resolve_challenge:
+        return resolve_challenge_onchain(
+            call.task_id, args["winner_wallet"], args["winner_payout"],
+            args["refunds"], args["arbiter_wallets"], args["arbiter_reward"])
+    return void_challenge_onchain(
+        call.task_id, args["publisher_wallet"], args["publisher_refund"],
+        args["refunds"], args["arbiter_wallets"], args["arbiter_reward"])
+
+
+def _already_applied(db: Session, call: EscrowCall) -> bool:
+    key = "exists" if call.action == EscrowAction.create_challenge else "resolved"
+    # The index may lag the chain, so only a positive answer from it is final
+    indexed = indexed_challenge_state(db, call.task_id)
+    if indexed and indexed[key]:
+        return True
+    return get_challenge_state(call.task_id)[key]
+
+
+def _on_sent(db: Session, call: EscrowCall, args: dict, tx_hash: Optional[str]) -> None:
+    task = db.get(Task, call.task_id)
+    if task is None:
+        return
+    if call.action == EscrowAction.create_challenge:
+        if tx_hash:
+            task.escrow_tx_hash = tx_hash
+            track_transaction(db, tx_hash, ChainTxKind.escrow_create, task_id=task.id)
+        return
+    if call.action == EscrowAction.resolve_challenge:
+        kind, done = ChainTxKind.escrow_resolve, PayoutStatus.paid
+    else:
+        kind, done = ChainTxKind.escrow_void, PayoutStatus.refunded
+    if tx_hash:
+        task.payout_status = PayoutStatus.submitted
+        task.payout_tx_hash = tx_hash
+        track_transaction(db, tx_hash, kind, task_id=task.id)
+    else:
+        task.payout_status = done   # effect found on-chain; the original hash is unknown
+
+
+def _on_gave_up(db: Session, call: EscrowCall) -> Optional[str]:
+    """Failure handling once retries are exhausted. Returns a task id to re-evaluate."""
+    task = db.get(Task, call.task_id)
+    if task is None:
+        return None
+    if call.action == EscrowAction.create_challenge:
+        if task.status == TaskStatus.challenge_window and not task.escrow_tx_hash:
+            # Do NOT stay in challenge_window without locked escrow; retried next tick
+            task.winner_submission_id = None
+            task.challenge_window_end = None
+            task.status = TaskStatus.scoring
+            return task.id
+    elif call.action == EscrowAction.resolve_challenge:
+        task.payout_status = PayoutStatus.failed
+    return None
+
+
+def execute_call(db: Session, call_id: int) -> bool:
+    """Broadcast one leased call and record the outcome. Returns True when it was sent."""
+    call = db.get(EscrowCall, call_id)
+    if call is None or call.status != EscrowCallStatus.sending:
+        return False
+    args = json.loads(call.payload)
+    retrigger = None
+    try:
+        # Only a retry can follow a broadcast whose outcome we never recorded
+        if call.attempts > 1 and _already_applied(db, call):
+            tx_hash = None
+            call.last_error = "already applied on-chain"
+        else:
+            tx_hash = _broadcast(call, args)
+            call.last_error = None
+        error = None
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+
+    now = _now()
+    call.lease_token = None
+    call.locked_until = None
+    if error is None:
+        call.status = EscrowCallStatus.sent
+        call.tx_hash = tx_hash
+        call.sent_at = now
+        _on_sent(db, call, args, tx_hash)
+    else:
+        call.last_error = error[-2000:]
+        if call.attempts >= ESCROW_MAX_ATTEMPTS:
+            call.status = EscrowCallStatus.failed
+            retrigger = _on_gave_up(db, call)
+        else:
+            call.status = EscrowCallStatus.pending
+            delay = min(ESCROW_RETRY_BASE * 2 ** (call.attempts - 1), ESCROW_RETRY_MAX)
+            call.next_attempt_at = now + timedelta(seconds=delay)
+        print(f"[escrow-outbox] {call.action.value}({call.task_id}) attempt {call.attempts} failed: {error}",
+              flush=True)
+    db.commit()
+    if retrigger:
+        from ..lifecycle import notify_lifecycle
+        notify_lifecycle(retrigger)
+    return error is None
+
+
+def relay_pending(db: Session, now: Optional[datetime] = None) -> int:
+    """Execute every due call inline on `db`, one after another (tests, scripts).
+    Returns how many calls were attempted."""
+    attempted = 0
+    while True:
+        claimed = claim_calls(db, ESCROW_RELAYER_CONCURRENCY, now)
+        if not claimed:
+            return attempted
+        for call_id in claimed.values():
+            execute_call(db, call_id)
+            attempted += 1
+
+
+class EscrowRelayer:
+    """Leases due escrow calls and broadcasts them, one per task, on a thread pool."""
+
+    def __init__(self, session_factory=None, concurrency: int = ESCROW_RELAYER_CONCURRENCY,
+                 poll_interval: float = ESCROW_RELAYER_POLL_INTERVAL):
+        self.session_factory = session_factory or SessionLocal
+        self.concurrency = max(1, concurrency)
+        self.poll_interval = poll_interval
+        self._executor = ThreadPoolExecutor(max_workers=self.concurrency,
+                                            thread_name_prefix="escrow-relayer")
+        self._lock = threading.Lock()
+        self._inflight: set[str] = set()   # task ids with a call in flight
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._loop, name="escrow-relayer", daemon=True)
+        self._thread.start()
+
+    def stop(self, wait: bool = True) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+        self._executor.shutdown(wait=wait)
+
+    def wake(self) -> None:
+        self._wake.set()
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.dispatch_once()
+            except Exception as e:
+                print(f"[escrow-outbox] dispatch error: {e}", flush=True)
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+
+    def dispatch_once(self, now: Optional[datetime] = None) -> int:
+        """Lease calls for free slots and submit them. Returns the number submitted."""
+        with self._lock:
+            free = self.concurrency - len(self._inflight)
+            busy = frozenset(self._inflight)
+        if free <= 0:
+            return 0
+        db = self.session_factory()
+        try:
+            claimed = claim_calls(db, free, now, exclude=busy)
+        finally:
+            db.close()
+        with self._lock:
+            self._inflight.update(claimed)
+        for task_id, call_id in claimed.items():
+            self._executor.submit(self._run, call_id, task_id)
+        return len(claimed)
+
+    def _run(self, call_id: int, task_id: str) -> None:
+        db = self.session_factory()
+        try:
+            execute_call(db, call_id)
+        except Exception as e:
+            db.rollback()
+            print(f"[escrow-outbox] could not execute call {call_id}: {e}", flush=True)
+        finally:
+            db.close()
+            with self._lock:
+                self._inflight.discard(task_id)
+            self._wake.set()
+
+    def idle(self) -> bool:
+        with self._lock:
+            return not self._inflight
+
+    def drain(self, timeout: float = 30.0, now: Optional[datetime] = None) -> None:
+        """Execute until nothing is due and nothing is in flight (tests, scripts)."""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.dispatch_once(now) == 0 and self.idle():
+                return
+            self._wake.wait(0.05)
+            self._wake.clear()
+        raise TimeoutError("escrow outbox did not drain")
+
+
+_relayer: Optional[EscrowRelayer] = None
+
+
+def start_escrow_relayer() -> EscrowRelayer:
+    global _relayer
+    if _relayer is None:
+        _relayer = EscrowRelayer()
+        _relayer.start()
+    return _relayer
+
+
+def stop_escrow_relayer() -> None:
+    global _relayer
+    if _relayer is not None:
+        _relayer.stop()
+        _relayer = None
+
+
+def wake_escrow_relayer() -> None:
+    """Nudge the relayer after new calls commit; no-op when it is not running."""
+    if _relayer is not None:
+        _relayer.wake()
@@ -0,0 +1,411 @@
+"""Task / submission state-change events and their in-process fan-out.
+
+Every flush that changes a task's `status` or `payout_status`, or a
+submission's `status`, appends a row to `task_events` in the same
+transaction. This is done by a session listener, so the scheduler, the
+oracle job handlers and payout code need no extra calls, and an event is
+only visible once the change itself has committed. The row id is the SSE
+event id: a client reconnecting with `Last-Event-ID` gets everything it
+missed replayed from the table.
+
+Live delivery goes through one EventBroker per process. It tails the table
+— woken right away by commits made in this process and every
+EVENTS_POLL_INTERVAL seconds for commits made on other nodes — and fans new
+rows out to subscriber queues, so N open streams cost one query per tick
+instead of N. The broker only runs while something is subscribed.
+
+Env vars:
+    EVENTS_POLL_INTERVAL: seconds between table polls for other nodes' events (default 2)
+    EVENTS_KEEPALIVE_SECONDS: idle seconds before a `: keepalive` comment is sent (default 15)
+    EVENTS_STREAM_MAX_SECONDS: stream lifetime; clients reconnect with Last-Event-ID (default 600)
+    SUBMISSION_WAIT_MAX_SECONDS: longest `?wait=` accepted by the submission long-poll (default 60)
+"""
+import asyncio
+import json
+import os
+import weakref
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Optional
+from sqlalchemy import event, func, insert, inspect, or_
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from ..database import SessionLocal
+from ..models import Submission, Task, TaskEvent
+
+EVENTS_POLL_INTERVAL = float(os.environ.get("EVENTS_POLL_INTERVAL", "2"))
+EVENTS_KEEPALIVE_SECONDS = float(os.environ.get("EVENTS_KEEPALIVE_SECONDS", "15"))
+EVENTS_STREAM_MAX_SECONDS = float(os.environ.get("EVENTS_STREAM_MAX_SECONDS", "600"))
+SUBMISSION_WAIT_MAX_SECONDS = float(os.environ.get("SUBMISSION_WAIT_MAX_SECONDS", "60"))
+REPLAY_LIMIT = 1000        # rows replayed for one Last-Event-ID; clients further behind should refetch state
+SUBSCRIBER_BUFFER = 1000   # events queued per stream before it is closed and has to resume
+GAP_WAIT_SECONDS = 10      # how long a skipped id may still show up (concurrent writers on Postgres)
+MAX_TRACKED_GAPS = 1000
+RETRY_MS = 3000            # client reconnect delay sent as the SSE `retry:` field
+
+EVENT_TYPES = ("task.status", "task.payout", "submission.status")
+
+_PENDING_KEY = "task_events_pending"
+_recorders: list = []   # callbacks run inside the flush with the rows just recorded
+
+
+# ---------------------------------------------------------------------------
+# Recording: session listeners
+# ---------------------------------------------------------------------------
+
+def _value(v):
+    return v.value if hasattr(v, "value") else v
+
+
+def _change(obj, attr: str) -> Optional[tuple]:
+    """(previous, current) if `attr` changed in the flush being processed, else None."""
+    hist = inspect(obj).attrs[attr].history
+    if not hist.added:
+        return None
+    previous = hist.deleted[0] if hist.deleted else None
+    current = hist.added[0]
+    if previous == current:
+        return None
+    return _value(previous), _value(current)
+
+
+def _row(event_type: str, task_id: str, submission_id: Optional[str], data: dict) -> dict:
+    return {"event_type": event_type, "task_id": task_id, "submission_id": submission_id,
+            "data": json.dumps(data)}
+
+
+def _task_rows(task: Task, is_new: bool) -> list[dict]:
+    rows = []
+    status = (None, _value(task.status)) if is_new else _change(task, "status")
+    if status:
+        rows.append(_row("task.status", task.id, None, {
+            "task_id": task.id, "previous": status[0], "status": status[1],
+        }))
+    payout = None if is_new else _change(task, "payout_status")
+    if payout:
+        rows.append(_row("task.payout", task.id, None, {
+            "task_id": task.id, "previous": payout[0], "payout_status": payout[1],
+            "payout_amount": task.payout_amount, "payout_tx_hash": task.payout_tx_hash,
+            "refund_amount": task.refund_amount, "refund_tx_hash": task.refund_tx_hash,
+        }))
+    return rows
+
+
+def _submission_rows(sub: Submission, is_new: bool) -> list[dict]:
+    status = (None, _value(sub.status)) if is_new else _change(sub, "status")
+    if not status:
+        return []
+    # No score: quality_first hides it until the challenge window, so clients
+    # read it back through the submissions API, which applies that rule
+    return [_row("submission.status", sub.task_id, sub.id, {
+        "task_id": sub.task_id, "submission_id": sub.id, "worker_id": sub.worker_id,
+        "revision": sub.revision, "previous": status[0], "status": status[1],
+    })]
+
+
+def _noop_set(target, value, oldvalue, initiator):
+    pass
+
+
+# active_history loads the old value on assignment even after a commit has
+# expired it, so the history always knows the state a transition came from
+for _attr in (Task.status, Task.payout_status, Submission.status):
+    event.listen(_attr, "set", _noop_set, active_history=True)
+
+
+@event.listens_for(Session, "after_flush")
+def _record_state_changes(session: Session, flush_context) -> None:
+    # new/dirty and attribute history still describe the flush that just ran,
+    # and primary keys have been assigned by now
+    changed = list(session.new) + list(session.dirty)
+    rows = []
+    for obj in changed:
+        if isinstance(obj, Task):
+            rows.extend(_task_rows(obj, obj in session.new))
+    for obj in changed:
+        if isinstance(obj, Submission):
+            rows.extend(_submission_rows(obj, obj in session.new))
+    if rows:
+        ids = session.connection().execute(
+            insert(TaskEvent).returning(TaskEvent.id, sort_by_parameter_order=True), rows
+        ).scalars().all()
+        for row, event_id in zip(rows, ids):
+            row["id"] = event_id
+        for recorder in _recorders:
+            recorder(session, rows)
+        session.info[_PENDING_KEY] = True
+
+
+def on_events_recorded(fn):
+    """Register `fn(session, rows)` to run in the same flush as newly recorded events.
+
+    Each row is a dict with id, event_type, task_id, submission_id and data
+    (JSON text). Use the session's connection for any writes; the ORM
+    session itself cannot take new objects mid-flush.
+    """
+    _recorders.append(fn)
+    return fn
+
+
+@event.listens_for(Session, "after_commit")
+def _wake_after_commit(session: Session) -> None:
+    if session.info.pop(_PENDING_KEY, False):
+        notify_events()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+# ---------------------------------------------------------------------------
+# Delivery: broker and SSE stream
+# ---------------------------------------------------------------------------
+
+@dataclass(frozen=True)
+class StreamEvent:
+    id: int
+    task_id: str
+    submission_id: Optional[str]
+    event_type: str
+    data: str
+
+    @classmethod
+    def from_row(cls, row: TaskEvent) -> "StreamEvent":
+        return cls(row.id, row.task_id, row.submission_id, row.event_type, row.data)
+
+    def payload(self) -> dict:
+        return json.loads(self.data)
+
+
+@dataclass(eq=False)
+class Subscription:
+    task_id: Optional[str] = None
+    submission_id: Optional[str] = None
+    queue: asyncio.Queue = field(default_factory=lambda: asyncio.Queue(SUBSCRIBER_BUFFER))
+    overflowed: bool = False
+
+    def matches(self, ev: StreamEvent) -> bool:
+        return ((self.task_id is None or ev.task_id == self.task_id)
+                and (self.submission_id is None or ev.submission_id == self.submission_id))
+
+
+_brokers: "weakref.WeakSet[EventBroker]" = weakref.WeakSet()
+
+
+class EventBroker:
+    """Tails `task_events` and fans new rows out to subscribers on one event loop."""
+
+    def __init__(self, session_factory=None, poll_interval: Optional[float] = None):
+        self.session_factory = session_factory or SessionLocal
+        self.poll_interval = poll_interval or EVENTS_POLL_INTERVAL
+        self._subscribers: set[Subscription] = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._ready: Optional[asyncio.Future] = None
+        self._task: Optional[asyncio.Task] = None
+        self._last_id = 0
+        self._gaps: dict[int, float] = {}   # ids skipped by the tail that may still commit -> first seen
+        _brokers.add(self)
+
+    # -- database access (runs in the threadpool) --
+
+    def _max_id(self) -> int:
+        db = self.session_factory()
+        try:
+            return db.query(func.max(TaskEvent.id)).scalar() or 0
+        finally:
+            db.close()
+
+    def _fetch(self, after_id: int, task_id: Optional[str] = None, limit: Optional[int] = None,
+               extra_ids: tuple = ()) -> list[StreamEvent]:
+        db = self.session_factory()
+        try:
+            cond = TaskEvent.id > after_id
+            if extra_ids:
+                cond = or_(cond, TaskEvent.id.in_(extra_ids))
+            q = db.query(TaskEvent).filter(cond)
+            if task_id is not None:
+                q = q.filter(TaskEvent.task_id == task_id)
+            q = q.order_by(TaskEvent.id)
+            if limit:
+                q = q.limit(limit)
+            return [StreamEvent.from_row(r) for r in q.all()]
+        finally:
+            db.close()
+
+    def _task_exists(self, task_id: str) -> bool:
+        db = self.session_factory()
+        try:
+            return db.query(Task.id).filter(Task.id == task_id).first() is not None
+        finally:
+            db.close()
+
+    async def task_exists(self, task_id: str) -> bool:
+        return await run_in_threadpool(self._task_exists, task_id)
+
+    async def replay(self, after_id: int, task_id: Optional[str] = None) -> list[StreamEvent]:
+        return await run_in_threadpool(self._fetch, after_id, task_id, REPLAY_LIMIT)
+
+    # -- subscriptions --
+
+    async def subscribe(self, task_id: Optional[str] = None,
+                        submission_id: Optional[str] = None) -> Subscription:
+        """Register a subscriber. Returns once the tail is running, so anything
+        committed afterwards reaches the subscriber's queue."""
+        sub = Subscription(task_id=task_id, submission_id=submission_id)
+        self._subscribers.add(sub)
+        try:
+            await asyncio.shield(self._ensure_running())
+        except BaseException:
+            self.unsubscribe(sub)
+            raise
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        self._subscribers.discard(sub)
+        if not self._subscribers and self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def _ensure_running(self) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._loop is not loop or self._task.done():
+            self._loop = loop
+            self._wake = asyncio.Event()
+            self._ready = loop.create_future()
+            self._gaps.clear()
+            self._task = loop.create_task(self._run(self._ready))
+        return self._ready
+
+    def notify(self) -> None:
+        """Wake the tail now. Safe to call from any thread."""
+        loop, wake = self._loop, self._wake
+        if self._task is None or loop is None or wake is None or loop.is_closed():
+            return
+        try:
+            loop.call_soon_threadsafe(wake.set)
+        except RuntimeError:
+            pass   # loop shut down in between
+
+    def publish(self, ev: StreamEvent) -> None:
+        for sub in list(self._subscribers):
+            if not sub.matches(ev):
+                continue
+            try:
+                sub.queue.put_nowait(ev)
+            except asyncio.QueueFull:
+                # Slow consumer: end its stream; it resumes from the table via Last-Event-ID
+                sub.overflowed = True
+                self._subscribers.discard(sub)
+
+    async def _run(self, ready: asyncio.Future) -> None:
+        try:
+            self._last_id = await run_in_threadpool(self._max_id)
+        except Exception as e:
+            ready.set_exception(e)
+            return
+        ready.set_result(None)
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            try:
+                events = await run_in_threadpool(self._fetch, self._last_id, None, None,
+                                                 tuple(self._gaps))
+            except Exception as e:
+                print(f"[events] tail query failed: {e}", flush=True)
+                continue
+            self._advance(events)
+            for ev in events:
+                self.publish(ev)
+
+    def _advance(self, events: list[StreamEvent]) -> None:
+        now = asyncio.get_running_loop().time()
+        for ev in events:
+            self._gaps.pop(ev.id, None)
+            if ev.id > self._last_id:
+                # Ids can commit out of order when several nodes write; keep
+                # asking for the skipped ones for a while
+                if ev.id - self._last_id - 1 <= MAX_TRACKED_GAPS:
+                    for missing in range(self._last_id + 1, ev.id):
+                        self._gaps[missing] = now
+                self._last_id = ev.id
+        self._gaps = {i: t for i, t in self._gaps.items() if now - t < GAP_WAIT_SECONDS}
+
+    def stop(self) -> None:
+        self._subscribers.clear()
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+
+def format_sse(ev: StreamEvent) -> str:
+    return f"id: {ev.id}\nevent: {ev.event_type}\ndata: {ev.data}\n\n"
+
+
+async def event_stream(broker: EventBroker, task_id: Optional[str] = None,
+                       last_event_id: Optional[int] = None) -> AsyncIterator[str]:
+    """SSE body: replay after `last_event_id`, then live events until the stream lifetime ends."""
+    sub = await broker.subscribe(task_id=task_id)
+    try:
+        yield f"retry: {RETRY_MS}\n\n"
+        replayed: set[int] = set()
+        if last_event_id is not None:
+            for ev in await broker.replay(last_event_id, task_id):
+                replayed.add(ev.id)
+                yield format_sse(ev)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + EVENTS_STREAM_MAX_SECONDS
+        while True:
+            remaining = deadline - loop.time()
+            if remaining <= 0 or (sub.overflowed and sub.queue.empty()):
+                return
+            try:
+                ev = await asyncio.wait_for(sub.queue.get(),
+                                            min(EVENTS_KEEPALIVE_SECONDS, remaining))
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            if ev.id not in replayed:
+                yield format_sse(ev)
+    finally:
+        broker.unsubscribe(sub)
+
+
+async def wait_for_status_change(sub: Subscription, status: str, timeout: float) -> bool:
+    """Wait until an event on `sub` reports a status other than `status`. False on timeout."""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while (remaining := deadline - loop.time()) > 0:
+        try:
+            ev = await asyncio.wait_for(sub.queue.get(), remaining)
+        except asyncio.TimeoutError:
+            return False
+        if ev.payload().get("status") != status:
+            return True
+    return False
+
+
+_broker: Optional[EventBroker] = None
+
+
+def get_event_broker() -> EventBroker:
+    global _broker
+    if _broker is None:
+        _broker = EventBroker()
+    return _broker
+
+
+def stop_event_broker() -> None:
+    global _broker
+    if _broker is not None:
+        _broker.stop()
+        _broker = None
+
+
+def notify_events() -> None:
+    """Wake every running broker in this process (called after a commit that recorded events)."""
+    for broker in list(_brokers):
+        broker.notify()
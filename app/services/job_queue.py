@@ -0,0 +1,277 @@
+"""Durable, prioritized oracle job queue.
+
+Oracle work is written to the `oracle_jobs` table in the same transaction as
+the submission / task row that needs it, so a crash or redeploy between the
+HTTP response and the LLM call no longer leaves submissions stuck in
+`pending` or tasks without dimensions.
+
+A dispatcher thread claims jobs with a conditional UPDATE that sets a lease
+(`locked_until`). A job whose lease expires — the process died mid-run — is
+claimed again, so delivery is at-least-once; the handlers in services/oracle
+skip work that is already done. Failed jobs are retried with exponential
+backoff and parked as `dead` after `max_attempts`.
+
+Env vars:
+    ORACLE_JOB_CONCURRENCY: jobs running at once (default 4)
+    ORACLE_JOB_VISIBILITY_TIMEOUT: lease seconds before a running job is redelivered (default 600)
+    ORACLE_JOB_MAX_ATTEMPTS: deliveries before a job is marked dead (default 3)
+    ORACLE_JOB_POLL_INTERVAL: idle poll seconds; enqueues wake the dispatcher immediately (default 2)
+"""
+import os
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import and_, or_, update
+from sqlalchemy.orm import Session
+from ..database import SessionLocal
+from ..models import OracleJob, OracleJobKind, OracleJobStatus, Task, TaskType
+
+JOB_CONCURRENCY = int(os.environ.get("ORACLE_JOB_CONCURRENCY", "4"))
+JOB_VISIBILITY_TIMEOUT = int(os.environ.get("ORACLE_JOB_VISIBILITY_TIMEOUT", "600"))
+JOB_MAX_ATTEMPTS = int(os.environ.get("ORACLE_JOB_MAX_ATTEMPTS", "3"))
+JOB_POLL_INTERVAL = float(os.environ.get("ORACLE_JOB_POLL_INTERVAL", "2"))
+RETRY_BACKOFF_BASE = 10  # seconds; attempt n waits BASE * 2**(n-1)
+
+# Lower runs first. fastest_first gate checks decide who wins the bounty, so
+# they jump ahead of quality_first feedback that only matters at the deadline.
+PRIORITY_FASTEST_FIRST = 0
+PRIORITY_DIMENSION_GEN = 10
+PRIORITY_QUALITY_FEEDBACK = 20
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def enqueue_job(db: Session, kind: OracleJobKind, task_id: str,
+                submission_id: str | None = None, priority: int = 0) -> OracleJob:
+    """Add a job to the session. The caller commits it together with its own rows."""
+    job = OracleJob(
+        kind=kind, task_id=task_id, submission_id=submission_id,
+        priority=priority, max_attempts=JOB_MAX_ATTEMPTS, available_at=_now(),
+    )
+    db.add(job)
+    return job
+
+
+def enqueue_submission_job(db: Session, task: Task, submission_id: str) -> OracleJob:
+    priority = (PRIORITY_QUALITY_FEEDBACK if task.type == TaskType.quality_first
+                else PRIORITY_FASTEST_FIRST)
+    return enqueue_job(db, OracleJobKind.submission, task.id, submission_id, priority)
+
+
+def enqueue_dimension_job(db: Session, task: Task) -> OracleJob:
+    return enqueue_job(db, OracleJobKind.dimension_gen, task.id, priority=PRIORITY_DIMENSION_GEN)
+
+
+def _claimable(now: datetime):
+    return or_(
+        and_(OracleJob.status == OracleJobStatus.queued, OracleJob.available_at <= now),
+        and_(OracleJob.status == OracleJobStatus.running, OracleJob.locked_until < now),
+    )
+
+
+def claim_jobs(db: Session, limit: int, now: datetime | None = None) -> list[OracleJob]:
+    """Lease up to `limit` runnable jobs, highest priority first.
+
+    Each row is taken with a conditional UPDATE that re-checks claimability,
+    so two dispatchers racing for the same row cannot both win it.
+    """
+    if limit <= 0:
+        return []
+    now = now or _now()
+    candidates = (
+        db.query(OracleJob.id)
+        .filter(_claimable(now))
+        .order_by(OracleJob.priority, OracleJob.available_at)
+        .limit(limit)
+        .all()
+    )
+    claimed_ids = []
+    for (job_id,) in candidates:
+        result = db.execute(
+            update(OracleJob)
+            .where(OracleJob.id == job_id, _claimable(now))
+            .values(
+                status=OracleJobStatus.running,
+                locked_until=now + timedelta(seconds=JOB_VISIBILITY_TIMEOUT),
+                attempts=OracleJob.attempts + 1,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount == 1:
+            claimed_ids.append(job_id)
+    db.commit()
+    if not claimed_ids:
+        return []
+
+    jobs = db.query(OracleJob).filter(OracleJob.id.in_(claimed_ids)).all()
+    runnable = []
+    for job in jobs:
+        if job.attempts > job.max_attempts:
+            # Lease expired on the last allowed delivery (worker crashed or hung)
+            job.status = OracleJobStatus.dead
+            job.locked_until = None
+            job.finished_at = now
+            job.last_error = job.last_error or "visibility timeout expired"
+            print(f"[jobs] {job.kind.value} job {job.id} dead after {job.max_attempts} attempts", flush=True)
+        else:
+            runnable.append(job)
+    db.commit()
+    runnable.sort(key=lambda j: (j.priority, j.available_at))
+    return runnable
+
+
+def complete_job(db: Session, job_id: str) -> None:
+    job = db.query(OracleJob).filter(OracleJob.id == job_id).first()
+    if job:
+        job.status = OracleJobStatus.done
+        job.locked_until = None
+        job.finished_at = _now()
+        db.commit()
+
+
+def fail_job(db: Session, job_id: str, error: str) -> None:
+    """Schedule a retry with exponential backoff, or park the job as dead."""
+    job = db.query(OracleJob).filter(OracleJob.id == job_id).first()
+    if not job:
+        return
+    now = _now()
+    job.last_error = error[-4000:]
+    job.locked_until = None
+    if job.attempts >= job.max_attempts:
+        job.status = OracleJobStatus.dead
+        job.finished_at = now
+        print(f"[jobs] {job.kind.value} job {job.id} dead after {job.attempts} attempts: {error}", flush=True)
+    else:
+        job.status = OracleJobStatus.queued
+        job.available_at = now + timedelta(seconds=RETRY_BACKOFF_BASE * 2 ** (job.attempts - 1))
+        print(f"[jobs] {job.kind.value} job {job.id} attempt {job.attempts} failed, retrying: {error}", flush=True)
+    db.commit()
+
+
+def _run_handler(db: Session, kind: OracleJobKind, task_id: str, submission_id: str | None) -> None:
+    from .oracle import run_oracle_job, run_dimension_job
+    if kind == OracleJobKind.submission:
+        run_oracle_job(db, submission_id, task_id)
+    elif kind == OracleJobKind.dimension_gen:
+        run_dimension_job(db, task_id)
+    else:
+        raise ValueError(f"unknown job kind: {kind}")
+
+
+class JobDispatcher:
+    """Claims queued jobs and runs them on a bounded thread pool."""
+
+    def __init__(self, session_factory=None, concurrency: int = JOB_CONCURRENCY,
+                 poll_interval: float = JOB_POLL_INTERVAL):
+        self.session_factory = session_factory or SessionLocal
+        self.concurrency = max(1, concurrency)
+        self.poll_interval = poll_interval
+        self._executor = ThreadPoolExecutor(max_workers=self.concurrency,
+                                            thread_name_prefix="oracle-job")
+        self._lock = threading.Lock()
+        self._inflight = 0
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._loop, name="oracle-job-dispatcher", daemon=True)
+        self._thread.start()
+
+    def stop(self, wait: bool = True) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+        self._executor.shutdown(wait=wait)
+
+    def wake(self) -> None:
+        self._wake.set()
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.dispatch_once()
+            except Exception as e:
+                print(f"[jobs] dispatch error: {e}", flush=True)
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+
+    def dispatch_once(self) -> int:
+        """Claim as many jobs as there are free slots and submit them. Returns the count."""
+        with self._lock:
+            free = self.concurrency - self._inflight
+        if free <= 0:
+            return 0
+        db = self.session_factory()
+        try:
+            jobs = claim_jobs(db, free)
+            claimed = [(j.id, j.kind, j.task_id, j.submission_id) for j in jobs]
+        finally:
+            db.close()
+        with self._lock:
+            self._inflight += len(claimed)
+        for args in claimed:
+            self._executor.submit(self._run, *args)
+        return len(claimed)
+
+    def _run(self, job_id: str, kind: OracleJobKind, task_id: str, submission_id: str | None) -> None:
+        db = self.session_factory()
+        try:
+            try:
+                _run_handler(db, kind, task_id, submission_id)
+            except Exception as e:
+                db.rollback()
+                traceback.print_exc()
+                fail_job(db, job_id, f"{type(e).__name__}: {e}")
+            else:
+                complete_job(db, job_id)
+        except Exception as e:
+            # Bookkeeping failed; the lease will expire and the job is redelivered
+            print(f"[jobs] could not record result of job {job_id}: {e}", flush=True)
+        finally:
+            db.close()
+            with self._lock:
+                self._inflight -= 1
+            self._wake.set()
+
+    def idle(self) -> bool:
+        with self._lock:
+            return self._inflight == 0
+
+    def drain(self, timeout: float = 30.0) -> None:
+        """Run until no job is claimable and nothing is in flight (tests, scripts)."""
+        deadline = _now() + timedelta(seconds=timeout)
+        while _now() < deadline:
+            if self.dispatch_once() == 0 and self.idle():
+                return
+            self._wake.wait(0.05)
+            self._wake.clear()
+        raise TimeoutError("job queue did not drain")
+
+
+_dispatcher: JobDispatcher | None = None
+
+
+def start_job_dispatcher() -> JobDispatcher:
+    global _dispatcher
+    if _dispatcher is None:
+        _dispatcher = JobDispatcher()
+        _dispatcher.start()
+    return _dispatcher
+
+
+def stop_job_dispatcher() -> None:
+    global _dispatcher
+    if _dispatcher is not None:
+        _dispatcher.stop()
+        _dispatcher = None
+
+
+def wake_job_dispatcher() -> None:
+    """Nudge the dispatcher after committing new jobs; no-op when it is not running."""
+    if _dispatcher is not None:
+        _dispatcher.wake()
@@ -4,13 +4,24 @@ import subprocess
 import sys
 import threading
 import time
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timezone
 from pathlib import Path
+
+import numpy as np
 from sqlalchemy.orm import Session
 from ..database import SessionLocal
-from ..models import Submission, Task, SubmissionStatus, TaskStatus, TaskType, ScoringDimension
+from ..models import (
+    Submission, Task, SubmissionStatus, TaskStatus, TaskType, ScoringDimension, DimensionScoreStage,
+    OracleFlow,
+)
 from .payout import pay_winner
+from .dimension_cache import get_dimension_bundle, put_dimension_bundle
+from .dimension_scores import load_dimension_scores, record_dimension_scores
+from .score_matrix import (
+    build_score_matrix, passes_threshold, penalized_totals, top_k_per_worker, weighted_totals,
+)
+from ..lifecycle import notify_lifecycle
 
 def _parse_criteria(raw: str | None) -> list[str]:
     """将数据库中存储的 JSON 字符串反序列化为条目列表。"""
@@ -25,6 +36,26 @@ def _parse_criteria(raw: str | None) -> list[str]:
 
 ORACLE_SCRIPT = Path(__file__).parent.parent.parent / "oracle" / "oracle.py"
 
+# "subprocess": spawn oracle.py per call; "pool": reuse pre-warmed workers (see oracle_pool.py)
+ORACLE_EXEC_MODE = os.environ.get("ORACLE_EXEC_MODE", "subprocess")
+ORACLE_TIMEOUT = 120
+
+# "staged": gate_check, then score_individual; "fused": one gate_and_score call.
+# A task's oracle_flow overrides this default.
+ORACLE_FLOW = os.environ.get("ORACLE_FLOW", "staged")
+
+# quality_first give_feedback (staged flow): start score_individual alongside gate_check and
+# drop it when the gate fails. Costs the score call's tokens for every rejected submission.
+ORACLE_SPECULATIVE_SCORING = os.environ.get("ORACLE_SPECULATIVE_SCORING", "0") == "1"
+ORACLE_SPECULATION_WORKERS = int(os.environ.get("ORACLE_SPECULATION_WORKERS", "4"))
+_speculation_executor = ThreadPoolExecutor(max_workers=ORACLE_SPECULATION_WORKERS,
+                                           thread_name_prefix="oracle-speculation")
+
+# Shared by every batch_score dimension_score fan-out, so no pool or event loop is built per call
+ORACLE_FANOUT_WORKERS = int(os.environ.get("ORACLE_FANOUT_WORKERS", "8"))
+_fanout_executor = ThreadPoolExecutor(max_workers=ORACLE_FANOUT_WORKERS,
+                                      thread_name_prefix="oracle-fanout")
+
 # In-memory oracle call logs
 _oracle_logs: list[dict] = []
 MAX_LOGS = 200
@@ -37,6 +68,52 @@ def get_oracle_logs(limit: int = 50) -> list[dict]:
         return list(reversed(_oracle_logs))[:limit]
 
 
+# Speculative scoring counters (process lifetime) and time-to-feedback per give_feedback path
+_speculation_stats = {"runs": 0, "hits": 0, "misses": 0, "cancelled": 0,
+                      "speculative_tokens": 0, "wasted_tokens": 0}
+_feedback_latency = {"staged": [0, 0], "speculative": [0, 0]}   # [count, total_ms]
+_speculation_lock = threading.Lock()
+
+
+def get_speculation_stats() -> dict:
+    """Hit ratio, wasted-token rate and mean time-to-feedback for speculative scoring."""
+    with _speculation_lock:
+        stats = dict(_speculation_stats)
+        latency = {k: v[:] for k, v in _feedback_latency.items()}
+    settled = stats["hits"] + stats["misses"]
+    stats["hit_ratio"] = round(stats["hits"] / settled, 4) if settled else None
+    stats["wasted_token_rate"] = (
+        round(stats["wasted_tokens"] / stats["speculative_tokens"], 4) if stats["speculative_tokens"] else None
+    )
+    stats["avg_time_to_feedback_ms"] = {
+        path: (total // count if count else None) for path, (count, total) in latency.items()
+    }
+    return stats
+
+
+def _settle_speculation(spec: dict) -> None:
+    """Count a finished speculation once its outcome and token cost are both known."""
+    tokens = spec.get("total_tokens", 0)
+    with _speculation_lock:
+        _speculation_stats["runs"] += 1
+        _speculation_stats["hits" if spec["outcome"] == "hit" else "misses"] += 1
+        if spec["outcome"] == "cancelled":
+            _speculation_stats["cancelled"] += 1
+        _speculation_stats["speculative_tokens"] += tokens
+        if spec["outcome"] != "hit":
+            _speculation_stats["wasted_tokens"] += tokens
+
+
+def _record_time_to_feedback(speculative: bool, started: float, spec: dict | None) -> None:
+    ms = int((time.monotonic() - started) * 1000)
+    if spec is not None:
+        spec["time_to_feedback_ms"] = ms
+    with _speculation_lock:
+        bucket = _feedback_latency["speculative" if speculative else "staged"]
+        bucket[0] += 1
+        bucket[1] += ms
+
+
 PENALTY_THRESHOLD = 60
 
 FIXED_DIM_NAMES = {
@@ -103,21 +180,27 @@ def _sanitize_surrogates(obj):
 
 
 def _call_oracle(payload: dict, meta: dict | None = None) -> dict:
-    """Call oracle subprocess. meta provides context for logging:
-    task_id, task_title, submission_id, worker_id."""
+    """Call the oracle (one-shot subprocess or worker pool, per ORACLE_EXEC_MODE).
+    meta provides context for logging: task_id, task_title, submission_id, worker_id."""
     start = time.monotonic()
-    result = subprocess.run(
-        [sys.executable, str(ORACLE_SCRIPT)],
-        input=json.dumps(_sanitize_surrogates(payload), ensure_ascii=False),
-        capture_output=True, text=True, encoding="utf-8", timeout=120,
-    )
+    payload_json = json.dumps(_sanitize_surrogates(payload), ensure_ascii=False)
+    if ORACLE_EXEC_MODE == "pool":
+        from .oracle_pool import get_oracle_pool
+        output = get_oracle_pool().call(payload_json, timeout=ORACLE_TIMEOUT)
+    else:
+        result = subprocess.run(
+            [sys.executable, str(ORACLE_SCRIPT)],
+            input=payload_json,
+            capture_output=True, text=True, encoding="utf-8", timeout=ORACLE_TIMEOUT,
+        )
+        if result.returncode != 0:
+            print(f"[oracle] subprocess error: {result.stderr}", flush=True)
+        output = json.loads(result.stdout)
     duration_ms = int((time.monotonic() - start) * 1000)
-    if result.returncode != 0:
-        print(f"[oracle] subprocess error: {result.stderr}", flush=True)
-    output = json.loads(result.stdout)
 
     # Extract and log token usage
     token_usage = output.pop("_token_usage", None)
+    cache_stats = output.pop("_cache", None) or {}
     if token_usage:
         m = meta or {}
         log_entry = {
@@ -131,9 +214,16 @@ def _call_oracle(payload: dict, meta: dict | None = None) -> dict:
             "prompt_tokens": token_usage.get("prompt_tokens", 0),
             "completion_tokens": token_usage.get("completion_tokens", 0),
             "total_tokens": token_usage.get("total_tokens", 0),
+            "cache_hits": cache_stats.get("hits", 0),
+            "cache_misses": cache_stats.get("misses", 0),
             "duration_ms": duration_ms,
             "output": output,
         }
+        spec = m.get("speculation")
+        if spec is not None:
+            # Shared with give_feedback, which fills in the outcome once the gate returns
+            spec["total_tokens"] = log_entry["total_tokens"]
+            log_entry["speculation"] = spec
         with _oracle_logs_lock:
             _oracle_logs.append(log_entry)
             if len(_oracle_logs) > MAX_LOGS:
@@ -142,6 +232,13 @@ def _call_oracle(payload: dict, meta: dict | None = None) -> dict:
     return output
 
 
+def _call_oracle_many(payloads: list[dict], meta: dict | None = None) -> list[dict]:
+    """Fan out several oracle calls concurrently; results keep payload order."""
+    # Submit every call up front so they all start together.
+    futures = [_fanout_executor.submit(_call_oracle, p, meta) for p in payloads]
+    return [f.result() for f in futures]
+
+
 def _build_payload(task: Task, submission: Submission, mode: str) -> dict:
     return {
         "mode": mode,
@@ -156,6 +253,80 @@ def _build_payload(task: Task, submission: Submission, mode: str) -> dict:
     }
 
 
+def _score_payload(task: Task, submission: Submission, bundle) -> dict:
+    return {
+        "mode": "score_individual",
+        "task_title": task.title,
+        "task_description": task.description,
+        "dimensions": list(bundle.payload) if bundle else [],
+        "submission_payload": submission.content,
+    }
+
+
+def _gate_check(
+    task: Task, submission: Submission, bundle, meta: dict, speculate: bool = False,
+) -> tuple[dict, dict | None, dict | None]:
+    """Acceptance check for a submission, per the task's oracle flow.
+
+    Returns (gate_result, score_result, speculation). gate_result has the
+    gate_check shape (or carries injection_detected / error). score_result is
+    the score_individual result when the fused call or a speculative call
+    produced one, else None and the caller scores separately. With
+    `speculate` on the staged flow, score_individual starts alongside
+    gate_check; speculation is its log annotation, None when not speculating.
+    """
+    flow = task.oracle_flow or ORACLE_FLOW
+    if flow == OracleFlow.fused and bundle is not None:
+        output = _call_oracle({
+            "mode": "gate_and_score",
+            "task_title": task.title,
+            "task_description": task.description,
+            "acceptance_criteria": _parse_criteria(task.acceptance_criteria),
+            "dimensions": list(bundle.payload),
+            "submission_payload": submission.content,
+        }, meta=meta)
+        if "gate" not in output:
+            # Injection guard hit or oracle error: handled like the staged gate_check reply
+            return output, None, None
+        return output["gate"], output.get("score"), None
+
+    gate_payload = {
+        "mode": "gate_check",
+        "task_description": task.description,
+        "acceptance_criteria": _parse_criteria(task.acceptance_criteria),
+        "submission_payload": submission.content,
+    }
+    if not speculate:
+        return _call_oracle(gate_payload, meta=meta), None, None
+
+    spec = {"outcome": None}
+    future: Future = _speculation_executor.submit(
+        _call_oracle, _score_payload(task, submission, bundle), {**meta, "speculation": spec})
+    gate_result = _call_oracle(gate_payload, meta=meta)
+
+    if not gate_result.get("injection_detected") and gate_result.get("overall_passed", False):
+        try:
+            score_result = future.result()
+        except Exception as e:
+            # Fall back to a regular score call; the speculative attempt bought nothing
+            print(f"[oracle] speculative score_individual failed: {e}", flush=True)
+            spec["outcome"] = "failed"
+            _settle_speculation(spec)
+            return gate_result, None, spec
+        spec["outcome"] = "hit"
+        _settle_speculation(spec)
+        return gate_result, score_result, spec
+
+    if future.cancel():
+        spec["outcome"] = "cancelled"
+        _settle_speculation(spec)
+    else:
+        # Already running: the reply is discarded, its tokens are counted as wasted when it lands
+        spec["outcome"] = "wasted"
+        future.add_done_callback(lambda _f: _settle_speculation(spec))
+    return gate_result, None, spec
+
+
 def generate_dimensions(db: Session, task: Task) -> list:
     """Generate and lock scoring dimensions for a task via LLM."""
     payload = {
@@ -168,6 +339,7 @@ def generate_dimensions(db: Session, task: Task) -> list:
     output = _call_oracle(payload, meta=meta)
     dimensions = output.get("dimensions", [])
 
+    rows = []
     for dim_data in dimensions:
         dim = ScoringDimension(
             task_id=task.id,
@@ -179,7 +351,10 @@ def generate_dimensions(db: Session, task: Task) -> list:
             scoring_guidance=dim_data["scoring_guidance"],
         )
         db.add(dim)
+        rows.append(dim)
     db.commit()
+    if rows:
+        put_dimension_bundle(task.id, rows)
     return dimensions
 
 
@@ -190,16 +365,13 @@ def give_feedback(db: Session, submission_id: str, task_id: str) -> None:
     if not submission or not task:
         return
 
-    # Step 1: Gate Check
+    # Step 1: Gate Check (fused flow / speculation: individual scores may come back with it)
+    started = time.monotonic()
     sub_meta = {"task_id": task.id, "task_title": task.title,
                 "submission_id": submission.id, "worker_id": submission.worker_id}
-    gate_payload = {
-        "mode": "gate_check",
-        "task_description": task.description,
-        "acceptance_criteria": _parse_criteria(task.acceptance_criteria),
-        "submission_payload": submission.content,
-    }
-    gate_result = _call_oracle(gate_payload, meta=sub_meta)
+    bundle = get_dimension_bundle(db, task_id)
+    gate_result, early_score, spec = _gate_check(
+        task, submission, bundle, sub_meta, speculate=ORACLE_SPECULATIVE_SCORING)
 
     # Injection guard result
     if gate_result.get("injection_detected"):
@@ -232,29 +404,18 @@ def give_feedback(db: Session, submission_id: str, task_id: str) -> None:
     db.commit()
 
     # Step 2: Individual scoring (score hidden, revision suggestions returned)
-    dimensions = db.query(ScoringDimension).filter(
-        ScoringDimension.task_id == task_id
-    ).all()
-    dims_data = [
-        {"id": d.dim_id, "name": d.name, "description": d.description,
-         "weight": d.weight, "scoring_guidance": d.scoring_guidance}
-        for d in dimensions
-    ]
-
-    score_payload = {
-        "mode": "score_individual",
-        "task_title": task.title,
-        "task_description": task.description,
-        "dimensions": dims_data,
-        "submission_payload": submission.content,
-    }
-    score_result = _call_oracle(score_payload, meta=sub_meta)
+    score_result = early_score
+    if score_result is None:
+        score_result = _call_oracle(_score_payload(task, submission, bundle), meta=sub_meta)
 
     submission.oracle_feedback = json.dumps({
         "type": "individual_scoring",
         **score_result,
     })
+    record_dimension_scores(db, submission, DimensionScoreStage.individual,
+                            score_result.get("dimension_scores") or {})
     db.commit()
+    _record_time_to_feedback(spec is not None, started, spec)
 
 
 def score_submission(db: Session, submission_id: str, task_id: str) -> None:
@@ -267,14 +428,9 @@ def score_submission(db: Session, submission_id: str, task_id: str) -> None:
     sub_meta = {"task_id": task.id, "task_title": task.title,
                 "submission_id": submission.id, "worker_id": submission.worker_id}
 
-    # Step 1: Gate Check
-    gate_payload = {
-        "mode": "gate_check",
-        "task_description": task.description,
-        "acceptance_criteria": _parse_criteria(task.acceptance_criteria),
-        "submission_payload": submission.content,
-    }
-    gate_result = _call_oracle(gate_payload, meta=sub_meta)
+    # Step 1: Gate Check (fused flow: individual scores come back in the same call)
+    bundle = get_dimension_bundle(db, task_id)
+    gate_result, fused_score, _ = _gate_check(task, submission, bundle, sub_meta)
 
     # Injection guard result
     if gate_result.get("injection_detected"):
@@ -299,11 +455,7 @@ def score_submission(db: Session, submission_id: str, task_id: str) -> None:
         return
 
     # Step 2: Score Individual (band-first + evidence)
-    dimensions = db.query(ScoringDimension).filter(
-        ScoringDimension.task_id == task_id
-    ).all()
-
-    if not dimensions:
+    if bundle is None:
         # V1 fallback — no dimensions available
         output = _call_oracle(_build_payload(task, submission, "score"), meta=sub_meta)
         submission.score = output.get("score", 0.0)
@@ -318,27 +470,13 @@ def score_submission(db: Session, submission_id: str, task_id: str) -> None:
             _apply_fastest_first(db, task, submission)
         return
 
-    dims_data = [
-        {"id": d.dim_id, "name": d.name, "description": d.description,
-         "weight": d.weight, "scoring_guidance": d.scoring_guidance}
-        for d in dimensions
-    ]
-    score_payload = {
-        "mode": "score_individual",
-        "task_title": task.title,
-        "task_description": task.description,
-        "dimensions": dims_data,
-        "submission_payload": submission.content,
-    }
-    score_result = _call_oracle(score_payload, meta=sub_meta)
+    score_result = fused_score
+    if score_result is None:
+        score_result = _call_oracle(_score_payload(task, submission, bundle), meta=sub_meta)
 
     # Step 3: Compute penalized_total
     dim_scores = score_result.get("dimension_scores", {})
-    dims_for_penalty = [
-        {"dim_id": d.dim_id, "dim_type": d.dim_type, "weight": d.weight}
-        for d in dimensions
-    ]
-    penalty_result = compute_penalized_total(dim_scores, dims_for_penalty)
+    penalty_result = compute_penalized_total(dim_scores, bundle.penalty_dims)
 
     final_score = penalty_result["final_score"]
     passed = final_score >= PENALTY_THRESHOLD
@@ -355,6 +493,7 @@ def score_submission(db: Session, submission_id: str, task_id: str) -> None:
         "risk_flags": penalty_result["risk_flags"],
         "passed": passed,
     })
+    record_dimension_scores(db, submission, DimensionScoreStage.individual, dim_scores)
     submission.score = final_score / 100.0
     submission.status = SubmissionStatus.scored
     db.commit()
@@ -363,61 +502,6 @@ def score_submission(db: Session, submission_id: str, task_id: str) -> None:
         _apply_fastest_first(db, task, submission)
 
 
-def _get_individual_weighted_total(submission: Submission, dimensions: list) -> float:
-    """Calculate weighted total from individual scoring stored in oracle_feedback."""
-    if not submission.oracle_feedback:
-        return 0.0
-    try:
-        feedback = json.loads(submission.oracle_feedback)
-        if feedback.get("type") != "individual_scoring":
-            return 0.0
-        dim_scores = feedback.get("dimension_scores", {})
-        total = 0.0
-        for dim in dimensions:
-            score_entry = dim_scores.get(dim.dim_id, {})
-            total += score_entry.get("score", 0) * dim.weight
-        return total
-    except (json.JSONDecodeError, KeyError):
-        return 0.0
-
-
-BAND_ORDER = {"A": 0, "B": 1, "C": 2, "D": 3, "E": 4}
-
-
-def _get_individual_ir(submission: Submission) -> dict:
-    """Extract individual scoring IR (band + evidence per dimension) from oracle_feedback."""
-    if not submission.oracle_feedback:
-        return {}
-    try:
-        feedback = json.loads(submission.oracle_feedback)
-        if feedback.get("type") != "individual_scoring":
-            return {}
-        dim_scores = feedback.get("dimension_scores", {})
-        return {
-            dim_id: {"band": v.get("band", "?"), "evidence": v.get("evidence", "")}
-            for dim_id, v in dim_scores.items()
-        }
-    except (json.JSONDecodeError, KeyError):
-        return {}
-
-
-def _passes_threshold_filter(submission: Submission, fixed_dim_ids: set) -> bool:
-    """Check if all fixed dimensions have band >= C (i.e., not D or E)."""
-    if not submission.oracle_feedback:
-        return False
-    try:
-        feedback = json.loads(submission.oracle_feedback)
-        dim_scores = feedback.get("dimension_scores", {})
-        for dim_id in fixed_dim_ids:
-            entry = dim_scores.get(dim_id, {})
-            band = entry.get("band", "E")
-            if BAND_ORDER.get(band, 4) > BAND_ORDER["C"]:  # D or E
-                return False
-        return True
-    except (json.JSONDecodeError, KeyError):
-        return False
-
-
 def batch_score_submissions(db: Session, task_id: str) -> None:
     """Score all gate_passed submissions after deadline: threshold filter + horizontal comparison."""
     task = db.query(Task).filter(Task.id == task_id).first()
@@ -439,14 +523,12 @@ def batch_score_submissions(db: Session, task_id: str) -> None:
     if not passed:
         return
 
-    dimensions = db.query(ScoringDimension).filter(
-        ScoringDimension.task_id == task_id
-    ).all()
+    bundle = get_dimension_bundle(db, task_id)
 
     task_meta = {"task_id": task.id, "task_title": task.title}
 
     # V1 fallback: no dimensions
-    if not dimensions:
+    if bundle is None:
         for submission in passed:
             m = {**task_meta, "submission_id": submission.id, "worker_id": submission.worker_id}
             output = _call_oracle(_build_payload(task, submission, "score"), meta=m)
@@ -456,57 +538,30 @@ def batch_score_submissions(db: Session, task_id: str) -> None:
         db.commit()
         return
 
-    dims_data = [
-        {"id": d.dim_id, "name": d.name, "description": d.description,
-         "weight": d.weight, "scoring_guidance": d.scoring_guidance}
-        for d in dimensions
-    ]
-    fixed_dim_ids = {d.dim_id for d in dimensions if d.dim_type == "fixed"}
+    dims_data = bundle.payload
+
+    # Read individual scores once (rows, else feedback); filter, penalize, dedup and rank over the matrix
+    stored = load_dimension_scores(db, [s.id for s in passed], DimensionScoreStage.individual)
+    matrix = build_score_matrix(passed, bundle, stored)
+    individual_totals = penalized_totals(matrix.scores, bundle, PENALTY_THRESHOLD)
 
     # Step 1: Threshold filter — any fixed dim band < C → below_threshold
-    eligible = []
-    below_threshold = []
-    for sub in passed:
-        if _passes_threshold_filter(sub, fixed_dim_ids):
-            eligible.append(sub)
-        else:
-            below_threshold.append(sub)
+    eligible_mask = passes_threshold(matrix, bundle)
 
     # Mark below_threshold subs as scored with their penalized individual score
-    for sub in below_threshold:
-        try:
-            feedback = json.loads(sub.oracle_feedback)
-            dim_scores_for_penalty = feedback.get("dimension_scores", {})
-        except (json.JSONDecodeError, KeyError):
-            dim_scores_for_penalty = {}
-        dims_for_penalty = [{"dim_id": d.dim_id, "dim_type": d.dim_type, "weight": d.weight} for d in dimensions]
-        penalty_result = compute_penalized_total(dim_scores_for_penalty, dims_for_penalty)
-        sub.score = penalty_result["final_score"] / 100.0
-        sub.status = SubmissionStatus.scored
+    for i in np.flatnonzero(~eligible_mask):
+        passed[i].score = float(individual_totals[i]) / 100.0
+        passed[i].status = SubmissionStatus.scored
 
-    if not eligible:
+    eligible_rows = np.flatnonzero(eligible_mask)
+    if not eligible_rows.size:
         db.commit()
         return
 
-    # Step 2: Sort by penalized_total from individual scores, take top 3
-    def _get_penalized_total(sub):
-        try:
-            feedback = json.loads(sub.oracle_feedback)
-            dim_scores = feedback.get("dimension_scores", {})
-        except (json.JSONDecodeError, KeyError):
-            dim_scores = {}
-        dims_for_penalty = [{"dim_id": d.dim_id, "dim_type": d.dim_type, "weight": d.weight} for d in dimensions]
-        return compute_penalized_total(dim_scores, dims_for_penalty)["final_score"]
-
-    eligible.sort(key=_get_penalized_total, reverse=True)
-    # Deduplicate by worker_id: keep only the highest-scoring submission per worker
-    seen_workers: set[str] = set()
-    deduped: list = []
-    for sub in eligible:
-        if sub.worker_id not in seen_workers:
-            seen_workers.add(sub.worker_id)
-            deduped.append(sub)
-    top_subs = deduped[:3]
+    # Step 2: Sort by penalized_total from individual scores, one submission per worker, take top 3
+    top_rows = eligible_rows[top_k_per_worker(
+        individual_totals[eligible_rows], [passed[i].worker_id for i in eligible_rows], 3)]
+    top_subs = [passed[i] for i in top_rows]
 
     # Anonymize
     label_map = {}
@@ -518,9 +573,8 @@ def batch_score_submissions(db: Session, task_id: str) -> None:
 
     # Build individual IR for dimension_score reference
     individual_ir_map = {}
-    for anon in anonymized:
-        sub = label_map[anon["label"]]
-        ir = _get_individual_ir(sub)
+    for anon, row in zip(anonymized, top_rows):
+        ir = matrix.individual_ir(row)
         for dim_data in dims_data:
             dim_id = dim_data["id"]
             if dim_id not in individual_ir_map:
@@ -528,10 +582,8 @@ def batch_score_submissions(db: Session, task_id: str) -> None:
             individual_ir_map[dim_id][anon["label"]] = ir.get(dim_id, {"band": "?", "evidence": ""})
 
     # Step 3: Horizontal scoring per dimension (PARALLEL)
-    all_scores = {}
-
-    def _score_dimension(dim_data):
-        dim_payload = {
+    dim_payloads = [
+        {
             "mode": "dimension_score",
             "task_title": task.title,
             "task_description": task.description,
@@ -539,13 +591,10 @@ def batch_score_submissions(db: Session, task_id: str) -> None:
             "individual_ir": individual_ir_map.get(dim_data["id"], {}),
             "submissions": anonymized,
         }
-        return dim_data["id"], _call_oracle(dim_payload, meta=task_meta)
-
-    with ThreadPoolExecutor(max_workers=len(dims_data)) as executor:
-        futures = [executor.submit(_score_dimension, d) for d in dims_data]
-        for future in futures:
-            dim_id, result = future.result()
-            all_scores[dim_id] = result
+        for dim_data in dims_data
+    ]
+    results = _call_oracle_many(dim_payloads, meta=task_meta)
+    all_scores = {d["id"]: r for d, r in zip(dims_data, results)}
 
     # Step 4: Compute ranking with penalized_total
     ranking = []
@@ -568,8 +617,7 @@ def batch_score_submissions(db: Session, task_id: str) -> None:
                 }
                 dim_scores_for_ranking[dim_id] = {"score": entry["final_score"]}
 
-        dims_for_penalty = [{"dim_id": d.dim_id, "dim_type": d.dim_type, "weight": d.weight} for d in dimensions]
-        penalty_result = compute_penalized_total(dim_scores_for_ranking, dims_for_penalty)
+        penalty_result = compute_penalized_total(dim_scores_for_ranking, bundle.penalty_dims)
 
         ranking.append({
             "label": label,
@@ -622,6 +670,7 @@ def batch_score_submissions(db: Session, task_id: str) -> None:
             "risk_flags": entry["risk_flags"],
             "rank": rank_idx + 1,
         })
+        record_dimension_scores(db, sub, DimensionScoreStage.comparative, entry["dimension_breakdown"])
         sub.score = entry["final_score"] / 100.0
         sub.status = SubmissionStatus.scored
 
@@ -631,11 +680,14 @@ def batch_score_submissions(db: Session, task_id: str) -> None:
             print(f"[batch_score] Setting comparative_feedback on winner sub={sub.id[:8]}, len={len(comparative_feedback_json)}", flush=True)
 
     # Mark remaining eligible subs (outside top 3) as scored
-    for sub in eligible:
-        if sub not in [label_map[a["label"]] for a in anonymized]:
+    ranked = set(top_rows.tolist())
+    base_totals = weighted_totals(matrix, bundle)
+    for i in eligible_rows:
+        if i not in ranked:
+            sub = passed[i]
             sub.status = SubmissionStatus.scored
             if not sub.score:
-                sub.score = _get_individual_weighted_total(sub, dimensions) / 100.0
+                sub.score = float(base_totals[i]) / 100.0
 
     db.commit()
 
@@ -660,15 +712,45 @@ def _apply_fastest_first(db: Session, task: Task, submission: Submission) -> Non
                         task_bounty=task.bounty or 0.0, task_id=task.id)
 
 
+def run_oracle_job(db: Session, submission_id: str, task_id: str) -> None:
+    """Run the oracle pipeline for one submission. Raises on failure so the job can be retried.
+
+    Jobs are delivered at least once, so a submission that already got its
+    verdict is skipped instead of being scored (and paid) twice.
+    """
+    submission = db.query(Submission).filter(Submission.id == submission_id).first()
+    task = db.query(Task).filter(Task.id == task_id).first()
+    if not submission or not task:
+        return
+    if task.type == TaskType.quality_first:
+        # gate_passed with only the gate feedback stored means individual scoring never finished
+        unfinished = submission.status == SubmissionStatus.pending or (
+            submission.status == SubmissionStatus.gate_passed
+            and json.loads(submission.oracle_feedback or "{}").get("type") == "gate_check"
+        )
+        if unfinished:
+            give_feedback(db, submission_id, task_id)
+    elif submission.status == SubmissionStatus.pending:
+        score_submission(db, submission_id, task_id)
+    # A scoring task may have been waiting on this submission
+    notify_lifecycle(task_id)
+
+
+def run_dimension_job(db: Session, task_id: str) -> None:
+    """Generate scoring dimensions for a task unless an earlier delivery already did."""
+    task = db.query(Task).filter(Task.id == task_id).first()
+    if not task:
+        return
+    if get_dimension_bundle(db, task_id) is not None:
+        return
+    generate_dimensions(db, task)
+
+
 def invoke_oracle(submission_id: str, task_id: str) -> None:
-    """Entry point for FastAPI BackgroundTasks. Creates its own db session."""
+    """Run the oracle for one submission outside the job queue. Creates its own db session."""
     db = SessionLocal()
     try:
-        task = db.query(Task).filter(Task.id == task_id).first()
-        if task and task.type == TaskType.quality_first:
-            give_feedback(db, submission_id, task_id)
-        else:
-            score_submission(db, submission_id, task_id)
+        run_oracle_job(db, submission_id, task_id)
     except Exception as e:
         print(f"[oracle] Error for submission {submission_id}: {e}", flush=True)
     finally:
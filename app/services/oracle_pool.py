@@ -0,0 +1,159 @@
+"""Persistent oracle worker pool.
+
+Each worker is a long-lived `python oracle/oracle.py --serve` process that has
+already imported llm_client, the V2 modules and the provider SDKs. Requests
+are exchanged as newline-delimited JSON over the worker's stdin/stdout, so the
+payloads are exactly the ones the one-shot subprocess mode sends.
+"""
+import json
+import os
+import queue
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+ORACLE_SCRIPT = Path(__file__).parent.parent.parent / "oracle" / "oracle.py"
+ORACLE_POOL_SIZE = int(os.environ.get("ORACLE_POOL_SIZE", "4"))
+WORKER_START_TIMEOUT = 30
+
+
+class OracleWorkerError(RuntimeError):
+    """Raised when a worker dies or times out while handling a request."""
+
+
+class _Worker:
+    """One pre-warmed oracle process plus a reader thread draining its stdout."""
+
+    def __init__(self, script: Path):
+        self.proc = subprocess.Popen(
+            [sys.executable, str(script), "--serve"],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+            text=True, encoding="utf-8", bufsize=1,
+        )
+        self._lines: queue.Queue = queue.Queue()
+        self._reader = threading.Thread(target=self._read_loop, daemon=True)
+        self._reader.start()
+        ready = self._next_line(WORKER_START_TIMEOUT)
+        if not json.loads(ready).get("ready"):
+            self.kill()
+            raise OracleWorkerError(f"unexpected worker handshake: {ready!r}")
+
+    def _read_loop(self) -> None:
+        for line in self.proc.stdout:
+            self._lines.put(line)
+        self._lines.put(None)  # EOF — process exited
+
+    def _next_line(self, timeout: float) -> str:
+        try:
+            line = self._lines.get(timeout=timeout)
+        except queue.Empty:
+            raise OracleWorkerError(f"worker pid={self.proc.pid} timed out after {timeout}s")
+        if line is None:
+            raise OracleWorkerError(
+                f"worker pid={self.proc.pid} exited (code={self.proc.poll()})"
+            )
+        return line
+
+    def alive(self) -> bool:
+        return self.proc.poll() is None
+
+    def request(self, payload_json: str, timeout: float) -> dict:
+        try:
+            self.proc.stdin.write(payload_json.replace("\n", " ") + "\n")
+            self.proc.stdin.flush()
+        except (BrokenPipeError, OSError) as e:
+            raise OracleWorkerError(f"worker pid={self.proc.pid} pipe closed: {e}")
+        return json.loads(self._next_line(timeout))
+
+    def kill(self) -> None:
+        if self.alive():
+            self.proc.kill()
+        try:
+            self.proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            pass
+
+
+class OracleWorkerPool:
+    """Fixed-size pool of oracle workers. Crashed or hung workers are replaced."""
+
+    def __init__(self, size: int = ORACLE_POOL_SIZE, script: Path = ORACLE_SCRIPT):
+        self.size = max(1, size)
+        self.script = script
+        self._idle: queue.Queue = queue.Queue()   # workers, or None for a slot to respawn
+        self._lock = threading.Lock()
+        self._workers: list[_Worker] = []
+        self._closed = False
+        self.restarts = 0
+        for _ in range(self.size):
+            self._idle.put(self._spawn())
+
+    def _spawn(self) -> _Worker:
+        worker = _Worker(self.script)
+        with self._lock:
+            self._workers.append(worker)
+        return worker
+
+    def _replace(self, worker: _Worker | None) -> _Worker:
+        """Kill `worker` (if any) and start its replacement; counts a restart once it is up."""
+        if worker is not None:
+            worker.kill()
+            with self._lock:
+                if worker in self._workers:
+                    self._workers.remove(worker)
+        replacement = self._spawn()
+        with self._lock:
+            self.restarts += 1
+        return replacement
+
+    def call(self, payload_json: str, timeout: float = 120) -> dict:
+        """Send one serialized payload to an idle worker and return the decoded reply."""
+        if self._closed:
+            raise OracleWorkerError("oracle pool is shut down")
+        worker = self._idle.get()
+        try:
+            if worker is None or not worker.alive():
+                # Slot emptied by a failed respawn, or a worker that died while idle
+                worker = self._replace(worker)
+            try:
+                return worker.request(payload_json, timeout)
+            except OracleWorkerError:
+                worker = self._replace(worker)
+                raise
+        finally:
+            # A dead worker is never handed out again; an empty slot respawns on next use
+            self._idle.put(worker if worker is not None and worker.alive() else None)
+
+    def shutdown(self) -> None:
+        self._closed = True
+        with self._lock:
+            workers = list(self._workers)
+            self._workers.clear()
+        for worker in workers:
+            try:
+                worker.proc.stdin.close()
+            except OSError:
+                pass
+            worker.kill()
+
+
+_pool: OracleWorkerPool | None = None
+_pool_lock = threading.Lock()
+
+
+def get_oracle_pool() -> OracleWorkerPool:
+    """Return the process-wide pool, starting it on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = OracleWorkerPool()
+        return _pool
+
+
+def shutdown_oracle_pool() -> None:
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown()
+            _pool = None
@@ -0,0 +1,68 @@
+"""Keyset (cursor) pagination on (created_at, id).
+
+List endpoints return a plain JSON array and, when more rows exist, an
+`X-Next-Cursor` response header. Clients pass it back as `?cursor=` to get
+the next page. The cursor is an opaque base64url token encoding the last
+row's (created_at, id), so paging stays stable while new rows are inserted
+and never needs an OFFSET or a total count. Endpoints that used to return
+everything keep doing so when called without limit or cursor.
+"""
+import base64
+import json
+from datetime import datetime
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Query
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(created_at: datetime, row_id: str) -> str:
+    raw = json.dumps([created_at.isoformat(), row_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, str]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), str(row_id)
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor(f"invalid cursor: {cursor!r}") from e
+
+
+def paginate(query: Query, model, limit: int | None, cursor: str | None = None,
+             descending: bool = True) -> tuple[list, str | None]:
+    """Return one page of `query` ordered by (created_at, id) plus the cursor for the next page.
+
+    limit=None returns every row when no cursor is given, else a DEFAULT_PAGE_SIZE page.
+    """
+    created_col, id_col = model.created_at, model.id
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        if descending:
+            query = query.filter(or_(created_col < created_at,
+                                     and_(created_col == created_at, id_col < row_id)))
+        else:
+            query = query.filter(or_(created_col > created_at,
+                                     and_(created_col == created_at, id_col > row_id)))
+    if descending:
+        query = query.order_by(created_col.desc(), id_col.desc())
+    else:
+        query = query.order_by(created_col.asc(), id_col.asc())
+    if limit is None:
+        if not cursor:
+            return query.all(), None
+        limit = DEFAULT_PAGE_SIZE
+    # Fetch one extra row to learn whether another page exists
+    rows = query.limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(last.created_at, last.id)
@@ -2,13 +2,15 @@ import os
 from typing import Optional
 from web3 import Web3
 from sqlalchemy.orm import Session
-from ..models import Task, Submission, User, PayoutStatus
+from ..models import Task, Submission, User, PayoutStatus, ChainTxKind
+from . import chain
+from .tx_tracker import track_transaction
 
-PLATFORM_PRIVATE_KEY = os.environ.get("PLATFORM_PRIVATE_KEY", "")
 PLATFORM_WALLET = os.environ.get("PLATFORM_WALLET", "")
-RPC_URL = os.environ.get("BASE_SEPOLIA_RPC_URL", "https://sepolia.base.org")
 USDC_CONTRACT = os.environ.get("USDC_CONTRACT", "0x036CbD53842c5426634e7929541eC2318f3dCF7e")
 PLATFORM_FEE_RATE = float(os.environ.get("PLATFORM_FEE_RATE", "0.20"))
+# "single": one ERC-20 transfer per payout; "batch": queue for BatchPayout.batchTransfer
+PAYOUT_MODE = os.environ.get("PAYOUT_MODE", "single").lower()
 
 # Minimal ERC-20 ABI for transfer
 ERC20_TRANSFER_ABI = [
@@ -26,26 +28,16 @@ ERC20_TRANSFER_ABI = [
 
 
 def _send_usdc_transfer(to_address: str, amount: float) -> str:
-    """Send USDC transfer on-chain. Returns tx hash. Separated for mocking."""
-    w3 = Web3(Web3.HTTPProvider(RPC_URL))
-    contract = w3.eth.contract(
-        address=Web3.to_checksum_address(USDC_CONTRACT), abi=ERC20_TRANSFER_ABI
-    )
+    """Broadcast a USDC transfer. Returns tx hash without waiting for the receipt.
+
+    Separated for mocking. The tx confirmer settles the outcome.
+    """
+    contract = chain.get_contract(USDC_CONTRACT, ERC20_TRANSFER_ABI, key="erc20-transfer")
     # USDC has 6 decimals
     amount_wei = int(amount * 10**6)
-    account = w3.eth.account.from_key(PLATFORM_PRIVATE_KEY)
-    tx = contract.functions.transfer(
-        Web3.to_checksum_address(to_address), amount_wei
-    ).build_transaction({
-        "from": account.address,
-        "nonce": w3.eth.get_transaction_count(account.address),
-        "gas": 100_000,
-        "gasPrice": w3.eth.gas_price,
-    })
-    signed = account.sign_transaction(tx)
-    tx_hash = w3.eth.send_raw_transaction(signed.raw_transaction)
-    w3.eth.wait_for_transaction_receipt(tx_hash, timeout=60)
-    return tx_hash.hex()
+    fn = contract.functions.transfer(Web3.to_checksum_address(to_address), amount_wei)
+    return chain.send_transaction(fn, gas=100_000, description=f"transfer({to_address})",
+                                  wait=False)
 
 
 def refund_publisher(db: Session, task_id: str, rate: float = 1.0) -> None:
@@ -53,7 +45,8 @@ def refund_publisher(db: Session, task_id: str, rate: float = 1.0) -> None:
     task = db.query(Task).filter(Task.id == task_id).first()
     if not task:
         return
-    if task.payout_status in (PayoutStatus.paid, PayoutStatus.refunded):
+    if task.payout_status in (PayoutStatus.queued, PayoutStatus.submitted,
+                              PayoutStatus.paid, PayoutStatus.refunded):
         return
 
     publisher = db.query(User).filter(User.id == task.publisher_id).first()
@@ -61,12 +54,19 @@ def refund_publisher(db: Session, task_id: str, rate: float = 1.0) -> None:
         return
 
     refund_amount = round(task.bounty * rate, 6)
+    if PAYOUT_MODE == "batch":
+        task.payout_status = PayoutStatus.queued
+        task.refund_amount = refund_amount
+        task.payout_batch_id = None   # a retry after a failed batch joins a new one
+        db.commit()
+        return
 
     try:
         tx_hash = _send_usdc_transfer(publisher.wallet, refund_amount)
-        task.payout_status = PayoutStatus.refunded
+        task.payout_status = PayoutStatus.submitted
         task.refund_amount = refund_amount
         task.refund_tx_hash = tx_hash
+        track_transaction(db, tx_hash, ChainTxKind.refund, task_id=task.id)
     except Exception as e:
         task.payout_status = PayoutStatus.failed
         print(f"[payout] Refund failed for task {task_id}: {e}", flush=True)
@@ -79,7 +79,7 @@ def pay_winner(db: Session, task_id: str) -> None:
     task = db.query(Task).filter(Task.id == task_id).first()
     if not task or not task.winner_submission_id or not task.bounty:
         return
-    if task.payout_status == PayoutStatus.paid:
+    if task.payout_status in (PayoutStatus.queued, PayoutStatus.submitted, PayoutStatus.paid):
         return
 
     submission = db.query(Submission).filter(
@@ -98,12 +98,19 @@ def pay_winner(db: Session, task_id: str) -> None:
     except ValueError:
         rate = 1 - PLATFORM_FEE_RATE
     payout_amount = round(task.bounty * rate, 6)
+    if PAYOUT_MODE == "batch":
+        task.payout_status = PayoutStatus.queued
+        task.payout_amount = payout_amount
+        task.payout_batch_id = None   # a retry after a failed batch joins a new one
+        db.commit()
+        return
 
     try:
         tx_hash = _send_usdc_transfer(winner.wallet, payout_amount)
-        task.payout_status = PayoutStatus.paid
+        task.payout_status = PayoutStatus.submitted
         task.payout_tx_hash = tx_hash
         task.payout_amount = payout_amount
+        track_transaction(db, tx_hash, ChainTxKind.payout, task_id=task.id)
     except Exception as e:
         task.payout_status = PayoutStatus.failed
         print(f"[payout] Failed for task {task_id}: {e}", flush=True)
@@ -0,0 +1,313 @@
+"""Batched USDC payouts through the BatchPayout contract (PAYOUT_MODE=batch).
+
+In batch mode pay_winner / refund_publisher don't send a transfer. They
+set payout_status = queued and record the amount. Every PAYOUT_BATCH_INTERVAL
+seconds the batcher claims up to PAYOUT_BATCH_MAX queued tasks into a
+PayoutBatch (each task row records its payout_batch_id). It then sends them all
+in one BatchPayout.batchTransfer:
+
+    queued → submitted (one tx for the whole batch) → paid / refunded | failed
+
+The tx confirmer (services/tx_tracker.py) settles the batch and all its
+tasks together once the receipt is in. The contract pulls each amount from
+the platform wallet, which approves the contract on first use. The batch
+id is the on-chain idempotency key, so a batch that is sent again reverts
+instead of paying twice. A batch still `pending` after
+PAYOUT_BATCH_STALE_SECONDS (the process died before broadcasting) is
+checked against executed(batchId) and then either marked done or sent again.
+
+Env vars:
+    PAYOUT_MODE: "single" (one transfer per payout, default) or "batch"
+    BATCH_PAYOUT_CONTRACT: BatchPayout contract address
+    PAYOUT_BATCH_MAX: transfers per batch (default 100, contract cap 200)
+    PAYOUT_BATCH_INTERVAL: seconds between flushes (default 10)
+    PAYOUT_BATCH_STALE_SECONDS: age after which an unsent batch is retried (default 300)
+"""
+import os
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+from web3 import Web3
+
+from ..database import SessionLocal
+from ..models import (
+    ChainTxKind, PayoutBatch, PayoutBatchStatus, PayoutStatus, Submission, Task, User,
+)
+from . import chain
+from .payout import PAYOUT_MODE, USDC_CONTRACT
+from .tx_tracker import track_transaction
+
+BATCH_PAYOUT_CONTRACT = os.environ.get("BATCH_PAYOUT_CONTRACT", "")
+PAYOUT_BATCH_MAX = int(os.environ.get("PAYOUT_BATCH_MAX", "100"))
+PAYOUT_BATCH_INTERVAL = float(os.environ.get("PAYOUT_BATCH_INTERVAL", "10"))
+PAYOUT_BATCH_STALE_SECONDS = int(os.environ.get("PAYOUT_BATCH_STALE_SECONDS", "300"))
+
+BATCH_PAYOUT_ABI = [
+    {
+        "inputs": [
+            {"name": "batchId", "type": "bytes32"},
+            {"name": "recipients", "type": "address[]"},
+            {"name": "amounts", "type": "uint256[]"},
+        ],
+        "name": "batchTransfer",
+        "outputs": [],
+        "stateMutability": "nonpayable",
+        "type": "function",
+    },
+    {
+        "inputs": [{"name": "", "type": "bytes32"}],
+        "name": "executed",
+        "outputs": [{"name": "", "type": "bool"}],
+        "stateMutability": "view",
+        "type": "function",
+    },
+]
+
+ERC20_ALLOWANCE_ABI = [
+    {
+        "inputs": [
+            {"name": "owner", "type": "address"},
+            {"name": "spender", "type": "address"},
+        ],
+        "name": "allowance",
+        "outputs": [{"name": "", "type": "uint256"}],
+        "stateMutability": "view",
+        "type": "function",
+    },
+    {
+        "inputs": [
+            {"name": "spender", "type": "address"},
+            {"name": "amount", "type": "uint256"},
+        ],
+        "name": "approve",
+        "outputs": [{"name": "", "type": "bool"}],
+        "stateMutability": "nonpayable",
+        "type": "function",
+    },
+]
+
+_MAX_UINT256 = 2**256 - 1
+
+
+def _batch_contract():
+    return chain.get_contract(BATCH_PAYOUT_CONTRACT,
+                              chain.load_abi("BatchPayout", fallback=BATCH_PAYOUT_ABI),
+                              key="BatchPayout")
+
+
+def _batch_key(batch_id: str) -> bytes:
+    return Web3.keccak(text=batch_id)
+
+
+def _ensure_allowance(total_wei: int) -> None:
+    """Approve the BatchPayout contract for the platform wallet when the allowance is short.
+
+    The approve is queued ahead of the batch from the same wallet, so its
+    nonce is lower and it is mined first.
+    """
+    usdc = chain.get_contract(USDC_CONTRACT, ERC20_ALLOWANCE_ABI, key="erc20-allowance")
+    owner = chain.platform_account().address
+    spender = Web3.to_checksum_address(BATCH_PAYOUT_CONTRACT)
+    if usdc.functions.allowance(owner, spender).call() >= total_wei:
+        return
+    chain.send_transaction(usdc.functions.approve(spender, _MAX_UINT256), gas=60_000,
+                           description="approve(BatchPayout)", wait=False)
+
+
+def _send_batch_transfer(batch_id: str, recipients: list[str], amounts: list[float]) -> str:
+    """Broadcast BatchPayout.batchTransfer. Returns tx hash. Separated for mocking."""
+    amounts_wei = [int(a * 10**6) for a in amounts]   # USDC has 6 decimals
+    _ensure_allowance(sum(amounts_wei))
+    fn = _batch_contract().functions.batchTransfer(
+        _batch_key(batch_id),
+        [Web3.to_checksum_address(r) for r in recipients],
+        amounts_wei,
+    )
+    return chain.send_transaction(fn, gas=80_000 + 45_000 * len(recipients),
+                                  description=f"batchTransfer({batch_id}, n={len(recipients)})",
+                                  wait=False)
+
+
+def _batch_executed(batch_id: str) -> bool:
+    """Whether batchTransfer already ran on-chain for this batch. Separated for mocking."""
+    return _batch_contract().functions.executed(_batch_key(batch_id)).call()
+
+
+def _transfers(db: Session, tasks: list[Task]) -> list[tuple[Task, Optional[str], float]]:
+    """(task, recipient wallet, amount) per queued task: refunds to the publisher, payouts to the winner."""
+    publishers = dict(db.query(User.id, User.wallet).filter(
+        User.id.in_({t.publisher_id for t in tasks if t.refund_amount is not None})
+    ).all())
+    winners = dict(db.query(Submission.id, User.wallet)
+                   .join(User, User.id == Submission.worker_id)
+                   .filter(Submission.id.in_({t.winner_submission_id for t in tasks
+                                              if t.refund_amount is None}))
+                   .all())
+    out = []
+    for t in tasks:
+        if t.refund_amount is not None:
+            out.append((t, publishers.get(t.publisher_id), t.refund_amount))
+        else:
+            out.append((t, winners.get(t.winner_submission_id), t.payout_amount))
+    return out
+
+
+def settle_batch(db: Session, batch: PayoutBatch, ok: bool, now: Optional[datetime] = None) -> None:
+    """Final outcome for a batch and every task in it (no commit)."""
+    batch.status = PayoutBatchStatus.confirmed if ok else PayoutBatchStatus.failed
+    batch.finished_at = now or datetime.now(timezone.utc)
+    tasks = db.query(Task).filter(
+        Task.payout_batch_id == batch.id,
+        Task.payout_status.in_([PayoutStatus.queued, PayoutStatus.submitted]),
+    ).all()
+    for t in tasks:
+        if not ok:
+            t.payout_status = PayoutStatus.failed
+        elif t.refund_amount is not None:
+            t.payout_status = PayoutStatus.refunded
+        else:
+            t.payout_status = PayoutStatus.paid
+
+
+def send_batch(db: Session, batch: PayoutBatch) -> Optional[str]:
+    """Broadcast one claimed batch and record it. Returns the tx hash, or None if it failed."""
+    tasks = db.query(Task).filter(Task.payout_batch_id == batch.id,
+                                  Task.payout_status == PayoutStatus.queued).all()
+    transfers = []
+    for task, wallet, amount in _transfers(db, tasks):
+        if wallet and amount:
+            transfers.append((task, wallet, amount))
+        else:
+            task.payout_status = PayoutStatus.failed
+            print(f"[payout-batch] task {task.id} has no recipient wallet or amount", flush=True)
+    if not transfers:
+        batch.status = PayoutBatchStatus.failed
+        batch.last_error = "no payable transfers"
+        db.commit()
+        return None
+
+    batch.transfer_count = len(transfers)
+    batch.total_amount = round(sum(a for _, _, a in transfers), 6)
+    try:
+        tx_hash = _send_batch_transfer(batch.id, [w for _, w, _ in transfers],
+                                       [a for _, _, a in transfers])
+    except Exception as e:
+        batch.last_error = f"{type(e).__name__}: {e}"[-2000:]
+        settle_batch(db, batch, ok=False)
+        db.commit()
+        print(f"[payout-batch] batch {batch.id} failed: {e}", flush=True)
+        return None
+
+    batch.status = PayoutBatchStatus.submitted
+    batch.tx_hash = tx_hash
+    for task, _, _ in transfers:
+        task.payout_status = PayoutStatus.submitted
+        if task.refund_amount is not None:
+            task.refund_tx_hash = tx_hash
+        else:
+            task.payout_tx_hash = tx_hash
+    track_transaction(db, tx_hash, ChainTxKind.payout_batch, ref_id=batch.id)
+    db.commit()
+    print(f"[payout-batch] batch {batch.id}: {len(transfers)} transfers, "
+          f"{batch.total_amount} USDC, tx={tx_hash}", flush=True)
+    return tx_hash
+
+
+def _retry_stale(db: Session, now: datetime) -> None:
+    stale = db.query(PayoutBatch).filter(
+        PayoutBatch.status == PayoutBatchStatus.pending,
+        PayoutBatch.created_at < now - timedelta(seconds=PAYOUT_BATCH_STALE_SECONDS),
+    ).all()
+    for batch in stale:
+        if _batch_executed(batch.id):
+            settle_batch(db, batch, ok=True, now=now)
+            batch.last_error = "executed on-chain before the hash was recorded"
+            db.commit()
+        else:
+            send_batch(db, batch)
+
+
+def flush_payout_batch(db: Session, now: Optional[datetime] = None) -> Optional[PayoutBatch]:
+    """Claim up to PAYOUT_BATCH_MAX queued tasks into a new batch and send it.
+    Returns the batch, or None when nothing was queued."""
+    now = now or datetime.now(timezone.utc)
+    _retry_stale(db, now)
+    ids = [row[0] for row in (
+        db.query(Task.id)
+        .filter(Task.payout_status == PayoutStatus.queued, Task.payout_batch_id.is_(None))
+        .order_by(Task.created_at)
+        .limit(PAYOUT_BATCH_MAX)
+        .all()
+    )]
+    if not ids:
+        return None
+    batch = PayoutBatch()
+    db.add(batch)
+    db.flush()
+    # Claim in the same commit as the batch row; the WHERE keeps racing flushers apart
+    db.execute(
+        update(Task)
+        .where(Task.id.in_(ids), Task.payout_status == PayoutStatus.queued,
+               Task.payout_batch_id.is_(None))
+        .values(payout_batch_id=batch.id)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    send_batch(db, batch)
+    return batch
+
+
+class PayoutBatcher:
+    """Background thread that flushes queued payouts every PAYOUT_BATCH_INTERVAL seconds."""
+
+    def __init__(self, session_factory=None, interval: float = PAYOUT_BATCH_INTERVAL):
+        self.session_factory = session_factory or SessionLocal
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._loop, name="payout-batcher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.interval):
+            db = self.session_factory()
+            try:
+                # Drain the queue a full batch at a time
+                while flush_payout_batch(db) is not None and not self._stop.is_set():
+                    pass
+            except Exception as e:
+                db.rollback()
+                print(f"[payout-batch] flush failed: {e}", flush=True)
+            finally:
+                db.close()
+
+
+_batcher: Optional[PayoutBatcher] = None
+
+
+def start_payout_batcher() -> Optional[PayoutBatcher]:
+    """Start the batcher in PAYOUT_MODE=batch; no-op in single mode."""
+    global _batcher
+    if PAYOUT_MODE != "batch":
+        return None
+    if _batcher is None:
+        _batcher = PayoutBatcher()
+        _batcher.start()
+    return _batcher
+
+
+def stop_payout_batcher() -> None:
+    global _batcher
+    if _batcher is not None:
+        _batcher.stop()
+        _batcher = None
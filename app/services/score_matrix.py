@@ -0,0 +1,137 @@
+"""Vectorized ranking inputs for batch_score_submissions.
+
+Each submission's individual scores are read once into two matrices:
+scores (n_submissions × n_dimensions) and band ranks (A=0 … E=4), from its
+submission_dimension_scores rows when it has them, otherwise by decoding
+its oracle_feedback (feedback set outside the oracle service). The
+threshold filter, the penalized totals, per-worker dedup and top-k then
+run as array operations instead of per-submission JSON decoding and
+compute_penalized_total calls. The arithmetic matches
+compute_penalized_total: weighted sum, multiplied by score / threshold
+for every fixed dimension below the threshold.
+"""
+import json
+from dataclasses import dataclass, field
+from typing import Optional
+
+import numpy as np
+
+from .dimension_cache import DimensionBundle
+
+BAND_ORDER = {"A": 0, "B": 1, "C": 2, "D": 3, "E": 4}
+_WORST_BAND = BAND_ORDER["E"]
+
+
+@dataclass
+class ScoreMatrix:
+    submissions: list
+    readable: np.ndarray      # bool (n,): oracle_feedback present and valid JSON
+    individual: np.ndarray    # bool (n,): feedback type is individual_scoring
+    scores: np.ndarray        # float64 (n, d), missing score = 0
+    bands: np.ndarray         # int8 (n, d), missing / unknown band = E
+    stored: dict = field(default_factory=dict)  # {submission_id: {dim_id: row}} individual rows
+
+    def individual_ir(self, row: int) -> dict:
+        """{dim_id: {"band", "evidence"}} from individual scoring, as passed to dimension_score.
+
+        Only needed for the top few rows, so their feedback is decoded again
+        here rather than keeping every decoded dict alive (thousands of live
+        dicts make each GC pass slower than the decoding itself).
+        """
+        if not self.individual[row]:
+            return {}
+        rows = self.stored.get(self.submissions[row].id) if self.stored else None
+        if rows:
+            return {dim_id: {"band": r.band or "?", "evidence": r.evidence or ""} for dim_id, r in rows.items()}
+        feedback = _decode(self.submissions[row].oracle_feedback) or {}
+        return {
+            dim_id: {"band": v.get("band", "?"), "evidence": v.get("evidence", "")}
+            for dim_id, v in feedback.get("dimension_scores", {}).items()
+        }
+
+
+def _decode(raw) -> Optional[dict]:
+    if not raw:
+        return None
+    try:
+        value = json.loads(raw)
+    except (json.JSONDecodeError, TypeError, ValueError):
+        return None
+    return value if isinstance(value, dict) else None
+
+
+def build_score_matrix(
+    submissions: list, bundle: DimensionBundle, stored: Optional[dict] = None,
+) -> ScoreMatrix:
+    """Read every submission's individual scores exactly once.
+
+    `stored` is load_dimension_scores(..., individual) for the submissions;
+    a submission found there is not decoded at all.
+    """
+    stored = stored or {}
+    dim_ids = bundle.dim_ids
+    missing = {}
+    readable, individual, flat_scores, flat_bands = [], [], [], []
+    for sub in submissions:
+        rows = stored.get(sub.id) if stored else None
+        if rows:
+            readable.append(True)
+            individual.append(True)
+            entries = [rows.get(dim_id) for dim_id in dim_ids]
+            flat_scores.extend([(r.score or 0) if r is not None else 0 for r in entries])
+            flat_bands.extend([BAND_ORDER.get(r.band, _WORST_BAND) if r is not None else _WORST_BAND
+                               for r in entries])
+            continue
+        fb = _decode(sub.oracle_feedback)
+        readable.append(fb is not None)
+        fb = fb or {}
+        individual.append(fb.get("type") == "individual_scoring")
+        dim_scores = fb.get("dimension_scores") or {}
+        entries = [dim_scores.get(dim_id) or missing for dim_id in dim_ids]
+        flat_scores.extend([e.get("score", 0) or 0 for e in entries])
+        flat_bands.extend([BAND_ORDER.get(e.get("band", "E"), _WORST_BAND) for e in entries])
+    shape = (len(submissions), len(dim_ids))
+    return ScoreMatrix(
+        submissions=submissions,
+        readable=np.array(readable, dtype=bool),
+        individual=np.array(individual, dtype=bool),
+        scores=np.array(flat_scores, dtype=np.float64).reshape(shape),
+        bands=np.array(flat_bands, dtype=np.int8).reshape(shape),
+        stored=stored,
+    )
+
+
+def _fixed_mask(bundle: DimensionBundle) -> np.ndarray:
+    return np.array([dim_id in bundle.fixed_dim_ids for dim_id in bundle.dim_ids], dtype=bool)
+
+
+def passes_threshold(matrix: ScoreMatrix, bundle: DimensionBundle) -> np.ndarray:
+    """bool (n,): readable feedback and every fixed dimension is band C or better."""
+    fixed = _fixed_mask(bundle)
+    return matrix.readable & (matrix.bands[:, fixed] <= BAND_ORDER["C"]).all(axis=1)
+
+
+def penalized_totals(scores: np.ndarray, bundle: DimensionBundle, threshold: float) -> np.ndarray:
+    """final_score (n,) of compute_penalized_total for each row of `scores`."""
+    weights = np.asarray(bundle.weights, dtype=np.float64)
+    weighted_base = (scores * weights).sum(axis=1)
+    below = _fixed_mask(bundle) & (scores < threshold)
+    penalty = np.where(below, scores / threshold, 1.0).prod(axis=1)
+    return np.round(weighted_base * penalty, 2)
+
+
+def weighted_totals(matrix: ScoreMatrix, bundle: DimensionBundle) -> np.ndarray:
+    """Unpenalized weighted sum of individual scores (0 when feedback is not individual scoring)."""
+    weights = np.asarray(bundle.weights, dtype=np.float64)
+    return np.where(matrix.individual, (matrix.scores * weights).sum(axis=1), 0.0)
+
+
+def top_k_per_worker(totals: np.ndarray, worker_ids: list[str], k: int) -> np.ndarray:
+    """Row indices of the k best totals, keeping each worker's best row only.
+
+    Ties keep input order, like a stable sort with reverse=True.
+    """
+    order = np.argsort(-totals, kind="stable")
+    _, codes = np.unique(np.asarray(worker_ids, dtype=object).astype(str), return_inverse=True)
+    _, first = np.unique(codes[order], return_index=True)
+    return order[np.sort(first)][:k]
@@ -122,8 +122,8 @@ def _quality_first_settlement(db: Session, task: Task) -> SettlementOut | None:
     if task.status == TaskStatus.voided:
         return _voided_settlement(db, task, sources, escrow_total, challenges)
 
-    # Refunded (no qualifying submissions → publisher gets refund)
-    if task.payout_status == PayoutStatus.refunded and task.refund_amount:
+    # Refunded (no qualifying submissions → publisher gets refund; queued/submitted = not yet confirmed)
+    if task.payout_status in (PayoutStatus.refunded, PayoutStatus.queued, PayoutStatus.submitted) and task.refund_amount:
         publisher = db.query(User).filter_by(id=task.publisher_id).first()
         refund = task.refund_amount
         distributions.append(SettlementDistribution(
@@ -3,22 +3,16 @@ import logging
 from sqlalchemy.orm import Session
 from app.models import User, StakeRecord, StakePurpose, TrustTier
 from app.services.trust import apply_event, TrustEventType
+from app.services import chain
 
 logger = logging.getLogger(__name__)
 
 ARBITER_STAKE_AMOUNT = 100.0  # USDC
 
 
-def stake_onchain(wallet: str, amount: float, deadline: int,
-                  v: int, r: str, s: str) -> str:
-    """Call StakingVault.stake() on-chain. Returns tx hash."""
-    from web3 import Web3
-    rpc = os.environ.get("BASE_SEPOLIA_RPC_URL", "https://sepolia.base.org")
-    w3 = Web3(Web3.HTTPProvider(rpc))
-    contract_addr = os.environ.get("STAKING_CONTRACT_ADDRESS", "")
-    private_key = os.environ.get("PLATFORM_PRIVATE_KEY", "")
-
-    abi = [{
+# StakingVault functions the platform wallet calls
+STAKING_VAULT_ABI = [
+    {
         "inputs": [
             {"name": "user", "type": "address"},
             {"name": "amount", "type": "uint256"},
@@ -31,53 +25,54 @@ def stake_onchain(wallet: str, amount: float, deadline: int,
         "outputs": [],
         "stateMutability": "nonpayable",
         "type": "function",
-    }]
+    },
+    {
+        "inputs": [
+            {"name": "user", "type": "address"},
+            {"name": "amount", "type": "uint256"},
+        ],
+        "name": "unstake",
+        "outputs": [],
+        "stateMutability": "nonpayable",
+        "type": "function",
+    },
+    {
+        "inputs": [{"name": "user", "type": "address"}],
+        "name": "slash",
+        "outputs": [],
+        "stateMutability": "nonpayable",
+        "type": "function",
+    },
+]
+
+
+def _vault():
+    return chain.get_contract(os.environ.get("STAKING_CONTRACT_ADDRESS", ""),
+                              STAKING_VAULT_ABI, key="StakingVault")
 
-    contract = w3.eth.contract(address=contract_addr, abi=abi)
-    amount_wei = int(amount * 1e6)
-    account = w3.eth.account.from_key(private_key)
 
-    tx = contract.functions.stake(
+def stake_onchain(wallet: str, amount: float, deadline: int,
+                  v: int, r: str, s: str) -> str:
+    """Call StakingVault.stake() on-chain. Returns tx hash."""
+    amount_wei = int(amount * 1e6)
+    fn = _vault().functions.stake(
         wallet, amount_wei, deadline, v,
         bytes.fromhex(r[2:]) if r.startswith("0x") else bytes.fromhex(r),
         bytes.fromhex(s[2:]) if s.startswith("0x") else bytes.fromhex(s),
-    ).build_transaction({
-        "from": account.address,
-        "nonce": w3.eth.get_transaction_count(account.address),
-        "gas": 200000,
-    })
-    signed = w3.eth.account.sign_transaction(tx, private_key)
-    tx_hash = w3.eth.send_raw_transaction(signed.raw_transaction)
-    return tx_hash.hex()
+    )
+    return chain.send_transaction(fn, gas=200000, description=f"stake({wallet})", wait=False)
 
 
 def slash_onchain(wallet: str) -> str:
     """Call StakingVault.slash() on-chain. Returns tx hash."""
-    from web3 import Web3
-    rpc = os.environ.get("BASE_SEPOLIA_RPC_URL", "https://sepolia.base.org")
-    w3 = Web3(Web3.HTTPProvider(rpc))
-    contract_addr = os.environ.get("STAKING_CONTRACT_ADDRESS", "")
-    private_key = os.environ.get("PLATFORM_PRIVATE_KEY", "")
+    fn = _vault().functions.slash(wallet)
+    return chain.send_transaction(fn, gas=200000, description=f"slash({wallet})", wait=False)
 
-    abi = [{
-        "inputs": [{"name": "user", "type": "address"}],
-        "name": "slash",
-        "outputs": [],
-        "stateMutability": "nonpayable",
-        "type": "function",
-    }]
-
-    contract = w3.eth.contract(address=contract_addr, abi=abi)
-    account = w3.eth.account.from_key(private_key)
 
-    tx = contract.functions.slash(wallet).build_transaction({
-        "from": account.address,
-        "nonce": w3.eth.get_transaction_count(account.address),
-        "gas": 200000,
-    })
-    signed = w3.eth.account.sign_transaction(tx, private_key)
-    tx_hash = w3.eth.send_raw_transaction(signed.raw_transaction)
-    return tx_hash.hex()
+def unstake_onchain(wallet: str, amount: float) -> str:
+    """Call StakingVault.unstake() on-chain. Returns tx hash."""
+    fn = _vault().functions.unstake(wallet, int(amount * 1e6))
+    return chain.send_transaction(fn, gas=200000, description=f"unstake({wallet})", wait=False)
 
 
 def stake_for_arbiter(
@@ -181,34 +176,7 @@ def unstake(db: Session, user_id: str, amount: float) -> StakeRecord:
     if user.staked_amount < amount:
         raise ValueError("Insufficient staked amount")
 
-    from web3 import Web3
-    rpc = os.environ.get("BASE_SEPOLIA_RPC_URL", "https://sepolia.base.org")
-    w3 = Web3(Web3.HTTPProvider(rpc))
-    contract_addr = os.environ.get("STAKING_CONTRACT_ADDRESS", "")
-    private_key = os.environ.get("PLATFORM_PRIVATE_KEY", "")
-
-    abi = [{
-        "inputs": [
-            {"name": "user", "type": "address"},
-            {"name": "amount", "type": "uint256"},
-        ],
-        "name": "unstake",
-        "outputs": [],
-        "stateMutability": "nonpayable",
-        "type": "function",
-    }]
-
-    contract = w3.eth.contract(address=contract_addr, abi=abi)
-    amount_wei = int(amount * 1e6)
-    account = w3.eth.account.from_key(private_key)
-
-    tx = contract.functions.unstake(user.wallet, amount_wei).build_transaction({
-        "from": account.address,
-        "nonce": w3.eth.get_transaction_count(account.address),
-        "gas": 200000,
-    })
-    signed = w3.eth.account.sign_transaction(tx, private_key)
-    tx_hash = w3.eth.send_raw_transaction(signed.raw_transaction)
+    tx_hash = unstake_onchain(user.wallet, amount)
 
     user.staked_amount -= amount
     if user.is_arbiter and user.staked_amount < ARBITER_STAKE_AMOUNT:
@@ -218,7 +186,7 @@ def unstake(db: Session, user_id: str, amount: float) -> StakeRecord:
         user_id=user_id,
         amount=amount,
         purpose=StakePurpose.credit_recharge,
-        tx_hash=tx_hash.hex(),
+        tx_hash=tx_hash,
     )
     db.add(record)
     db.commit()
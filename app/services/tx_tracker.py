@@ -0,0 +1,197 @@
+"""Pending on-chain transactions and the background confirmer.
+
+Payouts, refunds and escrow calls broadcast their transaction and return
+right away. The caller records a ChainTransaction in the same DB transaction
+as its state change (e.g. payout_status = submitted). The confirmer then
+polls receipts for all submitted rows in one batched RPC per pass and
+applies the outcome:
+
+    payout          submitted -> paid      | failed
+    refund          submitted -> refunded  | failed
+    escrow_resolve  submitted -> paid      | failed
+    escrow_void     submitted -> refunded  | failed
+    escrow_create   reverted: task goes back to scoring and the lifecycle retries
+    escrow_join     reverted: the challenge is withdrawn, as when joinChallenge failed inline
+    payout_batch    batch and every task in it: paid / refunded | failed
+
+A transaction is failed only when it reverted, or when the node no longer
+knows it after CHAIN_TX_DROP_SECONDS. A slow one stays submitted and is never
+re-sent automatically, so a late inclusion cannot pay twice.
+
+Env vars:
+    CHAIN_CONFIRM_POLL_INTERVAL: seconds between passes (default 5)
+    CHAIN_CONFIRM_BATCH_SIZE: receipts fetched per pass (default 100)
+    CHAIN_CONFIRMATIONS: blocks on top of the receipt before it counts (default 1)
+    CHAIN_TX_DROP_SECONDS: age after which an unknown tx is treated as dropped (default 1800)
+"""
+import os
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from ..database import SessionLocal
+from ..models import (
+    ChainTransaction, ChainTxKind, ChainTxStatus, Challenge, PayoutBatch, PayoutBatchStatus,
+    PayoutStatus, Task, TaskStatus,
+)
+from . import chain
+
+CHAIN_CONFIRM_POLL_INTERVAL = float(os.environ.get("CHAIN_CONFIRM_POLL_INTERVAL", "5"))
+CHAIN_CONFIRM_BATCH_SIZE = int(os.environ.get("CHAIN_CONFIRM_BATCH_SIZE", "100"))
+CHAIN_CONFIRMATIONS = int(os.environ.get("CHAIN_CONFIRMATIONS", "1"))
+CHAIN_TX_DROP_SECONDS = int(os.environ.get("CHAIN_TX_DROP_SECONDS", "1800"))
+
+
+def track_transaction(
+    db: Session, tx_hash: str, kind: ChainTxKind,
+    task_id: Optional[str] = None, ref_id: Optional[str] = None,
+) -> ChainTransaction:
+    """Record a broadcast transaction; commits with the caller's state change."""
+    row = ChainTransaction(tx_hash=tx_hash, kind=kind, task_id=task_id, ref_id=ref_id)
+    db.add(row)
+    return row
+
+
+def _apply_outcome(db: Session, row: ChainTransaction, ok: bool) -> Optional[str]:
+    """Move the owning task / challenge on. Returns a task id to re-evaluate, if any.
+
+    Each branch checks that the row still refers to this transaction, so a
+    repeated pass (or two confirmers racing) changes nothing the second time.
+    """
+    task = db.get(Task, row.task_id) if row.task_id else None
+    kind = row.kind
+    if kind in (ChainTxKind.payout, ChainTxKind.escrow_resolve, ChainTxKind.escrow_void):
+        if task and task.payout_status == PayoutStatus.submitted and task.payout_tx_hash == row.tx_hash:
+            done = PayoutStatus.refunded if kind == ChainTxKind.escrow_void else PayoutStatus.paid
+            task.payout_status = done if ok else PayoutStatus.failed
+    elif kind == ChainTxKind.refund:
+        if task and task.payout_status == PayoutStatus.submitted and task.refund_tx_hash == row.tx_hash:
+            task.payout_status = PayoutStatus.refunded if ok else PayoutStatus.failed
+    elif kind == ChainTxKind.escrow_create and not ok:
+        if task and task.escrow_tx_hash == row.tx_hash and task.status == TaskStatus.challenge_window:
+            # Same revert as a failed inline createChallenge: back to scoring, retried next tick
+            task.winner_submission_id = None
+            task.challenge_window_end = None
+            task.escrow_tx_hash = None
+            task.status = TaskStatus.scoring
+            return task.id
+    elif kind == ChainTxKind.payout_batch:
+        from .payout_batch import settle_batch
+        batch = db.get(PayoutBatch, row.ref_id) if row.ref_id else None
+        if batch and batch.status == PayoutBatchStatus.submitted and batch.tx_hash == row.tx_hash:
+            settle_batch(db, batch, ok)
+    elif kind == ChainTxKind.escrow_join and not ok:
+        challenge = db.get(Challenge, row.ref_id) if row.ref_id else None
+        if challenge and challenge.deposit_tx_hash == row.tx_hash:
+            db.delete(challenge)
+    return None
+
+
+def confirm_pending(db: Session, now: Optional[datetime] = None) -> int:
+    """One confirmer pass over the oldest submitted transactions. Returns how many finished."""
+    now = now or datetime.now(timezone.utc)
+    rows = (
+        db.query(ChainTransaction)
+        .filter(ChainTransaction.status == ChainTxStatus.submitted)
+        .order_by(ChainTransaction.id)
+        .limit(CHAIN_CONFIRM_BATCH_SIZE)
+        .all()
+    )
+    if not rows:
+        return 0
+    receipts = chain.get_receipts([r.tx_hash for r in rows])
+    head = chain.get_w3().eth.block_number if CHAIN_CONFIRMATIONS > 1 else None
+    finished = 0
+    retrigger: list[str] = []
+    for row in rows:
+        row.checks += 1
+        receipt = receipts.get(row.tx_hash)
+        if receipt is None:
+            created = row.created_at if row.created_at.tzinfo else row.created_at.replace(tzinfo=timezone.utc)
+            if now - created >= timedelta(seconds=CHAIN_TX_DROP_SECONDS) and not chain.transaction_known(row.tx_hash):
+                row.status = ChainTxStatus.failed
+                row.last_error = "dropped: node no longer knows the transaction"
+                row.finished_at = now
+                # The dropped nonce left a gap; re-read the count before the next send
+                chain.resync_nonces()
+                task_id = _apply_outcome(db, row, ok=False)
+                if task_id:
+                    retrigger.append(task_id)
+                finished += 1
+            continue
+        if head is not None and head - receipt["blockNumber"] + 1 < CHAIN_CONFIRMATIONS:
+            continue
+        ok = receipt["status"] == 1
+        row.block_number = receipt["blockNumber"]
+        row.status = ChainTxStatus.confirmed if ok else ChainTxStatus.failed
+        row.last_error = None if ok else "reverted"
+        row.finished_at = now
+        task_id = _apply_outcome(db, row, ok)
+        if task_id:
+            retrigger.append(task_id)
+        if not ok:
+            print(f"[tx] {row.kind.value} {row.tx_hash} reverted (task={row.task_id})", flush=True)
+        finished += 1
+    db.commit()
+    if retrigger:
+        from ..lifecycle import notify_lifecycle
+        for task_id in retrigger:
+            notify_lifecycle(task_id)
+    return finished
+
+
+class TxConfirmer:
+    """Background thread that runs confirm_pending every poll interval."""
+
+    def __init__(self, session_factory=None, poll_interval: float = CHAIN_CONFIRM_POLL_INTERVAL):
+        self.session_factory = session_factory or SessionLocal
+        self.poll_interval = poll_interval
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._loop, name="tx-confirmer", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def wake(self) -> None:
+        self._wake.set()
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            db = self.session_factory()
+            try:
+                confirm_pending(db)
+            except Exception as e:
+                db.rollback()
+                print(f"[tx] confirm pass failed: {e}", flush=True)
+            finally:
+                db.close()
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+
+
+_confirmer: Optional[TxConfirmer] = None
+
+
+def start_tx_confirmer() -> TxConfirmer:
+    global _confirmer
+    if _confirmer is None:
+        _confirmer = TxConfirmer()
+        _confirmer.start()
+    return _confirmer
+
+
+def stop_tx_confirmer() -> None:
+    global _confirmer
+    if _confirmer is not None:
+        _confirmer.stop()
+        _confirmer = None
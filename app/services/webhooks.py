@@ -0,0 +1,415 @@
+"""Outbound webhooks for task events.
+
+Users register an endpoint URL with an optional event-type and task filter.
+When a task event is recorded (see services/events.py), a delivery row is
+written for every matching webhook in the same transaction, so a
+notification exists if and only if the state change committed. A webhook
+only receives events that involve its owner:
+    - any event of a task they published
+    - status changes of their own submissions
+    - task status / payout changes of tasks they submitted to
+
+A dispatcher thread leases due deliveries, groups them per webhook and POSTs
+them in batches of up to WEBHOOK_BATCH_SIZE events:
+
+    POST <url>
+    X-Webhook-Id: <webhook id>
+    X-Webhook-Timestamp: <unix seconds>
+    X-Webhook-Signature: sha256=<hex HMAC-SHA256(secret, "<timestamp>.<body>")>
+
+    {"webhook_id": "...", "events": [{"id": 42, "type": "task.status",
+      "task_id": "...", "created_at": "...", "data": {...}}, ...]}
+
+Any 2xx marks the batch delivered. Anything else is retried with exponential
+backoff. After WEBHOOK_MAX_ATTEMPTS the deliveries are parked as `dead` and
+can be listed and redriven through the API. Delivery is at least once and
+may be out of order across retries; receivers should dedupe on the event id.
+
+Env vars:
+    WEBHOOK_BATCH_SIZE: events per POST (default 50)
+    WEBHOOK_MAX_ATTEMPTS: attempts before a delivery is dead-lettered (default 8)
+    WEBHOOK_RETRY_BASE: first retry delay in seconds, doubled per attempt (default 30)
+    WEBHOOK_RETRY_MAX: cap on the retry delay in seconds (default 3600)
+    WEBHOOK_TIMEOUT: per-request timeout in seconds (default 10)
+    WEBHOOK_CONCURRENCY: endpoints posted to at once (default 4)
+    WEBHOOK_POLL_INTERVAL: idle poll seconds; new deliveries wake the dispatcher (default 2)
+    WEBHOOK_ALLOW_PRIVATE_URLS: accept loopback / private network URLs (default false)
+"""
+import hashlib
+import hmac
+import ipaddress
+import json
+import os
+import socket
+import threading
+import time
+import uuid
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from urllib.parse import urlparse
+
+import httpx
+from sqlalchemy import and_, event, insert, or_, select, update
+from sqlalchemy.orm import Session
+
+from ..database import SessionLocal
+from ..models import Submission, Task, TaskEvent, Webhook, WebhookDelivery, WebhookDeliveryStatus
+from .events import on_events_recorded
+
+WEBHOOK_BATCH_SIZE = int(os.environ.get("WEBHOOK_BATCH_SIZE", "50"))
+WEBHOOK_MAX_ATTEMPTS = int(os.environ.get("WEBHOOK_MAX_ATTEMPTS", "8"))
+WEBHOOK_RETRY_BASE = float(os.environ.get("WEBHOOK_RETRY_BASE", "30"))
+WEBHOOK_RETRY_MAX = float(os.environ.get("WEBHOOK_RETRY_MAX", "3600"))
+WEBHOOK_TIMEOUT = float(os.environ.get("WEBHOOK_TIMEOUT", "10"))
+WEBHOOK_CONCURRENCY = int(os.environ.get("WEBHOOK_CONCURRENCY", "4"))
+WEBHOOK_POLL_INTERVAL = float(os.environ.get("WEBHOOK_POLL_INTERVAL", "2"))
+WEBHOOK_ALLOW_PRIVATE_URLS = os.environ.get("WEBHOOK_ALLOW_PRIVATE_URLS", "false").lower() == "true"
+WEBHOOK_LEASE_SECONDS = 120   # a batch not settled by then (process died) is sent again
+
+_PENDING_KEY = "webhook_deliveries_pending"
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class InvalidWebhookURL(ValueError):
+    pass
+
+
+def validate_webhook_url(url: str) -> str:
+    """Reject non-HTTP URLs and, unless allowed, hosts on loopback / private networks."""
+    parsed = urlparse(url)
+    if parsed.scheme not in ("http", "https") or not parsed.hostname:
+        raise InvalidWebhookURL("webhook url must be an http(s) URL")
+    if WEBHOOK_ALLOW_PRIVATE_URLS:
+        return url
+    try:
+        infos = socket.getaddrinfo(parsed.hostname, parsed.port or 443, proto=socket.IPPROTO_TCP)
+    except socket.gaierror:
+        raise InvalidWebhookURL(f"cannot resolve host {parsed.hostname}")
+    for info in infos:
+        ip = ipaddress.ip_address(info[4][0])
+        if ip.is_private or ip.is_loopback or ip.is_link_local or ip.is_reserved:
+            raise InvalidWebhookURL(f"webhook host {parsed.hostname} resolves to a private address")
+    return url
+
+
+def sign_payload(secret: str, timestamp: str, body: bytes) -> str:
+    digest = hmac.new(secret.encode(), timestamp.encode() + b"." + body, hashlib.sha256).hexdigest()
+    return f"sha256={digest}"
+
+
+# ---------------------------------------------------------------------------
+# Fan-out: runs inside the flush that records the events
+# ---------------------------------------------------------------------------
+
+@on_events_recorded
+def _enqueue_deliveries(session: Session, events: list[dict]) -> None:
+    conn = session.connection()
+    task_ids = {e["task_id"] for e in events}
+    hooks = conn.execute(
+        select(Webhook.id, Webhook.user_id, Webhook.event_types, Webhook.task_id)
+        .where(Webhook.active == True,  # noqa: E712
+               or_(Webhook.task_id.is_(None), Webhook.task_id.in_(task_ids)))
+    ).all()
+    if not hooks:
+        return
+    owners = {h.user_id for h in hooks}
+    publishers = dict(conn.execute(
+        select(Task.id, Task.publisher_id).where(Task.id.in_(task_ids))
+    ).all())
+    participants = set(conn.execute(
+        select(Submission.task_id, Submission.worker_id)
+        .where(Submission.task_id.in_(task_ids), Submission.worker_id.in_(owners))
+        .distinct()
+    ).all())
+
+    rows = []
+    for ev in events:
+        data = json.loads(ev["data"])
+        for hook in hooks:
+            if hook.task_id and hook.task_id != ev["task_id"]:
+                continue
+            if hook.event_types and ev["event_type"] not in json.loads(hook.event_types):
+                continue
+            if publishers.get(ev["task_id"]) == hook.user_id:
+                involved = True
+            elif ev["event_type"] == "submission.status":
+                involved = data.get("worker_id") == hook.user_id
+            else:
+                involved = (ev["task_id"], hook.user_id) in participants
+            if involved:
+                rows.append({"webhook_id": hook.id, "event_id": ev["id"]})
+    if rows:
+        conn.execute(insert(WebhookDelivery), rows)
+        session.info[_PENDING_KEY] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _wake_after_commit(session: Session) -> None:
+    if session.info.pop(_PENDING_KEY, False):
+        wake_webhook_dispatcher()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session: Session) -> None:
+    session.info.pop(_PENDING_KEY, None)
+
+
+# ---------------------------------------------------------------------------
+# Delivery
+# ---------------------------------------------------------------------------
+
+def _claimable(now: datetime):
+    return or_(
+        and_(WebhookDelivery.status == WebhookDeliveryStatus.pending,
+             WebhookDelivery.next_attempt_at <= now),
+        and_(WebhookDelivery.status == WebhookDeliveryStatus.sending,
+             WebhookDelivery.locked_until < now),
+    )
+
+
+def claim_batches(db: Session, max_endpoints: int, now: Optional[datetime] = None,
+                  exclude: frozenset = frozenset()) -> dict[str, list[str]]:
+    """Lease due deliveries for up to `max_endpoints` webhooks (skipping the
+    ones in `exclude`), at most WEBHOOK_BATCH_SIZE each.
+    Returns {webhook_id: [delivery_id, ...]}."""
+    if max_endpoints <= 0:
+        return {}
+    now = now or _now()
+    query = db.query(WebhookDelivery.id, WebhookDelivery.webhook_id).filter(_claimable(now))
+    if exclude:
+        query = query.filter(WebhookDelivery.webhook_id.notin_(exclude))
+    candidates = (
+        query
+        .order_by(WebhookDelivery.next_attempt_at, WebhookDelivery.event_id)
+        .limit(max_endpoints * WEBHOOK_BATCH_SIZE)
+        .all()
+    )
+    picked: dict[str, list[str]] = {}
+    for delivery_id, webhook_id in candidates:
+        if webhook_id not in picked and len(picked) >= max_endpoints:
+            continue
+        batch = picked.setdefault(webhook_id, [])
+        if len(batch) < WEBHOOK_BATCH_SIZE:
+            batch.append(delivery_id)
+    if not picked:
+        return {}
+
+    token = uuid.uuid4().hex
+    ids = [i for batch in picked.values() for i in batch]
+    # The WHERE re-checks claimability, so racing dispatchers never share a row
+    db.execute(
+        update(WebhookDelivery)
+        .where(WebhookDelivery.id.in_(ids), _claimable(now))
+        .values(status=WebhookDeliveryStatus.sending, lease_token=token,
+                locked_until=now + timedelta(seconds=WEBHOOK_LEASE_SECONDS))
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    claimed: dict[str, list[str]] = defaultdict(list)
+    for delivery_id, webhook_id in (
+        db.query(WebhookDelivery.id, WebhookDelivery.webhook_id)
+        .filter(WebhookDelivery.lease_token == token)
+        .all()
+    ):
+        claimed[webhook_id].append(delivery_id)
+    return dict(claimed)
+
+
+def _build_body(webhook_id: str, events: list[TaskEvent]) -> bytes:
+    return json.dumps({
+        "webhook_id": webhook_id,
+        "events": [{
+            "id": ev.id, "type": ev.event_type, "task_id": ev.task_id,
+            "created_at": ev.created_at.replace(tzinfo=ev.created_at.tzinfo or timezone.utc).isoformat(),
+            "data": json.loads(ev.data),
+        } for ev in events],
+    }, separators=(",", ":")).encode()
+
+
+def send_batch(db: Session, webhook_id: str, delivery_ids: list[str],
+               client: httpx.Client) -> bool:
+    """POST one batch and record the outcome. Returns True when the endpoint accepted it."""
+    hook = db.query(Webhook).filter(Webhook.id == webhook_id).first()
+    deliveries = db.query(WebhookDelivery).filter(WebhookDelivery.id.in_(delivery_ids)).all()
+    if not deliveries:
+        return False
+    if hook is None or not hook.active:
+        _settle(db, deliveries, error="webhook removed or disabled", dead=True)
+        return False
+
+    events = (db.query(TaskEvent)
+              .filter(TaskEvent.id.in_([d.event_id for d in deliveries]))
+              .order_by(TaskEvent.id).all())
+    body = _build_body(hook.id, events)
+    timestamp = str(int(time.time()))
+    headers = {
+        "Content-Type": "application/json",
+        "X-Webhook-Id": hook.id,
+        "X-Webhook-Timestamp": timestamp,
+        "X-Webhook-Signature": sign_payload(hook.secret, timestamp, body),
+    }
+    try:
+        resp = client.post(hook.url, content=body, headers=headers, timeout=WEBHOOK_TIMEOUT)
+        error = None if 200 <= resp.status_code < 300 else f"HTTP {resp.status_code}: {resp.text[:500]}"
+    except httpx.HTTPError as e:
+        error = f"{type(e).__name__}: {e}"
+    _settle(db, deliveries, error=error)
+    if error:
+        print(f"[webhooks] {hook.id} batch of {len(deliveries)} failed: {error}", flush=True)
+    return error is None
+
+
+def _settle(db: Session, deliveries: list[WebhookDelivery], error: Optional[str],
+            dead: bool = False) -> None:
+    now = _now()
+    for d in deliveries:
+        d.attempts += 1
+        d.lease_token = None
+        d.locked_until = None
+        if error is None:
+            d.status = WebhookDeliveryStatus.delivered
+            d.delivered_at = now
+            d.last_error = None
+            continue
+        d.last_error = error[-2000:]
+        if dead or d.attempts >= WEBHOOK_MAX_ATTEMPTS:
+            d.status = WebhookDeliveryStatus.dead
+        else:
+            d.status = WebhookDeliveryStatus.pending
+            delay = min(WEBHOOK_RETRY_BASE * 2 ** (d.attempts - 1), WEBHOOK_RETRY_MAX)
+            d.next_attempt_at = now + timedelta(seconds=delay)
+    db.commit()
+
+
+def redrive_dead(db: Session, webhook_id: str) -> int:
+    """Queue a webhook's dead-lettered deliveries again. Returns how many."""
+    count = (
+        db.query(WebhookDelivery)
+        .filter(WebhookDelivery.webhook_id == webhook_id,
+                WebhookDelivery.status == WebhookDeliveryStatus.dead)
+        .update({"status": WebhookDeliveryStatus.pending, "attempts": 0,
+                 "next_attempt_at": _now(), "last_error": None},
+                synchronize_session=False)
+    )
+    db.commit()
+    if count:
+        wake_webhook_dispatcher()
+    return count
+
+
+class WebhookDispatcher:
+    """Leases due deliveries and posts them, one batch per endpoint, on a thread pool."""
+
+    def __init__(self, session_factory=None, concurrency: int = WEBHOOK_CONCURRENCY,
+                 poll_interval: float = WEBHOOK_POLL_INTERVAL, client: Optional[httpx.Client] = None):
+        self.session_factory = session_factory or SessionLocal
+        self.concurrency = max(1, concurrency)
+        self.poll_interval = poll_interval
+        # One keep-alive client shared by all workers; httpx.Client is thread-safe
+        self.client = client or httpx.Client(timeout=WEBHOOK_TIMEOUT)
+        self._executor = ThreadPoolExecutor(max_workers=self.concurrency,
+                                            thread_name_prefix="webhook")
+        self._lock = threading.Lock()
+        self._inflight: set[str] = set()   # webhook ids with a batch in flight
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._loop, name="webhook-dispatcher", daemon=True)
+        self._thread.start()
+
+    def stop(self, wait: bool = True) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+        self._executor.shutdown(wait=wait)
+        self.client.close()
+
+    def wake(self) -> None:
+        self._wake.set()
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.dispatch_once()
+            except Exception as e:
+                print(f"[webhooks] dispatch error: {e}", flush=True)
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+
+    def dispatch_once(self, now: Optional[datetime] = None) -> int:
+        """Lease batches for free slots and submit them. Returns the number of batches."""
+        with self._lock:
+            free = self.concurrency - len(self._inflight)
+            busy = frozenset(self._inflight)
+        if free <= 0:
+            return 0
+        db = self.session_factory()
+        try:
+            # One batch per endpoint at a time keeps a slow receiver from taking every slot
+            batches = claim_batches(db, free, now, exclude=busy)
+        finally:
+            db.close()
+        with self._lock:
+            self._inflight.update(batches)
+        for webhook_id, delivery_ids in batches.items():
+            self._executor.submit(self._run, webhook_id, delivery_ids)
+        return len(batches)
+
+    def _run(self, webhook_id: str, delivery_ids: list[str]) -> None:
+        db = self.session_factory()
+        try:
+            send_batch(db, webhook_id, delivery_ids, self.client)
+        except Exception as e:
+            db.rollback()
+            print(f"[webhooks] could not send batch for {webhook_id}: {e}", flush=True)
+        finally:
+            db.close()
+            with self._lock:
+                self._inflight.discard(webhook_id)
+            self._wake.set()
+
+    def idle(self) -> bool:
+        with self._lock:
+            return not self._inflight
+
+    def drain(self, timeout: float = 30.0, now: Optional[datetime] = None) -> None:
+        """Send until nothing is due and nothing is in flight (tests, scripts)."""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.dispatch_once(now) == 0 and self.idle():
+                return
+            self._wake.wait(0.05)
+            self._wake.clear()
+        raise TimeoutError("webhook deliveries did not drain")
+
+
+_dispatcher: Optional[WebhookDispatcher] = None
+
+
+def start_webhook_dispatcher() -> WebhookDispatcher:
+    global _dispatcher
+    if _dispatcher is None:
+        _dispatcher = WebhookDispatcher()
+        _dispatcher.start()
+    return _dispatcher
+
+
+def stop_webhook_dispatcher() -> None:
+    global _dispatcher
+    if _dispatcher is not None:
+        _dispatcher.stop()
+        _dispatcher = None
+
+
+def wake_webhook_dispatcher() -> None:
+    """Nudge the dispatcher after new deliveries commit; no-op when it is not running."""
+    if _dispatcher is not None:
+        _dispatcher.wake()
@@ -1,6 +1,30 @@
-import os
-import json
+"""x402 payment verification against the facilitator.
+
+Verification is two facilitator round trips, `/verify` then `/settle` (the
+on-chain USDC transfer). They run on one shared `httpx.AsyncClient` with
+keep-alive connections, so `POST /tasks` awaits them on the event loop
+instead of parking a threadpool worker for up to a minute.
+
+Each stage has its own total deadline. A circuit breaker counts consecutive
+facilitator failures (timeouts, connection errors, 5xx). Once it opens,
+payments are rejected right away as "facilitator unavailable" rather than
+every publisher waiting out the timeout. After X402_BREAKER_RESET_SECONDS
+one probe request is let through to test recovery.
+
+Env vars:
+    X402_CONNECT_TIMEOUT: TCP/TLS connect timeout in seconds (default 5)
+    X402_VERIFY_TIMEOUT: total seconds for the /verify call (default 10)
+    X402_SETTLE_TIMEOUT: total seconds for the /settle call (default 30)
+    X402_MAX_CONNECTIONS: pooled connections to the facilitator (default 100)
+    X402_BREAKER_THRESHOLD: consecutive failures that open the breaker (default 5)
+    X402_BREAKER_RESET_SECONDS: seconds before a probe is allowed through (default 30)
+"""
+import asyncio
 import base64
+import json
+import os
+import time
+from typing import Optional
 
 import httpx
 
@@ -9,6 +33,13 @@ PLATFORM_WALLET = os.environ.get("PLATFORM_WALLET", "0x0000000000000000000000000
 X402_NETWORK = os.environ.get("X402_NETWORK", "eip155:84532")
 USDC_CONTRACT = os.environ.get("USDC_CONTRACT", "0x036CbD53842c5426634e7929541eC2318f3dCF7e")
 
+X402_CONNECT_TIMEOUT = float(os.environ.get("X402_CONNECT_TIMEOUT", "5"))
+X402_VERIFY_TIMEOUT = float(os.environ.get("X402_VERIFY_TIMEOUT", "10"))
+X402_SETTLE_TIMEOUT = float(os.environ.get("X402_SETTLE_TIMEOUT", "30"))
+X402_MAX_CONNECTIONS = int(os.environ.get("X402_MAX_CONNECTIONS", "100"))
+X402_BREAKER_THRESHOLD = int(os.environ.get("X402_BREAKER_THRESHOLD", "5"))
+X402_BREAKER_RESET_SECONDS = float(os.environ.get("X402_BREAKER_RESET_SECONDS", "30"))
+
 
 def build_payment_requirements(bounty: float) -> dict:
     """Build x402 payment requirements for a given bounty amount."""
@@ -27,52 +58,183 @@ def build_payment_requirements(bounty: float) -> dict:
     }
 
 
-def _facilitator_verify(payment_header: str, requirements: dict) -> dict:
-    """Call the x402 facilitator to verify then settle a payment. Separated for easy mocking."""
-    try:
-        decoded = json.loads(base64.b64decode(payment_header))
+class CircuitBreaker:
+    """Opens after `threshold` consecutive failures; lets one probe through every `reset_after` seconds."""
+
+    def __init__(self, threshold: int = X402_BREAKER_THRESHOLD,
+                 reset_after: float = X402_BREAKER_RESET_SECONDS, clock=time.monotonic):
+        self.threshold = threshold
+        self.reset_after = reset_after
+        self.clock = clock
+        self.failures = 0
+        self._opened_at: Optional[float] = None
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return "closed"
+        if self._probing or self.clock() - self._opened_at >= self.reset_after:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        if self._opened_at is None:
+            return True
+        if not self._probing and self.clock() - self._opened_at >= self.reset_after:
+            self._probing = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self._opened_at = None
+        self._probing = False
+
+    def release_probe(self) -> None:
+        """Abandon a probe without a verdict; the next request may probe again."""
+        self._probing = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._probing = False
+        if self._opened_at is not None or self.failures >= self.threshold:
+            self._opened_at = self.clock()
+
+
+class FacilitatorUnavailable(Exception):
+    pass
+
+
+class FacilitatorClient:
+    """Keep-alive async client for the facilitator's /verify and /settle."""
+
+    def __init__(self, base_url: Optional[str] = None, breaker: Optional[CircuitBreaker] = None,
+                 transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.base_url = (base_url or FACILITATOR_URL).rstrip("/")
+        self.breaker = breaker or CircuitBreaker()
+        self._transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _http(self) -> httpx.AsyncClient:
+        # Pooled connections belong to one event loop; rebuild if called from another
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._loop is not loop:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=httpx.Timeout(X402_SETTLE_TIMEOUT, connect=X402_CONNECT_TIMEOUT),
+                limits=httpx.Limits(max_connections=X402_MAX_CONNECTIONS,
+                                    max_keepalive_connections=X402_MAX_CONNECTIONS),
+                follow_redirects=True,
+                verify=False,
+                transport=self._transport,
+            )
+            self._loop = loop
+        return self._client
+
+    async def _post(self, stage: str, payload: dict, timeout: float) -> httpx.Response:
+        if not self.breaker.allow():
+            raise FacilitatorUnavailable("facilitator unavailable (circuit open)")
+        try:
+            async with asyncio.timeout(timeout):
+                resp = await self._http().post(
+                    f"/{stage}", json=payload,
+                    timeout=httpx.Timeout(timeout, connect=X402_CONNECT_TIMEOUT),
+                )
+        except (TimeoutError, httpx.TimeoutException):
+            self.breaker.record_failure()
+            raise FacilitatorUnavailable(f"{stage}: facilitator timeout")
+        except httpx.TransportError as e:
+            self.breaker.record_failure()
+            raise FacilitatorUnavailable(f"{stage}: {type(e).__name__}: {e}")
+        except asyncio.CancelledError:
+            # The caller went away (e.g. client disconnect): says nothing about the facilitator
+            self.breaker.release_probe()
+            raise
+        except Exception:
+            # Anything else (redirect loops, undecodable bodies, bugs) must not leave a probe open
+            self.breaker.record_failure()
+            raise
+        if resp.status_code >= 500:
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+        return resp
+
+    async def verify_and_settle(self, payment_header: str, requirements: dict) -> dict:
+        try:
+            decoded = json.loads(base64.b64decode(payment_header))
+        except (ValueError, TypeError) as e:
+            return {"valid": False, "tx_hash": None, "reason": f"malformed payment header: {e}"}
         payload = {"paymentPayload": decoded, "paymentRequirements": requirements}
+        try:
+            # Step 1: verify signature
+            verify_resp = await self._post("verify", payload, X402_VERIFY_TIMEOUT)
+            verify_data = _json(verify_resp)
+            print(f"[x402] verify status={verify_resp.status_code} body={verify_data}", flush=True)
+            if not verify_data.get("isValid", False):
+                reason = (verify_data.get("invalidReason") or verify_data.get("error")
+                          or "signature verification failed")
+                return {"valid": False, "tx_hash": None, "reason": f"verify: {reason}"}
+
+            # Step 2: settle (executes the on-chain USDC transfer)
+            settle_resp = await self._post("settle", payload, X402_SETTLE_TIMEOUT)
+            settle_data = _json(settle_resp)
+            print(f"[x402] settle status={settle_resp.status_code} body={settle_data}", flush=True)
+            if settle_resp.status_code != 200 or not settle_data.get("success", False):
+                reason = settle_data.get("error") or f"settle failed (HTTP {settle_resp.status_code})"
+                return {"valid": False, "tx_hash": None, "reason": f"settle: {reason}"}
+
+            return {"valid": True, "tx_hash": settle_data.get("transaction")}
+        except FacilitatorUnavailable as e:
+            print(f"[x402] {e}", flush=True)
+            return {"valid": False, "tx_hash": None, "reason": str(e), "unavailable": True}
+        except Exception as e:
+            # Redirect loops, undecodable bodies and the like: a 402 the client can retry, not a 500
+            print(f"[x402] facilitator error: {type(e).__name__}: {e}", flush=True)
+            return {"valid": False, "tx_hash": None, "reason": f"facilitator error: {type(e).__name__}: {e}",
+                    "unavailable": True}
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+def _json(resp: httpx.Response) -> dict:
+    try:
+        data = resp.json()
+    except ValueError:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+_client: Optional[FacilitatorClient] = None
+
+
+def get_facilitator_client() -> FacilitatorClient:
+    global _client
+    if _client is None:
+        _client = FacilitatorClient()
+    return _client
+
+
+async def close_facilitator_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+async def _facilitator_verify(payment_header: str, requirements: dict) -> dict:
+    """Call the x402 facilitator to verify then settle a payment. Separated for easy mocking."""
+    return await get_facilitator_client().verify_and_settle(payment_header, requirements)
+
 
-        # Step 1: verify signature
-        verify_resp = httpx.post(
-            f"{FACILITATOR_URL}/verify",
-            json=payload,
-            timeout=30,
-            follow_redirects=True,
-            verify=False,
-        )
-        verify_data = verify_resp.json()
-        print(f"[x402] verify status={verify_resp.status_code} body={verify_data}", flush=True)
-        if not verify_data.get("isValid", False):
-            reason = verify_data.get("invalidReason") or verify_data.get("error") or "signature verification failed"
-            return {"valid": False, "tx_hash": None, "reason": f"verify: {reason}"}
-
-        # Step 2: settle (executes the on-chain USDC transfer)
-        settle_resp = httpx.post(
-            f"{FACILITATOR_URL}/settle",
-            json=payload,
-            timeout=30,
-            follow_redirects=True,
-            verify=False,
-        )
-        settle_data = settle_resp.json()
-        print(f"[x402] settle status={settle_resp.status_code} body={settle_data}", flush=True)
-        if settle_resp.status_code != 200 or not settle_data.get("success", False):
-            reason = settle_data.get("error") or f"settle failed (HTTP {settle_resp.status_code})"
-            return {"valid": False, "tx_hash": None, "reason": f"settle: {reason}"}
-
-        return {"valid": True, "tx_hash": settle_data.get("transaction")}
-    except httpx.TimeoutException:
-        print("[x402] facilitator timeout", flush=True)
-        return {"valid": False, "tx_hash": None, "reason": "facilitator timeout"}
-    except Exception as e:
-        print(f"[x402] exception: {e}", flush=True)
-        return {"valid": False, "tx_hash": None, "reason": str(e)}
-
-
-def verify_payment(payment_header: str | None, bounty: float) -> dict:
+async def verify_payment(payment_header: str | None, bounty: float) -> dict:
     """Verify an x402 payment header for a given bounty amount."""
     if not payment_header:
         return {"valid": False, "tx_hash": None}
     requirements = build_payment_requirements(bounty)
-    return _facilitator_verify(payment_header, requirements)
+    return await _facilitator_verify(payment_header, requirements)
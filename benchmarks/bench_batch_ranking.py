@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""Ranking step of batch_score_submissions over many gate-passed submissions.
+
+Builds N in-memory submissions with individual-scoring feedback, then times
+the per-submission path (json.loads in each helper + compute_penalized_total
+per submission, as before the score matrix) against the score matrix:
+threshold filter, penalized totals, per-worker dedup and top-3. No database
+or oracle calls; this is the CPU work on the scheduler thread only.
+
+    python benchmarks/bench_batch_ranking.py [--submissions 10000] [--repeat 5]
+"""
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.dimension_cache import DimensionBundle  # noqa: E402
+from app.services.oracle import PENALTY_THRESHOLD, compute_penalized_total  # noqa: E402
+from app.services.score_matrix import (  # noqa: E402
+    BAND_ORDER, build_score_matrix, passes_threshold, penalized_totals, top_k_per_worker,
+)
+
+DIMS = [("substantiveness", "fixed", 0.25), ("credibility", "fixed", 0.2),
+        ("completeness", "fixed", 0.2), ("depth", "dynamic", 0.2), ("clarity", "dynamic", 0.15)]
+BANDS = "ABCDE"
+
+
+def _bundle() -> DimensionBundle:
+    rows = [SimpleNamespace(dim_id=d, name=d, dim_type=t, description="", weight=w, scoring_guidance="")
+            for d, t, w in DIMS]
+    return DimensionBundle.from_rows("bench", rows)
+
+
+def _submissions(n: int) -> list:
+    rng = random.Random(7)
+    subs = []
+    for i in range(n):
+        scores = {}
+        for dim_id, _, _ in DIMS:
+            band = rng.choice(BANDS[:4])
+            scores[dim_id] = {"band": band, "score": rng.randint(30, 95),
+                              "evidence": "e" * 80, "feedback": "f" * 40}
+        subs.append(SimpleNamespace(
+            id=f"s{i}", worker_id=f"w{rng.randrange(n // 3 or 1)}",
+            oracle_feedback=json.dumps({"type": "individual_scoring", "dimension_scores": scores,
+                                        "overall_band": "B", "revision_suggestions": []}),
+        ))
+    return subs
+
+
+def per_submission(subs: list, bundle: DimensionBundle) -> list:
+    """The previous shape: every helper decodes the feedback again."""
+    def passes(sub):
+        ds = json.loads(sub.oracle_feedback).get("dimension_scores", {})
+        return all(BAND_ORDER.get(ds.get(d, {}).get("band", "E"), 4) <= BAND_ORDER["C"]
+                   for d in bundle.fixed_dim_ids)
+
+    def total(sub):
+        ds = json.loads(sub.oracle_feedback).get("dimension_scores", {})
+        return compute_penalized_total(ds, list(bundle.penalty_dims))["final_score"]
+
+    eligible, below = [], []
+    for sub in subs:
+        (eligible if passes(sub) else below).append(sub)
+    for sub in below:
+        total(sub)
+    eligible.sort(key=total, reverse=True)
+    seen, top = set(), []
+    for sub in eligible:
+        if sub.worker_id not in seen:
+            seen.add(sub.worker_id)
+            top.append(sub)
+    return [s.id for s in top[:3]]
+
+
+def vectorized(subs: list, bundle: DimensionBundle) -> list:
+    matrix = build_score_matrix(subs, bundle)
+    totals = penalized_totals(matrix.scores, bundle, PENALTY_THRESHOLD)
+    rows = passes_threshold(matrix, bundle).nonzero()[0]
+    top = rows[top_k_per_worker(totals[rows], [subs[i].worker_id for i in rows], 3)]
+    return [subs[i].id for i in top]
+
+
+def _best(fn, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return min(times)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--submissions", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    bundle = _bundle()
+    subs = _submissions(args.submissions)
+    assert per_submission(subs, bundle) == vectorized(subs, bundle), "rankings differ"
+
+    old = _best(lambda: per_submission(subs, bundle), args.repeat)
+    new = _best(lambda: vectorized(subs, bundle), args.repeat)
+    print(f"{args.submissions} submissions × {len(DIMS)} dimensions (best of {args.repeat})")
+    print(f"  per-submission: {old * 1000:8.1f} ms")
+    print(f"  score matrix:   {new * 1000:8.1f} ms   ({old / new:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""Injection guard throughput (MB/s of UTF-8 input) on large clean payloads.
+
+Compares the previous scan (every pattern searched over the whole text in
+turn) with the lead-literal prefilter, cold and memoized. Clean text is the
+worst case for both, since nothing stops the scan early.
+
+    python benchmarks/bench_injection_guard.py [--mb 4] [--repeat 3]
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "oracle"))
+
+import injection_guard  # noqa: E402
+
+_EN_WORDS = (
+    "the report shows revenue growth across all regions with pricing data from three competitors "
+    "you should note that our system must handle results from every partner and always act on it "
+    "survey results suggest users want clearer onboarding and faster support responses"
+).split()
+_ZH_SENTENCES = [
+    "这是一份竞品分析报告，包含三个竞品的定价数据与市场份额。",
+    "用户调研结果显示，大部分用户希望获得更清晰的新手引导。",
+    "系统需要在高峰期保持稳定，接口响应时间应控制在两百毫秒以内。",
+    "建议在下一季度优先优化支付流程，并补充退款相关的说明文档。",
+]
+
+
+def _english(size: int) -> str:
+    rng = random.Random(1)
+    words = []
+    total = 0
+    while total < size:
+        w = rng.choice(_EN_WORDS)
+        words.append(w)
+        total += len(w) + 1
+    return " ".join(words)
+
+
+def _chinese(size: int) -> str:
+    rng = random.Random(2)
+    parts = []
+    total = 0
+    while total < size:
+        s = rng.choice(_ZH_SENTENCES)
+        parts.append(s)
+        total += len(s.encode("utf-8"))
+    return "".join(parts)
+
+
+def per_pattern(text: str):
+    """The previous check(): search each pattern over the whole text in turn."""
+    for pattern, name, _ in injection_guard._RULES:
+        if pattern.search(text):
+            return name
+    return None
+
+
+def _best(fn, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return min(times)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--mb", type=float, default=4.0)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    size = int(args.mb * 1_000_000)
+
+    for label, text in (("English", _english(size)), ("Chinese", _chinese(size))):
+        mb = len(text.encode("utf-8")) / 1_000_000
+        assert per_pattern(text) is None and injection_guard._scan(text) is None, "payload not clean"
+
+        def cold():
+            injection_guard.clear_scan_cache()
+            injection_guard.check(text, "submission_payload")
+
+        old = _best(lambda: per_pattern(text), args.repeat)
+        new = _best(cold, args.repeat)
+        injection_guard.check(text, "submission_payload")
+        warm = _best(lambda: injection_guard.check(text, "submission_payload"), args.repeat)
+        print(f"{label} {mb:.1f} MB (best of {args.repeat})")
+        print(f"  per-pattern search: {mb / old:8.1f} MB/s")
+        print(f"  lead prefilter:     {mb / new:8.1f} MB/s   ({old / new:.1f}x)")
+        print(f"  memoized repeat:    {mb / warm:8.1f} MB/s   (content hash only)")
+
+
+if __name__ == "__main__":
+    main()
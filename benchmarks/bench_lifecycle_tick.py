@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""One quality_first_lifecycle + fastest_first_refund tick over a large task table.
+
+Seeds an in-memory SQLite database with N tasks spread over the lifecycle
+phases (expired open, scoring still waiting on the oracle, scoring ready to
+pick a winner, expired challenge window) and reports how long one tick takes
+and how many SQL statements it issues. On-chain calls are stubbed out so
+the numbers reflect database work only.
+
+    python benchmarks/bench_lifecycle_tick.py [--tasks 10000]
+"""
+import argparse
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import create_engine, event  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+
+from app.database import Base  # noqa: E402
+from app.models import (  # noqa: E402
+    Submission, SubmissionStatus, Task, TaskStatus, TaskType, User, UserRole,
+)
+from app.scheduler import fastest_first_refund, quality_first_lifecycle  # noqa: E402
+
+
+def _seed(db, n_tasks: int) -> None:
+    now = datetime.now(timezone.utc)
+    past = now - timedelta(minutes=5)
+    db.add(User(id="w", nickname="w", wallet="0xw", role=UserRole.worker))
+    tasks, subs = [], []
+    for i in range(n_tasks):
+        phase = i % 5
+        task = Task(
+            id=f"t{i}", title="t", description="d", bounty=10.0, deadline=past,
+            type=TaskType.fastest_first if phase == 4 else TaskType.quality_first,
+            challenge_duration=7200,
+        )
+        if phase == 0:      # expired open -> scoring
+            statuses = [SubmissionStatus.gate_passed, SubmissionStatus.pending]
+        elif phase == 1:    # scoring, oracle still running on one submission -> wait
+            task.status = TaskStatus.scoring
+            statuses = [SubmissionStatus.pending, SubmissionStatus.gate_passed, SubmissionStatus.gate_failed]
+        elif phase == 2:    # scoring, all scored -> challenge_window
+            task.status = TaskStatus.scoring
+            statuses = [SubmissionStatus.scored, SubmissionStatus.scored]
+        elif phase == 3:    # expired challenge window, no challenges -> closed
+            task.status = TaskStatus.challenge_window
+            task.challenge_window_end = past
+            statuses = [SubmissionStatus.scored]
+        else:               # expired fastest_first -> refund
+            statuses = [SubmissionStatus.scored]
+        tasks.append(task)
+        for j, status in enumerate(statuses):
+            subs.append(Submission(
+                task_id=task.id, worker_id="w", content="c", revision=j + 1,
+                status=status, score=0.5 + j / 10 if status == SubmissionStatus.scored else None,
+            ))
+        if phase == 3:
+            task.winner_submission_id = subs[-1].id = f"s{i}"
+    db.add_all(tasks)
+    db.add_all(subs)
+    db.commit()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tasks", type=int, default=10000)
+    args = parser.parse_args()
+
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False},
+                           poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+    t0 = time.perf_counter()
+    with Session() as seed_db:
+        _seed(seed_db, args.tasks)
+    print(f"seeded {args.tasks} tasks in {time.perf_counter() - t0:.1f}s")
+
+    # Fresh session, as the scheduler opens one per tick
+    db = Session()
+
+    queries = 0
+
+    def _count(*_):
+        nonlocal queries
+        queries += 1
+
+    event.listen(engine, "before_cursor_execute", _count)
+    # Escrow calls only go to the outbox; the relayer that broadcasts them is not running
+    with patch("app.scheduler._resolve_via_contract"), \
+         patch("app.scheduler.refund_publisher"):
+        t0 = time.perf_counter()
+        quality_first_lifecycle(db=db)
+        fastest_first_refund(db=db)
+        elapsed = time.perf_counter() - t0
+    event.remove(engine, "before_cursor_execute", _count)
+
+    print(f"tick: {elapsed * 1000:.0f} ms, {queries} SQL statements")
+    db.close()
+
+
+if __name__ == "__main__":
+    main()
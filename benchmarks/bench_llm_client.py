@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""Per-call LLM latency: fresh SDK client per call vs cached client vs threaded fan-out.
+
+Runs against a local OpenAI-compatible stub, so the numbers isolate client
+construction and connection setup from model latency.
+
+    python benchmarks/bench_llm_client.py [--calls 200]
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "oracle"))
+
+import llm_client  # noqa: E402
+
+_REPLY = json.dumps({
+    "id": "stub", "object": "chat.completion", "created": 0, "model": "stub",
+    "choices": [{"index": 0, "finish_reason": "stop",
+                 "message": {"role": "assistant", "content": "{\"ok\": true}"}}],
+    "usage": {"prompt_tokens": 10, "completion_tokens": 2, "total_tokens": 12},
+}).encode()
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(_REPLY)))
+        self.end_headers()
+        self.wfile.write(_REPLY)
+
+    def log_message(self, *args):
+        pass
+
+
+def _start_stub() -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _fresh_client_call(base_url: str) -> None:
+    import openai
+    client = openai.OpenAI(base_url=base_url)
+    client.chat.completions.create(
+        model="stub", max_tokens=16, messages=[{"role": "user", "content": "hi"}],
+    )
+    client.close()
+
+
+def _report(label: str, elapsed: float, calls: int) -> None:
+    print(f"{label:<28} {elapsed / calls * 1000:8.2f} ms/call   {calls / elapsed:8.1f} calls/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=6,
+                        help="parallel calls per batch in the async run (≈ dims per task)")
+    args = parser.parse_args()
+
+    server = _start_stub()
+    base_url = f"http://127.0.0.1:{server.server_port}/v1"
+    os.environ.update({
+        "ORACLE_LLM_PROVIDER": "openai", "ORACLE_LLM_MODEL": "stub",
+        "ORACLE_LLM_BASE_URL": base_url, "OPENAI_API_KEY": "bench",
+    })
+
+    _fresh_client_call(base_url)  # warm imports
+    start = time.perf_counter()
+    for _ in range(args.calls):
+        _fresh_client_call(base_url)
+    _report("new client per call", time.perf_counter() - start, args.calls)
+
+    llm_client.reset_clients()
+    llm_client.call_llm("warm")
+    start = time.perf_counter()
+    for _ in range(args.calls):
+        llm_client.call_llm("hi")
+    _report("cached client (call_llm)", time.perf_counter() - start, args.calls)
+
+    # Same shape as the dimension_score fan-out: concurrent calls sharing the cached client
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        list(pool.map(llm_client.call_llm, ["hi"] * args.calls))
+    _report(f"call_llm x{args.concurrency} threads", time.perf_counter() - start, args.calls)
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""POST /tasks throughput with many concurrent publishers against a fake x402 facilitator.
+
+Starts a local facilitator stub whose /verify and /settle answer after a fixed
+delay (standing in for signature checks and the on-chain transfer), serves
+the app with uvicorn on a temporary SQLite file, then has N publishers each
+create tasks back to back. Reports tasks/s and latency percentiles.
+
+`--mode legacy` swaps in the previous behaviour for comparison: a blocking
+`httpx.post` per stage with a fresh connection, run on the threadpool the way
+the old sync endpoint was.
+
+    python benchmarks/bench_x402_publish.py [--publishers 200] [--tasks-per-publisher 5]
+        [--verify-ms 50] [--settle-ms 250] [--mode async|legacy]
+"""
+import argparse
+import asyncio
+import base64
+import json
+import multiprocessing
+import os
+import socket
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import httpx  # noqa: E402
+import uvicorn  # noqa: E402
+from starlette.applications import Starlette  # noqa: E402
+from starlette.concurrency import run_in_threadpool  # noqa: E402
+from starlette.responses import JSONResponse  # noqa: E402
+from starlette.routing import Route  # noqa: E402
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _serve(app, port: int) -> None:
+    uvicorn.run(app, host="127.0.0.1", port=port, lifespan="off", log_level="warning",
+                backlog=4096, timeout_keep_alive=120)
+
+
+def _wait_for_port(port: int) -> None:
+    while True:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.05)
+
+
+def _fake_facilitator(verify_s: float, settle_s: float) -> Starlette:
+    counter = {"n": 0}
+
+    async def verify(request):
+        await request.body()
+        await asyncio.sleep(verify_s)
+        return JSONResponse({"isValid": True})
+
+    async def settle(request):
+        await request.body()
+        await asyncio.sleep(settle_s)
+        counter["n"] += 1
+        return JSONResponse({"success": True, "transaction": f"0x{counter['n']:064x}"})
+
+    return Starlette(routes=[Route("/verify", verify, methods=["POST"]),
+                             Route("/settle", settle, methods=["POST"])])
+
+
+def _run_facilitator(port: int, verify_s: float, settle_s: float) -> None:
+    _serve(_fake_facilitator(verify_s, settle_s), port)
+
+
+def _legacy_verify(facilitator_url: str):
+    """The pre-async flow: blocking httpx.post per stage on a threadpool worker."""
+    def blocking(payment_header: str, bounty: float) -> dict:
+        from app.services.x402 import build_payment_requirements
+        payload = {"paymentPayload": json.loads(base64.b64decode(payment_header)),
+                   "paymentRequirements": build_payment_requirements(bounty)}
+        r = httpx.post(f"{facilitator_url}/verify", json=payload, timeout=30)
+        if not r.json().get("isValid"):
+            return {"valid": False, "tx_hash": None}
+        r = httpx.post(f"{facilitator_url}/settle", json=payload, timeout=30)
+        return {"valid": True, "tx_hash": r.json().get("transaction")}
+
+    async def verify_payment(payment_header: str, bounty: float) -> dict:
+        return await run_in_threadpool(blocking, payment_header, bounty)
+
+    return verify_payment
+
+
+async def _publish(base_url: str, publishers: int, per_publisher: int) -> tuple[list[float], Counter]:
+    header = base64.b64encode(json.dumps({"x402Version": 2, "payload": {}}).encode()).decode()
+    deadline = (datetime.now(timezone.utc) + timedelta(hours=1)).isoformat()
+    latencies: list[float] = []
+    outcomes: Counter = Counter()
+
+    async def publisher(i: int, client: httpx.AsyncClient):
+        for j in range(per_publisher):
+            body = {"title": f"bench {i}-{j}", "description": "d", "type": "fastest_first",
+                    "threshold": 0.6, "deadline": deadline, "bounty": 1.0,
+                    "publisher_id": f"pub{i}", "acceptance_criteria": ["ok"]}
+            t0 = time.perf_counter()
+            try:
+                resp = await client.post("/tasks", json=body, headers={"X-PAYMENT": header})
+                outcomes[resp.status_code] += 1
+            except httpx.HTTPError as e:
+                outcomes[type(e).__name__] += 1
+            latencies.append(time.perf_counter() - t0)
+
+    limits = httpx.Limits(max_connections=publishers, max_keepalive_connections=publishers)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=300) as client:
+        await asyncio.gather(*(publisher(i, client) for i in range(publishers)))
+    return latencies, outcomes
+
+
+def _run_app(port: int, facilitator_url: str, mode: str, max_connections: int) -> None:
+    os.environ["FACILITATOR_URL"] = facilitator_url
+    os.environ.setdefault("X402_MAX_CONNECTIONS", str(max_connections))
+    sys.stdout = open(os.devnull, "w")   # silence per-request [x402] logging
+
+    from sqlalchemy import create_engine, event
+    from sqlalchemy.orm import sessionmaker
+    from app.database import Base, get_db
+    from app.main import app
+    import app.routers.tasks as tasks_router
+
+    db_path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    engine = create_engine(f"sqlite:///{db_path}", pool_size=64, max_overflow=64,
+                           connect_args={"check_same_thread": False, "timeout": 60})
+
+    @event.listens_for(engine, "connect")
+    def _pragmas(dbapi_conn, _):
+        dbapi_conn.execute("PRAGMA journal_mode=WAL")
+        dbapi_conn.execute("PRAGMA synchronous=NORMAL")
+
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    def override_db():
+        db = Session()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_db
+
+    # SQLite has a single writer and its busy handler backs off in up to 100 ms
+    # sleeps, which swamps everything else under contention. Serialise the
+    # insert so the numbers reflect the payment path, not SQLite lock waits.
+    write_lock = threading.Lock()
+    persist = tasks_router._persist_task
+
+    def serialised_persist(*a):
+        with write_lock:
+            return persist(*a)
+
+    tasks_router._persist_task = serialised_persist
+    if mode == "legacy":
+        tasks_router.verify_payment = _legacy_verify(facilitator_url)
+    _serve(app, port)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--publishers", type=int, default=200)
+    parser.add_argument("--tasks-per-publisher", type=int, default=5)
+    parser.add_argument("--verify-ms", type=float, default=50)
+    parser.add_argument("--settle-ms", type=float, default=250)
+    parser.add_argument("--mode", choices=["async", "legacy"], default="async")
+    args = parser.parse_args()
+
+    # Facilitator, app and load generator each get their own process (and GIL)
+    fac_port, app_port = _free_port(), _free_port()
+    facilitator_url = f"http://127.0.0.1:{fac_port}"
+    procs = [
+        multiprocessing.Process(target=_run_facilitator, daemon=True,
+                                args=(fac_port, args.verify_ms / 1000, args.settle_ms / 1000)),
+        multiprocessing.Process(target=_run_app, daemon=True,
+                                args=(app_port, facilitator_url, args.mode, args.publishers)),
+    ]
+    for p in procs:
+        p.start()
+    _wait_for_port(fac_port)
+    _wait_for_port(app_port)
+
+    total = args.publishers * args.tasks_per_publisher
+    t0 = time.perf_counter()
+    latencies, outcomes = asyncio.run(_publish(f"http://127.0.0.1:{app_port}",
+                                             args.publishers, args.tasks_per_publisher))
+    elapsed = time.perf_counter() - t0
+
+    latencies.sort()
+    pct = lambda p: latencies[min(len(latencies) - 1, int(p / 100 * len(latencies)))] * 1000  # noqa: E731
+    print(f"mode={args.mode} publishers={args.publishers} tasks={total} "
+          f"facilitator verify={args.verify_ms:.0f}ms settle={args.settle_ms:.0f}ms")
+    print(f"  {outcomes[201] / elapsed:8.1f} tasks/s   wall {elapsed:6.2f}s   "
+          f"responses {dict(outcomes)}")
+    print(f"  latency ms  p50 {pct(50):7.1f}  p95 {pct(95):7.1f}  p99 {pct(99):7.1f}  "
+          f"mean {statistics.mean(latencies) * 1000:7.1f}")
+    for p in procs:
+        p.terminate()
+
+
+if __name__ == "__main__":
+    main()
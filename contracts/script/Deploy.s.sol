@@ -4,6 +4,7 @@ pragma solidity ^0.8.20;
 import "forge-std/Script.sol";
 import "../src/ChallengeEscrow.sol";
 import "../src/StakingVault.sol";
+import "../src/BatchPayout.sol";
 
 contract DeployScript is Script {
     function run() external {
@@ -13,9 +14,11 @@ contract DeployScript is Script {
         vm.startBroadcast(deployerPrivateKey);
         ChallengeEscrow escrow = new ChallengeEscrow(usdcAddress);
         StakingVault vault = new StakingVault(usdcAddress);
+        BatchPayout batchPayout = new BatchPayout(usdcAddress);
         vm.stopBroadcast();
 
         console.log("ChallengeEscrow deployed at:", address(escrow));
         console.log("StakingVault deployed at:", address(vault));
+        console.log("BatchPayout deployed at:", address(batchPayout));
     }
 }
@@ -0,0 +1,47 @@
+// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.20;
+
+import {Ownable} from "@openzeppelin/contracts/access/Ownable.sol";
+import {IERC20} from "@openzeppelin/contracts/token/ERC20/IERC20.sol";
+
+/// @notice Pays many USDC recipients in one transaction.
+/// The platform wallet (owner) approves this contract once; each batch then
+/// moves every amount straight from the platform wallet to its recipient.
+contract BatchPayout is Ownable {
+    IERC20 public immutable usdc;
+
+    uint256 public constant MAX_BATCH_SIZE = 200;
+
+    /// batchId => already executed (a re-sent batch reverts instead of paying twice)
+    mapping(bytes32 => bool) public executed;
+
+    event BatchTransferred(bytes32 indexed batchId, uint256 count, uint256 total);
+
+    constructor(address _usdc) Ownable(msg.sender) {
+        usdc = IERC20(_usdc);
+    }
+
+    function batchTransfer(
+        bytes32 batchId,
+        address[] calldata recipients,
+        uint256[] calldata amounts
+    ) external onlyOwner {
+        require(!executed[batchId], "Batch already executed");
+        require(recipients.length == amounts.length, "Length mismatch");
+        require(recipients.length > 0, "Empty batch");
+        require(recipients.length <= MAX_BATCH_SIZE, "Batch too large");
+
+        executed[batchId] = true;
+        uint256 total = 0;
+        for (uint256 i = 0; i < recipients.length; i++) {
+            require(recipients[i] != address(0), "Zero recipient");
+            require(
+                usdc.transferFrom(msg.sender, recipients[i], amounts[i]),
+                "Transfer failed"
+            );
+            total += amounts[i];
+        }
+
+        emit BatchTransferred(batchId, recipients.length, total);
+    }
+}
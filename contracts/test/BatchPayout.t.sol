@@ -0,0 +1,111 @@
+// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.20;
+
+import "forge-std/Test.sol";
+import "../src/BatchPayout.sol";
+import {ERC20} from "@openzeppelin/contracts/token/ERC20/ERC20.sol";
+
+contract MockUSDC is ERC20 {
+    constructor() ERC20("USDC", "USDC") {
+        _mint(msg.sender, 1_000_000e6);
+    }
+    function decimals() public pure override returns (uint8) { return 6; }
+    function mint(address to, uint256 amount) external { _mint(to, amount); }
+}
+
+contract BatchPayoutTest is Test {
+    BatchPayout payout;
+    MockUSDC usdc;
+    address winner = address(0x1);
+    address publisher = address(0x2);
+    address other = address(0x3);
+
+    event BatchTransferred(bytes32 indexed batchId, uint256 count, uint256 total);
+
+    function setUp() public {
+        usdc = new MockUSDC();
+        payout = new BatchPayout(address(usdc));
+        usdc.approve(address(payout), type(uint256).max);
+    }
+
+    function _batch(address a, uint256 x, address b, uint256 y)
+        internal pure returns (address[] memory recipients, uint256[] memory amounts)
+    {
+        recipients = new address[](2);
+        amounts = new uint256[](2);
+        recipients[0] = a;
+        recipients[1] = b;
+        amounts[0] = x;
+        amounts[1] = y;
+    }
+
+    function test_batch_transfer() public {
+        (address[] memory r, uint256[] memory a) = _batch(winner, 8e6, publisher, 9_500_000);
+        uint256 before = usdc.balanceOf(address(this));
+        vm.expectEmit(true, false, false, true);
+        emit BatchTransferred(bytes32("b1"), 2, 17_500_000);
+        payout.batchTransfer(bytes32("b1"), r, a);
+        assertEq(usdc.balanceOf(winner), 8e6);
+        assertEq(usdc.balanceOf(publisher), 9_500_000);
+        assertEq(usdc.balanceOf(address(this)), before - 17_500_000);
+        assertEq(usdc.balanceOf(address(payout)), 0);
+        assertTrue(payout.executed(bytes32("b1")));
+    }
+
+    function test_same_recipient_twice() public {
+        (address[] memory r, uint256[] memory a) = _batch(winner, 1e6, winner, 2e6);
+        payout.batchTransfer(bytes32("b1"), r, a);
+        assertEq(usdc.balanceOf(winner), 3e6);
+    }
+
+    function test_batch_cannot_run_twice() public {
+        (address[] memory r, uint256[] memory a) = _batch(winner, 1e6, publisher, 1e6);
+        payout.batchTransfer(bytes32("b1"), r, a);
+        vm.expectRevert("Batch already executed");
+        payout.batchTransfer(bytes32("b1"), r, a);
+        assertEq(usdc.balanceOf(winner), 1e6);
+    }
+
+    function test_length_mismatch() public {
+        address[] memory r = new address[](2);
+        uint256[] memory a = new uint256[](1);
+        r[0] = winner;
+        r[1] = publisher;
+        a[0] = 1e6;
+        vm.expectRevert("Length mismatch");
+        payout.batchTransfer(bytes32("b1"), r, a);
+    }
+
+    function test_empty_batch() public {
+        vm.expectRevert("Empty batch");
+        payout.batchTransfer(bytes32("b1"), new address[](0), new uint256[](0));
+    }
+
+    function test_zero_recipient() public {
+        (address[] memory r, uint256[] memory a) = _batch(winner, 1e6, address(0), 1e6);
+        vm.expectRevert("Zero recipient");
+        payout.batchTransfer(bytes32("b1"), r, a);
+    }
+
+    function test_failed_batch_is_atomic() public {
+        (address[] memory r, uint256[] memory a) = _batch(winner, 1e6, other, 2_000_000e6);
+        vm.expectRevert();
+        payout.batchTransfer(bytes32("b1"), r, a);
+        assertEq(usdc.balanceOf(winner), 0);
+        assertFalse(payout.executed(bytes32("b1")));
+    }
+
+    function test_only_owner() public {
+        (address[] memory r, uint256[] memory a) = _batch(winner, 1e6, publisher, 1e6);
+        vm.prank(other);
+        vm.expectRevert();
+        payout.batchTransfer(bytes32("b1"), r, a);
+    }
+
+    function test_needs_allowance() public {
+        usdc.approve(address(payout), 0);
+        (address[] memory r, uint256[] memory a) = _batch(winner, 1e6, publisher, 1e6);
+        vm.expectRevert();
+        payout.batchTransfer(bytes32("b1"), r, a);
+    }
+}
@@ -130,6 +130,8 @@ interface OracleLog {
   prompt_tokens: number
   completion_tokens: number
   total_tokens: number
+  cache_hits?: number
+  cache_misses?: number
   duration_ms: number
   output?: unknown
 }
@@ -198,6 +200,11 @@ function OracleLogRow({ log }: { log: OracleLog }) {
         <span className="px-1.5 py-0.5 rounded bg-zinc-800 text-white shrink-0">
           {log.mode}
         </span>
+        {!!log.cache_hits && (
+          <span className="px-1.5 py-0.5 rounded bg-emerald-900/60 text-emerald-300 shrink-0">
+            cache {log.cache_hits}/{log.cache_hits + (log.cache_misses ?? 0)}
+          </span>
+        )}
         <span className="text-muted-foreground ml-auto tabular-nums">
           {log.prompt_tokens.toLocaleString()}
           <span className="text-zinc-600 mx-0.5">/</span>
@@ -3,6 +3,8 @@ import type { PayoutStatus } from '@/lib/api'
 
 const config: Record<PayoutStatus, { variant: 'secondary' | 'default' | 'destructive'; label: string }> = {
   pending: { variant: 'secondary', label: 'pending' },
+  queued: { variant: 'secondary', label: 'queued' },
+  submitted: { variant: 'secondary', label: 'confirming' },
   paid: { variant: 'default', label: 'paid' },
   failed: { variant: 'destructive', label: 'failed' },
   refunded: { variant: 'secondary', label: 'refunded' },
@@ -1,4 +1,5 @@
-import useSWR from 'swr'
+import { useEffect } from 'react'
+import useSWR, { mutate } from 'swr'
 
 const fetcher = (url: string) =>
   fetch(url).then((r) => {
@@ -6,7 +7,7 @@ const fetcher = (url: string) =>
     return r.json()
   })
 
-export type PayoutStatus = 'pending' | 'paid' | 'failed' | 'refunded'
+export type PayoutStatus = 'pending' | 'queued' | 'submitted' | 'paid' | 'failed' | 'refunded'
 export type UserRole = 'publisher' | 'worker'
 export type TaskStatus = 'open' | 'scoring' | 'challenge_window' | 'arbitrating' | 'closed' | 'voided'
 export type ChallengeVerdict = 'upheld' | 'rejected' | 'malicious'
@@ -40,10 +41,12 @@ export interface Task {
   payment_tx_hash: string | null
   payout_status: PayoutStatus | null
   payout_tx_hash: string | null
+  payout_batch_id: string | null
   payout_amount: number | null
   submission_deposit: number | null
   challenge_duration: number | null
   acceptance_criteria: string[]
+  oracle_flow: 'staged' | 'fused' | null
   escrow_tx_hash: string | null
   challenge_window_end: string | null
   scoring_dimensions: ScoringDimension[]
@@ -229,14 +232,49 @@ export interface JuryBallot {
   malicious_tags: string[]
 }
 
+export type TaskEventType = 'task.status' | 'task.payout' | 'submission.status'
+
+const TASK_EVENT_TYPES: TaskEventType[] = ['task.status', 'task.payout', 'submission.status']
+
+// One EventSource on /api/events shared by every mounted hook. Each task or
+// submission state change revalidates the SWR keys it affects, so task list
+// and detail views no longer poll. EventSource reconnects on its own and
+// resumes with Last-Event-ID.
+let eventSource: EventSource | null = null
+let eventSubscribers = 0
+
+function revalidateTask(e: MessageEvent) {
+  const { task_id } = JSON.parse(e.data) as { task_id: string }
+  mutate('/api/tasks')
+  mutate(`/api/tasks/${task_id}`)
+  mutate(`/api/tasks/${task_id}/settlement`)
+  mutate(`/api/tasks/${task_id}/challenges`)
+}
+
+export function useLiveEvents() {
+  useEffect(() => {
+    if (typeof EventSource === 'undefined') return
+    if (eventSubscribers++ === 0) {
+      eventSource = new EventSource('/api/events')
+      for (const type of TASK_EVENT_TYPES) eventSource.addEventListener(type, revalidateTask)
+    }
+    return () => {
+      if (--eventSubscribers === 0) {
+        eventSource?.close()
+        eventSource = null
+      }
+    }
+  }, [])
+}
+
 export function useTasks() {
-  return useSWR<Task[]>('/api/tasks', fetcher, { refreshInterval: 30_000 })
+  useLiveEvents()
+  return useSWR<Task[]>('/api/tasks', fetcher)
 }
 
 export function useTask(id: string | null) {
-  return useSWR<TaskDetail>(id ? `/api/tasks/${id}` : null, fetcher, {
-    refreshInterval: 30_000,
-  })
+  useLiveEvents()
+  return useSWR<TaskDetail>(id ? `/api/tasks/${id}` : null, fetcher)
 }
 
 export function useChallenges(taskId: string | null) {
@@ -1,10 +1,33 @@
-"""Prompt injection guard — rule-based detection, zero LLM calls."""
+"""Prompt injection guard — rule-based detection, zero LLM calls.
+
+Every pattern can only start with a few literals (its "leads"). A scan
+lowercases the text once and looks for those literals with str.find; the
+pattern's regex then only runs anchored at the positions where one of its
+leads occurs, instead of searching the whole text eight times. Results are
+identical to searching each pattern in order: the first pattern that
+matches wins, at its leftmost match. Text that lower() cannot line up with
+the regex engine's case folding (a length change, or one of the non-ASCII
+letters that (?i) matches to an ASCII letter) takes that per-pattern search.
+
+Scan results are memoized by content hash, so a submission is scanned once
+across gate_check, score_individual and every dimension_score handled by
+the same oracle process.
+
+Env vars:
+    ORACLE_INJECTION_CACHE_SIZE: scanned contents remembered per process (default 1024)
+"""
+import hashlib
+import os
 import re
+import threading
+from collections import OrderedDict
+from typing import Optional
 
 # 各模式需要检测的字段
 FIELDS_BY_MODE = {
     "gate_check": ["submission_payload"],
     "score_individual": ["submission_payload"],
+    "gate_and_score": ["submission_payload"],
     "dimension_gen": ["acceptance_criteria"],
     "dimension_score": ["submission_payloads"],  # 列表，特殊处理
 }
@@ -33,7 +56,73 @@ _PATTERNS: list[tuple[str, str]] = [
      "output_hijack_zh"),
 ]
 
-_COMPILED = [(re.compile(pat), name) for pat, name in _PATTERNS]
+# Literals each pattern's matches start with (lowercase; matched against the lowercased text)
+_LEADS: dict[str, tuple[str, ...]] = {
+    "instruction_override_en": ("ignore", "forget", "disregard"),
+    "instruction_override_zh": ("忽略",),
+    "role_injection_en": ("you", "act", "pretend", "roleplay"),
+    "role_injection_zh": ("你现在是", "你是一个新的", "假装你是", "你来扮演", "扮演你是", "roleplay"),
+    "system_prompt_manipulation": ("system", "hidden", "override"),
+    "system_prompt_manipulation_zh": ("系统提示", "隐藏指令", "覆盖指令", "取消"),
+    "output_hijack_en": ("always", "must", "output", "you"),
+    "output_hijack_zh": ("你必须输出", "强制返回", "你只能输出", "你必须回复"),
+}
+
+_RULES = [(re.compile(pat), name, _LEADS[name]) for pat, name in _PATTERNS]
+
+# Non-ASCII letters that (?i) matches to ASCII ones but lower() leaves alone or
+# maps elsewhere: İ (i), ı (i), ſ (s), K (Kelvin sign, k). A lead search on the
+# lowered text would miss them.
+_ASCII_CASE_FOLDS = re.compile("[\u0130\u0131\u017f\u212a]")
+
+INJECTION_CACHE_SIZE = int(os.environ.get("ORACLE_INJECTION_CACHE_SIZE", "1024"))
+
+_scan_cache: "OrderedDict[bytes, Optional[tuple[str, str]]]" = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _scan(text: str) -> Optional[tuple[str, str]]:
+    """(pattern name, matched text) of the first pattern that matches, or None."""
+    lowered = text.lower()
+    if len(lowered) != len(text) or _ASCII_CASE_FOLDS.search(text):
+        # Positions or case folding no longer line up with the lowered text
+        for pattern, name, _ in _RULES:
+            m = pattern.search(text)
+            if m:
+                return name, m.group(0)
+        return None
+
+    for pattern, name, leads in _RULES:
+        positions = set()
+        for lead in leads:
+            pos = lowered.find(lead)
+            while pos != -1:
+                positions.add(pos)
+                pos = lowered.find(lead, pos + 1)
+        for pos in sorted(positions):
+            m = pattern.match(text, pos)
+            if m:
+                return name, m.group(0)
+    return None
+
+
+def _scan_cached(text: str) -> Optional[tuple[str, str]]:
+    key = hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+    with _cache_lock:
+        if key in _scan_cache:
+            _scan_cache.move_to_end(key)
+            return _scan_cache[key]
+    hit = _scan(text)
+    with _cache_lock:
+        _scan_cache[key] = hit
+        while len(_scan_cache) > INJECTION_CACHE_SIZE:
+            _scan_cache.popitem(last=False)
+    return hit
+
+
+def clear_scan_cache() -> None:
+    with _cache_lock:
+        _scan_cache.clear()
 
 
 def check(text: str, field: str) -> dict:
@@ -45,14 +134,14 @@ def check(text: str, field: str) -> dict:
     if not text:
         return {"detected": False, "reason": "", "field": field}
 
-    for pattern, name in _COMPILED:
-        m = pattern.search(text)
-        if m:
-            return {
-                "detected": True,
-                "reason": f"injection pattern '{name}' matched: '{m.group(0)[:80]}'",
-                "field": field,
-            }
+    hit = _scan_cached(text)
+    if hit:
+        name, matched = hit
+        return {
+            "detected": True,
+            "reason": f"injection pattern '{name}' matched: '{matched[:80]}'",
+            "field": field,
+        }
 
     return {"detected": False, "reason": "", "field": field}
 
@@ -0,0 +1,123 @@
+"""Content-addressed LLM response cache (SQLite file, shared by all oracle processes).
+
+Keyed by a hash of (mode, provider, model, system prompt, rendered prompt), so a
+retried tick, an identical resubmission or a re-run pipeline reads the earlier
+reply from disk instead of paying for the same tokens again.
+
+Env vars:
+    ORACLE_LLM_CACHE_PATH: SQLite file path; empty disables the cache (default "")
+    ORACLE_LLM_CACHE_MAX_MB: total stored reply size before LRU eviction (default 100)
+    ORACLE_LLM_CACHE_TTL: max entry age in seconds (default 604800 = 7 days)
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_cache (
+    key TEXT PRIMARY KEY,
+    response TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    last_access REAL NOT NULL
+)
+"""
+
+
+def make_key(mode: str, provider: str, model: str, system: str | None, prompt: str) -> str:
+    raw = json.dumps([mode, provider, model, system or "", prompt], ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    """Size- and age-bounded key/value store for raw LLM replies."""
+
+    def __init__(self, path: str, max_bytes: int, ttl_seconds: float):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=5, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(_SCHEMA)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_llm_cache_last_access ON llm_cache (last_access)")
+        self._conn.commit()
+
+    def get(self, key: str) -> str | None:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, created_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if now - row[1] > self.ttl_seconds:
+                self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            self._conn.execute("UPDATE llm_cache SET last_access = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            return row[0]
+
+    def put(self, key: str, response: str) -> None:
+        now = time.time()
+        size = len(response.encode("utf-8"))
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, response, size, created_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, response, size, now, now),
+            )
+            self._evict(now)
+            self._conn.commit()
+
+    def _evict(self, now: float) -> None:
+        self._conn.execute("DELETE FROM llm_cache WHERE created_at < ?", (now - self.ttl_seconds,))
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM llm_cache").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        # Drop least recently used entries until back under budget
+        freed = 0
+        doomed = []
+        for key, size in self._conn.execute("SELECT key, size FROM llm_cache ORDER BY last_access"):
+            if total - freed <= self.max_bytes:
+                break
+            doomed.append((key,))
+            freed += size
+        self._conn.executemany("DELETE FROM llm_cache WHERE key = ?", doomed)
+
+    def stats(self) -> dict:
+        with self._lock:
+            count, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_cache"
+            ).fetchone()
+        return {"entries": count, "bytes": total}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_cache: LLMCache | None = None
+_cache_path: str | None = None
+_cache_lock = threading.Lock()
+
+
+def get_cache() -> LLMCache | None:
+    """Return the cache configured by ORACLE_LLM_CACHE_PATH, or None when disabled."""
+    global _cache, _cache_path
+    path = os.environ.get("ORACLE_LLM_CACHE_PATH", "")
+    if not path:
+        return None
+    with _cache_lock:
+        if _cache is None or _cache_path != path:
+            if _cache is not None:
+                _cache.close()
+            max_mb = float(os.environ.get("ORACLE_LLM_CACHE_MAX_MB", "100"))
+            ttl = float(os.environ.get("ORACLE_LLM_CACHE_TTL", "604800"))
+            _cache = LLMCache(path, int(max_mb * 1024 * 1024), ttl)
+            _cache_path = path
+        return _cache
@@ -1,11 +1,34 @@
 """LLM API client wrapper. Supports Anthropic and OpenAI-compatible APIs (e.g. SiliconFlow)."""
 import json
 import os
+import sys
+import threading
+
+import llm_cache
+import llm_governor
 
 # Module-level usage accumulator (reset per oracle invocation)
 _accumulated_usage = {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
 
 
+# Response cache bookkeeping (reset per oracle invocation, like token usage)
+_cache_mode = ""
+_cache_stats = {"hits": 0, "misses": 0}
+_ZERO_USAGE = {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+
+
+def set_cache_mode(mode: str) -> None:
+    """Set the oracle mode that namespaces cache keys and reset hit/miss counters."""
+    global _cache_mode, _cache_stats
+    _cache_mode = mode
+    _cache_stats = {"hits": 0, "misses": 0}
+
+
+def get_cache_stats() -> dict:
+    """Return a copy of the response-cache hit/miss counters."""
+    return dict(_cache_stats)
+
+
 def reset_accumulated_usage():
     """Reset the accumulated token usage counters."""
     global _accumulated_usage
@@ -22,74 +45,144 @@ def _clean_surrogates(s: str) -> str:
     return s.encode("utf-8", errors="replace").decode("utf-8")
 
 
+# Client caches: building an SDK client per call throws away its HTTP keep-alive
+# pool, so every call would pay a fresh TCP/TLS handshake to the provider.
+_clients: dict[tuple, object] = {}
+_clients_lock = threading.Lock()
+
+
+def _provider_config() -> tuple[str, str, str]:
+    """Return (provider, model, base_url) from the environment."""
+    provider = os.environ.get("ORACLE_LLM_PROVIDER", "openai")
+    model = os.environ.get("ORACLE_LLM_MODEL", "")
+    base_url = os.environ.get("ORACLE_LLM_BASE_URL", "")
+    return provider, model, base_url
+
+
+def _client_key(provider: str, base_url: str, api_key: str | None) -> tuple:
+    if api_key is None:
+        api_key_env = "ANTHROPIC_API_KEY" if provider == "anthropic" else "OPENAI_API_KEY"
+        api_key = os.environ.get(api_key_env, "")
+    return (provider, base_url, api_key)
+
+
+def _build_client(provider: str, base_url: str, api_key: str):
+    # llm_governor owns retries: an SDK retry would sleep on the same key inside the
+    # in-flight lease before the governor could cool the key down and switch keys
+    kwargs = {"max_retries": 0}
+    if api_key:
+        kwargs["api_key"] = api_key
+    if provider == "openai":
+        import openai
+        if base_url:
+            kwargs["base_url"] = base_url
+        return openai.OpenAI(**kwargs)
+    elif provider == "anthropic":
+        import anthropic
+        return anthropic.Anthropic(**kwargs)
+    raise ValueError(f"Unsupported provider: {provider}")
+
+
+def get_client(provider: str, base_url: str = "", api_key: str | None = None):
+    """Return a cached SDK client for (provider, base URL, API key).
+    api_key=None uses the provider's single *_API_KEY env var."""
+    key = _client_key(provider, base_url, api_key)
+    with _clients_lock:
+        client = _clients.get(key)
+        if client is None:
+            client = _build_client(provider, base_url, key[2])
+            _clients[key] = client
+        return client
+
+
+def reset_clients() -> None:
+    """Drop all cached clients (e.g. after rotating API keys)."""
+    with _clients_lock:
+        _clients.clear()
+
+
+def _openai_messages(prompt: str, system: str | None) -> list[dict]:
+    messages = []
+    if system:
+        messages.append({"role": "system", "content": system})
+    messages.append({"role": "user", "content": prompt})
+    return messages
+
+
+def _openai_result(resp) -> tuple[str, dict]:
+    usage = {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+    if resp.usage:
+        usage["prompt_tokens"] = resp.usage.prompt_tokens or 0
+        usage["completion_tokens"] = resp.usage.completion_tokens or 0
+        usage["total_tokens"] = resp.usage.total_tokens or 0
+    _accumulate(usage)
+    return resp.choices[0].message.content, usage
+
+
+def _anthropic_result(resp) -> tuple[str, dict]:
+    usage = {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
+    if resp.usage:
+        usage["prompt_tokens"] = resp.usage.input_tokens or 0
+        usage["completion_tokens"] = resp.usage.output_tokens or 0
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+    _accumulate(usage)
+    return resp.content[0].text, usage
+
+
+def _accumulate(usage: dict) -> None:
+    _accumulated_usage["prompt_tokens"] += usage["prompt_tokens"]
+    _accumulated_usage["completion_tokens"] += usage["completion_tokens"]
+    _accumulated_usage["total_tokens"] += usage["total_tokens"]
+
+
+def _check_provider(provider: str) -> None:
+    if provider not in ("openai", "anthropic"):
+        raise ValueError(f"Unsupported provider: {provider}")
+
+
 def call_llm(prompt: str, system: str = None) -> tuple[str, dict]:
     """Call LLM API and return (text, usage_dict).
 
+    Calls go through llm_governor, which picks a key from the pool, holds the
+    call back while the RPM / TPM / in-flight limits have no headroom and
+    re-queues it after a 429.
+
     Env vars:
         ORACLE_LLM_PROVIDER: "anthropic" or "openai" (default "openai")
         ORACLE_LLM_MODEL: model name
         ORACLE_LLM_BASE_URL: base URL for OpenAI-compatible APIs (e.g. SiliconFlow)
-        ANTHROPIC_API_KEY: API key for Anthropic provider
-        OPENAI_API_KEY: API key for OpenAI-compatible provider
+        ANTHROPIC_API_KEY / ANTHROPIC_API_KEYS: API key (or comma-separated pool) for Anthropic
+        OPENAI_API_KEY / OPENAI_API_KEYS: API key (or comma-separated pool) for OpenAI-compatible providers
     """
     prompt = _clean_surrogates(prompt)
     if system:
         system = _clean_surrogates(system)
-    global _accumulated_usage
-    provider = os.environ.get("ORACLE_LLM_PROVIDER", "openai")
-    model = os.environ.get("ORACLE_LLM_MODEL", "")
-    base_url = os.environ.get("ORACLE_LLM_BASE_URL", "")
+    provider, model, base_url = _provider_config()
+    _check_provider(provider)
 
-    if provider == "openai":
-        import openai
-        kwargs = {}
-        if base_url:
-            kwargs["base_url"] = base_url
-        client = openai.OpenAI(**kwargs)
-        messages = []
-        if system:
-            messages.append({"role": "system", "content": system})
-        messages.append({"role": "user", "content": prompt})
-        resp = client.chat.completions.create(
-            model=model,
-            max_tokens=4096,
-            messages=messages,
-        )
-        usage = {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
-        if resp.usage:
-            usage["prompt_tokens"] = resp.usage.prompt_tokens or 0
-            usage["completion_tokens"] = resp.usage.completion_tokens or 0
-            usage["total_tokens"] = resp.usage.total_tokens or 0
-        _accumulated_usage["prompt_tokens"] += usage["prompt_tokens"]
-        _accumulated_usage["completion_tokens"] += usage["completion_tokens"]
-        _accumulated_usage["total_tokens"] += usage["total_tokens"]
-        return resp.choices[0].message.content, usage
-    elif provider == "anthropic":
-        import anthropic
-        client = anthropic.Anthropic()
+    def request(api_key: str) -> tuple[str, dict]:
+        if provider == "openai":
+            client = get_client(provider, base_url, api_key)
+            resp = client.chat.completions.create(
+                model=model,
+                max_tokens=4096,
+                messages=_openai_messages(prompt, system),
+            )
+            return _openai_result(resp)
+        client = get_client(provider, api_key=api_key)
         resp = client.messages.create(
             model=model or "claude-sonnet-4-20250514",
             max_tokens=4096,
             system=system or "",
             messages=[{"role": "user", "content": prompt}],
         )
-        usage = {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0}
-        if resp.usage:
-            usage["prompt_tokens"] = resp.usage.input_tokens or 0
-            usage["completion_tokens"] = resp.usage.output_tokens or 0
-            usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
-        _accumulated_usage["prompt_tokens"] += usage["prompt_tokens"]
-        _accumulated_usage["completion_tokens"] += usage["completion_tokens"]
-        _accumulated_usage["total_tokens"] += usage["total_tokens"]
-        return resp.content[0].text, usage
-    else:
-        raise ValueError(f"Unsupported provider: {provider}")
+        return _anthropic_result(resp)
 
+    return llm_governor.call(provider, llm_governor.estimate_tokens(prompt, system), request)
 
-def call_llm_json(prompt: str, system: str = None) -> tuple[dict, dict]:
-    """Call LLM and parse response as JSON. Returns (parsed_dict, usage_dict).
-    Strips markdown code fences if present."""
-    raw, usage = call_llm(prompt, system)
+
+def _parse_json_text(raw: str) -> dict:
+    """Parse an LLM reply as JSON, stripping markdown code fences if present."""
     text = raw.strip()
     if text.startswith("```"):
         lines = text.split("\n")
@@ -97,4 +190,42 @@ def call_llm_json(prompt: str, system: str = None) -> tuple[dict, dict]:
         if lines and lines[-1].strip() == "```":
             lines = lines[:-1]
         text = "\n".join(lines)
-    return json.loads(text), usage
+    return json.loads(text)
+
+
+def _cache_lookup(prompt: str, system: str | None) -> tuple[str | None, str | None]:
+    """Return (cache_key, cached_raw_reply); both None when caching is disabled."""
+    try:
+        cache = llm_cache.get_cache()
+        if cache is None:
+            return None, None
+        provider, model, _ = _provider_config()
+        key = llm_cache.make_key(_cache_mode, provider, model, system, prompt)
+        raw = cache.get(key)
+    except Exception as e:  # a broken cache must never block scoring
+        print(f"[llm_cache] lookup failed: {e}", file=sys.stderr, flush=True)
+        return None, None
+    _cache_stats["hits" if raw is not None else "misses"] += 1
+    return key, raw
+
+
+def _cache_store(key: str | None, raw: str) -> None:
+    if key is None:
+        return
+    try:
+        llm_cache.get_cache().put(key, raw)
+    except Exception as e:
+        print(f"[llm_cache] store failed: {e}", file=sys.stderr, flush=True)
+
+
+def call_llm_json(prompt: str, system: str = None) -> tuple[dict, dict]:
+    """Call LLM and parse response as JSON. Returns (parsed_dict, usage_dict).
+    Strips markdown code fences if present. Replies are served from / written to
+    the response cache when ORACLE_LLM_CACHE_PATH is set."""
+    key, cached = _cache_lookup(prompt, system)
+    if cached is not None:
+        return _parse_json_text(cached), dict(_ZERO_USAGE)
+    raw, usage = call_llm(prompt, system)
+    parsed = _parse_json_text(raw)
+    _cache_store(key, raw)
+    return parsed, usage
@@ -0,0 +1,393 @@
+"""Concurrency governor for provider LLM calls (token buckets + API key pool).
+
+Every call first leases capacity from a per-key requests-per-minute bucket, a
+per-key tokens-per-minute bucket and a global in-flight cap. When no key has
+headroom the call waits (queues) rather than failing. A 429 puts its key on
+cooldown for as long as the provider's Retry-After / rate-limit reset headers
+say, and the call is queued again, usually onto another key of the pool.
+
+State lives in a SQLite file (like llm_cache), so one-shot oracle subprocesses
+and pool workers draw from the same buckets. Without a path the state is
+private to the process.
+
+Env vars:
+    ORACLE_LLM_GOVERNOR_PATH: SQLite file shared by all oracle processes; empty = per process (default "")
+    ORACLE_LLM_RPM: requests per minute per API key; 0 = unlimited (default 0)
+    ORACLE_LLM_TPM: tokens per minute per API key; 0 = unlimited (default 0)
+    ORACLE_LLM_MAX_INFLIGHT: concurrent calls across all keys; 0 = unlimited (default 0)
+    ORACLE_LLM_QUEUE_TIMEOUT: max seconds a call waits for capacity (default 90)
+    ORACLE_LLM_RATE_LIMIT_RETRIES: times a rate-limited call is re-queued (default 5)
+    OPENAI_API_KEYS / ANTHROPIC_API_KEYS: comma-separated key pool, falling back
+        to the single OPENAI_API_KEY / ANTHROPIC_API_KEY
+"""
+import hashlib
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from datetime import datetime
+
+# A lease outliving the app's oracle timeout belongs to a killed process
+LEASE_TTL = 180
+# Completion tokens reserved per call until the real usage is known
+EST_COMPLETION_TOKENS = 1024
+# Cooldown when a 429 carries no usable header
+DEFAULT_COOLDOWN = 5.0
+# Retries for errors the SDK would otherwise have retried (its default is 2)
+TRANSIENT_RETRIES = 2
+TRANSIENT_BACKOFF = 0.5
+MAX_POLL = 1.0
+INFLIGHT_POLL = 0.05
+
+_SCHEMA = (
+    """CREATE TABLE IF NOT EXISTS governor_keys (
+        key_id TEXT PRIMARY KEY,
+        req_level REAL NOT NULL,
+        tok_level REAL NOT NULL,
+        updated_at REAL NOT NULL,
+        cooldown_until REAL NOT NULL DEFAULT 0
+    )""",
+    """CREATE TABLE IF NOT EXISTS governor_leases (
+        id TEXT PRIMARY KEY,
+        key_id TEXT NOT NULL,
+        est_tokens INTEGER NOT NULL,
+        expires_at REAL NOT NULL
+    )""",
+)
+
+
+class GovernorTimeout(RuntimeError):
+    """Raised when a call waited ORACLE_LLM_QUEUE_TIMEOUT without getting capacity."""
+
+
+@dataclass
+class Lease:
+    id: str
+    key_id: str
+    est_tokens: int
+    waited: float
+
+
+def key_id(provider: str, api_key: str) -> str:
+    """Stable, non-secret identifier for an API key (raw keys never reach the state file)."""
+    return hashlib.sha256(f"{provider}:{api_key}".encode("utf-8")).hexdigest()[:16]
+
+
+def api_keys(provider: str) -> list[str]:
+    """The key pool for a provider; [""] lets the SDK fall back to its own default."""
+    prefix = "ANTHROPIC" if provider == "anthropic" else "OPENAI"
+    pool = [k.strip() for k in os.environ.get(f"{prefix}_API_KEYS", "").split(",") if k.strip()]
+    return pool or [os.environ.get(f"{prefix}_API_KEY", "")]
+
+
+def estimate_tokens(prompt: str, system: str | None = None) -> int:
+    """Rough pre-call token count: ~4 UTF-8 bytes per token plus a completion reserve."""
+    size = len(prompt.encode("utf-8")) + len((system or "").encode("utf-8"))
+    return size // 4 + 1 + EST_COMPLETION_TOKENS
+
+
+_DURATION = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+_UNIT_SECONDS = {"h": 3600.0, "m": 60.0, "s": 1.0, "ms": 0.001}
+
+
+def _reset_seconds(value: str, now: float) -> float | None:
+    """Parse a reset header: "6m0s"/"20ms" durations, plain seconds or an RFC 3339 timestamp."""
+    value = value.strip()
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    parts = _DURATION.findall(value)
+    if parts and "".join(n + u for n, u in parts) == value:
+        return sum(float(n) * _UNIT_SECONDS[u] for n, u in parts)
+    try:
+        return max(datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp() - now, 0.0)
+    except ValueError:
+        return None
+
+
+def retry_after_seconds(headers, now: float | None = None) -> float | None:
+    """Seconds to back off according to a rate-limited response's headers.
+
+    Retry-After (seconds or HTTP date) and OpenAI's retry-after-ms win; otherwise
+    the longest reset among the limits the headers report as exhausted
+    (x-ratelimit-* for OpenAI-compatible APIs, anthropic-ratelimit-* for Anthropic).
+    """
+    if not headers:
+        return None
+    now = time.time() if now is None else now
+    h = {str(k).lower(): str(v) for k, v in headers.items()}
+    if "retry-after-ms" in h:
+        try:
+            return max(float(h["retry-after-ms"]) / 1000, 0.0)
+        except ValueError:
+            pass
+    if "retry-after" in h:
+        try:
+            return max(float(h["retry-after"]), 0.0)
+        except ValueError:
+            try:
+                return max(parsedate_to_datetime(h["retry-after"]).timestamp() - now, 0.0)
+            except (TypeError, ValueError):
+                pass
+    waits = []
+    for name, value in h.items():
+        if name.startswith("x-ratelimit-remaining-"):
+            reset = h.get("x-ratelimit-reset-" + name[len("x-ratelimit-remaining-"):])
+        elif name.startswith("anthropic-ratelimit-") and name.endswith("-remaining"):
+            reset = h.get(name[:-len("-remaining")] + "-reset")
+        else:
+            continue
+        if reset is None or value.strip() not in ("0", "0.0"):
+            continue
+        seconds = _reset_seconds(reset, now)
+        if seconds is not None:
+            waits.append(seconds)
+    return max(waits) if waits else None
+
+
+def _rate_limit_headers(exc: Exception):
+    """Headers of a 429 raised by either SDK, or None when exc is not a rate limit."""
+    if getattr(exc, "status_code", None) != 429:
+        return None
+    response = getattr(exc, "response", None)
+    return getattr(response, "headers", None) or {}
+
+
+class Governor:
+    """RPM/TPM token buckets per API key plus a global in-flight cap, kept in SQLite."""
+
+    def __init__(self, path: str, rpm: float, tpm: float, max_inflight: int, queue_timeout: float):
+        self.path = path
+        self.rpm = rpm
+        self.tpm = tpm
+        self.max_inflight = max_inflight
+        self.queue_timeout = queue_timeout
+        self._lock = threading.Lock()
+        # Autocommit mode so BEGIN IMMEDIATE serializes acquire/release across processes
+        self._conn = sqlite3.connect(path or ":memory:", timeout=10, check_same_thread=False,
+                                     isolation_level=None)
+        if path:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        for ddl in _SCHEMA:
+            self._conn.execute(ddl)
+
+    def _refill(self, row, now: float) -> tuple[float, float]:
+        _, req, tok, updated, _ = row
+        elapsed = max(now - updated, 0.0)
+        if self.rpm:
+            req = min(self.rpm, req + elapsed * self.rpm / 60)
+        if self.tpm:
+            tok = min(self.tpm, tok + elapsed * self.tpm / 60)
+        return req, tok
+
+    def _need_tokens(self, est_tokens: int) -> int:
+        # A call bigger than the whole bucket waits for a full bucket instead of forever
+        return int(min(est_tokens, self.tpm)) if self.tpm else 0
+
+    def try_acquire(self, key_ids: list[str], est_tokens: int, now: float | None = None):
+        """Take capacity on the key with the most headroom.
+
+        Returns (lease_id, key_id, 0) on success or (None, None, seconds_to_wait).
+        """
+        now = time.time() if now is None else now
+        need_tok = self._need_tokens(est_tokens)
+        with self._lock:
+            c = self._conn
+            c.execute("BEGIN IMMEDIATE")
+            try:
+                c.execute("DELETE FROM governor_leases WHERE expires_at < ?", (now,))
+                inflight = dict(c.execute(
+                    "SELECT key_id, COUNT(*) FROM governor_leases GROUP BY key_id").fetchall())
+                if self.max_inflight and sum(inflight.values()) >= self.max_inflight:
+                    c.execute("COMMIT")
+                    return None, None, INFLIGHT_POLL
+                rows = {r[0]: r for r in c.execute(
+                    f"SELECT * FROM governor_keys WHERE key_id IN ({','.join('?' * len(key_ids))})",
+                    key_ids)}
+                best, best_rank, waits, levels = None, None, [], {}
+                for kid in key_ids:
+                    row = rows.get(kid) or (kid, float(self.rpm), float(self.tpm), now, 0.0)
+                    req, tok = self._refill(row, now)
+                    levels[kid] = (req, tok)
+                    if row[4] > now:
+                        waits.append(row[4] - now)
+                        continue
+                    short_req = (1 - req) * 60 / self.rpm if self.rpm and req < 1 else 0.0
+                    short_tok = (need_tok - tok) * 60 / self.tpm if self.tpm and tok < need_tok else 0.0
+                    if short_req or short_tok:
+                        waits.append(max(short_req, short_tok))
+                        continue
+                    # Spread load: fewest calls in flight first, then the fullest token bucket
+                    rank = (inflight.get(kid, 0), -(tok / self.tpm if self.tpm else 0))
+                    if best is None or rank < best_rank:
+                        best, best_rank = kid, rank
+                lease_id = None
+                if best is not None:
+                    req, tok = levels[best]
+                    levels[best] = (req - 1 if self.rpm else req, tok - need_tok)
+                    lease_id = uuid.uuid4().hex
+                    c.execute("INSERT INTO governor_leases VALUES (?, ?, ?, ?)",
+                              (lease_id, best, need_tok, now + LEASE_TTL))
+                c.executemany(
+                    "INSERT INTO governor_keys (key_id, req_level, tok_level, updated_at) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT(key_id) DO UPDATE SET req_level = excluded.req_level, "
+                    "tok_level = excluded.tok_level, updated_at = excluded.updated_at",
+                    [(kid, req, tok, now) for kid, (req, tok) in levels.items()],
+                )
+                c.execute("COMMIT")
+            except BaseException:
+                c.execute("ROLLBACK")
+                raise
+        if lease_id is None:
+            return None, None, min(waits) if waits else INFLIGHT_POLL
+        return lease_id, best, 0.0
+
+    def _wait(self, key_ids: list[str], est_tokens: int, deadline: float, start: float):
+        lease_id, kid, wait = self.try_acquire(key_ids, est_tokens)
+        if lease_id is not None:
+            return Lease(lease_id, kid, self._need_tokens(est_tokens), time.monotonic() - start), 0.0
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise GovernorTimeout(
+                f"no LLM capacity within {self.queue_timeout:.0f}s "
+                f"(rpm={self.rpm:g}, tpm={self.tpm:g}, max_inflight={self.max_inflight})")
+        return None, min(max(wait, 0.01), MAX_POLL, remaining)
+
+    def acquire(self, key_ids: list[str], est_tokens: int) -> Lease:
+        """Block until a key has capacity for one call of est_tokens."""
+        start = time.monotonic()
+        deadline = start + self.queue_timeout
+        while True:
+            lease, sleep = self._wait(key_ids, est_tokens, deadline, start)
+            if lease is not None:
+                return lease
+            time.sleep(sleep)
+
+    def release(self, lease: Lease, used_tokens: int | None = None) -> None:
+        """End a call; with the real usage the token estimate is settled (refund or extra debit)."""
+        with self._lock:
+            c = self._conn
+            c.execute("BEGIN IMMEDIATE")
+            try:
+                c.execute("DELETE FROM governor_leases WHERE id = ?", (lease.id,))
+                if self.tpm and used_tokens is not None:
+                    c.execute("UPDATE governor_keys SET tok_level = MAX(tok_level + ?, ?) WHERE key_id = ?",
+                              (lease.est_tokens - used_tokens, -self.tpm, lease.key_id))
+                c.execute("COMMIT")
+            except BaseException:
+                c.execute("ROLLBACK")
+                raise
+
+    def cool_down(self, kid: str, seconds: float, now: float | None = None) -> None:
+        """Keep a rate-limited key out of rotation for `seconds` and empty its request bucket."""
+        now = time.time() if now is None else now
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO governor_keys (key_id, req_level, tok_level, updated_at, cooldown_until) "
+                "VALUES (?, 0, ?, ?, ?) ON CONFLICT(key_id) DO UPDATE SET req_level = 0, "
+                "cooldown_until = MAX(cooldown_until, excluded.cooldown_until)",
+                (kid, float(self.tpm), now, now + seconds),
+            )
+
+    def stats(self) -> dict:
+        now = time.time()
+        with self._lock:
+            inflight = self._conn.execute(
+                "SELECT COUNT(*) FROM governor_leases WHERE expires_at >= ?", (now,)).fetchone()[0]
+            cooling = self._conn.execute(
+                "SELECT COUNT(*) FROM governor_keys WHERE cooldown_until > ?", (now,)).fetchone()[0]
+        return {"in_flight": inflight, "keys_cooling_down": cooling}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_governor: Governor | None = None
+_governor_config: tuple | None = None
+_governor_lock = threading.Lock()
+
+
+def get_governor() -> Governor:
+    """Return the governor for the current env configuration (rebuilt when it changes)."""
+    global _governor, _governor_config
+    config = (
+        os.environ.get("ORACLE_LLM_GOVERNOR_PATH", ""),
+        float(os.environ.get("ORACLE_LLM_RPM", "0")),
+        float(os.environ.get("ORACLE_LLM_TPM", "0")),
+        int(os.environ.get("ORACLE_LLM_MAX_INFLIGHT", "0")),
+        float(os.environ.get("ORACLE_LLM_QUEUE_TIMEOUT", "90")),
+    )
+    with _governor_lock:
+        if _governor is None or _governor_config != config:
+            if _governor is not None:
+                _governor.close()
+            _governor = Governor(*config)
+            _governor_config = config
+        return _governor
+
+
+def _retries() -> int:
+    return int(os.environ.get("ORACLE_LLM_RATE_LIMIT_RETRIES", "5"))
+
+
+def _is_transient(exc: Exception) -> bool:
+    """Errors the SDKs would have retried themselves: connection errors, timeouts, 408/409, 5xx."""
+    status = getattr(exc, "status_code", None)
+    if status is not None:
+        return status in (408, 409) or status >= 500
+    return any(c.__name__ == "APIConnectionError" for c in type(exc).__mro__)
+
+
+def _on_rate_limit(gov: Governor, lease: Lease, headers) -> None:
+    seconds = retry_after_seconds(headers)
+    seconds = DEFAULT_COOLDOWN if seconds is None else seconds
+    gov.cool_down(lease.key_id, seconds)
+    print(f"[llm_governor] 429 on key {lease.key_id[:8]}, cooling down {seconds:.1f}s",
+          file=sys.stderr, flush=True)
+
+
+def _retry_delay(gov: Governor, lease: Lease, exc: Exception, tries: dict) -> float | None:
+    """Seconds to wait before re-queuing a failed call, or None when it should raise.
+
+    Governed clients are built with max_retries=0, so every retry happens here,
+    outside the in-flight lease.
+    """
+    headers = _rate_limit_headers(exc)
+    if headers is not None:
+        if tries["rate_limit"] >= _retries():
+            return None
+        tries["rate_limit"] += 1
+        _on_rate_limit(gov, lease, headers)
+        return 0.0      # the key's cooldown does the waiting; another key may be free now
+    if _is_transient(exc) and tries["transient"] < TRANSIENT_RETRIES:
+        tries["transient"] += 1
+        return min(TRANSIENT_BACKOFF * 2 ** (tries["transient"] - 1), MAX_POLL * 8)
+    return None
+
+
+def call(provider: str, est_tokens: int, fn):
+    """Run fn(api_key) -> (result, usage) under the governor, re-queuing on 429."""
+    gov = get_governor()
+    pool = {key_id(provider, k): k for k in api_keys(provider)}
+    tries = {"rate_limit": 0, "transient": 0}
+    while True:
+        lease = gov.acquire(list(pool), est_tokens)
+        try:
+            result, usage = fn(pool[lease.key_id])
+        except Exception as e:
+            gov.release(lease)
+            delay = _retry_delay(gov, lease, e, tries)
+            if delay is None:
+                raise
+            time.sleep(delay)
+            continue
+        gov.release(lease, usage.get("total_tokens"))
+        return result, usage
+
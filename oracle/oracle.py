@@ -32,6 +32,7 @@ def _register_v2_modules():
         from gate_check import run as gate_check_run
         from score_individual import run as score_individual_run
         from dimension_score import run as dimension_score_run
+        from gate_and_score import run as gate_and_score_run
         global _injection_guard
         import injection_guard as _injection_guard_module
         _injection_guard = _injection_guard_module
@@ -40,6 +41,7 @@ def _register_v2_modules():
             "gate_check": gate_check_run,
             "score_individual": score_individual_run,
             "dimension_score": dimension_score_run,
+            "gate_and_score": gate_and_score_run,
         }
     except ImportError:
         pass  # V2 modules not yet available, fall back to legacy
@@ -56,45 +58,81 @@ def _legacy_handler(payload: dict) -> dict:
         return {"score": score, "feedback": f"Stub oracle: random score {score}"}
 
 
-def main():
-    payload = json.loads(sys.stdin.read())
+def dispatch(payload: dict) -> dict:
+    """Run a single oracle request and return its JSON-serializable result.
+
+    Shared by the one-shot subprocess entry point and the persistent worker
+    loop, so every mode is routed from here.
+    """
     mode = payload.get("mode", "score")
 
     _register_v2_modules()
 
-    if mode in V2_MODES:
-        from llm_client import reset_accumulated_usage, get_accumulated_usage
-        reset_accumulated_usage()
-
-        # Injection guard: run before any LLM call
-        if mode in ("gate_check", "score_individual", "dimension_score"):
-            if _injection_guard is not None:
-                guard = _injection_guard.check_payload(payload, mode)
-                if guard["detected"]:
-                    result = {
-                        "injection_detected": True,
-                        "reason": guard["reason"],
-                        "field": guard["field"],
-                        "_token_usage": get_accumulated_usage(),
-                    }
-                    print(json.dumps(result))
-                    return
+    if mode not in V2_MODES:
+        return _legacy_handler(payload)
+
+    from llm_client import (
+        reset_accumulated_usage, get_accumulated_usage, set_cache_mode, get_cache_stats,
+    )
+    reset_accumulated_usage()
+    set_cache_mode(mode)
+
+    # Injection guard: run before any LLM call
+    if mode in ("gate_check", "score_individual", "dimension_score", "gate_and_score"):
+        if _injection_guard is not None:
+            guard = _injection_guard.check_payload(payload, mode)
+            if guard["detected"]:
+                return {
+                    "injection_detected": True,
+                    "reason": guard["reason"],
+                    "field": guard["field"],
+                    "_token_usage": get_accumulated_usage(),
+                }
+
+    try:
+        result = V2_MODES[mode](payload)
+        result["_token_usage"] = get_accumulated_usage()
+    except Exception as e:
+        result = {
+            "injection_detected": False,
+            "error": str(e),
+            "_token_usage": get_accumulated_usage(),
+        }
+    result["_cache"] = get_cache_stats()
+    return result
+
+
+def serve():
+    """Persistent worker loop: one JSON request per stdin line, one JSON reply per stdout line.
 
+    Used by the oracle worker pool (app/services/oracle_pool.py) so the
+    interpreter, SDKs and V2 modules are imported once per worker instead of
+    once per call.
+    """
+    out = sys.stdout
+    # Anything the modes print must not corrupt the reply stream.
+    sys.stdout = sys.stderr
+    _register_v2_modules()
+    out.write(json.dumps({"ready": True}) + "\n")
+    out.flush()
+    for line in sys.stdin:
+        line = line.strip()
+        if not line:
+            continue
         try:
-            result = V2_MODES[mode](payload)
-            result["_token_usage"] = get_accumulated_usage()
+            result = dispatch(json.loads(line))
         except Exception as e:
-            result = {
-                "injection_detected": False,
-                "error": str(e),
-                "_token_usage": get_accumulated_usage(),
-            }
-            print(json.dumps(result))
-            return
-    else:
-        result = _legacy_handler(payload)
+            result = {"error": f"worker failure: {e}"}
+        out.write(json.dumps(result) + "\n")
+        out.flush()
 
-    print(json.dumps(result))
+
+def main():
+    if "--serve" in sys.argv[1:]:
+        serve()
+        return
+    payload = json.loads(sys.stdin.read())
+    print(json.dumps(dispatch(payload)))
 
 
 if __name__ == "__main__":
@@ -6,6 +6,22 @@ from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
 
+def _test_broker(session_factory):
+    """Event broker bound to the test database (SSE streams, submission long-poll)."""
+    from app.services.events import EventBroker
+    broker = EventBroker(session_factory=session_factory, poll_interval=0.05)
+    return lambda: broker
+
+
+@pytest.fixture(autouse=True)
+def _clear_dimension_cache():
+    """Task ids are unique per test, but keep the process-wide dimension LRU from leaking anyway."""
+    from app.services.dimension_cache import clear_dimension_cache
+    clear_dimension_cache()
+    yield
+    clear_dimension_cache()
+
+
 @pytest.fixture
 def db_session():
     from app.database import Base
@@ -26,6 +42,7 @@ def db_session():
 def client():
     from app.database import Base, get_db
     from app.main import app
+    from app.services.events import get_event_broker
 
     test_engine = create_engine(
         "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
@@ -41,12 +58,20 @@ def client():
             db.close()
 
     app.dependency_overrides[get_db] = override_db
+    app.dependency_overrides[get_event_broker] = _test_broker(TestSession)
 
-    # Prevent lifespan from touching the real DB or starting scheduler
-    # Also mock generate_dimensions to avoid real LLM subprocess calls in tests
+    # Prevent lifespan from touching the real DB or starting scheduler / job dispatcher /
+    # lifecycle engine / webhook dispatcher / tx confirmer / escrow relayer.
+    # Oracle jobs are only enqueued, so no real LLM subprocess runs in tests.
     with patch("app.main.create_scheduler", return_value=MagicMock()), \
          patch("app.main.run_migrations"), \
-         patch("app.routers.tasks.generate_dimensions"):
+         patch("app.main.start_job_dispatcher"), \
+         patch("app.main.start_lifecycle_engine"), \
+         patch("app.main.start_webhook_dispatcher"), \
+         patch("app.main.start_tx_confirmer"), \
+         patch("app.main.start_escrow_relayer"), \
+         patch("app.main.start_payout_batcher"), \
+         patch("app.main.start_chain_indexer"):
         with TestClient(app) as c:
             yield c
 
@@ -59,6 +84,7 @@ def client_with_db():
     """Yields (TestClient, db_session) sharing the same in-memory engine."""
     from app.database import Base, get_db
     from app.main import app
+    from app.services.events import get_event_broker
 
     test_engine = create_engine(
         "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
@@ -74,10 +100,17 @@ def client_with_db():
             db.close()
 
     app.dependency_overrides[get_db] = override_db
+    app.dependency_overrides[get_event_broker] = _test_broker(TestSession)
 
     with patch("app.main.create_scheduler", return_value=MagicMock()), \
          patch("app.main.run_migrations"), \
-         patch("app.routers.tasks.generate_dimensions"):
+         patch("app.main.start_job_dispatcher"), \
+         patch("app.main.start_lifecycle_engine"), \
+         patch("app.main.start_webhook_dispatcher"), \
+         patch("app.main.start_tx_confirmer"), \
+         patch("app.main.start_escrow_relayer"), \
+         patch("app.main.start_payout_batcher"), \
+         patch("app.main.start_chain_indexer"):
         with TestClient(app) as c:
             db = TestSession()
             try:
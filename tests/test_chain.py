@@ -0,0 +1,151 @@
+"""Tests for the shared chain access layer: provider reuse, contract memoization, nonce allocation."""
+import os
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.services import chain
+from app.services.chain import NonceAllocator
+
+ANVIL_KEY = "0xac0974bec39a17e36ba4a6b4d238ff944bacb478cbed5efcae784d7bf4f2ff80"
+
+
+@pytest.fixture(autouse=True)
+def _fresh_chain_state():
+    chain.reset()
+    yield
+    chain.reset()
+
+
+def _mock_w3(start_nonce=7):
+    w3 = MagicMock()
+    w3.eth.get_transaction_count.return_value = start_nonce
+    w3.eth.gas_price = 1000
+    w3.eth.chain_id = 84532
+    w3.eth.account.from_key.return_value.address = "0x" + "aa" * 20
+    w3.eth.send_raw_transaction.side_effect = lambda raw: os.urandom(32)
+    w3.eth.wait_for_transaction_receipt.return_value = {"status": 1}
+    return w3
+
+
+def test_get_w3_is_built_once():
+    with patch("app.services.chain.requests.Session", wraps=chain.requests.Session) as session_cls:
+        w3 = chain.get_w3()
+        assert chain.get_w3() is w3
+    assert session_cls.call_count == 1
+    assert w3.provider.endpoint_uri == chain.RPC_URL
+
+
+def test_nonces_are_allocated_locally_across_threads():
+    w3 = _mock_w3(start_nonce=7)
+    allocator = NonceAllocator("0x" + "aa" * 20)
+    got = []
+
+    def worker():
+        for _ in range(20):
+            got.append(allocator.allocate(w3))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert sorted(got) == list(range(7, 7 + 160))
+    w3.eth.get_transaction_count.assert_called_once_with("0x" + "aa" * 20, "pending")
+
+
+def test_released_nonce_is_reused_and_gaps_resync():
+    w3 = _mock_w3(start_nonce=0)
+    allocator = NonceAllocator("0xabc")
+    assert [allocator.allocate(w3) for _ in range(3)] == [0, 1, 2]
+    allocator.release(2)                  # latest: just step back
+    assert allocator.allocate(w3) == 2
+    allocator.release(1)                  # leaves a gap: re-read from the node
+    w3.eth.get_transaction_count.return_value = 1
+    assert allocator.allocate(w3) == 1
+    assert w3.eth.get_transaction_count.call_count == 2
+
+
+def test_send_transaction_uses_local_nonces_and_cached_chain_id():
+    w3 = _mock_w3(start_nonce=5)
+    chain.configure(w3)
+    fn = MagicMock()
+    fn.build_transaction.side_effect = lambda params: dict(params)
+
+    hashes = [chain.send_transaction(fn, gas=100_000, description="t") for _ in range(3)]
+    assert len(set(hashes)) == 3
+    nonces = [call.args[0]["nonce"] for call in fn.build_transaction.call_args_list]
+    assert nonces == [5, 6, 7]
+    assert all(call.args[0]["chainId"] == 84532 for call in fn.build_transaction.call_args_list)
+    assert w3.eth.get_transaction_count.call_count == 1
+
+
+def test_failed_broadcast_hands_the_nonce_back():
+    w3 = _mock_w3(start_nonce=3)
+    chain.configure(w3)
+    fn = MagicMock()
+    fn.build_transaction.side_effect = lambda params: dict(params)
+    w3.eth.send_raw_transaction.side_effect = [ConnectionError("rpc down"), b"\x01" * 32]
+
+    with pytest.raises(ConnectionError):
+        chain.send_transaction(fn, gas=100_000, description="t")
+    chain.send_transaction(fn, gas=100_000, description="t")
+    nonces = [call.args[0]["nonce"] for call in fn.build_transaction.call_args_list]
+    assert nonces == [3, 3]
+
+
+def test_reverted_transaction_raises():
+    w3 = _mock_w3()
+    w3.eth.wait_for_transaction_receipt.return_value = {"status": 0}
+    chain.configure(w3)
+    fn = MagicMock()
+    fn.build_transaction.side_effect = lambda params: dict(params)
+    with pytest.raises(RuntimeError, match="reverted"):
+        chain.send_transaction(fn, gas=100_000, description="transfer(x)")
+
+
+def test_contracts_and_abi_are_memoized():
+    w3 = _mock_w3()
+    chain.configure(w3)
+    abi = [{"name": "transfer", "type": "function", "inputs": [], "outputs": []}]
+    a = chain.get_contract("0x" + "11" * 20, abi)
+    b = chain.get_contract("0x" + "11" * 20, abi)
+    assert a is b
+    assert w3.eth.contract.call_count == 1
+    assert chain.load_abi("NoSuchContract", fallback=abi) is abi
+    with pytest.raises(FileNotFoundError):
+        chain.load_abi("NoSuchContract")
+
+
+@pytest.fixture
+def local_chain():
+    """A real dev chain: anvil when ANVIL_RPC_URL is set, otherwise in-process eth-tester."""
+    from web3 import Web3
+    if os.environ.get("ANVIL_RPC_URL"):
+        yield Web3(Web3.HTTPProvider(os.environ["ANVIL_RPC_URL"])), ANVIL_KEY
+        return
+    eth_tester = pytest.importorskip("eth_tester")
+    tester = eth_tester.EthereumTester()
+    yield Web3(Web3.EthereumTesterProvider(tester)), tester.backend.account_keys[0].to_hex()
+
+
+def test_back_to_back_transfers_on_local_chain(local_chain):
+    w3, key = local_chain
+    chain.configure(w3)
+    recipient = w3.eth.account.create().address
+
+    with patch("app.services.chain.PLATFORM_PRIVATE_KEY", key):
+        sender = chain.platform_account().address
+        start = w3.eth.get_transaction_count(sender)
+        with patch.object(w3.eth, "get_transaction_count",
+                          wraps=w3.eth.get_transaction_count) as count:
+            hashes = [chain.send_transaction({"to": recipient, "value": 1}, gas=21_000,
+                                             description="value", wait=False)
+                      for _ in range(5)]
+        assert count.call_count == 1   # nonces after the first come from memory
+
+    receipts = [w3.eth.wait_for_transaction_receipt(h, timeout=30) for h in hashes]
+    assert all(r["status"] == 1 for r in receipts)
+    assert w3.eth.get_transaction_count(sender) == start + 5
+    assert w3.eth.get_balance(recipient) == 5
@@ -26,7 +26,7 @@ def make_quality_task(client, bounty=10.0):
 
 
 def submit(client, task_id, worker_id, content="answer"):
-    with patch("app.routers.submissions.invoke_oracle"):
+    with patch("app.routers.submissions.wake_job_dispatcher"):
         return client.post(
             f"/tasks/{task_id}/submissions",
             json={"worker_id": worker_id, "content": content},
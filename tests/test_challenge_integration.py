@@ -26,7 +26,7 @@ def test_manual_arbitrate_endpoint(client):
         }, headers=PAYMENT_HEADERS).json()
 
     # Submit
-    with patch("app.routers.submissions.invoke_oracle"):
+    with patch("app.routers.submissions.wake_job_dispatcher"):
         s1 = client.post(f"/tasks/{task['id']}/submissions",
                          json={"worker_id": "w1", "content": "a"}).json()
         s2 = client.post(f"/tasks/{task['id']}/submissions",
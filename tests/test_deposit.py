@@ -27,7 +27,7 @@ def make_quality_task(client, bounty=10.0, submission_deposit=1.0):
 def test_quality_first_submission_no_deposit(client):
     """quality_first submissions no longer require deposit (deposits are for challenges only)."""
     task = make_quality_task(client, bounty=10.0, submission_deposit=1.0)
-    with patch("app.routers.submissions.invoke_oracle"):
+    with patch("app.routers.submissions.wake_job_dispatcher"):
         resp = client.post(f"/tasks/{task['id']}/submissions", json={
             "worker_id": "w1", "content": "answer"
         })
@@ -46,7 +46,7 @@ def test_fastest_first_no_deposit(client):
     }
     with PAYMENT_MOCK:
         task = client.post("/tasks", json=body, headers=PAYMENT_HEADERS).json()
-    with patch("app.routers.submissions.invoke_oracle"):
+    with patch("app.routers.submissions.wake_job_dispatcher"):
         resp = client.post(f"/tasks/{task['id']}/submissions", json={
             "worker_id": "w1", "content": "answer"
         })
@@ -0,0 +1,111 @@
+"""Tests for the per-task scoring dimension bundle cache."""
+import json
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base
+from app.models import ScoringDimension, Task, TaskType
+from app.services import dimension_cache
+from app.services.dimension_cache import get_dimension_bundle
+
+MOCK_DIM_RESULT = json.dumps({
+    "dimensions": [
+        {"id": "substantiveness", "name": "实质性", "type": "fixed",
+         "description": "内容质量", "weight": 0.6, "scoring_guidance": "g1"},
+        {"id": "data_precision", "name": "数据精度", "type": "dynamic",
+         "description": "准确性", "weight": 0.4, "scoring_guidance": "g2"},
+    ],
+})
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    return engine
+
+
+def _task(db) -> Task:
+    task = Task(title="T", description="d", type=TaskType.quality_first, bounty=10.0,
+                deadline=datetime(2026, 12, 31, tzinfo=timezone.utc))
+    db.add(task)
+    db.commit()
+    return task
+
+
+def _count_dimension_queries(engine) -> list:
+    seen = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _record(conn, cursor, statement, *args):
+        if "FROM scoring_dimensions" in statement:
+            seen.append(statement)
+    return seen
+
+
+def test_generate_dimensions_fills_cache(engine):
+    from app.services.oracle import generate_dimensions
+    db = sessionmaker(bind=engine)()
+    task = _task(db)
+    result = type("R", (), {"stdout": MOCK_DIM_RESULT, "returncode": 0})()
+    with patch("app.services.oracle.subprocess.run", return_value=result):
+        generate_dimensions(db, task)
+
+    queries = _count_dimension_queries(engine)
+    bundle = get_dimension_bundle(db, task.id)
+    assert queries == []
+    assert bundle.dim_ids == ("substantiveness", "data_precision")
+    assert bundle.weights == (0.6, 0.4)
+    assert bundle.fixed_dim_ids == frozenset({"substantiveness"})
+    assert bundle.payload[0] == {"id": "substantiveness", "name": "实质性", "description": "内容质量",
+                                 "weight": 0.6, "scoring_guidance": "g1"}
+    assert bundle.penalty_dims[1] == {"dim_id": "data_precision", "dim_type": "dynamic", "weight": 0.4}
+
+
+def test_miss_loads_once_and_empty_task_is_not_cached(engine):
+    db = sessionmaker(bind=engine)()
+    task = _task(db)
+    queries = _count_dimension_queries(engine)
+
+    assert get_dimension_bundle(db, task.id) is None
+    db.add(ScoringDimension(task_id=task.id, dim_id="completeness", name="完整性", dim_type="fixed",
+                            description="d", weight=1.0, scoring_guidance="g"))
+    db.commit()
+    # Dimensions generated after an empty lookup are still picked up
+    assert get_dimension_bundle(db, task.id).dim_ids == ("completeness",)
+    assert get_dimension_bundle(db, task.id).dim_ids == ("completeness",)
+    assert len(queries) == 2
+
+
+def test_lru_is_bounded(engine):
+    db = sessionmaker(bind=engine)()
+    with patch("app.services.dimension_cache.DIMENSION_CACHE_SIZE", 2):
+        for task_id in ("a", "b", "c"):
+            dimension_cache.put_dimension_bundle(task_id, [])
+        get_dimension_bundle(db, "b")       # touch b so c is the least recently used
+        dimension_cache.put_dimension_bundle("d", [])
+    assert list(dimension_cache._bundles) == ["b", "d"]
+
+
+def test_task_detail_serves_cached_dimensions(client):
+    from app.services.dimension_cache import put_dimension_bundle
+    with patch("app.routers.tasks.verify_payment", return_value={"valid": True, "tx_hash": "0xtest"}), \
+         patch("app.routers.tasks.enqueue_dimension_job"):
+        resp = client.post("/tasks", json={
+            "title": "T", "description": "d", "type": "quality_first",
+            "deadline": "2030-01-01T00:00:00Z", "bounty": 10.0,
+            "publisher_id": "pub", "acceptance_criteria": ["c1"],
+        }, headers={"X-PAYMENT": "test"})
+    assert resp.status_code == 201
+    task_id = resp.json()["id"]
+    row = ScoringDimension(task_id=task_id, dim_id="credibility", name="可信度", dim_type="fixed",
+                           description="d", weight=1.0, scoring_guidance="g")
+    put_dimension_bundle(task_id, [row])
+
+    dims = client.get(f"/tasks/{task_id}").json()["scoring_dimensions"]
+    assert [d["dim_id"] for d in dims] == ["credibility"]
@@ -0,0 +1,166 @@
+"""Tests for the submission_dimension_scores table."""
+import json
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base
+from app.models import (
+    DimensionScoreStage, ScoringDimension, Submission, SubmissionDimensionScore, SubmissionStatus,
+    Task, TaskType,
+)
+from app.services.dimension_scores import feedback_stage, load_dimension_scores, record_dimension_scores
+
+INDIVIDUAL = {
+    "dimension_scores": {
+        "substantiveness": {"band": "B", "score": 72, "evidence": "e1", "feedback": "ok"},
+        "data_precision": {"band": "A", "score": 91, "evidence": "e2", "feedback": "ok"},
+    },
+    "revision_suggestions": [],
+}
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(bind=engine)()
+
+
+def _task(db) -> Task:
+    task = Task(title="T", description="d", type=TaskType.quality_first, bounty=10.0,
+                deadline=datetime(2026, 12, 31, tzinfo=timezone.utc))
+    db.add(task)
+    db.flush()
+    for dim_id, dim_type in (("substantiveness", "fixed"), ("data_precision", "dynamic")):
+        db.add(ScoringDimension(task_id=task.id, dim_id=dim_id, name=dim_id, dim_type=dim_type,
+                                description="d", weight=0.5, scoring_guidance="g"))
+    db.commit()
+    return task
+
+
+def _rows(db, sub_id, stage):
+    return {r.dim_id: r for r in db.query(SubmissionDimensionScore).filter_by(
+        submission_id=sub_id, stage=stage)}
+
+
+def test_feedback_stage():
+    assert feedback_stage({"type": "individual_scoring", "dimension_scores": {}}) == DimensionScoreStage.individual
+    assert feedback_stage({"type": "scoring", "dimension_scores": {}}) == DimensionScoreStage.individual
+    assert feedback_stage({"type": "scoring", "rank": 1, "dimension_scores": {}}) == DimensionScoreStage.comparative
+    assert feedback_stage({"type": "scoring", "score": 0.8}) is None
+    assert feedback_stage({"type": "gate_check", "overall_passed": True}) is None
+
+
+def test_give_feedback_writes_individual_rows(db):
+    from app.services.oracle import give_feedback
+    task = _task(db)
+    sub = Submission(task_id=task.id, worker_id="w1", content="c", status=SubmissionStatus.pending)
+    db.add(sub)
+    db.commit()
+
+    replies = iter([{"overall_passed": True, "criteria_checks": []}, INDIVIDUAL])
+    with patch("app.services.oracle._call_oracle", side_effect=lambda *a, **k: next(replies)):
+        give_feedback(db, sub.id, task.id)
+
+    rows = _rows(db, sub.id, DimensionScoreStage.individual)
+    assert {d: (r.band, r.score, r.evidence) for d, r in rows.items()} == {
+        "substantiveness": ("B", 72.0, "e1"), "data_precision": ("A", 91.0, "e2"),
+    }
+    assert rows["substantiveness"].task_id == task.id and rows["substantiveness"].worker_id == "w1"
+
+    # Re-recording the same stage replaces the rows instead of duplicating them
+    record_dimension_scores(db, sub, DimensionScoreStage.individual,
+                            {"substantiveness": {"band": "C", "score": 60}})
+    db.commit()
+    assert list(_rows(db, sub.id, DimensionScoreStage.individual)) == ["substantiveness"]
+
+
+def test_load_dimension_scores_chunks_large_id_lists(db):
+    task = _task(db)
+    subs = [Submission(task_id=task.id, worker_id=f"w{i}", content="c", status=SubmissionStatus.gate_passed)
+            for i in range(3)]
+    db.add_all(subs)
+    db.flush()
+    for sub in subs:
+        record_dimension_scores(db, sub, DimensionScoreStage.individual, INDIVIDUAL["dimension_scores"])
+    db.commit()
+
+    ids = [s.id for s in subs] + [f"missing-{i}" for i in range(2000)]
+    params = []
+
+    def listen(conn, cursor, statement, parameters, context, executemany):
+        params.append(len(parameters))
+
+    event.listen(db.get_bind(), "before_cursor_execute", listen)
+    try:
+        stored = load_dimension_scores(db, ids, DimensionScoreStage.individual)
+    finally:
+        event.remove(db.get_bind(), "before_cursor_execute", listen)
+    # 2003 ids in three queries, each under SQLite's bound-parameter limit
+    assert len(params) == 3 and max(params) < 999
+    assert set(stored) == {s.id for s in subs}
+    assert stored[subs[0].id]["data_precision"].score == 91.0
+    assert load_dimension_scores(db, [], DimensionScoreStage.individual) == {}
+
+
+def test_batch_ranks_from_rows_and_writes_comparative(db):
+    from app.services.oracle import batch_score_submissions
+    task = _task(db)
+    subs = []
+    for worker, (s1, s2) in (("w1", (60, 70)), ("w2", (90, 95))):
+        sub = Submission(task_id=task.id, worker_id=worker, content=worker,
+                         status=SubmissionStatus.gate_passed,
+                         oracle_feedback=json.dumps({"type": "individual_scoring"}))
+        db.add(sub)
+        db.flush()
+        # Scores only live in the table; the blob carries none
+        record_dimension_scores(db, sub, DimensionScoreStage.individual, {
+            "substantiveness": {"band": "B", "score": s1, "evidence": f"{worker}-s"},
+            "data_precision": {"band": "B", "score": s2, "evidence": f"{worker}-d"},
+        })
+        subs.append(sub)
+    db.commit()
+
+    payloads = []
+
+    def fake_many(batch, meta=None):
+        payloads.extend(batch)
+        return [{"scores": [
+            {"submission": "Submission_A", "raw_score": 88, "final_score": 90, "evidence": "a"},
+            {"submission": "Submission_B", "raw_score": 60, "final_score": 62, "evidence": "b"},
+        ]} for _ in batch]
+
+    with patch("app.services.oracle._call_oracle_many", side_effect=fake_many):
+        batch_score_submissions(db, task.id)
+
+    # w2 ranks first on the stored individual scores and its evidence reaches dimension_score
+    assert [s["payload"] for s in payloads[0]["submissions"]] == ["w2", "w1"]
+    assert payloads[0]["individual_ir"]["Submission_A"] == {"band": "B", "evidence": "w2-s"}
+
+    winner = _rows(db, subs[1].id, DimensionScoreStage.comparative)["substantiveness"]
+    assert (winner.band, winner.score, winner.raw_score, winner.evidence) == ("B", 90.0, 88.0, "a")
+    # Individual rows survive the comparative write-back
+    assert _rows(db, subs[1].id, DimensionScoreStage.individual)["substantiveness"].score == 90.0
+
+
+def test_dimension_scores_endpoint_returns_top_n(client_with_db):
+    client, db = client_with_db
+    task = _task(db)
+    for i, score in enumerate((40, 85, None, 70)):
+        sub = Submission(task_id=task.id, worker_id=f"w{i}", content="c", status=SubmissionStatus.scored)
+        db.add(sub)
+        db.flush()
+        record_dimension_scores(db, sub, DimensionScoreStage.individual,
+                                {"substantiveness": {"band": "B", "score": score}})
+    db.commit()
+
+    resp = client.get(f"/tasks/{task.id}/dimension-scores",
+                      params={"dim_id": "substantiveness", "limit": 2})
+    assert resp.status_code == 200
+    assert [(r["worker_id"], r["score"]) for r in resp.json()] == [("w1", 85.0), ("w3", 70.0)]
+    assert client.get("/tasks/missing/dimension-scores", params={"dim_id": "x"}).status_code == 404
@@ -30,6 +30,7 @@ from app.services.oracle import (
     compute_penalized_total, PENALTY_THRESHOLD,
 )
 from app.scheduler import quality_first_lifecycle
+from app.services.escrow_outbox import relay_pending
 
 # ---------------------------------------------------------------------------
 # Fixtures
@@ -69,7 +70,14 @@ def client():
 
     app.dependency_overrides[get_db] = override_db
     with patch("app.main.create_scheduler", return_value=MagicMock()), \
-         patch("app.main.run_migrations"):
+         patch("app.main.run_migrations"), \
+         patch("app.main.start_job_dispatcher"), \
+         patch("app.main.start_lifecycle_engine"), \
+         patch("app.main.start_webhook_dispatcher"), \
+         patch("app.main.start_tx_confirmer"), \
+         patch("app.main.start_escrow_relayer"), \
+         patch("app.main.start_payout_batcher"), \
+         patch("app.main.start_chain_indexer"):
         with TestClient(app) as c:
             # Attach db session factory for direct DB manipulation
             c._test_session_factory = TestSession
@@ -83,6 +91,16 @@ def _db_session(client):
     return client._test_session_factory()
 
 
+def _drain_jobs(client):
+    """Run every queued oracle job against the test client's DB."""
+    from app.services.job_queue import JobDispatcher
+    dispatcher = JobDispatcher(session_factory=client._test_session_factory, concurrency=1)
+    try:
+        dispatcher.drain()
+    finally:
+        dispatcher.stop()
+
+
 # ---------------------------------------------------------------------------
 # Oracle mock responses
 # ---------------------------------------------------------------------------
@@ -551,13 +569,14 @@ class TestQualityFirstE2E:
 
         # Phase 1: open → scoring (deadline expired)
         with patch("app.services.oracle.subprocess.run", side_effect=mock_run), \
-             patch("app.scheduler.create_challenge_onchain", return_value="0xescrow"):
+             patch("app.services.escrow_outbox.create_challenge_onchain", return_value="0xescrow"):
             quality_first_lifecycle(db=db)
             db.refresh(task)
             assert task.status == TaskStatus.scoring
 
             # Phase 2: scoring → challenge_window (batch_score runs)
             quality_first_lifecycle(db=db)
+            relay_pending(db)   # relayer broadcasts the queued createChallenge
 
         db.refresh(task)
         db.refresh(sub1)
@@ -735,8 +754,9 @@ class TestQualityFirstChallengeE2E:
         task.winner_submission_id = sub.id
         db.commit()
 
-        with patch("app.scheduler.resolve_challenge_onchain", return_value="0xrelease") as mock_resolve:
+        with patch("app.services.escrow_outbox.resolve_challenge_onchain", return_value="0xrelease") as mock_resolve:
             quality_first_lifecycle(db=db)
+            relay_pending(db)
 
         db.refresh(task)
         assert task.status == TaskStatus.closed
@@ -776,10 +796,11 @@ class TestHTTPE2E:
                 "publisher_id": pub_id, "bounty": 0.1,
                 "acceptance_criteria": ["覆盖率达到80%"],
             }, headers=PAYMENT_HEADERS)
-        assert resp.status_code == 201
-        task_data = resp.json()
-        task_id = task_data["id"]
-        assert len(task_data.get("scoring_dimensions", [])) == 4
+            assert resp.status_code == 201
+            task_id = resp.json()["id"]
+            _drain_jobs(client)
+        resp = client.get(f"/tasks/{task_id}")
+        assert len(resp.json().get("scoring_dimensions", [])) == 4
 
         # Register worker
         resp = client.post("/users", json={
@@ -795,7 +816,8 @@ class TestHTTPE2E:
             resp = client.post(f"/tasks/{task_id}/submissions", json={
                 "worker_id": worker_id, "content": "完整的测试代码覆盖率85%",
             })
-        assert resp.status_code == 201
+            assert resp.status_code == 201
+            _drain_jobs(client)
         sub_id = resp.json()["id"]
 
         # Verify task closed
@@ -834,8 +856,9 @@ class TestHTTPE2E:
                 "acceptance_criteria": ["至少覆盖10个产品"],
                 "challenge_duration": 7200,
             }, headers=PAYMENT_HEADERS)
-        assert resp.status_code == 201
-        task_id = resp.json()["id"]
+            assert resp.status_code == 201
+            task_id = resp.json()["id"]
+            _drain_jobs(client)
 
         # Submit — oracle gives gate_check + individual_scoring
         oracle_mock = _oracle_subprocess_factory([MOCK_GATE_PASS, MOCK_INDIVIDUAL_HIGH])
@@ -843,7 +866,8 @@ class TestHTTPE2E:
             resp = client.post(f"/tasks/{task_id}/submissions", json={
                 "worker_id": w1_id, "content": "完整的竞品调研报告",
             })
-        assert resp.status_code == 201
+            assert resp.status_code == 201
+            _drain_jobs(client)
         sub_id = resp.json()["id"]
 
         # Verify score hidden while task is open
@@ -862,7 +886,7 @@ class TestHTTPE2E:
 class TestParallelDimensionScore:
 
     def test_dimension_score_calls_are_parallel(self, db):
-        """batch_score uses ThreadPoolExecutor for dimension_score calls."""
+        """batch_score fans dimension_score calls out over the shared oracle executor."""
         import threading
 
         task = Task(
@@ -892,9 +916,13 @@ class TestParallelDimensionScore:
         db.add(sub)
         db.commit()
 
+        import time
+
         thread_ids = []
         def mock_run(*args, **kwargs):
             thread_ids.append(threading.current_thread().ident)
+            # Oracle calls take time: an instant mock would let one warm pool thread drain the queue
+            time.sleep(0.05)
             payload = json.loads(kwargs.get("input", ""))
             dim_id = payload.get("dimension", {}).get("id", "unknown")
             resp = _make_dim_score_response(dim_id, "test", [
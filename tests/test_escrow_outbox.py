@@ -0,0 +1,207 @@
+"""Tests for the escrow outbox: lifecycle writes calls, the relayer executes them in order."""
+import json
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base
+from app.models import (
+    ChainTransaction, ChainTxKind, EscrowAction, EscrowCall, EscrowCallStatus,
+    PayoutStatus, Submission, SubmissionStatus, Task, TaskStatus, TaskType, User, UserRole,
+)
+from app.scheduler import quality_first_lifecycle
+from app.services.escrow_outbox import (
+    EscrowRelayer, claim_calls, enqueue_escrow_call, relay_pending,
+)
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    Base.metadata.drop_all(bind=engine)
+
+
+def _scoring_task(db, n=0) -> Task:
+    worker = User(nickname=f"w{n}", wallet=f"0x{n:040x}", role=UserRole.worker)
+    db.add(worker)
+    db.flush()
+    task = Task(title="T", description="d", type=TaskType.quality_first, bounty=10.0,
+                status=TaskStatus.scoring, publisher_id="pub",
+                deadline=datetime.now(timezone.utc) - timedelta(minutes=1))
+    db.add(task)
+    db.flush()
+    db.add(Submission(task_id=task.id, worker_id=worker.id, content="c",
+                      status=SubmissionStatus.scored, score=0.9))
+    db.commit()
+    return task
+
+
+def test_lifecycle_queues_create_without_calling_chain(session_factory):
+    db = session_factory()
+    task = _scoring_task(db)
+
+    with patch("app.services.escrow_outbox.create_challenge_onchain") as create:
+        quality_first_lifecycle(db=db)
+        create.assert_not_called()
+
+    db.refresh(task)
+    assert task.status == TaskStatus.challenge_window
+    call = db.query(EscrowCall).one()
+    assert call.action == EscrowAction.create_challenge
+    assert call.status == EscrowCallStatus.pending
+    assert json.loads(call.payload) == {"winner_wallet": "0x" + "0" * 40, "bounty": 9.5, "incentive": 0.5}
+
+    with patch("app.services.escrow_outbox.create_challenge_onchain", return_value="0xcreate") as create:
+        assert relay_pending(db) == 1
+        create.assert_called_once_with(task.id, "0x" + "0" * 40, 9.5, 0.5)
+
+    db.refresh(task)
+    assert task.escrow_tx_hash == "0xcreate"
+    assert db.query(EscrowCall).one().status == EscrowCallStatus.sent
+    tracked = db.query(ChainTransaction).one()
+    assert (tracked.kind, tracked.tx_hash) == (ChainTxKind.escrow_create, "0xcreate")
+
+
+def test_failed_create_backs_off_then_returns_task_to_scoring(session_factory):
+    db = session_factory()
+    task = _scoring_task(db)
+    quality_first_lifecycle(db=db)
+
+    with patch("app.services.escrow_outbox.create_challenge_onchain",
+               side_effect=ConnectionError("rpc down")), \
+         patch("app.services.escrow_outbox.get_challenge_state",
+               return_value={"exists": False, "resolved": False}), \
+         patch("app.services.escrow_outbox.ESCROW_MAX_ATTEMPTS", 3), \
+         patch("app.lifecycle.notify_lifecycle") as notify:
+        assert relay_pending(db) == 1
+        call = db.query(EscrowCall).one()
+        assert call.status == EscrowCallStatus.pending
+        assert call.next_attempt_at.replace(tzinfo=timezone.utc) > datetime.now(timezone.utc)
+        assert relay_pending(db) == 0    # not due yet
+
+        later = datetime.now(timezone.utc) + timedelta(hours=1)
+        relay_pending(db, now=later)
+
+    db.refresh(call)
+    db.refresh(task)
+    assert call.status == EscrowCallStatus.failed
+    assert call.attempts == 3
+    assert task.status == TaskStatus.scoring
+    assert task.winner_submission_id is None
+    notify.assert_called_once_with(task.id)
+
+
+def test_calls_of_one_task_run_in_order(session_factory):
+    db = session_factory()
+    enqueue_escrow_call(db, "t1", EscrowAction.create_challenge,
+                        winner_wallet="0xW", bounty=9.5, incentive=0.5)
+    enqueue_escrow_call(db, "t1", EscrowAction.resolve_challenge,
+                        winner_wallet="0xW", winner_payout=8.0, refunds=[],
+                        arbiter_wallets=[], arbiter_reward=0)
+    enqueue_escrow_call(db, "t2", EscrowAction.create_challenge,
+                        winner_wallet="0xV", bounty=9.5, incentive=0.5)
+    db.commit()
+
+    claimed = claim_calls(db, 10)
+    assert set(claimed) == {"t1", "t2"}
+    first = db.get(EscrowCall, claimed["t1"])
+    assert first.action == EscrowAction.create_challenge
+    # resolve for t1 waits until create is settled
+    assert claim_calls(db, 10) == {}
+
+
+def test_retry_skips_call_already_applied_onchain(session_factory):
+    db = session_factory()
+    task = Task(title="T", description="d", type=TaskType.quality_first, bounty=10.0,
+                status=TaskStatus.closed, publisher_id="pub",
+                deadline=datetime.now(timezone.utc))
+    db.add(task)
+    db.flush()
+    call = enqueue_escrow_call(db, task.id, EscrowAction.resolve_challenge,
+                               winner_wallet="0xW", winner_payout=8.0, refunds=[],
+                               arbiter_wallets=[], arbiter_reward=0)
+    call.attempts = 1    # an earlier attempt may have broadcast before failing
+    db.commit()
+
+    with patch("app.services.escrow_outbox.get_challenge_state",
+               return_value={"exists": True, "resolved": True}), \
+         patch("app.services.escrow_outbox.resolve_challenge_onchain") as resolve:
+        relay_pending(db)
+        resolve.assert_not_called()
+
+    db.refresh(task)
+    assert task.payout_status == PayoutStatus.paid
+    assert db.get(EscrowCall, call.id).last_error == "already applied on-chain"
+
+
+def test_call_reclaimed_after_crash_past_send_is_not_rebroadcast(session_factory):
+    from app.services.escrow_outbox import ESCROW_LEASE_SECONDS, execute_call
+    db = session_factory()
+    task = _scoring_task(db)
+    quality_first_lifecycle(db=db)
+    call_id = claim_calls(db, 10)[task.id]
+
+    # The broadcast goes out, then the process dies before recording it
+    with patch("app.services.escrow_outbox.create_challenge_onchain", return_value="0xfirst") as create, \
+         patch.object(db, "commit", side_effect=SystemExit):
+        with pytest.raises(SystemExit):
+            execute_call(db, call_id)
+    create.assert_called_once()
+    db.rollback()
+    assert db.get(EscrowCall, call_id).attempts == 1
+
+    after_lease = datetime.now(timezone.utc) + timedelta(seconds=ESCROW_LEASE_SECONDS + 1)
+    with patch("app.services.escrow_outbox.get_challenge_state",
+               return_value={"exists": True, "resolved": False}), \
+         patch("app.services.escrow_outbox.create_challenge_onchain") as create:
+        assert relay_pending(db, now=after_lease) == 1
+        create.assert_not_called()
+
+    db.refresh(task)
+    call = db.get(EscrowCall, call_id)
+    assert (call.status, call.attempts, call.last_error) == (
+        EscrowCallStatus.sent, 2, "already applied on-chain")
+    assert task.status == TaskStatus.challenge_window
+
+
+def test_relayer_bounds_parallel_broadcasts(session_factory):
+    db = session_factory()
+    for i in range(6):
+        enqueue_escrow_call(db, f"task-{i}", EscrowAction.create_challenge,
+                            winner_wallet="0xW", bounty=1.0, incentive=0.1)
+    db.commit()
+    db.close()
+
+    lock = threading.Lock()
+    running, peak = 0, 0
+
+    def slow_create(task_id, *args):
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.05)
+        with lock:
+            running -= 1
+        return f"0x{task_id}"
+
+    relayer = EscrowRelayer(session_factory=session_factory, concurrency=2, poll_interval=0.05)
+    try:
+        with patch("app.services.escrow_outbox.create_challenge_onchain", side_effect=slow_create):
+            relayer.drain(timeout=10)
+    finally:
+        relayer.stop()
+
+    db = session_factory()
+    assert peak == 2
+    assert {c.status for c in db.query(EscrowCall).all()} == {EscrowCallStatus.sent}
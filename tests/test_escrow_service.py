@@ -1,5 +1,9 @@
 """Tests for the escrow service layer (chain calls mocked)."""
 from unittest.mock import patch, MagicMock
+
+import pytest
+
+from app.services import chain
 from app.services.escrow import (
     check_usdc_balance,
     create_challenge_onchain,
@@ -8,6 +12,13 @@ from app.services.escrow import (
 )
 
 
+@pytest.fixture(autouse=True)
+def _fresh_chain_state():
+    chain.reset()
+    yield
+    chain.reset()
+
+
 def test_check_usdc_balance():
     """Should return float USDC balance from RPC."""
     mock_w3 = MagicMock()
@@ -16,10 +27,14 @@ def test_check_usdc_balance():
     mock_contract.functions.balanceOf.return_value.call.return_value = 5_000_000
     mock_w3.eth.contract.return_value = mock_contract
 
-    with patch("app.services.escrow.Web3", return_value=mock_w3):
-        balance = check_usdc_balance("0xabc")
+    chain.configure(mock_w3)
+    balance = check_usdc_balance("0x" + "ab" * 20)
     assert balance == 5.0
 
+    # Contract object is memoized on the shared provider
+    check_usdc_balance("0x" + "cd" * 20)
+    assert mock_w3.eth.contract.call_count == 1
+
 
 def test_create_challenge_onchain():
     """Should call contract.createChallenge and return tx hash."""
@@ -35,9 +50,8 @@ def test_create_challenge_onchain():
     mock_contract = MagicMock()
     mock_w3.eth.contract.return_value = mock_contract
 
-    with patch("app.services.escrow.Web3", return_value=mock_w3):
-        with patch("app.services.escrow._get_w3_and_contract", return_value=(mock_w3, mock_contract)):
-            tx = create_challenge_onchain("task-1", "0xWinner", 8.0, 1.0)
+    with patch("app.services.escrow._get_w3_and_contract", return_value=(mock_w3, mock_contract)):
+        tx = create_challenge_onchain("task-1", "0x" + "cc" * 20, 8.0, 1.0)
     assert tx is not None
 
 
@@ -6,6 +6,7 @@ from app.models import (
     TaskType, TaskStatus, SubmissionStatus, ChallengeStatus, ChallengeVerdict, PayoutStatus,
 )
 from app.scheduler import _settle_after_arbitration
+from app.services.escrow_outbox import relay_pending
 
 
 def _setup_arbitrated_task(db):
@@ -49,8 +50,9 @@ def test_settle_calls_escrow_when_challengers_have_wallets(client):
 
     task = _setup_arbitrated_task(db)
 
-    with patch("app.scheduler.resolve_challenge_onchain", return_value="0xresolve") as mock_resolve:
+    with patch("app.services.escrow_outbox.resolve_challenge_onchain", return_value="0xresolve") as mock_resolve:
         _settle_after_arbitration(db, task)
+        relay_pending(db)
 
     # Verify resolveChallenge was called via _resolve_via_contract
     mock_resolve.assert_called_once()
@@ -62,7 +64,7 @@ def test_settle_calls_escrow_when_challengers_have_wallets(client):
     db.refresh(task)
     assert task.status == TaskStatus.closed
     assert task.payout_tx_hash == "0xresolve"
-    assert task.payout_status == PayoutStatus.paid
+    assert task.payout_status == PayoutStatus.submitted
     assert task.payout_amount == 8.0
 
 
@@ -101,8 +103,9 @@ def test_settle_without_wallets_still_resolves(client):
     db.add(challenge)
     db.commit()
 
-    with patch("app.scheduler.resolve_challenge_onchain", return_value="0xresolve") as mock_resolve:
+    with patch("app.services.escrow_outbox.resolve_challenge_onchain", return_value="0xresolve") as mock_resolve:
         _settle_after_arbitration(db, task)
+        relay_pending(db)
 
     # Still calls resolve with empty verdicts (no challenger_wallet)
     mock_resolve.assert_called_once()
@@ -0,0 +1,190 @@
+"""Tests for task/submission state-change events and the SSE endpoints."""
+import asyncio
+import json
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base, get_db
+from app.models import (
+    PayoutStatus, Submission, SubmissionStatus, Task, TaskEvent, TaskStatus, TaskType,
+)
+from app.services.events import EventBroker, get_event_broker
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture
+def sse_client(session_factory):
+    from app.main import app
+
+    def override_db():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    broker = EventBroker(session_factory=session_factory, poll_interval=0.05)
+    app.dependency_overrides[get_db] = override_db
+    app.dependency_overrides[get_event_broker] = lambda: broker
+    with patch("app.main.create_scheduler", return_value=MagicMock()), \
+         patch("app.main.start_job_dispatcher"), \
+         patch("app.main.start_lifecycle_engine"), \
+         patch("app.main.start_webhook_dispatcher"), \
+         patch("app.main.start_tx_confirmer"), \
+         patch("app.main.start_escrow_relayer"), \
+         patch("app.main.start_payout_batcher"), \
+         patch("app.main.start_chain_indexer"), \
+         patch("app.services.events.EVENTS_STREAM_MAX_SECONDS", 0.3):
+        with TestClient(app) as c:
+            yield c
+    app.dependency_overrides.clear()
+
+
+def _task(db, type=TaskType.fastest_first) -> Task:
+    task = Task(title="T", description="d", type=type, threshold=0.6,
+                deadline=datetime.now(timezone.utc) + timedelta(hours=1), bounty=5.0)
+    db.add(task)
+    db.commit()
+    return task
+
+
+def _events(db, task_id=None):
+    q = db.query(TaskEvent).order_by(TaskEvent.id)
+    if task_id:
+        q = q.filter(TaskEvent.task_id == task_id)
+    return [(e.event_type, json.loads(e.data)) for e in q.all()]
+
+
+def _parse_sse(body: str) -> list[dict]:
+    events = []
+    for block in body.split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines()
+                      if ": " in line and not line.startswith(":"))
+        if "id" in fields:
+            events.append({"id": int(fields["id"]), "event": fields["event"],
+                           "data": json.loads(fields["data"])})
+    return events
+
+
+def test_state_changes_are_recorded_with_the_commit(session_factory):
+    db = session_factory()
+    task = _task(db)
+    sub = Submission(task_id=task.id, worker_id="w1", content="c")
+    db.add(sub)
+    db.commit()
+
+    sub.status = SubmissionStatus.gate_passed
+    task.status = TaskStatus.closed
+    task.payout_status = PayoutStatus.paid
+    task.payout_amount = 4.0
+    db.commit()
+
+    # Re-assigning the same value is not a transition
+    task.status = TaskStatus.closed
+    db.commit()
+
+    # Rolled-back changes leave no events behind
+    sub.status = SubmissionStatus.scored
+    db.flush()
+    db.rollback()
+
+    events = _events(db, task.id)
+    assert [e[0] for e in events] == [
+        "task.status", "submission.status", "task.status", "task.payout", "submission.status",
+    ]
+    assert events[0][1] == {"task_id": task.id, "previous": None, "status": "open"}
+    assert events[4][1]["previous"] == "pending"
+    assert events[4][1]["status"] == "gate_passed"
+    assert events[4][1]["submission_id"] == sub.id
+    assert events[3][1]["payout_status"] == "paid"
+    assert events[3][1]["payout_amount"] == 4.0
+    db.close()
+
+
+def test_broker_fans_out_commits_to_matching_subscribers(session_factory):
+    db = session_factory()
+    watched = _task(db)
+    other = _task(db)
+    broker = EventBroker(session_factory=session_factory, poll_interval=30)
+
+    async def scenario():
+        task_sub = await broker.subscribe(task_id=watched.id)
+        all_sub = await broker.subscribe()
+        other.status = TaskStatus.closed
+        watched.status = TaskStatus.closed
+        db.commit()   # wakes the broker without waiting for the 30 s poll
+        first = await asyncio.wait_for(task_sub.queue.get(), 2)
+        seen = [await asyncio.wait_for(all_sub.queue.get(), 2) for _ in range(2)]
+        broker.unsubscribe(task_sub)
+        broker.unsubscribe(all_sub)
+        return first, seen
+
+    first, seen = asyncio.run(scenario())
+    assert first.task_id == watched.id
+    assert first.payload()["status"] == "closed"
+    assert {ev.task_id for ev in seen} == {watched.id, other.id}
+    assert broker._task is None   # tail stops with the last subscriber
+    db.close()
+
+
+def test_task_stream_resumes_from_last_event_id(sse_client, session_factory):
+    db = session_factory()
+    task = _task(db)
+    other = _task(db)
+    sub = Submission(task_id=task.id, worker_id="w1", content="c")
+    db.add(sub)
+    db.commit()
+    sub.status = SubmissionStatus.gate_passed
+    other.status = TaskStatus.closed
+    db.commit()
+    first_id = db.query(TaskEvent.id).filter(TaskEvent.task_id == task.id).first()[0]
+
+    resp = sse_client.get(f"/tasks/{task.id}/events", headers={"Last-Event-ID": str(first_id)})
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/event-stream")
+    events = _parse_sse(resp.text)
+    assert [e["event"] for e in events] == ["submission.status", "submission.status"]
+    assert [e["data"]["status"] for e in events] == ["pending", "gate_passed"]
+    assert all(e["id"] > first_id for e in events)
+
+    resp = sse_client.get("/events?last_event_id=0")
+    assert {e["data"]["task_id"] for e in _parse_sse(resp.text)} == {task.id, other.id}
+    db.close()
+
+
+def test_task_stream_unknown_task_404(sse_client):
+    assert sse_client.get("/tasks/nope/events").status_code == 404
+
+
+def test_stream_rejects_bad_last_event_id(sse_client):
+    assert sse_client.get("/events", headers={"Last-Event-ID": "abc"}).status_code == 400
+
+
+def test_submission_events_do_not_leak_hidden_scores(session_factory):
+    db = session_factory()
+    task = _task(db, type=TaskType.quality_first)
+    sub = Submission(task_id=task.id, worker_id="w1", content="c")
+    db.add(sub)
+    db.commit()
+    sub.status = SubmissionStatus.gate_passed
+    sub.score = 0.93   # individual score, hidden while the task is open
+    db.commit()
+
+    payloads = [data for kind, data in _events(db, task.id) if kind == "submission.status"]
+    assert payloads and all("score" not in p for p in payloads)
+    db.close()
@@ -0,0 +1,126 @@
+"""Tests for the fused gate_and_score oracle mode and the per-task oracle flow."""
+import json
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "oracle"))
+
+import gate_and_score  # noqa: E402
+from app.database import Base  # noqa: E402
+from app.models import (  # noqa: E402
+    OracleFlow, ScoringDimension, Submission, SubmissionStatus, Task, TaskType,
+)
+
+DIMS = [
+    {"id": "substantiveness", "name": "实质性", "description": "d", "weight": 0.5, "scoring_guidance": "g"},
+    {"id": "data_precision", "name": "数据精度", "description": "d", "weight": 0.5, "scoring_guidance": "g"},
+]
+GATE = {"overall_passed": True, "criteria_checks": [{"criteria": "c1", "passed": True, "evidence": "ok"}],
+        "summary": "通过"}
+SCORING = {
+    "dimension_scores": {
+        "substantiveness": {"band": "B", "score": 78, "evidence": "e1", "feedback": "f"},
+        "data_precision": {"score": 104, "evidence": "e2", "feedback": "f"},
+    },
+    "overall_band": "B",
+    "revision_suggestions": [{"problem": "p", "suggestion": "s", "severity": "high"}],
+}
+
+
+def _run(llm_result):
+    with patch("gate_and_score.call_llm_json", return_value=(llm_result, {})):
+        return gate_and_score.run({"task_title": "T", "task_description": "d",
+                                   "acceptance_criteria": ["c1"], "dimensions": DIMS,
+                                   "submission_payload": "content"})
+
+
+def test_fused_output_is_split_into_staged_shapes():
+    out = _run({**GATE, "scoring": SCORING})
+    assert out["gate"] == GATE
+    scores = out["score"]["dimension_scores"]
+    assert scores["substantiveness"] == SCORING["dimension_scores"]["substantiveness"]
+    # Out-of-range score is clamped and the missing band derived from it
+    assert (scores["data_precision"]["score"], scores["data_precision"]["band"]) == (100, "A")
+    assert out["score"]["revision_suggestions"] == SCORING["revision_suggestions"]
+
+    failed = _run({**GATE, "overall_passed": False, "scoring": SCORING})
+    assert failed["gate"]["overall_passed"] is False and failed["score"] is None
+
+
+def test_incomplete_scoring_falls_back_to_score_individual():
+    partial = {"dimension_scores": {"substantiveness": SCORING["dimension_scores"]["substantiveness"]}}
+    with patch("gate_and_score.score_individual.run", return_value=SCORING) as staged:
+        out = _run({**GATE, "scoring": partial})
+    staged.assert_called_once()
+    assert out["score"] is SCORING
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(bind=engine)()
+
+
+def _setup(db, task_type, oracle_flow):
+    task = Task(title="T", description="d", type=task_type, bounty=10.0, threshold=0.5,
+                deadline=datetime(2026, 12, 31, tzinfo=timezone.utc),
+                acceptance_criteria=json.dumps(["c1"]), oracle_flow=oracle_flow)
+    db.add(task)
+    db.flush()
+    for d in DIMS:
+        db.add(ScoringDimension(task_id=task.id, dim_id=d["id"], name=d["name"], dim_type="fixed",
+                                description="d", weight=d["weight"], scoring_guidance="g"))
+    sub = Submission(task_id=task.id, worker_id="w1", content="c", status=SubmissionStatus.pending)
+    db.add(sub)
+    db.commit()
+    return task, sub
+
+
+def test_fused_task_makes_one_oracle_call(db):
+    from app.services.oracle import give_feedback
+    task, sub = _setup(db, TaskType.quality_first, OracleFlow.fused)
+    fused_reply = {"gate": GATE, "score": SCORING}
+    with patch("app.services.oracle._call_oracle", return_value=fused_reply) as call:
+        give_feedback(db, sub.id, task.id)
+
+    assert [c.args[0]["mode"] for c in call.call_args_list] == ["gate_and_score"]
+    assert call.call_args.args[0]["dimensions"][0]["id"] == "substantiveness"
+    db.refresh(sub)
+    assert sub.status == SubmissionStatus.gate_passed
+    assert json.loads(sub.oracle_feedback) == {"type": "individual_scoring", **SCORING}
+
+
+def test_task_flow_overrides_global_default(db):
+    from app.services.oracle import score_submission
+    task, sub = _setup(db, TaskType.fastest_first, OracleFlow.staged)
+    replies = iter([GATE, SCORING])
+    with patch("app.services.oracle.ORACLE_FLOW", "fused"), \
+         patch("app.services.oracle._call_oracle", side_effect=lambda *a, **k: next(replies)) as call, \
+         patch("app.services.oracle._apply_fastest_first"):
+        score_submission(db, sub.id, task.id)
+
+    assert [c.args[0]["mode"] for c in call.call_args_list] == ["gate_check", "score_individual"]
+    db.refresh(sub)
+    assert sub.status == SubmissionStatus.scored
+
+
+def test_fused_injection_is_handled_like_gate_check(db):
+    from app.services.oracle import score_submission
+    task, sub = _setup(db, TaskType.fastest_first, None)
+    reply = {"injection_detected": True, "reason": "r", "field": "submission_payload"}
+    with patch("app.services.oracle.ORACLE_FLOW", "fused"), \
+         patch("app.services.oracle._call_oracle", return_value=reply) as call, \
+         patch("app.services.trust.apply_event"):
+        score_submission(db, sub.id, task.id)
+
+    assert call.call_args.args[0]["mode"] == "gate_and_score"
+    db.refresh(sub)
+    assert sub.status == SubmissionStatus.policy_violation
@@ -28,14 +28,14 @@ def test_fastest_first_full_lifecycle(client):
     assert task["status"] == "open"
 
     # 2. Worker A submits (oracle mocked -- score will be applied via internal endpoint)
-    with patch("app.routers.submissions.invoke_oracle"):
+    with patch("app.routers.submissions.wake_job_dispatcher"):
         sub_a = client.post(f"/tasks/{task['id']}/submissions", json={
             "worker_id": "agent-A", "content": "My answer"
         }).json()
     assert sub_a["status"] == "pending"
 
     # 3. Worker B submits
-    with patch("app.routers.submissions.invoke_oracle"):
+    with patch("app.routers.submissions.wake_job_dispatcher"):
         sub_b = client.post(f"/tasks/{task['id']}/submissions", json={
             "worker_id": "agent-B", "content": "Another answer"
         }).json()
@@ -62,14 +62,14 @@ def test_quality_first_full_lifecycle(client):
         }, headers=PAYMENT_HEADERS).json()
 
     # 2. Worker submits revision 1
-    with patch("app.routers.submissions.invoke_oracle"):
+    with patch("app.routers.submissions.wake_job_dispatcher"):
         r1 = client.post(f"/tasks/{task['id']}/submissions", json={
             "worker_id": "agent-X", "content": "Draft 1"
         }).json()
     assert r1["revision"] == 1
 
     # 3. Worker refines with revision 2
-    with patch("app.routers.submissions.invoke_oracle"):
+    with patch("app.routers.submissions.wake_job_dispatcher"):
         r2 = client.post(f"/tasks/{task['id']}/submissions", json={
             "worker_id": "agent-X", "content": "Better draft"
         }).json()
@@ -113,7 +113,7 @@ def test_quality_first_full_lifecycle(client):
 
 def test_filter_tasks_by_status(client):
     with PAYMENT_MOCK:
-        with patch("app.routers.submissions.invoke_oracle"):
+        with patch("app.routers.submissions.wake_job_dispatcher"):
             t1 = client.post("/tasks", json={
                 "title": "Open", "description": "d",
                 "type": "fastest_first", "threshold": 0.5, "deadline": future(),
@@ -165,7 +165,7 @@ def test_bounty_lifecycle_fastest_first(client):
     assert task["payout_status"] == "pending"
 
     # 3. Worker submits
-    with patch("app.routers.submissions.invoke_oracle"):
+    with patch("app.routers.submissions.wake_job_dispatcher"):
         sub = client.post(f"/tasks/{task['id']}/submissions", json={
             "worker_id": worker["id"], "content": "my answer"
         }).json()
@@ -179,7 +179,7 @@ def test_bounty_lifecycle_fastest_first(client):
     detail = client.get(f"/tasks/{task['id']}").json()
     assert detail["status"] == "closed"
     assert detail["winner_submission_id"] == sub["id"]
-    assert detail["payout_status"] == "paid"
+    assert detail["payout_status"] == "submitted"
     assert detail["payout_amount"] == 8.0
     assert detail["payout_tx_hash"] == "0xPAYOUT"
 
@@ -202,7 +202,7 @@ def test_bounty_lifecycle_quality_first(client):
             "acceptance_criteria": ["验收标准"],
         }, headers={"X-PAYMENT": "valid"}).json()
 
-    with patch("app.routers.submissions.invoke_oracle"):
+    with patch("app.routers.submissions.wake_job_dispatcher"):
         r1 = client.post(f"/tasks/{task['id']}/submissions", json={
             "worker_id": worker["id"], "content": "draft 1"
         }).json()
@@ -218,28 +218,39 @@ def test_bounty_lifecycle_quality_first(client):
     from app.main import app
     from app.models import Task as TaskModel
     from app.scheduler import quality_first_lifecycle
+    from app.services.escrow_outbox import relay_pending
     db = next(app.dependency_overrides[get_db]())
     t = db.query(TaskModel).filter(TaskModel.id == task["id"]).first()
     t.deadline = datetime.now(timezone.utc) - timedelta(minutes=1)
     db.commit()
 
-    with patch("app.scheduler.create_challenge_onchain", return_value="0xESCROW"), \
-         patch("app.scheduler.resolve_challenge_onchain", return_value="0xQPAYOUT"):
+    with patch("app.services.escrow_outbox.create_challenge_onchain", return_value="0xESCROW"), \
+         patch("app.services.escrow_outbox.resolve_challenge_onchain", return_value="0xQPAYOUT"):
         # Phase 1: open → scoring
         quality_first_lifecycle(db=db)
-        # Phase 2: scoring → challenge_window (calls create_challenge_onchain)
+        # Phase 2: scoring → challenge_window (queues createChallenge for the relayer)
         quality_first_lifecycle(db=db)
+        relay_pending(db)
 
         # Expire challenge window
         db.refresh(t)
         t.challenge_window_end = datetime.now(timezone.utc) - timedelta(minutes=1)
         db.commit()
 
-        # Phase 3: challenge_window → closed (calls resolve_challenge_onchain)
+        # Phase 3: challenge_window → closed (queues resolveChallenge)
         quality_first_lifecycle(db=db)
+        relay_pending(db)
 
     detail = client.get(f"/tasks/{task['id']}").json()
     assert detail["status"] == "closed"
-    assert detail["payout_status"] == "paid"
+    assert detail["payout_status"] == "submitted"
     assert detail["payout_amount"] == 16.0  # 20.0 * 0.80
     assert detail["payout_tx_hash"] == "0xQPAYOUT"
+
+    # Tx confirmer sees both escrow receipts mined → paid
+    from app.services.tx_tracker import confirm_pending
+    mined = {"status": 1, "blockNumber": 10}
+    with patch("app.services.chain.get_receipts",
+               side_effect=lambda hashes: {h: mined for h in hashes}):
+        assert confirm_pending(db) == 2
+    assert client.get(f"/tasks/{task['id']}").json()["payout_status"] == "paid"
@@ -20,7 +20,7 @@ def make_task_and_submission(client, type="fastest_first", threshold=0.8):
             "publisher_id": "test-pub", "bounty": 1.0,
             "acceptance_criteria": ["验收标准"],
         }, headers=PAYMENT_HEADERS).json()
-    with patch("app.routers.submissions.invoke_oracle"):
+    with patch("app.routers.submissions.wake_job_dispatcher"):
         sub = client.post(f"/tasks/{task['id']}/submissions", json={
             "worker_id": "w1", "content": "answer"
         }).json()
@@ -0,0 +1,192 @@
+"""Tests for the durable oracle job queue."""
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base
+from app.models import (
+    OracleJob, OracleJobKind, OracleJobStatus, Submission, SubmissionStatus, Task, TaskType,
+)
+from app.services.job_queue import (
+    JobDispatcher, PRIORITY_FASTEST_FIRST, PRIORITY_QUALITY_FEEDBACK,
+    claim_jobs, complete_job, enqueue_dimension_job, enqueue_submission_job, fail_job,
+)
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(bind=engine)
+    Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture
+def db(session_factory):
+    s = session_factory()
+    yield s
+    s.close()
+
+
+def _task(db, task_type):
+    task = Task(title="t", description="d", type=task_type,
+                deadline=datetime.now(timezone.utc) + timedelta(days=1))
+    db.add(task)
+    db.commit()
+    return task
+
+
+def _submission(db, task):
+    sub = Submission(task_id=task.id, worker_id="w1", content="answer")
+    db.add(sub)
+    db.commit()
+    return sub
+
+
+def test_fastest_first_claimed_before_quality_first(db):
+    qf = _task(db, TaskType.quality_first)
+    ff = _task(db, TaskType.fastest_first)
+    enqueue_submission_job(db, qf, _submission(db, qf).id)
+    enqueue_submission_job(db, ff, _submission(db, ff).id)
+    db.commit()
+
+    jobs = claim_jobs(db, 1)
+    assert len(jobs) == 1
+    assert jobs[0].task_id == ff.id
+    assert jobs[0].priority == PRIORITY_FASTEST_FIRST
+    assert jobs[0].status == OracleJobStatus.running
+    assert jobs[0].attempts == 1
+
+    jobs = claim_jobs(db, 5)
+    assert [j.priority for j in jobs] == [PRIORITY_QUALITY_FEEDBACK]
+    assert claim_jobs(db, 5) == []
+
+
+def test_expired_lease_is_redelivered(db):
+    task = _task(db, TaskType.fastest_first)
+    enqueue_submission_job(db, task, _submission(db, task).id)
+    db.commit()
+
+    [job] = claim_jobs(db, 1)
+    assert claim_jobs(db, 1) == []  # still leased
+
+    later = datetime.now(timezone.utc) + timedelta(hours=1)
+    [again] = claim_jobs(db, 1, now=later)
+    assert again.id == job.id
+    assert again.attempts == 2
+
+
+def test_expired_lease_on_last_attempt_goes_dead(db):
+    task = _task(db, TaskType.fastest_first)
+    job = enqueue_submission_job(db, task, _submission(db, task).id)
+    job.max_attempts = 1
+    db.commit()
+
+    claim_jobs(db, 1)
+    later = datetime.now(timezone.utc) + timedelta(hours=1)
+    assert claim_jobs(db, 1, now=later) == []
+    db.refresh(job)
+    assert job.status == OracleJobStatus.dead
+
+
+def test_fail_job_backs_off_then_dies(db):
+    task = _task(db, TaskType.fastest_first)
+    job = enqueue_submission_job(db, task, _submission(db, task).id)
+    job.max_attempts = 2
+    db.commit()
+
+    claim_jobs(db, 1)
+    fail_job(db, job.id, "boom")
+    db.refresh(job)
+    assert job.status == OracleJobStatus.queued
+    assert job.last_error == "boom"
+    assert claim_jobs(db, 1) == []  # waiting out the backoff
+
+    later = datetime.now(timezone.utc) + timedelta(hours=1)
+    claim_jobs(db, 1, now=later)
+    fail_job(db, job.id, "boom again")
+    db.refresh(job)
+    assert job.status == OracleJobStatus.dead
+
+
+def test_complete_job(db):
+    task = _task(db, TaskType.quality_first)
+    job = enqueue_dimension_job(db, task)
+    db.commit()
+    claim_jobs(db, 1)
+    complete_job(db, job.id)
+    db.refresh(job)
+    assert job.status == OracleJobStatus.done
+    assert job.finished_at is not None
+
+
+def test_dispatcher_runs_handlers_and_records_result(session_factory, db):
+    task = _task(db, TaskType.quality_first)
+    enqueue_dimension_job(db, task)
+    sub = _submission(db, task)
+    enqueue_submission_job(db, task, sub.id)
+    db.commit()
+
+    ran = []
+    with patch("app.services.oracle.generate_dimensions",
+               side_effect=lambda d, t: ran.append(("dims", t.id))), \
+         patch("app.services.oracle.give_feedback",
+               side_effect=lambda d, s, t: ran.append(("feedback", s))):
+        dispatcher = JobDispatcher(session_factory=session_factory, concurrency=1)
+        dispatcher.drain()
+        dispatcher.stop()
+
+    # Dimension generation outranks quality_first feedback
+    assert ran == [("dims", task.id), ("feedback", sub.id)]
+    statuses = {j.status for j in db.query(OracleJob).all()}
+    assert statuses == {OracleJobStatus.done}
+
+
+def test_dispatcher_retries_failed_handler(session_factory, db):
+    task = _task(db, TaskType.fastest_first)
+    enqueue_submission_job(db, task, _submission(db, task).id)
+    db.commit()
+
+    with patch("app.services.oracle.score_submission", side_effect=RuntimeError("llm down")):
+        dispatcher = JobDispatcher(session_factory=session_factory, concurrency=2)
+        dispatcher.drain()
+        dispatcher.stop()
+
+    job = db.query(OracleJob).one()
+    assert job.status == OracleJobStatus.queued
+    assert job.attempts == 1
+    assert "llm down" in job.last_error
+
+
+def test_redelivered_job_skips_scored_submission(session_factory, db):
+    task = _task(db, TaskType.fastest_first)
+    sub = _submission(db, task)
+    sub.status = SubmissionStatus.scored
+    enqueue_submission_job(db, task, sub.id)
+    db.commit()
+
+    with patch("app.services.oracle.score_submission") as mock_score:
+        dispatcher = JobDispatcher(session_factory=session_factory)
+        dispatcher.drain()
+        dispatcher.stop()
+
+    mock_score.assert_not_called()
+    assert db.query(OracleJob).one().status == OracleJobStatus.done
+
+
+def test_create_submission_enqueues_job(client_with_db):
+    client, db = client_with_db
+    task = _task(db, TaskType.fastest_first)
+    resp = client.post(f"/tasks/{task.id}/submissions",
+                       json={"worker_id": "w1", "content": "answer"})
+    assert resp.status_code == 201
+    job = db.query(OracleJob).one()
+    assert job.kind == OracleJobKind.submission
+    assert job.submission_id == resp.json()["id"]
+    assert job.status == OracleJobStatus.queued
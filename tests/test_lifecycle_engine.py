@@ -0,0 +1,172 @@
+"""Tests for the event-driven lifecycle engine (timer heap)."""
+import time
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base
+from app.lifecycle import LifecycleEngine
+from app.models import Submission, SubmissionStatus, Task, TaskStatus, TaskType
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(bind=engine)
+    Base.metadata.drop_all(bind=engine)
+
+
+def _quality_task(db, deadline, with_submission=True):
+    task = Task(title="Q", description="d", type=TaskType.quality_first,
+                deadline=deadline, bounty=10.0, challenge_duration=7200)
+    db.add(task)
+    db.flush()
+    if with_submission:
+        db.add(Submission(task_id=task.id, worker_id="w1", content="c",
+                          score=0.9, status=SubmissionStatus.scored))
+    db.commit()
+    return task
+
+
+def test_pop_due_orders_timers_and_skips_stale_entries():
+    engine = LifecycleEngine(session_factory=lambda: None)
+    now = datetime.now(timezone.utc)
+    engine.schedule("a", now - timedelta(seconds=5))
+    engine.schedule("b", now + timedelta(hours=1))
+    engine.schedule("c", now - timedelta(seconds=1))
+    # Rescheduling "c" into the future leaves its old heap entry stale
+    engine.schedule("c", now + timedelta(hours=2))
+    engine.trigger("d")
+
+    assert engine.pop_due(now) == ["a", "d"]
+    assert engine.pop_due(now) == []
+    assert engine.pop_due(now + timedelta(hours=3)) == ["b", "c"]
+
+
+def test_load_schedules_live_tasks(session_factory):
+    db = session_factory()
+    future = datetime.now(timezone.utc) + timedelta(hours=1)
+    open_task = _quality_task(db, future)
+    scoring = _quality_task(db, future)
+    scoring.status = TaskStatus.scoring
+    closed = _quality_task(db, future)
+    closed.status = TaskStatus.closed
+    db.commit()
+
+    engine = LifecycleEngine(session_factory=session_factory)
+    assert engine.load() == 2
+    assert engine._scheduled == {open_task.id: future}
+    # Tasks already in scoring are re-evaluated right away
+    assert engine.pop_due() == [scoring.id]
+    db.close()
+
+
+def test_process_cascades_open_to_challenge_window(session_factory):
+    db = session_factory()
+    task = _quality_task(db, datetime.now(timezone.utc) - timedelta(seconds=1))
+    engine = LifecycleEngine(session_factory=session_factory)
+
+    engine.process([task.id])
+    db.refresh(task)
+    assert task.status == TaskStatus.scoring
+
+    # Entering scoring queues the task for an immediate second pass
+    with patch("app.services.escrow_outbox.create_challenge_onchain", return_value="0xescrow"):
+        engine.process(engine.pop_due())
+    db.refresh(task)
+    assert task.status == TaskStatus.challenge_window
+    window_end = task.challenge_window_end.replace(tzinfo=timezone.utc)
+    assert engine._scheduled[task.id] == window_end
+    db.close()
+
+
+def test_failed_batch_score_is_retried(session_factory):
+    from app.lifecycle import RECHECK_INTERVAL
+    db = session_factory()
+    task = _quality_task(db, datetime.now(timezone.utc) - timedelta(seconds=1), with_submission=False)
+    db.add(Submission(task_id=task.id, worker_id="w1", content="c", status=SubmissionStatus.gate_passed))
+    task.status = TaskStatus.scoring
+    db.commit()
+    engine = LifecycleEngine(session_factory=session_factory)
+
+    with patch("app.scheduler.batch_score_submissions", side_effect=RuntimeError("oracle down")):
+        before = datetime.now(timezone.utc)
+        engine.process([task.id])
+    db.refresh(task)
+    assert task.status == TaskStatus.scoring
+    assert engine.pop_due() == []
+    # Retried on a short timer instead of waiting for the safety-net sweep
+    assert before + RECHECK_INTERVAL <= engine._scheduled[task.id] <= datetime.now(timezone.utc) + RECHECK_INTERVAL
+    db.close()
+
+
+def test_task_leased_elsewhere_is_not_spun_on(session_factory):
+    from app.lifecycle import RECHECK_INTERVAL
+    db = session_factory()
+    task = _quality_task(db, datetime.now(timezone.utc) - timedelta(seconds=1))
+    task.lease_owner = "other-node:abcd1234"
+    task.lease_until = datetime.now(timezone.utc) + timedelta(minutes=15)
+    db.commit()
+    engine = LifecycleEngine(session_factory=session_factory)
+
+    before = datetime.now(timezone.utc)
+    engine.process([task.id])
+    db.refresh(task)
+    assert task.status == TaskStatus.open
+    # The past deadline is not re-queued for an immediate pass
+    assert engine.pop_due() == []
+    assert engine._scheduled[task.id] >= before + RECHECK_INTERVAL
+    db.close()
+
+
+def test_legacy_arbitration_is_rechecked(session_factory):
+    from app.lifecycle import RECHECK_INTERVAL, next_due
+    db = session_factory()
+    task = _quality_task(db, datetime.now(timezone.utc) - timedelta(hours=3))
+    task.status = TaskStatus.arbitrating      # no merged-jury ballots
+    db.commit()
+
+    before = datetime.now(timezone.utc)
+    due = next_due(db, task)
+    assert before + RECHECK_INTERVAL <= due <= datetime.now(timezone.utc) + RECHECK_INTERVAL
+    db.close()
+
+
+def test_process_only_touches_given_tasks(session_factory):
+    db = session_factory()
+    past = datetime.now(timezone.utc) - timedelta(seconds=1)
+    due = _quality_task(db, past)
+    other = _quality_task(db, past)
+
+    LifecycleEngine(session_factory=session_factory).process([due.id])
+    db.refresh(due)
+    db.refresh(other)
+    assert due.status == TaskStatus.scoring
+    assert other.status == TaskStatus.open
+    db.close()
+
+
+def test_engine_thread_fires_on_deadline(session_factory):
+    db = session_factory()
+    task = _quality_task(db, datetime.now(timezone.utc) + timedelta(milliseconds=200),
+                         with_submission=False)
+    engine = LifecycleEngine(session_factory=session_factory)
+    engine.start()
+    try:
+        for _ in range(50):
+            db.expire_all()
+            if db.get(Task, task.id).status != TaskStatus.open:
+                break
+            time.sleep(0.05)
+    finally:
+        engine.stop()
+    # No submissions: closed with a full refund as soon as the deadline passed
+    assert db.get(Task, task.id).status == TaskStatus.closed
+    db.close()
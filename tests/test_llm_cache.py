@@ -0,0 +1,133 @@
+"""Tests for the content-addressed LLM response cache."""
+import sys
+import time
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "oracle"))
+
+import llm_cache  # noqa: E402
+import llm_client  # noqa: E402
+from llm_cache import LLMCache, make_key  # noqa: E402
+
+
+def test_key_depends_on_mode_model_system_and_prompt():
+    base = make_key("gate_check", "openai", "m", "sys", "prompt")
+    assert base == make_key("gate_check", "openai", "m", "sys", "prompt")
+    assert base != make_key("score_individual", "openai", "m", "sys", "prompt")
+    assert base != make_key("gate_check", "openai", "m2", "sys", "prompt")
+    assert base != make_key("gate_check", "openai", "m", "sys2", "prompt")
+    assert base != make_key("gate_check", "openai", "m", "sys", "prompt2")
+
+
+def test_get_put_roundtrip_persists_to_disk(tmp_path):
+    path = str(tmp_path / "cache.db")
+    cache = LLMCache(path, max_bytes=10_000, ttl_seconds=60)
+    cache.put("k", '{"a": 1}')
+    cache.close()
+    reopened = LLMCache(path, max_bytes=10_000, ttl_seconds=60)
+    assert reopened.get("k") == '{"a": 1}'
+    assert reopened.get("missing") is None
+
+
+def test_entries_expire_after_ttl(tmp_path):
+    cache = LLMCache(str(tmp_path / "cache.db"), max_bytes=10_000, ttl_seconds=60)
+    cache.put("k", "v")
+    with patch("llm_cache.time.time", return_value=time.time() + 120):
+        assert cache.get("k") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_size_eviction_drops_least_recently_used(tmp_path):
+    cache = LLMCache(str(tmp_path / "cache.db"), max_bytes=250, ttl_seconds=60)
+    cache.put("old", "x" * 100)
+    time.sleep(0.01)
+    cache.put("recent", "y" * 100)
+    time.sleep(0.01)
+    cache.get("old")  # touch: "recent" is now the LRU entry
+    time.sleep(0.01)
+    cache.put("new", "z" * 100)
+    assert cache.get("recent") is None
+    assert cache.get("old") is not None
+    assert cache.get("new") is not None
+    assert cache.stats()["bytes"] <= 250
+
+
+def _mock_openai_reply(text):
+    resp = MagicMock()
+    resp.choices = [MagicMock(message=MagicMock(content=text))]
+    resp.usage = MagicMock(prompt_tokens=100, completion_tokens=20, total_tokens=120)
+    return resp
+
+
+def test_call_llm_json_serves_repeat_prompt_from_cache(tmp_path):
+    env = {
+        "ORACLE_LLM_PROVIDER": "openai", "ORACLE_LLM_MODEL": "m",
+        "ORACLE_LLM_BASE_URL": "http://cache-test/v1", "OPENAI_API_KEY": "k",
+        "ORACLE_LLM_CACHE_PATH": str(tmp_path / "cache.db"),
+    }
+    llm_client.reset_clients()
+    with patch.dict("os.environ", env), patch("openai.OpenAI") as MockClient:
+        MockClient.return_value.chat.completions.create.return_value = _mock_openai_reply('{"ok": true}')
+        llm_client.set_cache_mode("gate_check")
+        first, usage1 = llm_client.call_llm_json("prompt", system="sys")
+        second, usage2 = llm_client.call_llm_json("prompt", system="sys")
+        llm_client.set_cache_mode("score_individual")
+        llm_client.call_llm_json("prompt", system="sys")
+
+    assert first == second == {"ok": True}
+    assert usage1["total_tokens"] == 120
+    assert usage2["total_tokens"] == 0
+    assert MockClient.return_value.chat.completions.create.call_count == 2
+    llm_client.reset_clients()
+
+
+def test_cache_stats_counted_per_invocation(tmp_path):
+    env = {
+        "ORACLE_LLM_PROVIDER": "openai", "ORACLE_LLM_MODEL": "m",
+        "ORACLE_LLM_BASE_URL": "http://cache-test2/v1", "OPENAI_API_KEY": "k",
+        "ORACLE_LLM_CACHE_PATH": str(tmp_path / "cache.db"),
+    }
+    llm_client.reset_clients()
+    with patch.dict("os.environ", env), patch("openai.OpenAI") as MockClient:
+        MockClient.return_value.chat.completions.create.return_value = _mock_openai_reply("{}")
+        llm_client.set_cache_mode("gate_check")
+        llm_client.call_llm_json("p")
+        llm_client.call_llm_json("p")
+        assert llm_client.get_cache_stats() == {"hits": 1, "misses": 1}
+        llm_client.set_cache_mode("gate_check")
+        assert llm_client.get_cache_stats() == {"hits": 0, "misses": 0}
+    llm_client.reset_clients()
+
+
+def test_unparseable_reply_is_not_cached(tmp_path):
+    env = {
+        "ORACLE_LLM_PROVIDER": "openai", "ORACLE_LLM_MODEL": "m",
+        "ORACLE_LLM_BASE_URL": "http://cache-test3/v1", "OPENAI_API_KEY": "k",
+        "ORACLE_LLM_CACHE_PATH": str(tmp_path / "cache.db"),
+    }
+    llm_client.reset_clients()
+    with patch.dict("os.environ", env), patch("openai.OpenAI") as MockClient:
+        MockClient.return_value.chat.completions.create.return_value = _mock_openai_reply("not json")
+        llm_client.set_cache_mode("gate_check")
+        for _ in range(2):
+            try:
+                llm_client.call_llm_json("p")
+            except ValueError:
+                pass
+        assert llm_cache.get_cache().stats()["entries"] == 0
+    llm_client.reset_clients()
+
+
+def test_call_oracle_logs_cache_counters():
+    import json
+    from app.services.oracle import _call_oracle, get_oracle_logs
+    reply = {"overall_passed": True, "_token_usage": {"total_tokens": 0},
+             "_cache": {"hits": 1, "misses": 0}}
+    fake = type("R", (), {"stdout": json.dumps(reply), "returncode": 0})()
+    with patch("app.services.oracle.subprocess.run", return_value=fake):
+        output = _call_oracle({"mode": "gate_check"}, meta={"task_id": "cache-log-task"})
+    assert "_cache" not in output
+    entry = next(l for l in get_oracle_logs(limit=200) if l["task_id"] == "cache-log-task")
+    assert entry["cache_hits"] == 1
+    assert entry["cache_misses"] == 0
@@ -67,7 +67,7 @@ def test_call_llm_openai_compatible():
     assert usage["prompt_tokens"] == 200
     assert usage["completion_tokens"] == 80
     assert usage["total_tokens"] == 280
-    MockClient.assert_called_once_with(base_url="https://api.siliconflow.cn/v1")
+    MockClient.assert_called_once_with(max_retries=0, api_key="test-key", base_url="https://api.siliconflow.cn/v1")
     call_args = MockClient.return_value.chat.completions.create.call_args
     assert call_args.kwargs["messages"] == [
         {"role": "system", "content": "test system"},
@@ -114,3 +114,29 @@ def test_accumulated_usage():
     assert acc["prompt_tokens"] == 200
     assert acc["completion_tokens"] == 100
     assert acc["total_tokens"] == 300
+
+
+def test_client_reused_across_calls():
+    """Sync clients are cached per (provider, base_url, key) so keep-alive pools survive."""
+    import sys
+    sys.path.insert(0, "oracle")
+    from llm_client import call_llm, reset_clients
+    sys.path.pop(0)
+
+    mock_resp = MagicMock()
+    mock_resp.choices = [MagicMock(message=MagicMock(content="hi"))]
+    mock_resp.usage = None
+
+    reset_clients()
+    env = {"ORACLE_LLM_PROVIDER": "openai", "ORACLE_LLM_BASE_URL": "http://cache-a/v1",
+           "OPENAI_API_KEY": "k1"}
+    with patch.dict("os.environ", env):
+        with patch("openai.OpenAI") as MockClient:
+            MockClient.return_value.chat.completions.create.return_value = mock_resp
+            call_llm("p1")
+            call_llm("p2")
+            assert MockClient.call_count == 1
+            with patch.dict("os.environ", {"OPENAI_API_KEY": "k2"}):
+                call_llm("p3")
+            assert MockClient.call_count == 2
+    reset_clients()
@@ -0,0 +1,139 @@
+"""Tests for the LLM concurrency governor (token buckets, key pool, 429 handling)."""
+import sys
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "oracle"))
+
+import llm_client  # noqa: E402
+import llm_governor  # noqa: E402
+from llm_governor import Governor, GovernorTimeout, retry_after_seconds  # noqa: E402
+
+
+class FakeRateLimit(Exception):
+    """Shape of openai/anthropic RateLimitError as far as the governor cares."""
+    status_code = 429
+
+    def __init__(self, headers):
+        super().__init__("rate limited")
+        self.response = SimpleNamespace(headers=headers)
+
+
+def _resp(text, tokens):
+    resp = MagicMock()
+    resp.choices = [MagicMock(message=MagicMock(content=text))]
+    resp.usage = MagicMock(prompt_tokens=tokens, completion_tokens=0, total_tokens=tokens)
+    return resp
+
+
+def test_retry_after_headers():
+    now = 1_700_000_000.0
+    assert retry_after_seconds({"Retry-After": "7"}, now) == 7
+    assert retry_after_seconds({"retry-after-ms": "250", "retry-after": "7"}, now) == 0.25
+    assert retry_after_seconds({"Retry-After": "Tue, 14 Nov 2023 22:13:50 GMT"}, now) == 30
+    openai_headers = {"x-ratelimit-remaining-requests": "0", "x-ratelimit-reset-requests": "1m2.5s",
+                      "x-ratelimit-remaining-tokens": "900", "x-ratelimit-reset-tokens": "20ms"}
+    assert retry_after_seconds(openai_headers, now) == 62.5
+    anthropic_headers = {"anthropic-ratelimit-tokens-remaining": "0",
+                         "anthropic-ratelimit-tokens-reset": "2023-11-14T22:13:32Z"}
+    assert retry_after_seconds(anthropic_headers, now) == 12
+    assert retry_after_seconds({"x-ratelimit-remaining-requests": "3",
+                                "x-ratelimit-reset-requests": "1s"}, now) is None
+
+
+def test_buckets_refill_and_settle_actual_usage():
+    gov = Governor("", rpm=2, tpm=1000, max_inflight=0, queue_timeout=1)
+    now = 1000.0
+    first = gov.try_acquire(["k"], 400, now)
+    second = gov.try_acquire(["k"], 400, now)
+    assert first[0] and second[0]
+    # Request bucket is empty: one request refills in 60 / rpm seconds
+    assert gov.try_acquire(["k"], 100, now) == (None, None, 30.0)
+    # 800 of 1000 tokens reserved; refunding the unused estimate frees the token bucket again
+    lease = llm_governor.Lease(first[0], "k", 400, 0)
+    gov.release(lease, used_tokens=100)
+    lease_id, _, _ = gov.try_acquire(["k"], 400, now + 30)
+    assert lease_id is not None
+
+
+def test_inflight_cap_queues_across_processes(tmp_path):
+    path = str(tmp_path / "governor.db")
+    a = Governor(path, rpm=0, tpm=0, max_inflight=1, queue_timeout=5)
+    b = Governor(path, rpm=0, tpm=0, max_inflight=1, queue_timeout=5)   # e.g. another oracle process
+    held = a.acquire(["k"], 10)
+    got = []
+    waiter = threading.Thread(target=lambda: got.append(b.acquire(["k"], 10)))
+    waiter.start()
+    time.sleep(0.2)
+    assert not got and b.stats()["in_flight"] == 1
+    a.release(held)
+    waiter.join(5)
+    assert got and got[0].waited >= 0.2
+
+    short = Governor(path, rpm=0, tpm=0, max_inflight=1, queue_timeout=0.1)
+    with pytest.raises(GovernorTimeout):
+        short.acquire(["k"], 10)
+
+
+def test_rate_limited_key_cools_down_and_call_moves_to_next_key(monkeypatch):
+    monkeypatch.setenv("ORACLE_LLM_PROVIDER", "openai")
+    monkeypatch.setenv("OPENAI_API_KEYS", "k1, k2")
+    monkeypatch.setenv("ORACLE_LLM_BASE_URL", "http://governor/v1")
+    llm_client.reset_clients()
+    llm_governor._governor = None
+
+    clients = {}
+
+    def build(**kwargs):
+        assert kwargs["max_retries"] == 0       # retries belong to the governor, not the SDK
+        client = MagicMock()
+        if kwargs["api_key"] == "k1":
+            client.chat.completions.create.side_effect = FakeRateLimit({"retry-after": "30"})
+        else:
+            client.chat.completions.create.return_value = _resp("ok", 5)
+        clients[kwargs["api_key"]] = client
+        return client
+
+    with patch("openai.OpenAI", side_effect=build):
+        assert llm_client.call_llm("p1")[0] == "ok"
+        assert llm_client.call_llm("p2")[0] == "ok"
+
+    # k1 was tried once, then left alone while cooling down
+    assert clients["k1"].chat.completions.create.call_count == 1
+    assert clients["k2"].chat.completions.create.call_count == 2
+    assert llm_governor.get_governor().stats() == {"in_flight": 0, "keys_cooling_down": 1}
+    llm_client.reset_clients()
+    llm_governor._governor = None
+
+
+def test_transient_errors_are_retried_by_the_governor(monkeypatch):
+    monkeypatch.setenv("ORACLE_LLM_PROVIDER", "openai")
+    monkeypatch.setenv("OPENAI_API_KEY", "k")
+    llm_client.reset_clients()
+    llm_governor._governor = None
+    server_error = FakeRateLimit({})
+    server_error.status_code = 503
+
+    with patch("openai.OpenAI") as MockClient, patch("llm_governor.time.sleep") as sleep:
+        create = MockClient.return_value.chat.completions.create
+        create.side_effect = [server_error, _resp("ok", 5)]
+        assert llm_client.call_llm("p")[0] == "ok"
+        sleep.assert_called_once_with(llm_governor.TRANSIENT_BACKOFF)
+
+        create.side_effect = [server_error] * 3
+        with pytest.raises(FakeRateLimit):
+            llm_client.call_llm("p")
+        assert create.call_count == 2 + 1 + llm_governor.TRANSIENT_RETRIES
+
+        create.side_effect = ValueError("bad request")      # not retryable
+        with pytest.raises(ValueError):
+            llm_client.call_llm("p")
+    # Server errors say nothing about the key's rate limit
+    assert llm_governor.get_governor().stats() == {"in_flight": 0, "keys_cooling_down": 0}
+    llm_client.reset_clients()
+    llm_governor._governor = None
@@ -302,7 +302,7 @@ def test_scheduler_voided_path(db_session):
         malicious_map={0: [pw_sub.id], 1: [pw_sub.id], 2: [pw_sub.id]},
     )
 
-    with patch("app.scheduler.void_challenge_onchain", return_value="0xvoid_tx") as mock_void, \
+    with patch("app.services.escrow_outbox.void_challenge_onchain", return_value="0xvoid_tx") as mock_void, \
          patch("app.scheduler._resolve_via_contract"):
         from app.scheduler import _settle_after_arbitration
         _settle_after_arbitration(db_session, task)
@@ -391,7 +391,7 @@ def test_full_lifecycle_pw_malicious_voided(db_session):
         malicious_map={0: [pw_sub.id], 1: [pw_sub.id]},
     )
 
-    with patch("app.scheduler.void_challenge_onchain", return_value="0xvoid_tx"), \
+    with patch("app.services.escrow_outbox.void_challenge_onchain", return_value="0xvoid_tx"), \
          patch("app.scheduler._resolve_via_contract"):
         from app.scheduler import _settle_after_arbitration
         _settle_after_arbitration(db_session, task)
@@ -42,7 +42,7 @@ def test_create_task_with_acceptance_criteria(client):
         db.commit()
 
     with PAYMENT_MOCK, \
-         patch("app.routers.tasks.generate_dimensions", side_effect=_mock_gen_dims):
+         patch("app.services.oracle.generate_dimensions", side_effect=_mock_gen_dims):
         resp = client.post("/tasks", json={
             "title": "调研", "description": "调研竞品",
             "type": "quality_first", "deadline": "2026-12-31T00:00:00Z",
@@ -0,0 +1,208 @@
+"""Tests for batched payouts: queued tasks → one batchTransfer → paid / refunded."""
+import json
+import os
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base
+from app.models import (
+    ChainTransaction, ChainTxKind, PayoutBatch, PayoutBatchStatus, PayoutStatus,
+    Submission, SubmissionStatus, Task, TaskStatus, TaskType, User, UserRole,
+)
+from app.services import chain
+from app.services.payout import pay_winner, refund_publisher
+from app.services.payout_batch import flush_payout_batch
+from app.services.tx_tracker import confirm_pending
+
+_OUT = Path(__file__).parent.parent / "contracts" / "out"
+_ANVIL_KEY = "0xac0974bec39a17e36ba4a6b4d238ff944bacb478cbed5efcae784d7bf4f2ff80"
+WINNER = "0x" + "11" * 20
+PUBLISHER = "0x" + "22" * 20
+
+
+@pytest.fixture(autouse=True)
+def _batch_mode():
+    chain.reset()
+    with patch("app.services.payout.PAYOUT_MODE", "batch"):
+        yield
+    chain.reset()
+
+
+def make_db():
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(bind=engine)()
+
+
+def _tasks(db):
+    """One closed task with a winner, one with nothing to pay (refund)."""
+    publisher = User(nickname="pub", wallet=PUBLISHER, role=UserRole.publisher)
+    worker = User(nickname="w", wallet=WINNER, role=UserRole.worker)
+    db.add_all([publisher, worker])
+    db.flush()
+    won = Task(title="A", description="d", type=TaskType.fastest_first, bounty=10.0,
+               status=TaskStatus.closed, publisher_id=publisher.id,
+               deadline=datetime.now(timezone.utc))
+    empty = Task(title="B", description="d", type=TaskType.fastest_first, bounty=5.0,
+                 status=TaskStatus.closed, publisher_id=publisher.id,
+                 deadline=datetime.now(timezone.utc) + timedelta(seconds=1))
+    db.add_all([won, empty])
+    db.flush()
+    sub = Submission(task_id=won.id, worker_id=worker.id, content="c",
+                     status=SubmissionStatus.scored, score=0.9)
+    db.add(sub)
+    db.flush()
+    won.winner_submission_id = sub.id
+    db.commit()
+    return won, empty
+
+
+def test_batch_mode_queues_without_transfer():
+    db = make_db()
+    won, empty = _tasks(db)
+    with patch("app.services.payout._send_usdc_transfer") as send:
+        pay_winner(db, won.id)
+        refund_publisher(db, empty.id)
+        send.assert_not_called()
+
+    db.refresh(won)
+    db.refresh(empty)
+    assert won.payout_status == PayoutStatus.queued
+    assert won.payout_amount == 8.0
+    assert empty.payout_status == PayoutStatus.queued
+    assert empty.refund_amount == 5.0
+    # already queued: a second call doesn't queue twice
+    pay_winner(db, won.id)
+    assert db.query(PayoutBatch).count() == 0
+
+
+def test_flush_sends_one_batch_then_confirmer_settles_it():
+    db = make_db()
+    won, empty = _tasks(db)
+    pay_winner(db, won.id)
+    refund_publisher(db, empty.id)
+
+    with patch("app.services.payout_batch._send_batch_transfer", return_value="0xbatch") as send:
+        batch = flush_payout_batch(db)
+        send.assert_called_once_with(batch.id, [WINNER, PUBLISHER], [8.0, 5.0])
+        assert flush_payout_batch(db) is None   # nothing left in the queue
+
+    db.refresh(won)
+    db.refresh(empty)
+    assert (batch.status, batch.tx_hash) == (PayoutBatchStatus.submitted, "0xbatch")
+    assert (batch.transfer_count, batch.total_amount) == (2, 13.0)
+    assert won.payout_batch_id == empty.payout_batch_id == batch.id
+    assert (won.payout_status, won.payout_tx_hash) == (PayoutStatus.submitted, "0xbatch")
+    assert (empty.payout_status, empty.refund_tx_hash) == (PayoutStatus.submitted, "0xbatch")
+    tracked = db.query(ChainTransaction).one()
+    assert (tracked.kind, tracked.ref_id) == (ChainTxKind.payout_batch, batch.id)
+
+    with patch("app.services.chain.get_receipts",
+               return_value={"0xbatch": {"status": 1, "blockNumber": 3}}):
+        assert confirm_pending(db) == 1
+
+    db.refresh(won)
+    db.refresh(empty)
+    db.refresh(batch)
+    assert batch.status == PayoutBatchStatus.confirmed
+    assert won.payout_status == PayoutStatus.paid
+    assert empty.payout_status == PayoutStatus.refunded
+
+
+def test_reverted_batch_fails_its_tasks_and_retry_joins_a_new_batch():
+    db = make_db()
+    won, _ = _tasks(db)
+    pay_winner(db, won.id)
+    with patch("app.services.payout_batch._send_batch_transfer", return_value="0xbad"):
+        first = flush_payout_batch(db)
+    with patch("app.services.chain.get_receipts",
+               return_value={"0xbad": {"status": 0, "blockNumber": 3}}):
+        confirm_pending(db)
+
+    db.refresh(won)
+    db.refresh(first)
+    assert first.status == PayoutBatchStatus.failed
+    assert won.payout_status == PayoutStatus.failed
+
+    pay_winner(db, won.id)
+    with patch("app.services.payout_batch._send_batch_transfer", return_value="0xgood"):
+        second = flush_payout_batch(db)
+    db.refresh(won)
+    assert second.id != first.id
+    assert won.payout_batch_id == second.id
+
+
+def test_stale_unsent_batch_already_executed_is_not_resent():
+    db = make_db()
+    won, _ = _tasks(db)
+    pay_winner(db, won.id)
+    # Process died between claiming and broadcasting
+    batch = PayoutBatch(created_at=datetime.now(timezone.utc) - timedelta(hours=1))
+    db.add(batch)
+    db.flush()
+    won.payout_batch_id = batch.id
+    db.commit()
+
+    with patch("app.services.payout_batch._batch_executed", return_value=True), \
+         patch("app.services.payout_batch._send_batch_transfer") as send:
+        assert flush_payout_batch(db) is None
+        send.assert_not_called()
+
+    db.refresh(won)
+    db.refresh(batch)
+    assert batch.status == PayoutBatchStatus.confirmed
+    assert won.payout_status == PayoutStatus.paid
+
+
+def _artifact(path):
+    with open(_OUT / path, encoding="utf-8") as f:
+        data = json.load(f)
+    return data["abi"], data["bytecode"]["object"]
+
+
+@pytest.mark.skipif(
+    not os.environ.get("ANVIL_RPC_URL") or not (_OUT / "BatchPayout.sol" / "BatchPayout.json").exists(),
+    reason="needs a local anvil node (ANVIL_RPC_URL) and `forge build` output",
+)
+def test_batch_end_to_end_on_anvil():
+    """Deploy MockUSDC + BatchPayout on anvil and run one real batch through flush and confirm."""
+    from web3 import Web3
+    w3 = Web3(Web3.HTTPProvider(os.environ["ANVIL_RPC_URL"]))
+    chain.configure(w3)
+    owner = w3.eth.account.from_key(_ANVIL_KEY)
+
+    def deploy(path, *args):
+        abi, bytecode = _artifact(path)
+        tx = w3.eth.contract(abi=abi, bytecode=bytecode).constructor(*args).transact({"from": owner.address})
+        address = w3.eth.wait_for_transaction_receipt(tx)["contractAddress"]
+        return w3.eth.contract(address=address, abi=abi)
+
+    usdc = deploy("BatchPayout.t.sol/MockUSDC.json")
+    batch_payout = deploy("BatchPayout.sol/BatchPayout.json", usdc.address)
+
+    db = make_db()
+    won, empty = _tasks(db)
+    with patch("app.services.chain.PLATFORM_PRIVATE_KEY", _ANVIL_KEY), \
+         patch("app.services.payout_batch.USDC_CONTRACT", usdc.address), \
+         patch("app.services.payout_batch.BATCH_PAYOUT_CONTRACT", batch_payout.address):
+        pay_winner(db, won.id)
+        refund_publisher(db, empty.id)
+        batch = flush_payout_batch(db)
+        w3.eth.wait_for_transaction_receipt(batch.tx_hash)
+        assert confirm_pending(db) == 1
+
+    db.refresh(won)
+    db.refresh(empty)
+    assert won.payout_status == PayoutStatus.paid
+    assert empty.payout_status == PayoutStatus.refunded
+    assert usdc.functions.balanceOf(Web3.to_checksum_address(WINNER)).call() == 8_000_000
+    assert usdc.functions.balanceOf(Web3.to_checksum_address(PUBLISHER)).call() == 5_000_000
+    assert batch_payout.functions.executed(Web3.keccak(text=batch.id)).call()
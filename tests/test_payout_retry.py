@@ -17,7 +17,7 @@ def test_retry_payout_for_failed_task(client):
             "acceptance_criteria": ["验收标准"],
         }, headers={"X-PAYMENT": "test"}).json()
 
-    with patch("app.routers.submissions.invoke_oracle"):
+    with patch("app.routers.submissions.wake_job_dispatcher"):
         sub = client.post(f"/tasks/{task['id']}/submissions", json={
             "worker_id": "w1", "content": "answer"
         }).json()
@@ -53,7 +53,7 @@ def test_retry_payout_rejects_already_paid(client):
             "acceptance_criteria": ["验收标准"],
         }, headers={"X-PAYMENT": "test"}).json()
 
-    with patch("app.routers.submissions.invoke_oracle"):
+    with patch("app.routers.submissions.wake_job_dispatcher"):
         sub = client.post(f"/tasks/{task['id']}/submissions", json={
             "worker_id": "w1", "content": "answer"
         }).json()
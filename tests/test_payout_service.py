@@ -46,7 +46,7 @@ def test_pay_winner_calculates_80_percent():
         pay_winner(db, task.id)
 
     db.refresh(task)
-    assert task.payout_status == PayoutStatus.paid
+    assert task.payout_status == PayoutStatus.submitted
     assert task.payout_tx_hash == "0xPAYOUT_TX"
     assert task.payout_amount == 8.0  # 10.0 * 0.80
     mock_send.assert_called_once_with("0xWINNER", 8.0)
@@ -0,0 +1,163 @@
+"""Query-plan regression tests: hot queries must not fall back to full table scans.
+
+Each query below mirrors one issued by a router or by scheduler.py. It is run
+through SQLite's EXPLAIN QUERY PLAN against a seeded database built from the
+models (so the indexes in app/models.py are what is being checked), and any
+plan step of the form `SCAN <table>` without an index fails the test.
+"""
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import create_engine, func, or_, and_, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base
+from app.models import (
+    ArbiterVote, Challenge, JuryBallot, MaliciousTag, OracleJob, OracleJobStatus,
+    ScoringDimension, Submission, SubmissionStatus, Task, TaskEvent, TaskStatus, TaskType,
+    TrustEvent, TrustEventType, User, UserRole, Webhook, WebhookDelivery, WebhookDeliveryStatus,
+)
+
+NOW = datetime.now(timezone.utc)
+
+
+@pytest.fixture(scope="module")
+def engine():
+    eng = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=eng)
+    db = sessionmaker(bind=eng)()
+    statuses = list(TaskStatus)
+    for i in range(200):
+        db.add(User(id=f"u{i}", nickname=f"u{i}", wallet=f"0x{i:040x}", role=UserRole.worker))
+        db.add(Task(
+            id=f"t{i}", title="t", description="d", bounty=1.0, publisher_id=f"u{i % 20}",
+            type=TaskType.quality_first if i % 2 else TaskType.fastest_first,
+            status=statuses[i % len(statuses)], deadline=NOW + timedelta(hours=i - 100),
+        ))
+        for j in range(3):
+            db.add(Submission(id=f"s{i}_{j}", task_id=f"t{i}", worker_id=f"u{j}",
+                              content="c", status=list(SubmissionStatus)[j]))
+        db.add(Challenge(id=f"c{i}", task_id=f"t{i}", challenger_submission_id=f"s{i}_1",
+                         target_submission_id=f"s{i}_0", reason="r", challenger_wallet="0xw"))
+        db.add(TrustEvent(user_id=f"u{i % 20}", event_type=TrustEventType.worker_won, task_id=f"t{i}"))
+        db.add(ArbiterVote(challenge_id=f"c{i}", arbiter_user_id=f"u{i % 20}"))
+        db.add(JuryBallot(task_id=f"t{i}", arbiter_user_id=f"u{i % 20}"))
+        db.add(MaliciousTag(task_id=f"t{i}", arbiter_user_id=f"u{i % 20}",
+                            target_submission_id=f"s{i}_0"))
+        db.add(ScoringDimension(task_id=f"t{i}", dim_id="d", name="n", dim_type="fixed",
+                                description="d", weight=1.0, scoring_guidance="g"))
+    db.commit()
+    db.close()
+    yield eng
+    eng.dispose()
+
+
+QUERIES = {
+    # routers/tasks.py, routers/submissions.py
+    "list_tasks_by_status": select(Task).where(Task.status == TaskStatus.open)
+        .order_by(Task.created_at.desc()),
+    "task_submissions": select(Submission).where(Submission.task_id == "t1"),
+    "task_dimensions": select(ScoringDimension).where(ScoringDimension.task_id == "t1"),
+    "worker_existing_submissions": select(func.count()).select_from(Submission)
+        .where(Submission.task_id == "t1", Submission.worker_id == "u1"),
+    "worker_policy_violation": select(Submission).where(
+        Submission.task_id == "t1", Submission.worker_id == "u1",
+        Submission.status == SubmissionStatus.policy_violation),
+    "list_tasks_page": select(Task).where(Task.status == TaskStatus.open)
+        .order_by(Task.created_at.desc(), Task.id.desc()).limit(101),
+    "list_users_page": select(User).order_by(User.created_at, User.id).limit(101),
+    # routers/challenges.py
+    "task_challenges": select(Challenge).where(Challenge.task_id == "t1"),
+    "duplicate_challenge": select(Challenge).where(
+        Challenge.task_id == "t1", Challenge.challenger_submission_id == "s1_1"),
+    "challenge_rate_limit": select(Challenge).where(
+        Challenge.challenger_wallet == "0xw",
+        Challenge.created_at > NOW - timedelta(minutes=1)),
+    "task_ballots": select(JuryBallot).where(JuryBallot.task_id == "t1"),
+    "task_malicious_tags": select(MaliciousTag).where(MaliciousTag.task_id == "t1"),
+    "malicious_tag_count": select(func.count()).select_from(MaliciousTag).where(
+        MaliciousTag.task_id == "t1", MaliciousTag.target_submission_id == "s1_0"),
+    # routers/trust.py
+    "user_trust_events": select(TrustEvent).where(TrustEvent.user_id == "u1")
+        .order_by(TrustEvent.created_at.desc()).limit(100),
+    "task_trust_events": select(TrustEvent).where(TrustEvent.task_id == "t1"),
+    "publisher_tasks": select(Task).where(Task.publisher_id == "u1",
+                                          Task.payment_tx_hash.isnot(None)),
+    "worker_submissions": select(Submission).where(Submission.worker_id == "u1"),
+    "payout_tasks": select(Task).where(Task.winner_submission_id.in_(["s1_0", "s2_0"])),
+    "challenge_votes": select(ArbiterVote).where(ArbiterVote.challenge_id == "c1"),
+    "arbiter_rewards": select(ArbiterVote).where(ArbiterVote.arbiter_user_id == "u1",
+                                                 ArbiterVote.reward_amount.isnot(None)),
+    # scheduler.py
+    "lifecycle_candidates": select(Task.id).where(
+        Task.type == TaskType.quality_first,
+        or_(
+            and_(Task.status == TaskStatus.open, Task.deadline <= NOW),
+            Task.status == TaskStatus.scoring,
+            and_(Task.status == TaskStatus.challenge_window, Task.challenge_window_end <= NOW),
+            Task.status == TaskStatus.arbitrating,
+        )),
+    "expired_open": select(Task).where(Task.type == TaskType.fastest_first,
+                                       Task.status == TaskStatus.open, Task.deadline <= NOW),
+    "expired_window": select(Task.id).where(Task.type == TaskType.quality_first,
+                                            Task.status == TaskStatus.challenge_window,
+                                            Task.challenge_window_end <= NOW),
+    "status_histogram": select(Submission.task_id, Submission.status, func.count(Submission.id))
+        .where(Submission.task_id.in_(["t1", "t2", "t3"]))
+        .group_by(Submission.task_id, Submission.status),
+    "challenge_counts": select(Challenge.task_id, func.count(Challenge.id))
+        .where(Challenge.task_id.in_(["t1", "t2"])).group_by(Challenge.task_id),
+    "best_submission": select(Submission).where(Submission.task_id == "t1",
+                                                Submission.score.isnot(None))
+        .order_by(Submission.score.desc()).limit(1),
+    # services/job_queue.py
+    "claim_jobs": select(OracleJob.id).where(
+        OracleJob.status == OracleJobStatus.queued, OracleJob.available_at <= NOW)
+        .order_by(OracleJob.priority, OracleJob.available_at).limit(4),
+    # services/events.py
+    "event_tail": select(TaskEvent).where(TaskEvent.id > 10).order_by(TaskEvent.id),
+    "task_event_replay": select(TaskEvent).where(TaskEvent.id > 10, TaskEvent.task_id == "t1")
+        .order_by(TaskEvent.id).limit(1000),
+    # services/webhooks.py
+    "webhook_fanout": select(Webhook.id).where(
+        Webhook.active == True,  # noqa: E712
+        or_(Webhook.task_id.is_(None), Webhook.task_id.in_(["t1", "t2"]))),
+    "webhook_claim": select(WebhookDelivery.id).where(or_(
+        and_(WebhookDelivery.status == WebhookDeliveryStatus.pending,
+             WebhookDelivery.next_attempt_at <= NOW),
+        and_(WebhookDelivery.status == WebhookDeliveryStatus.sending,
+             WebhookDelivery.locked_until < NOW),
+    )).limit(200),
+    "webhook_claimed_batch": select(WebhookDelivery.id).where(WebhookDelivery.lease_token == "x"),
+    "webhook_dead_letters": select(WebhookDelivery).where(
+        WebhookDelivery.webhook_id == "h1", WebhookDelivery.status == WebhookDeliveryStatus.dead),
+}
+
+
+def _plan(engine, stmt) -> list[str]:
+    compiled = stmt.compile(dialect=engine.dialect, compile_kwargs={"render_postcompile": True})
+    params = tuple(compiled.params[name] for name in compiled.positiontup)
+    with engine.connect() as conn:
+        rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}", params).fetchall()
+    return [row[-1] for row in rows]
+
+
+def _full_scans(plan: list[str]) -> list[str]:
+    # "SCAN tasks" is a table scan; "SCAN tasks USING INDEX ..." walks an index
+    return [step for step in plan
+            if step.startswith("SCAN ") and "USING" not in step and "CONSTANT ROW" not in step]
+
+
+@pytest.mark.parametrize("name", sorted(QUERIES))
+def test_query_uses_index(engine, name):
+    plan = _plan(engine, QUERIES[name])
+    assert not _full_scans(plan), f"{name} falls back to a full scan: {plan}"
+
+
+def test_detector_flags_unindexed_query(engine):
+    """Sanity check: a filter on an unindexed column is reported as a scan."""
+    plan = _plan(engine, select(Submission).where(Submission.content == "c"))
+    assert _full_scans(plan)
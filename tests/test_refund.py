@@ -87,7 +87,7 @@ def test_quality_first_no_submissions_full_refund():
 
     db.refresh(task)
     assert task.status == TaskStatus.closed
-    assert task.payout_status == PayoutStatus.refunded
+    assert task.payout_status == PayoutStatus.submitted
     assert task.refund_amount == 10.0
     assert task.refund_tx_hash == "0xrefund_tx"
     mock_transfer.assert_called_once_with("0xPublisher", 10.0)
@@ -114,7 +114,7 @@ def test_quality_first_no_qualifying_submissions_95_refund():
 
     db.refresh(task)
     assert task.status == TaskStatus.closed
-    assert task.payout_status == PayoutStatus.refunded
+    assert task.payout_status == PayoutStatus.submitted
     assert task.refund_amount == 9.5  # 10 * 0.95
     assert task.refund_tx_hash == "0xrefund_tx"
 
@@ -133,7 +133,7 @@ def test_quality_first_qualifying_submission_no_refund():
     add_scored_submission(db, task.id, "w2", 0.6)
     db.commit()
 
-    with patch("app.scheduler.create_challenge_onchain", return_value="0xESCROW"):
+    with patch("app.services.escrow_outbox.create_challenge_onchain", return_value="0xESCROW"):
         from app.scheduler import quality_first_lifecycle
         quality_first_lifecycle(db=db)
 
@@ -156,7 +156,7 @@ def test_quality_first_no_threshold_picks_best():
     s1 = add_scored_submission(db, task.id, "w1", 0.3)
     db.commit()
 
-    with patch("app.scheduler.create_challenge_onchain", return_value="0xESCROW"):
+    with patch("app.services.escrow_outbox.create_challenge_onchain", return_value="0xESCROW"):
         from app.scheduler import quality_first_lifecycle
         quality_first_lifecycle(db=db)
 
@@ -183,7 +183,7 @@ def test_fastest_first_no_submissions_full_refund():
 
     db.refresh(task)
     assert task.status == TaskStatus.closed
-    assert task.payout_status == PayoutStatus.refunded
+    assert task.payout_status == PayoutStatus.submitted
     assert task.refund_amount == 5.0
 
 
@@ -206,7 +206,7 @@ def test_fastest_first_no_qualifying_95_refund():
 
     db.refresh(task)
     assert task.status == TaskStatus.closed
-    assert task.payout_status == PayoutStatus.refunded
+    assert task.payout_status == PayoutStatus.submitted
     assert task.refund_amount == 4.75  # 5 * 0.95
 
 
@@ -143,7 +143,7 @@ def test_settle_triggers_payout():
     quality_first_lifecycle(db=db)
 
     # Phase 2: scoring → challenge_window (mock escrow lock)
-    with patch("app.scheduler.create_challenge_onchain", return_value="0xESCROW"):
+    with patch("app.services.escrow_outbox.create_challenge_onchain", return_value="0xESCROW"):
         quality_first_lifecycle(db=db)
 
     # Phase 3: expire challenge window → closed with payout
@@ -0,0 +1,83 @@
+"""Tests for the vectorized ranking inputs used by batch_score_submissions."""
+import json
+import random
+from types import SimpleNamespace
+
+import numpy as np
+
+from app.services.dimension_cache import DimensionBundle
+from app.services.oracle import PENALTY_THRESHOLD, compute_penalized_total
+from app.services.score_matrix import (
+    build_score_matrix, passes_threshold, penalized_totals, top_k_per_worker, weighted_totals,
+)
+
+
+def _bundle():
+    rows = [
+        SimpleNamespace(dim_id="substantiveness", name="s", dim_type="fixed", description="",
+                        weight=0.3, scoring_guidance=""),
+        SimpleNamespace(dim_id="completeness", name="c", dim_type="fixed", description="",
+                        weight=0.3, scoring_guidance=""),
+        SimpleNamespace(dim_id="data_precision", name="d", dim_type="dynamic", description="",
+                        weight=0.4, scoring_guidance=""),
+    ]
+    return DimensionBundle.from_rows("t", rows)
+
+
+def _sub(worker="w", feedback=None, **scores):
+    raw = None
+    if feedback is not None or scores:
+        raw = json.dumps({"type": feedback or "individual_scoring", "dimension_scores": {
+            k: {"band": v[0], "score": v[1], "evidence": f"ev-{k}"} for k, v in scores.items()
+        }})
+    return SimpleNamespace(worker_id=worker, oracle_feedback=raw)
+
+
+def test_penalized_totals_match_scalar_implementation():
+    bundle = _bundle()
+    rng = random.Random(3)
+    subs = [_sub(substantiveness=("B", rng.randint(0, 100)),
+                 completeness=("C", rng.randint(0, 100)),
+                 data_precision=("A", rng.randint(0, 100))) for _ in range(500)]
+    matrix = build_score_matrix(subs, bundle)
+    totals = penalized_totals(matrix.scores, bundle, PENALTY_THRESHOLD)
+    expected = [
+        compute_penalized_total(json.loads(s.oracle_feedback)["dimension_scores"],
+                                list(bundle.penalty_dims))["final_score"]
+        for s in subs
+    ]
+    np.testing.assert_allclose(totals, expected, atol=0.01)
+
+
+def test_threshold_filter_checks_fixed_bands_only():
+    bundle = _bundle()
+    subs = [
+        _sub(substantiveness=("C", 60), completeness=("B", 70), data_precision=("E", 10)),  # passes
+        _sub(substantiveness=("D", 40), completeness=("A", 90), data_precision=("A", 90)),  # fixed D
+        _sub(substantiveness=("A", 90)),                                                    # fixed missing
+        _sub(),                                                                             # no feedback
+        SimpleNamespace(worker_id="w", oracle_feedback="not json"),
+    ]
+    matrix = build_score_matrix(subs, bundle)
+    assert passes_threshold(matrix, bundle).tolist() == [True, False, False, False, False]
+    assert matrix.scores[2].tolist() == [90.0, 0.0, 0.0]
+
+
+def test_top_k_keeps_best_per_worker_and_stable_ties():
+    totals = np.array([50.0, 90.0, 70.0, 90.0, 80.0, 10.0])
+    workers = ["a", "b", "a", "c", "b", "d"]
+    # b's 90 beats its 80; the 90 tie keeps input order (b before c); a's best is 70
+    assert top_k_per_worker(totals, workers, 3).tolist() == [1, 3, 2]
+    assert top_k_per_worker(totals, workers, 10).tolist() == [1, 3, 2, 5]
+
+
+def test_individual_ir_and_weighted_totals():
+    bundle = _bundle()
+    subs = [
+        _sub(substantiveness=("B", 80), completeness=("A", 90), data_precision=("C", 50)),
+        _sub(feedback="gate_check", substantiveness=("B", 80)),
+    ]
+    matrix = build_score_matrix(subs, bundle)
+    assert matrix.individual_ir(0)["completeness"] == {"band": "A", "evidence": "ev-completeness"}
+    assert matrix.individual_ir(1) == {}
+    np.testing.assert_allclose(weighted_totals(matrix, bundle), [0.3 * 80 + 0.3 * 90 + 0.4 * 50, 0.0])
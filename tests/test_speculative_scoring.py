@@ -0,0 +1,118 @@
+"""Tests for speculative score_individual alongside gate_check in give_feedback."""
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base
+from app.models import ScoringDimension, Submission, SubmissionStatus, Task, TaskType
+from app.services import oracle
+
+GATE_PASS = {"overall_passed": True, "criteria_checks": [], "summary": "ok"}
+GATE_FAIL = {"overall_passed": False, "criteria_checks": [], "summary": "no"}
+SCORE = {"dimension_scores": {"substantiveness": {"band": "B", "score": 75, "evidence": "e"}},
+         "overall_band": "B", "revision_suggestions": []}
+
+
+@pytest.fixture
+def db(monkeypatch):
+    monkeypatch.setattr(oracle, "ORACLE_SPECULATIVE_SCORING", True)
+    monkeypatch.setattr(oracle, "_speculation_stats", {k: 0 for k in oracle._speculation_stats})
+    monkeypatch.setattr(oracle, "_feedback_latency", {"staged": [0, 0], "speculative": [0, 0]})
+    monkeypatch.setattr(oracle, "_oracle_logs", [])
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(bind=engine)()
+
+
+def _setup(db):
+    task = Task(title="T", description="d", type=TaskType.quality_first, bounty=10.0,
+                deadline=datetime(2026, 12, 31, tzinfo=timezone.utc), acceptance_criteria='["c1"]')
+    db.add(task)
+    db.flush()
+    db.add(ScoringDimension(task_id=task.id, dim_id="substantiveness", name="实质性", dim_type="fixed",
+                            description="d", weight=1.0, scoring_guidance="g"))
+    sub = Submission(task_id=task.id, worker_id="w1", content="c", status=SubmissionStatus.pending)
+    db.add(sub)
+    db.commit()
+    return task, sub
+
+
+def _oracle(gate_reply, score_started: threading.Event, release_score: threading.Event):
+    """subprocess.run stand-in: gate_check waits until the score call has started."""
+    def run(*args, **kwargs):
+        mode = json.loads(kwargs["input"])["mode"]
+        if mode == "gate_check":
+            assert score_started.wait(5), "score_individual did not start alongside gate_check"
+            reply = {**gate_reply, "_token_usage": {"total_tokens": 100}}
+        else:
+            score_started.set()
+            release_score.wait(5)
+            reply = {**SCORE, "_token_usage": {"total_tokens": 400}}
+        return type("R", (), {"stdout": json.dumps(reply), "returncode": 0, "stderr": ""})()
+    return run
+
+
+def test_speculative_score_is_used_when_gate_passes(db):
+    task, sub = _setup(db)
+    started, release = threading.Event(), threading.Event()
+    release.set()
+    with patch("app.services.oracle.subprocess.run", side_effect=_oracle(GATE_PASS, started, release)) as run:
+        oracle.give_feedback(db, sub.id, task.id)
+
+    assert run.call_count == 2
+    db.refresh(sub)
+    assert sub.status == SubmissionStatus.gate_passed
+    assert json.loads(sub.oracle_feedback)["type"] == "individual_scoring"
+
+    score_log = next(e for e in oracle.get_oracle_logs() if e["mode"] == "score_individual")
+    assert score_log["speculation"]["outcome"] == "hit"
+    assert score_log["speculation"]["time_to_feedback_ms"] >= 0
+    stats = oracle.get_speculation_stats()
+    assert (stats["hits"], stats["misses"], stats["hit_ratio"], stats["wasted_token_rate"]) == (1, 0, 1.0, 0.0)
+    assert stats["avg_time_to_feedback_ms"]["speculative"] is not None
+
+
+def test_failed_gate_discards_in_flight_score_and_counts_tokens(db):
+    task, sub = _setup(db)
+    started, release = threading.Event(), threading.Event()
+    with patch("app.services.oracle.subprocess.run", side_effect=_oracle(GATE_FAIL, started, release)):
+        oracle.give_feedback(db, sub.id, task.id)
+        db.refresh(sub)
+        assert sub.status == SubmissionStatus.gate_failed
+        assert json.loads(sub.oracle_feedback)["type"] == "gate_check"
+        assert oracle.get_speculation_stats()["runs"] == 0     # still waiting for the score reply
+        release.set()
+        deadline = time.monotonic() + 5
+        while not oracle.get_speculation_stats()["runs"] and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    stats = oracle.get_speculation_stats()
+    assert (stats["misses"], stats["wasted_tokens"], stats["wasted_token_rate"]) == (1, 400, 1.0)
+
+
+def test_queued_speculation_is_cancelled_when_gate_fails(db, monkeypatch):
+    task, sub = _setup(db)
+    busy = ThreadPoolExecutor(max_workers=1)
+    unblock = threading.Event()
+    busy.submit(unblock.wait)                     # the only worker is busy, so the score call queues
+    monkeypatch.setattr(oracle, "_speculation_executor", busy)
+
+    def run(*args, **kwargs):
+        assert json.loads(kwargs["input"])["mode"] == "gate_check"
+        return type("R", (), {"stdout": json.dumps(GATE_FAIL), "returncode": 0, "stderr": ""})()
+
+    with patch("app.services.oracle.subprocess.run", side_effect=run):
+        oracle.give_feedback(db, sub.id, task.id)
+    unblock.set()
+    busy.shutdown(wait=True)
+
+    stats = oracle.get_speculation_stats()
+    assert (stats["misses"], stats["cancelled"], stats["wasted_tokens"]) == (1, 1, 0)
@@ -30,7 +30,7 @@ def make_task(client, type="fastest_first", threshold=0.8, max_revisions=None):
 
 def test_submit_to_open_task(client):
     task = make_task(client)
-    with patch("app.routers.submissions.invoke_oracle"):
+    with patch("app.routers.submissions.wake_job_dispatcher"):
         resp = client.post(f"/tasks/{task['id']}/submissions", json={
             "worker_id": "w1", "content": "my answer"
         })
@@ -43,7 +43,7 @@ def test_submit_to_open_task(client):
 
 def test_fastest_first_only_one_submission_per_worker(client):
     task = make_task(client, type="fastest_first")
-    with patch("app.routers.submissions.invoke_oracle"):
+    with patch("app.routers.submissions.wake_job_dispatcher"):
         client.post(f"/tasks/{task['id']}/submissions", json={"worker_id": "w1", "content": "a"})
         resp = client.post(f"/tasks/{task['id']}/submissions", json={"worker_id": "w1", "content": "b"})
     assert resp.status_code == 400
@@ -52,7 +52,7 @@ def test_fastest_first_only_one_submission_per_worker(client):
 
 def test_quality_first_multiple_revisions(client):
     task = make_task(client, type="quality_first", max_revisions=3)
-    with patch("app.routers.submissions.invoke_oracle"):
+    with patch("app.routers.submissions.wake_job_dispatcher"):
         r1 = client.post(f"/tasks/{task['id']}/submissions", json={"worker_id": "w1", "content": "v1"})
         r2 = client.post(f"/tasks/{task['id']}/submissions", json={"worker_id": "w1", "content": "v2"})
         r3 = client.post(f"/tasks/{task['id']}/submissions", json={"worker_id": "w1", "content": "v3"})
@@ -72,7 +72,7 @@ def test_submit_to_nonexistent_task(client):
 def test_submit_to_closed_task(client):
     task = make_task(client)
     # Manually close task via internal endpoint after scoring above threshold
-    with patch("app.routers.submissions.invoke_oracle"):
+    with patch("app.routers.submissions.wake_job_dispatcher"):
         client.post(f"/tasks/{task['id']}/submissions", json={"worker_id": "w1", "content": "a"})
 
     # Close via internal score endpoint
@@ -92,7 +92,7 @@ def test_submit_to_closed_task(client):
 
 def test_list_submissions(client):
     task = make_task(client)
-    with patch("app.routers.submissions.invoke_oracle"):
+    with patch("app.routers.submissions.wake_job_dispatcher"):
         client.post(f"/tasks/{task['id']}/submissions", json={"worker_id": "w1", "content": "a"})
         client.post(f"/tasks/{task['id']}/submissions", json={"worker_id": "w2", "content": "b"})
     resp = client.get(f"/tasks/{task['id']}/submissions")
@@ -102,13 +102,64 @@ def test_list_submissions(client):
 
 def test_get_single_submission(client):
     task = make_task(client)
-    with patch("app.routers.submissions.invoke_oracle"):
+    with patch("app.routers.submissions.wake_job_dispatcher"):
         sub = client.post(f"/tasks/{task['id']}/submissions", json={"worker_id": "w1", "content": "a"}).json()
     resp = client.get(f"/tasks/{task['id']}/submissions/{sub['id']}")
     assert resp.status_code == 200
     assert resp.json()["id"] == sub["id"]
 
 
+def test_get_submission_long_poll_returns_on_status_change(client):
+    import threading
+    import time
+    from app.database import get_db
+    from app.models import Submission, SubmissionStatus
+    task = make_task(client)
+    with patch("app.routers.submissions.wake_job_dispatcher"):
+        sub = client.post(f"/tasks/{task['id']}/submissions", json={"worker_id": "w1", "content": "a"}).json()
+
+    def oracle_finishes():
+        time.sleep(0.3)
+        db = next(client.app.dependency_overrides[get_db]())
+        s = db.query(Submission).filter(Submission.id == sub["id"]).first()
+        s.status = SubmissionStatus.scored
+        s.score = 0.9
+        db.commit()
+
+    t = threading.Thread(target=oracle_finishes)
+    started = time.monotonic()
+    t.start()
+    resp = client.get(f"/tasks/{task['id']}/submissions/{sub['id']}?wait=10&since_status=pending")
+    t.join()
+    assert resp.status_code == 200
+    assert resp.json()["status"] == "scored"
+    assert resp.json()["score"] == 0.9
+    assert time.monotonic() - started < 5
+
+
+def test_get_submission_long_poll_timeout_and_stale_since_status(client):
+    import time
+    task = make_task(client)
+    with patch("app.routers.submissions.wake_job_dispatcher"):
+        sub = client.post(f"/tasks/{task['id']}/submissions", json={"worker_id": "w1", "content": "a"}).json()
+    url = f"/tasks/{task['id']}/submissions/{sub['id']}"
+
+    # Nothing changes: returns the unchanged submission once the wait runs out
+    started = time.monotonic()
+    resp = client.get(f"{url}?wait=0.3")
+    assert resp.json()["status"] == "pending"
+    assert 0.3 <= time.monotonic() - started < 5
+
+    # since_status already out of date: answers immediately
+    started = time.monotonic()
+    resp = client.get(f"{url}?wait=30&since_status=gate_passed")
+    assert resp.json()["status"] == "pending"
+    assert time.monotonic() - started < 5
+
+    assert client.get(f"/tasks/{task['id']}/submissions/nope?wait=1").status_code == 404
+    assert client.get(f"{url}?wait=3600").status_code == 422
+
+
 def make_quality_task(client):
     body = {"title": "T", "description": "d", "type": "quality_first",
             "max_revisions": 3, "deadline": future(),
@@ -120,7 +171,7 @@ def make_quality_task(client):
 
 def test_quality_first_score_hidden_when_open(client):
     task = make_quality_task(client)
-    with patch("app.routers.submissions.invoke_oracle"):
+    with patch("app.routers.submissions.wake_job_dispatcher"):
         sub = client.post(f"/tasks/{task['id']}/submissions",
                           json={"worker_id": "w1", "content": "a"}).json()
 
@@ -139,7 +190,7 @@ def test_quality_first_score_hidden_when_open(client):
 
 def test_fastest_first_score_always_visible(client):
     task = make_task(client, type="fastest_first")
-    with patch("app.routers.submissions.invoke_oracle"):
+    with patch("app.routers.submissions.wake_job_dispatcher"):
         sub = client.post(f"/tasks/{task['id']}/submissions",
                           json={"worker_id": "w1", "content": "a"}).json()
 
@@ -225,7 +225,7 @@ def test_policy_violation_worker_cannot_resubmit(client_with_db):
     task_id = task_resp.json()["id"]
 
     # 第一次提交（mock oracle 不实际调用）
-    with patch("app.routers.submissions.invoke_oracle"):
+    with patch("app.routers.submissions.wake_job_dispatcher"):
         sub_resp = client.post(
             f"/tasks/{task_id}/submissions",
             json={"worker_id": "bad_worker", "content": "inject attempt"},
@@ -239,7 +239,7 @@ def test_policy_violation_worker_cannot_resubmit(client_with_db):
     db.commit()
 
     # 第二次提交应被 403 拒绝
-    with patch("app.routers.submissions.invoke_oracle"):
+    with patch("app.routers.submissions.wake_job_dispatcher"):
         resp2 = client.post(
             f"/tasks/{task_id}/submissions",
             json={"worker_id": "bad_worker", "content": "another attempt"},
@@ -353,3 +353,73 @@ def test_task_detail_includes_full_scoring_dimensions(client_with_db):
     assert dims[0]["scoring_guidance"] == "Evaluate depth of analysis"
     assert dims[0]["name"] == "Substantiveness"
     assert dims[0]["description"] == "Content depth"
+
+
+def _seed_tasks(db, n, **overrides):
+    from app.models import Task, TaskType
+    base = datetime.now(timezone.utc)
+    tasks = []
+    for i in range(n):
+        fields = dict(title=f"T{i}", description="d", type=TaskType.fastest_first,
+                      deadline=base + timedelta(days=i), bounty=float(i + 1),
+                      created_at=base - timedelta(minutes=n - i))
+        fields.update(overrides)
+        tasks.append(Task(**fields))
+    db.add_all(tasks)
+    db.commit()
+    return tasks
+
+
+def test_list_tasks_keyset_pagination(client_with_db):
+    client, db = client_with_db
+    tasks = _seed_tasks(db, 5)
+    # Same created_at for two rows: the id tiebreak must keep paging stable
+    tasks[1].created_at = tasks[2].created_at
+    db.commit()
+
+    seen = []
+    cursor = None
+    while True:
+        url = "/tasks?limit=2" + (f"&cursor={cursor}" if cursor else "")
+        resp = client.get(url)
+        assert resp.status_code == 200
+        page = resp.json()
+        assert len(page) <= 2
+        seen.extend(t["id"] for t in page)
+        cursor = resp.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+    assert sorted(seen) == sorted(t.id for t in tasks)
+    assert len(seen) == len(set(seen))
+    assert seen[0] == tasks[4].id  # newest first
+
+
+def test_list_tasks_without_limit_returns_all(client_with_db):
+    from unittest.mock import patch
+    client, db = client_with_db
+    tasks = _seed_tasks(db, 3)
+    with patch("app.services.pagination.DEFAULT_PAGE_SIZE", 2):
+        resp = client.get("/tasks")
+    assert [t["id"] for t in resp.json()] == [t.id for t in reversed(tasks)]
+    assert "X-Next-Cursor" not in resp.headers
+
+
+def test_list_tasks_invalid_cursor(client):
+    resp = client.get("/tasks?cursor=not-a-cursor")
+    assert resp.status_code == 400
+
+
+def test_list_tasks_bounty_and_deadline_filters(client_with_db):
+    client, db = client_with_db
+    tasks = _seed_tasks(db, 5)  # bounty 1..5, deadline today+0..4 days
+
+    resp = client.get("/tasks?min_bounty=2&max_bounty=4")
+    assert sorted(t["bounty"] for t in resp.json()) == [2.0, 3.0, 4.0]
+
+    after = (tasks[3].deadline - timedelta(hours=1)).isoformat()
+    resp = client.get("/tasks", params={"deadline_after": after})
+    assert {t["id"] for t in resp.json()} == {tasks[3].id, tasks[4].id}
+
+    before = (tasks[0].deadline + timedelta(hours=1)).isoformat()
+    resp = client.get("/tasks", params={"deadline_before": before, "min_bounty": 1})
+    assert [t["id"] for t in resp.json()] == [tasks[0].id]
@@ -43,3 +43,25 @@ def test_get_trust_events(client):
     resp = client.get(f"/users/{user_id}/trust/events")
     assert resp.status_code == 200
     assert resp.json() == []
+
+
+def test_get_trust_events_paginated(client_with_db):
+    from datetime import datetime, timedelta, timezone
+    from app.models import TrustEvent, TrustEventType
+    client, db = client_with_db
+    resp = client.post("/users", json={
+        "nickname": "paged-user", "wallet": "0xPAGED", "role": "worker"
+    })
+    user_id = resp.json()["id"]
+    base = datetime.now(timezone.utc)
+    for i in range(5):
+        db.add(TrustEvent(user_id=user_id, event_type=TrustEventType.worker_won,
+                          delta=float(i), created_at=base + timedelta(seconds=i)))
+    db.commit()
+
+    resp = client.get(f"/users/{user_id}/trust/events?limit=3")
+    assert [e["delta"] for e in resp.json()] == [4.0, 3.0, 2.0]
+    cursor = resp.headers["X-Next-Cursor"]
+    resp = client.get(f"/users/{user_id}/trust/events?limit=3&cursor={cursor}")
+    assert [e["delta"] for e in resp.json()] == [1.0, 0.0]
+    assert "X-Next-Cursor" not in resp.headers
@@ -46,7 +46,7 @@ def test_full_trust_settlement_upheld(client):
     db.commit()
 
     from app.scheduler import _settle_after_arbitration
-    with patch("app.scheduler.resolve_challenge_onchain", return_value="0x"):
+    with patch("app.services.escrow_outbox.resolve_challenge_onchain", return_value="0x"):
         _settle_after_arbitration(db, task)
 
     # Challenger should have challenger_won trust event
@@ -114,7 +114,7 @@ def test_full_trust_settlement_rejected(client):
     db.commit()
 
     from app.scheduler import _settle_after_arbitration
-    with patch("app.scheduler.resolve_challenge_onchain", return_value="0x"):
+    with patch("app.services.escrow_outbox.resolve_challenge_onchain", return_value="0x"):
         _settle_after_arbitration(db, task)
 
     # Winner should have worker_won trust event
@@ -174,7 +174,7 @@ def test_full_trust_settlement_malicious(client):
     db.commit()
 
     from app.scheduler import _settle_after_arbitration
-    with patch("app.scheduler.resolve_challenge_onchain", return_value="0x"), \
+    with patch("app.services.escrow_outbox.resolve_challenge_onchain", return_value="0x"), \
          patch("app.services.staking.slash_onchain", return_value="0xslash"):
         _settle_after_arbitration(db, task)
 
@@ -230,7 +230,7 @@ def test_settlement_no_challenges(client):
     task.winner_submission_id = w_sub.id
 
     from app.scheduler import _settle_after_arbitration
-    with patch("app.scheduler.resolve_challenge_onchain", return_value="0x"):
+    with patch("app.services.escrow_outbox.resolve_challenge_onchain", return_value="0x"):
         _settle_after_arbitration(db, task)
 
     # Winner gets worker_won
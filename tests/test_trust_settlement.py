@@ -60,8 +60,8 @@ def test_scheduler_selects_jury_on_challenge_window_expiry(client):
     db.commit()
 
     from app.scheduler import quality_first_lifecycle
-    with patch("app.scheduler.create_challenge_onchain", return_value="0x"):
-        with patch("app.scheduler.resolve_challenge_onchain", return_value="0x"):
+    with patch("app.services.escrow_outbox.create_challenge_onchain", return_value="0x"):
+        with patch("app.services.escrow_outbox.resolve_challenge_onchain", return_value="0x"):
             quality_first_lifecycle(db)
 
     db.refresh(task)
@@ -116,8 +116,8 @@ def test_scheduler_falls_back_to_stub_when_no_arbiters(client):
     db.commit()
 
     from app.scheduler import quality_first_lifecycle
-    with patch("app.scheduler.create_challenge_onchain", return_value="0x"):
-        with patch("app.scheduler.resolve_challenge_onchain", return_value="0x"):
+    with patch("app.services.escrow_outbox.create_challenge_onchain", return_value="0x"):
+        with patch("app.services.escrow_outbox.resolve_challenge_onchain", return_value="0x"):
             with patch("app.scheduler.run_arbitration") as mock_arb:
                 quality_first_lifecycle(db)
                 mock_arb.assert_called_once_with(db, task.id)
@@ -190,7 +190,7 @@ def test_scheduler_resolves_jury_when_all_voted(client):
     db.commit()
 
     from app.scheduler import quality_first_lifecycle
-    with patch("app.scheduler.resolve_challenge_onchain", return_value="0x"):
+    with patch("app.services.escrow_outbox.resolve_challenge_onchain", return_value="0x"):
         quality_first_lifecycle(db)
 
     db.refresh(task)
@@ -285,7 +285,7 @@ def test_scheduler_applies_timeout_penalty(client):
     db.commit()
 
     from app.scheduler import quality_first_lifecycle
-    with patch("app.scheduler.resolve_challenge_onchain", return_value="0x"):
+    with patch("app.services.escrow_outbox.resolve_challenge_onchain", return_value="0x"):
         quality_first_lifecycle(db)
 
     db.refresh(task)
@@ -384,7 +384,7 @@ def test_apply_verdict_trust_minority(client):
     db.commit()
 
     from app.scheduler import quality_first_lifecycle
-    with patch("app.scheduler.resolve_challenge_onchain", return_value="0x"):
+    with patch("app.services.escrow_outbox.resolve_challenge_onchain", return_value="0x"):
         quality_first_lifecycle(db)
 
     db.refresh(task)
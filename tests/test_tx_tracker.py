@@ -0,0 +1,196 @@
+"""Tests for the background tx confirmer: submitted → paid / refunded / failed."""
+import os
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base
+from app.models import (
+    Task, Submission, Challenge, ChainTransaction,
+    TaskType, TaskStatus, SubmissionStatus, PayoutStatus,
+    ChainTxKind, ChainTxStatus,
+)
+from app.services import chain
+from app.services.tx_tracker import confirm_pending, track_transaction
+
+
+@pytest.fixture(autouse=True)
+def _fresh_chain_state():
+    chain.reset()
+    yield
+    chain.reset()
+
+
+def make_db():
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    return sessionmaker(bind=engine)()
+
+
+def make_task(db, **kw):
+    task = Task(
+        title="T", description="d", type=TaskType.quality_first, bounty=10.0,
+        deadline=datetime.now(timezone.utc), publisher_id="pub-1", **kw,
+    )
+    db.add(task)
+    db.flush()
+    return task
+
+
+def receipts(mapping):
+    """Patch chain.get_receipts with {tx_hash: status or None}."""
+    def fake(hashes):
+        return {h: None if mapping.get(h) is None else {"status": mapping[h], "blockNumber": 7}
+                for h in hashes}
+    return patch("app.services.chain.get_receipts", side_effect=fake)
+
+
+def test_payout_and_refund_confirmed():
+    db = make_db()
+    paid = make_task(db, payout_status=PayoutStatus.submitted, payout_tx_hash="0xpay")
+    refunded = make_task(db, payout_status=PayoutStatus.submitted, refund_tx_hash="0xref")
+    track_transaction(db, "0xpay", ChainTxKind.payout, task_id=paid.id)
+    track_transaction(db, "0xref", ChainTxKind.refund, task_id=refunded.id)
+    db.commit()
+
+    with receipts({"0xpay": 1, "0xref": 1}):
+        assert confirm_pending(db) == 2
+        assert confirm_pending(db) == 0   # nothing left to check
+
+    db.refresh(paid)
+    db.refresh(refunded)
+    assert paid.payout_status == PayoutStatus.paid
+    assert refunded.payout_status == PayoutStatus.refunded
+    rows = db.query(ChainTransaction).all()
+    assert {r.status for r in rows} == {ChainTxStatus.confirmed}
+    assert all(r.block_number == 7 for r in rows)
+
+
+def test_reverted_payout_marks_failed():
+    db = make_db()
+    task = make_task(db, payout_status=PayoutStatus.submitted, payout_tx_hash="0xpay")
+    track_transaction(db, "0xpay", ChainTxKind.payout, task_id=task.id)
+    db.commit()
+
+    with receipts({"0xpay": 0}):
+        confirm_pending(db)
+
+    db.refresh(task)
+    assert task.payout_status == PayoutStatus.failed
+    row = db.query(ChainTransaction).one()
+    assert row.status == ChainTxStatus.failed
+    assert row.last_error == "reverted"
+
+
+def test_unmined_stays_submitted_until_drop_window():
+    db = make_db()
+    task = make_task(db, payout_status=PayoutStatus.submitted, payout_tx_hash="0xpay")
+    track_transaction(db, "0xpay", ChainTxKind.payout, task_id=task.id)
+    db.commit()
+
+    with receipts({}), \
+         patch("app.services.chain.transaction_known", return_value=False), \
+         patch("app.services.chain.resync_nonces") as resync:
+        assert confirm_pending(db) == 0
+        db.refresh(task)
+        assert task.payout_status == PayoutStatus.submitted
+
+        later = datetime.now(timezone.utc) + timedelta(hours=1)
+        assert confirm_pending(db, now=later) == 1
+
+    db.refresh(task)
+    assert task.payout_status == PayoutStatus.failed
+    row = db.query(ChainTransaction).one()
+    assert row.checks == 2
+    assert row.last_error.startswith("dropped")
+    resync.assert_called_once()
+
+
+def test_waits_for_confirmation_depth():
+    db = make_db()
+    task = make_task(db, payout_status=PayoutStatus.submitted, payout_tx_hash="0xpay")
+    track_transaction(db, "0xpay", ChainTxKind.payout, task_id=task.id)
+    db.commit()
+
+    class W3:
+        class eth:
+            block_number = 8
+
+    with receipts({"0xpay": 1}), \
+         patch("app.services.tx_tracker.CHAIN_CONFIRMATIONS", 3), \
+         patch("app.services.chain.get_w3", return_value=W3):
+        assert confirm_pending(db) == 0    # mined at 7, head 8: two confirmations
+        W3.eth.block_number = 9
+        assert confirm_pending(db) == 1
+
+    db.refresh(task)
+    assert task.payout_status == PayoutStatus.paid
+
+
+def test_reverted_create_challenge_returns_task_to_scoring():
+    db = make_db()
+    task = make_task(
+        db, status=TaskStatus.challenge_window, winner_submission_id="sub-1",
+        challenge_window_end=datetime.now(timezone.utc) + timedelta(hours=2),
+        escrow_tx_hash="0xcreate",
+    )
+    track_transaction(db, "0xcreate", ChainTxKind.escrow_create, task_id=task.id)
+    db.commit()
+
+    with receipts({"0xcreate": 0}), patch("app.lifecycle.notify_lifecycle") as notify:
+        confirm_pending(db)
+
+    db.refresh(task)
+    assert task.status == TaskStatus.scoring
+    assert task.winner_submission_id is None
+    assert task.escrow_tx_hash is None
+    notify.assert_called_once_with(task.id)
+
+
+def test_reverted_join_withdraws_challenge():
+    db = make_db()
+    task = make_task(db, status=TaskStatus.challenge_window)
+    sub = Submission(task_id=task.id, worker_id="w1", revision=1, content="c",
+                     status=SubmissionStatus.gate_passed)
+    db.add(sub)
+    db.flush()
+    challenge = Challenge(task_id=task.id, challenger_submission_id=sub.id,
+                          target_submission_id=sub.id, reason="r",
+                          challenger_wallet="0xC", deposit_tx_hash="0xjoin", deposit_amount=1.0)
+    db.add(challenge)
+    db.flush()
+    track_transaction(db, "0xjoin", ChainTxKind.escrow_join, task_id=task.id, ref_id=challenge.id)
+    db.commit()
+
+    with receipts({"0xjoin": 0}):
+        confirm_pending(db)
+
+    assert db.query(Challenge).count() == 0
+
+
+def test_get_receipts_on_local_chain():
+    """Batched JSON-RPC against anvil (ANVIL_RPC_URL), per-hash calls against eth-tester."""
+    from web3 import Web3
+    if os.environ.get("ANVIL_RPC_URL"):
+        w3 = Web3(Web3.HTTPProvider(os.environ["ANVIL_RPC_URL"]))
+    else:
+        eth_tester = pytest.importorskip("eth_tester")
+        w3 = Web3(Web3.EthereumTesterProvider(eth_tester.EthereumTester()))
+    chain.configure(w3)
+    sender = w3.eth.accounts[0]
+    tx = w3.eth.send_transaction({"from": sender, "to": sender, "value": 1})
+    w3.eth.wait_for_transaction_receipt(tx)
+
+    mined, unknown = tx.to_0x_hex(), "0x" + "ab" * 32
+    got = chain.get_receipts([mined, unknown])
+    assert got[mined]["status"] == 1
+    assert got[mined]["blockNumber"] >= 1
+    assert got[unknown] is None
+    assert chain.transaction_known(mined)
+    assert not chain.transaction_known(unknown)
@@ -44,3 +44,33 @@ def test_get_user(client):
 def test_get_user_not_found(client):
     resp = client.get("/users/nonexistent-id")
     assert resp.status_code == 404
+
+
+def test_list_users_paginated(client):
+    for i in range(3):
+        client.post("/users", json={"nickname": f"page{i}", "wallet": f"0xPAGE{i}", "role": "worker"})
+
+    resp = client.get("/users/list?limit=2")
+    assert resp.status_code == 200
+    first = resp.json()
+    assert [u["nickname"] for u in first] == ["page0", "page1"]
+    cursor = resp.headers["X-Next-Cursor"]
+
+    resp = client.get(f"/users/list?limit=2&cursor={cursor}")
+    assert [u["nickname"] for u in resp.json()] == ["page2"]
+    assert "X-Next-Cursor" not in resp.headers
+
+
+def test_list_users_without_limit_returns_everyone(client):
+    from unittest.mock import patch
+    for i in range(3):
+        client.post("/users", json={"nickname": f"all{i}", "wallet": f"0xALL{i}", "role": "worker"})
+
+    with patch("app.services.pagination.DEFAULT_PAGE_SIZE", 2):
+        resp = client.get("/users/list")
+        assert [u["nickname"] for u in resp.json()] == ["all0", "all1", "all2"]
+        assert "X-Next-Cursor" not in resp.headers
+        # A cursor without a limit pages with the default size
+        first = client.get("/users/list?limit=1")
+        resp = client.get(f"/users/list?cursor={first.headers['X-Next-Cursor']}")
+        assert [u["nickname"] for u in resp.json()] == ["all1", "all2"]
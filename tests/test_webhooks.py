@@ -0,0 +1,233 @@
+"""Tests for outbound webhooks: fan-out rules, signed batched delivery, backoff and dead-lettering.
+
+Deliveries go to a real HTTP server on 127.0.0.1 standing in for an agent endpoint.
+"""
+import json
+import threading
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base
+from app.models import (
+    PayoutStatus, Submission, SubmissionStatus, Task, TaskStatus, TaskType, User, UserRole,
+    Webhook, WebhookDelivery, WebhookDeliveryStatus,
+)
+from app.services.webhooks import WebhookDispatcher, sign_payload
+
+
+class Receiver:
+    """Local HTTP stand-in that records every request and answers with `status`."""
+
+    def __init__(self):
+        self.requests: list[dict] = []
+        self.status = 200
+        receiver = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                receiver.requests.append({"headers": dict(self.headers), "body": body})
+                self.send_response(receiver.status)
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}/hook"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def events(self) -> list[dict]:
+        return [ev for r in self.requests for ev in json.loads(r["body"])["events"]]
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def receiver():
+    r = Receiver()
+    yield r
+    r.close()
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    Base.metadata.drop_all(bind=engine)
+
+
+@pytest.fixture
+def dispatcher(session_factory):
+    d = WebhookDispatcher(session_factory=session_factory, concurrency=2, poll_interval=0.05)
+    yield d
+    d.stop()
+
+
+def _hook(db, user_id, url, events=None, task_id=None, secret="s3cret") -> Webhook:
+    hook = Webhook(user_id=user_id, url=url, secret=secret, task_id=task_id,
+                   event_types=json.dumps(events) if events else None)
+    db.add(hook)
+    db.commit()
+    return hook
+
+
+def _task(db, publisher="pub") -> Task:
+    task = Task(title="T", description="d", type=TaskType.fastest_first, threshold=0.6,
+                deadline=datetime.now(timezone.utc) + timedelta(hours=1), bounty=5.0,
+                publisher_id=publisher)
+    db.add(task)
+    db.commit()
+    return task
+
+
+def _delivered_types(db, hook) -> list[str]:
+    from app.models import TaskEvent
+    rows = (db.query(TaskEvent.event_type)
+            .join(WebhookDelivery, WebhookDelivery.event_id == TaskEvent.id)
+            .filter(WebhookDelivery.webhook_id == hook.id)
+            .order_by(TaskEvent.id).all())
+    return [r[0] for r in rows]
+
+
+def test_deliveries_only_for_events_involving_the_owner(session_factory):
+    db = session_factory()
+    pub_hook = _hook(db, "pub", "http://x/pub")
+    w1_hook = _hook(db, "w1", "http://x/w1")
+    w1_payouts = _hook(db, "w1", "http://x/w1-payouts", events=["task.payout"])
+    outsider = _hook(db, "nobody", "http://x/other")
+    task = _task(db)
+    other_task = _task(db, publisher="someone-else")
+    mine = Submission(task_id=task.id, worker_id="w1", content="a")
+    theirs = Submission(task_id=task.id, worker_id="w2", content="b")
+    db.add_all([mine, theirs])
+    db.commit()
+
+    mine.status = SubmissionStatus.scored
+    theirs.status = SubmissionStatus.scored
+    task.status = TaskStatus.closed
+    task.payout_status = PayoutStatus.paid
+    other_task.status = TaskStatus.closed
+    db.commit()
+
+    # Publisher: everything on their task (creation, both submissions, close, payout)
+    assert _delivered_types(db, pub_hook) == [
+        "task.status", "submission.status", "submission.status",
+        "task.status", "task.payout", "submission.status", "submission.status",
+    ]
+    # Worker: own submission + phase/payout of a task they entered, nothing from w2
+    assert _delivered_types(db, w1_hook) == [
+        "submission.status", "task.status", "task.payout", "submission.status",
+    ]
+    assert _delivered_types(db, w1_payouts) == ["task.payout"]
+    assert _delivered_types(db, outsider) == []
+    db.close()
+
+
+def test_batched_signed_delivery(session_factory, dispatcher, receiver):
+    db = session_factory()
+    hook = _hook(db, "pub", receiver.url)
+    task = _task(db)
+    task.status = TaskStatus.scoring
+    db.commit()
+    task.status = TaskStatus.closed
+    db.commit()
+
+    dispatcher.drain(timeout=10)
+
+    assert len(receiver.requests) == 1   # three events, one POST
+    req = receiver.requests[0]
+    headers = {k.lower(): v for k, v in req["headers"].items()}
+    assert headers["x-webhook-id"] == hook.id
+    assert headers["x-webhook-signature"] == sign_payload("s3cret", headers["x-webhook-timestamp"], req["body"])
+    assert [ev["data"]["status"] for ev in receiver.events()] == ["open", "scoring", "closed"]
+    statuses = {d.status for d in db.query(WebhookDelivery).all()}
+    assert statuses == {WebhookDeliveryStatus.delivered}
+    db.close()
+
+
+def test_failures_back_off_then_dead_letter(session_factory, dispatcher, receiver):
+    db = session_factory()
+    hook = _hook(db, "pub", receiver.url)
+    _task(db)
+    receiver.status = 500
+
+    with patch("app.services.webhooks.WEBHOOK_MAX_ATTEMPTS", 3), \
+         patch("app.services.webhooks.WEBHOOK_RETRY_BASE", 30):
+        dispatcher.drain(timeout=10)
+        delivery = db.query(WebhookDelivery).filter_by(webhook_id=hook.id).one()
+        assert delivery.status == WebhookDeliveryStatus.pending
+        assert delivery.attempts == 1
+        assert "HTTP 500" in delivery.last_error
+        first_retry = delivery.next_attempt_at.replace(tzinfo=timezone.utc)
+        assert first_retry > datetime.now(timezone.utc) + timedelta(seconds=25)
+
+        # Not due yet: nothing is sent
+        dispatcher.drain(timeout=10)
+        assert len(receiver.requests) == 1
+
+        # Second retry waits twice as long, the third attempt dead-letters it
+        dispatcher.drain(timeout=10, now=first_retry + timedelta(seconds=1))
+        db.expire_all()
+        second_retry = delivery.next_attempt_at.replace(tzinfo=timezone.utc)
+        assert second_retry - datetime.now(timezone.utc) > timedelta(seconds=55)
+        dispatcher.drain(timeout=10, now=second_retry + timedelta(seconds=1))
+        db.expire_all()
+        assert delivery.status == WebhookDeliveryStatus.dead
+        assert delivery.attempts == 3
+    assert len(receiver.requests) == 3
+    db.close()
+
+
+def test_webhook_api_register_list_and_redrive(client_with_db, receiver):
+    client, db = client_with_db
+    db.add(User(id="pub", nickname="pub", wallet="0xpub", role=UserRole.publisher))
+    db.commit()
+
+    # Loopback endpoints are refused unless explicitly allowed
+    resp = client.post("/users/pub/webhooks", json={"url": receiver.url})
+    assert resp.status_code == 400
+    assert client.post("/users/pub/webhooks", json={"url": "ftp://example.com/x"}).status_code == 400
+    assert client.post("/users/pub/webhooks",
+                       json={"url": receiver.url, "events": ["task.nope"]}).status_code == 422
+    assert client.post("/users/ghost/webhooks", json={"url": receiver.url}).status_code == 404
+
+    with patch("app.services.webhooks.WEBHOOK_ALLOW_PRIVATE_URLS", True):
+        resp = client.post("/users/pub/webhooks",
+                           json={"url": receiver.url, "events": ["task.status"]})
+    assert resp.status_code == 201
+    created = resp.json()
+    assert len(created["secret"]) == 64
+    assert created["events"] == ["task.status"]
+
+    listed = client.get("/users/pub/webhooks").json()
+    assert [h["id"] for h in listed] == [created["id"]]
+    assert "secret" not in listed[0]
+
+    # Park a dead delivery and redrive it
+    _task(db)
+    delivery = db.query(WebhookDelivery).filter_by(webhook_id=created["id"]).one()
+    delivery.status = WebhookDeliveryStatus.dead
+    delivery.attempts = 8
+    db.commit()
+    dead = client.get(f"/users/pub/webhooks/{created['id']}/deliveries?status=dead").json()
+    assert [d["id"] for d in dead] == [delivery.id]
+    assert client.post(f"/users/pub/webhooks/{created['id']}/deliveries/redrive").json() == {"requeued": 1}
+    db.refresh(delivery)
+    assert delivery.status == WebhookDeliveryStatus.pending
+    assert delivery.attempts == 0
+
+    assert client.delete(f"/users/pub/webhooks/{created['id']}").status_code == 204
+    assert client.get("/users/pub/webhooks").json() == []
+    assert db.query(WebhookDelivery).count() == 0
@@ -1,6 +1,11 @@
 """Tests for the x402 payment service."""
+import asyncio
+import base64
+import json
 from unittest.mock import patch
 
+import httpx
+
 
 def test_build_payment_requirements():
     from app.services.x402 import build_payment_requirements
@@ -22,7 +27,7 @@ def test_verify_payment_valid():
         "app.services.x402._facilitator_verify",
         return_value={"valid": True, "tx_hash": "0xabc123"},
     ):
-        result = verify_payment("some-payment-header", 1.0)
+        result = asyncio.run(verify_payment("some-payment-header", 1.0))
     assert result["valid"] is True
     assert result["tx_hash"] == "0xabc123"
 
@@ -34,7 +39,7 @@ def test_verify_payment_invalid():
         "app.services.x402._facilitator_verify",
         return_value={"valid": False, "tx_hash": None},
     ):
-        result = verify_payment("bad-payment-header", 1.0)
+        result = asyncio.run(verify_payment("bad-payment-header", 1.0))
     assert result["valid"] is False
     assert result["tx_hash"] is None
 
@@ -42,6 +47,159 @@ def test_verify_payment_invalid():
 def test_verify_payment_missing_header():
     from app.services.x402 import verify_payment
 
-    result = verify_payment(None, 1.0)
+    result = asyncio.run(verify_payment(None, 1.0))
     assert result["valid"] is False
     assert result["tx_hash"] is None
+
+
+HEADER = base64.b64encode(json.dumps({"x402Version": 2, "payload": {}}).encode()).decode()
+
+
+def _facilitator(handler):
+    from app.services.x402 import CircuitBreaker, FacilitatorClient
+    clock = [0.0]
+    breaker = CircuitBreaker(threshold=2, reset_after=30, clock=lambda: clock[0])
+    client = FacilitatorClient(base_url="http://facilitator", breaker=breaker,
+                               transport=httpx.MockTransport(handler))
+    return client, clock
+
+
+def test_facilitator_verify_then_settle():
+    calls = []
+
+    def handler(request):
+        calls.append(request.url.path)
+        if request.url.path == "/verify":
+            return httpx.Response(200, json={"isValid": True})
+        return httpx.Response(200, json={"success": True, "transaction": "0xfeed"})
+
+    client, _ = _facilitator(handler)
+    result = asyncio.run(client.verify_and_settle(HEADER, {"amount": "1"}))
+    assert result == {"valid": True, "tx_hash": "0xfeed"}
+    assert calls == ["/verify", "/settle"]
+
+
+def test_facilitator_rejection_does_not_trip_breaker():
+    client, _ = _facilitator(lambda r: httpx.Response(200, json={"isValid": False, "invalidReason": "bad sig"}))
+
+    async def run():
+        return [await client.verify_and_settle(HEADER, {}) for _ in range(3)]
+
+    results = asyncio.run(run())
+    assert all(r["valid"] is False and "bad sig" in r["reason"] for r in results)
+    assert not any(r.get("unavailable") for r in results)
+    assert client.breaker.state == "closed"
+
+
+def test_breaker_opens_on_failures_and_probes_after_reset():
+    status = {"code": 503}
+    calls = []
+
+    def handler(request):
+        calls.append(request.url.path)
+        if status["code"] != 200:
+            return httpx.Response(status["code"])
+        if request.url.path == "/verify":
+            return httpx.Response(200, json={"isValid": True})
+        return httpx.Response(200, json={"success": True, "transaction": "0x1"})
+
+    client, clock = _facilitator(handler)
+
+    async def run():
+        first = [await client.verify_and_settle(HEADER, {}) for _ in range(2)]
+        assert client.breaker.state == "open"
+        rejected = await client.verify_and_settle(HEADER, {})
+        assert rejected["unavailable"] is True
+        assert len(calls) == 2          # short-circuited, facilitator not called
+
+        clock[0] = 31                   # reset window elapsed: one probe goes through
+        status["code"] = 200
+        recovered = await client.verify_and_settle(HEADER, {})
+        return first, recovered
+
+    first, recovered = asyncio.run(run())
+    assert all(r["valid"] is False for r in first)
+    assert recovered == {"valid": True, "tx_hash": "0x1"}
+    assert client.breaker.state == "closed"
+
+
+def test_cancelled_or_failed_probe_does_not_wedge_breaker():
+    started = asyncio.Event()
+    mode = {"handler": "hang"}
+
+    async def handler(request):
+        if mode["handler"] == "hang":
+            started.set()
+            await asyncio.sleep(10)
+        if mode["handler"] == "error":
+            raise RuntimeError("boom")
+        if request.url.path == "/verify":
+            return httpx.Response(200, json={"isValid": True})
+        return httpx.Response(200, json={"success": True, "transaction": "0x2"})
+
+    client, clock = _facilitator(handler)
+    client.breaker.record_failure()
+    client.breaker.record_failure()
+    clock[0] = 31
+
+    async def run():
+        probe = asyncio.create_task(client.verify_and_settle(HEADER, {}))
+        await started.wait()
+        probe.cancel()                  # client disconnects mid-probe
+        try:
+            await probe
+        except asyncio.CancelledError:
+            pass
+        assert client.breaker.state == "half_open" and client.breaker.allow()
+        client.breaker.release_probe()
+
+        mode["handler"] = "error"       # an unexpected error counts as a failed probe
+        result = await client.verify_and_settle(HEADER, {})
+        assert result["valid"] is False and result["unavailable"] is True
+        assert "RuntimeError" in result["reason"]
+        assert client.breaker.state == "open"
+
+        clock[0] = 62
+        mode["handler"] = "ok"
+        return await client.verify_and_settle(HEADER, {})
+
+    assert asyncio.run(run()) == {"valid": True, "tx_hash": "0x2"}
+    assert client.breaker.state == "closed"
+
+
+def test_stage_timeout_counts_as_unavailable():
+    async def handler(request):
+        await asyncio.sleep(1)
+        return httpx.Response(200, json={"isValid": True})
+
+    client, _ = _facilitator(handler)
+    with patch("app.services.x402.X402_VERIFY_TIMEOUT", 0.05):
+        result = asyncio.run(client.verify_and_settle(HEADER, {}))
+    assert result["valid"] is False
+    assert result["unavailable"] is True
+    assert "timeout" in result["reason"]
+    assert client.breaker.failures == 1
+
+
+def test_create_task_returns_503_when_facilitator_unavailable(client):
+    with patch("app.routers.tasks.verify_payment",
+               return_value={"valid": False, "tx_hash": None, "unavailable": True,
+                             "reason": "facilitator unavailable (circuit open)"}):
+        resp = client.post("/tasks", json={
+            "title": "T", "description": "d", "type": "fastest_first", "threshold": 0.6,
+            "deadline": "2099-01-01T00:00:00Z", "publisher_id": "pub", "bounty": 1.0,
+            "acceptance_criteria": ["ok"],
+        }, headers={"X-PAYMENT": HEADER})
+    assert resp.status_code == 503
+    assert "Retry-After" in resp.headers
+
+
+def test_unexpected_facilitator_error_is_reported_as_unavailable():
+    def handler(request):
+        raise httpx.DecodingError("garbled gzip body", request=request)
+
+    client, _ = _facilitator(handler)
+    result = asyncio.run(client.verify_and_settle(HEADER, {}))
+    assert result["valid"] is False and result["unavailable"] is True
+    assert "DecodingError" in result["reason"]
+    assert client.breaker.failures == 1